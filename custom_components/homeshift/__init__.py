@@ -9,6 +9,8 @@ from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN, SERVICE_REFRESH_SCHEDULERS, SERVICE_SYNC_CALENDAR
 from .coordinator import HomeShiftCoordinator
+from .scheduler_index import get_scheduler_index
+from .scheduler_storage import get_scheduler_storage
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,9 +20,15 @@ PLATFORMS: list[Platform] = [Platform.SELECT, Platform.NUMBER]
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up HomeShift from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    # Scheduler tags and timeslots are read from the scheduler component's storage
+    entry.async_on_unload(await get_scheduler_storage(hass).async_track())
+    entry.async_on_unload(get_scheduler_index(hass).async_track())
 
     # Create coordinator
     coordinator = HomeShiftCoordinator(hass, entry)
+    coordinator.async_setup_listeners()
+    # Drive transitions from the last fetched events until the calendar is loaded
+    await coordinator.async_load_snapshot()
     await coordinator.async_config_entry_first_refresh()
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
@@ -59,6 +67,7 @@ async def async_setup_services(hass: HomeAssistant, coordinator: HomeShiftCoordi
         """Handle the refresh_schedulers service call."""
         _LOGGER.info("Service call: refresh_schedulers")
         await coordinator.async_refresh_schedulers()
+        await coordinator.async_refresh_climate()
 
     async def handle_sync_calendar(_call) -> None:
         """Handle the sync_calendar service call."""
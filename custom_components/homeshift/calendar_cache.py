@@ -0,0 +1,405 @@
+"""Domain-level calendar event cache shared by every HomeShift entry.
+
+Several entries often point at the same work or holiday calendar.  Instead of
+each of them calling ``calendar.get_events`` on its own, they go through one
+:class:`CalendarEventCache` stored in ``hass.data[DOMAIN]``:
+
+- entries are keyed by (calendar entity, window start, window end) and are
+  fresh for a TTL;
+- an expired window is returned at once while it is refreshed in the
+  background (stale-while-revalidate), so a slow calendar does not slow
+  down the coordinator update; the refresh retries failed reads with
+  exponential backoff and full jitter;
+- a state change of a tracked calendar entity marks all of its windows
+  stale;
+- windows expired for more than CALENDAR_STALE_MAX_AGE are swept whenever
+  a new window is stored, so past days do not pile up;
+- a per-calendar :class:`CircuitBreaker` stops reading a calendar after
+  several failures in a row, and lets a single read through once it has
+  cooled down;
+- concurrent requests for the same window share a single in-flight fetch
+  (single-flight), so a burst of entries costs one service call.
+
+Only a window that was never read waits for the calendar, and each read
+is bounded by CALENDAR_FETCH_TIMEOUT seconds.
+
+Event times are parsed by :func:`parse_event_span`, which accepts ISO 8601
+datetimes (with or without offset), space-separated datetimes and dates, and
+memoizes the aware UTC result per (start, end) pair: the same event is parsed
+on every cycle while it is active.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CALENDAR_BREAKER_RESET,
+    CALENDAR_BREAKER_THRESHOLD,
+    CALENDAR_FETCH_TIMEOUT,
+    CALENDAR_RETRY_ATTEMPTS,
+    CALENDAR_RETRY_BASE_DELAY,
+    CALENDAR_RETRY_MAX_DELAY,
+    CALENDAR_STALE_MAX_AGE,
+    DATA_CALENDAR_CACHE,
+    DEFAULT_CALENDAR_CACHE_TTL,
+    DOMAIN,
+)
+from .day_table import day_table, local_to_utc
+
+_LOGGER = logging.getLogger(__name__)
+
+CacheKey = tuple[str, datetime, datetime]
+
+# Parsed (start, end) pairs kept by parse_event_span
+EVENT_SPAN_CACHE_SIZE = 256
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+# Failures worth retrying (service errors and timeouts); others are bugs
+_RETRYABLE = (HomeAssistantError, TimeoutError)
+
+
+def get_calendar_cache(hass: HomeAssistant) -> CalendarEventCache:
+    """Return the domain-wide calendar event cache, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get(DATA_CALENDAR_CACHE)
+    if cache is None:
+        cache = domain_data[DATA_CALENDAR_CACHE] = CalendarEventCache(hass)
+    return cache
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Return the wait before retry *attempt* (0-based): full jitter up to min(cap, base * 2**attempt)."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class CircuitBreaker:
+    """Stop calling a failing calendar until it has cooled down."""
+
+    def __init__(self, threshold: int = CALENDAR_BREAKER_THRESHOLD, reset_timeout: float = CALENDAR_BREAKER_RESET) -> None:
+        """Initialize a closed breaker (reset_timeout in seconds)."""
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open (cooled down, next call is a trial)."""
+        if self._opened_at is None:
+            return BREAKER_CLOSED
+        if self._trial or time.monotonic() - self._opened_at < self.reset_timeout:
+            return BREAKER_OPEN
+        return BREAKER_HALF_OPEN
+
+    def allow(self) -> bool:
+        """Return True when a call may be made (one trial call once half open)."""
+        state = self.state
+        if state == BREAKER_HALF_OPEN:
+            self._trial = True
+        return state != BREAKER_OPEN
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        """Count a failure; open after *threshold* in a row or a failed trial."""
+        self.failures += 1
+        if self._trial or self.failures >= self.threshold:
+            self._opened_at = time.monotonic()
+            self._trial = False
+
+
+class CalendarEventCache:
+    """Stale-while-revalidate cache of calendar events with single-flight fetches."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        ttl: float = DEFAULT_CALENDAR_CACHE_TTL,
+        fetch_timeout: float = CALENDAR_FETCH_TIMEOUT,
+        retry_attempts: int = CALENDAR_RETRY_ATTEMPTS,
+        retry_base_delay: float = CALENDAR_RETRY_BASE_DELAY,
+        retry_max_delay: float = CALENDAR_RETRY_MAX_DELAY,
+    ) -> None:
+        """Initialize the cache (durations in seconds)."""
+        self.hass = hass
+        self.ttl = ttl
+        self.fetch_timeout = fetch_timeout
+        self.retry_attempts = retry_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        # key -> (monotonic expiry, events)
+        self._entries: dict[CacheKey, tuple[float, list[dict[str, Any]]]] = {}
+        self._inflight: dict[CacheKey, asyncio.Task] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        # entity_id -> (state listener unsubscribe, number of trackers)
+        self._listeners: dict[str, tuple[CALLBACK_TYPE, int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.retries = 0
+        self.failures = 0
+
+    def breaker(self, entity_id: str) -> CircuitBreaker:
+        """Return the circuit breaker of a calendar."""
+        breaker = self._breakers.get(entity_id)
+        if breaker is None:
+            breaker = self._breakers[entity_id] = CircuitBreaker()
+        return breaker
+
+    async def async_get_events(self, entity_id: str, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        """Return the events of *entity_id* in [start, end).
+
+        Fresh windows are returned from the cache, expired ones too while a
+        background refresh runs.  A window never read is fetched, which
+        raises HomeAssistantError when the calendar fails, times out or its
+        circuit is open.
+        """
+        key: CacheKey = (entity_id, start, end)
+        now = time.monotonic()
+        cached = self._entries.get(key)
+        if cached is not None and now - cached[0] > CALENDAR_STALE_MAX_AGE:
+            del self._entries[key]
+            cached = None
+        if cached is not None:
+            if cached[0] > now:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._async_revalidate(key)
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            if not self.breaker(entity_id).allow():
+                raise HomeAssistantError(f"Calendar {entity_id} is failing, not read until it cools down")
+            self.misses += 1
+            task = self._async_start(key, self._async_fetch(key))
+        # Shield so a cancelled or timed-out waiter does not cancel the fetch shared by others
+        try:
+            events = await asyncio.wait_for(asyncio.shield(task), self.fetch_timeout)
+        except TimeoutError as err:
+            raise HomeAssistantError(f"Timed out reading {entity_id}") from err
+        if events is None:
+            # Joined a background refresh that gave up
+            raise HomeAssistantError(f"Could not read {entity_id}")
+        return events
+
+    def _async_start(self, key: CacheKey, coro) -> asyncio.Task:
+        """Run the fetch of a window as the single in-flight task for it."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._inflight[key] = task
+        task.add_done_callback(lambda _task: self._inflight.pop(key, None))
+        return task
+
+    def _async_revalidate(self, key: CacheKey) -> None:
+        """Refresh an expired window in the background (unless already refreshing)."""
+        if key in self._inflight or not self.breaker(key[0]).allow():
+            return
+        task = self._async_start(key, self._async_fetch_with_retry(key))
+        # The result lands in the cache; failures are counted, not raised
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    async def _async_fetch_with_retry(self, key: CacheKey) -> list[dict[str, Any]] | None:
+        """Fetch a window, retrying with exponential backoff while its circuit stays closed."""
+        breaker = self.breaker(key[0])
+        for attempt in range(self.retry_attempts):
+            if attempt:
+                self.retries += 1
+                await asyncio.sleep(backoff_delay(attempt - 1, self.retry_base_delay, self.retry_max_delay))
+                if not breaker.allow():
+                    break
+            try:
+                return await self._async_fetch(key)
+            except _RETRYABLE as err:
+                _LOGGER.debug("Refreshing events of %s failed (attempt %d): %s", key[0], attempt + 1, err)
+        _LOGGER.warning("Could not refresh the events of %s, serving the cached ones", key[0])
+        return None
+
+    async def _async_fetch(self, key: CacheKey) -> list[dict[str, Any]]:
+        """Call calendar.get_events for one window and store the result."""
+        entity_id, start, end = key
+        breaker = self.breaker(entity_id)
+        _LOGGER.debug("Fetching events of %s between %s and %s", entity_id, start, end)
+        try:
+            async with asyncio.timeout(self.fetch_timeout):
+                response = await self.hass.services.async_call(
+                    "calendar",
+                    "get_events",
+                    {
+                        "entity_id": entity_id,
+                        "start_date_time": dt_util.as_local(start).isoformat(),
+                        "end_date_time": dt_util.as_local(end).isoformat(),
+                    },
+                    blocking=True,
+                    return_response=True,
+                )
+        except Exception:
+            self.failures += 1
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        events: list[dict[str, Any]] = list(((response or {}).get(entity_id) or {}).get("events", []))
+        now = time.monotonic()
+        if key not in self._entries:
+            self._sweep(now)
+        self._entries[key] = (now + self.ttl, events)
+        return events
+
+    def _sweep(self, now: float) -> None:
+        """Drop the windows expired for more than CALENDAR_STALE_MAX_AGE."""
+        aged = [key for key, (expiry, _events) in self._entries.items() if now - expiry > CALENDAR_STALE_MAX_AGE]
+        for key in aged:
+            del self._entries[key]
+        if aged:
+            self.evictions += len(aged)
+            _LOGGER.debug("Calendar cache evicted %d aged window(s)", len(aged))
+
+    @callback
+    def async_invalidate(self, entity_id: str) -> None:
+        """Mark every cached window of *entity_id* stale (refreshed on next read)."""
+        now = time.monotonic()
+        stale = [key for key in self._entries if key[0] == entity_id]
+        for key in stale:
+            expiry, events = self._entries[key]
+            self._entries[key] = (min(expiry, now), events)
+        if stale:
+            self.invalidations += 1
+            _LOGGER.debug("Calendar cache invalidated for %s (%d window(s))", entity_id, len(stale))
+
+    @callback
+    def async_track(self, entity_id: str) -> CALLBACK_TYPE:
+        """Invalidate *entity_id* on state changes until the returned callback is called.
+
+        Listeners are reference-counted so several entries tracking the same
+        calendar share one state subscription.
+        """
+        if entity_id in self._listeners:
+            unsub, count = self._listeners[entity_id]
+            self._listeners[entity_id] = (unsub, count + 1)
+        else:
+
+            @callback
+            def _async_state_changed(_event: Event) -> None:
+                self.async_invalidate(entity_id)
+
+            unsub = async_track_state_change_event(self.hass, [entity_id], _async_state_changed)
+            self._listeners[entity_id] = (unsub, 1)
+
+        @callback
+        def _async_untrack() -> None:
+            unsub, count = self._listeners.pop(entity_id, (None, 0))
+            if count > 1:
+                self._listeners[entity_id] = (unsub, count - 1)
+            elif unsub is not None:
+                unsub()
+
+        return _async_untrack
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return cache counters for the diagnostics download."""
+        now = time.monotonic()
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "coalesced": self.coalesced,
+            "retries": self.retries,
+            "failures": self.failures,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "live_entries": sum(1 for expiry, _events in self._entries.values() if expiry > now),
+            "in_flight": len(self._inflight),
+            "tracked_calendars": sorted(self._listeners),
+            "breakers": {entity_id: breaker.state for entity_id, breaker in sorted(self._breakers.items())},
+            "parsed_event_spans": _parse_event_span.cache_info()._asdict(),
+        }
+
+
+def next_event_after(events: list[dict[str, Any]], now: datetime) -> dict[str, Any] | None:
+    """Return the first event starting strictly after *now*, or None.
+
+    Event start values are ISO dates or datetimes as returned by
+    calendar.get_events; naive values are interpreted in the local time zone.
+    """
+    now = dt_util.as_local(now)
+    upcoming: list[tuple[datetime, dict[str, Any]]] = []
+    for event in events:
+        start = parse_event_time(event.get("start"))
+        if start is not None and start > now:
+            upcoming.append((start, event))
+    if not upcoming:
+        return None
+    return min(upcoming, key=lambda item: item[0])[1]
+
+
+def parse_event_time(value: Any) -> datetime | None:
+    """Parse a get_events start/end value into an aware local datetime.
+
+    ISO dates (all-day events) map to local midnight; naive datetimes are
+    interpreted in the local time zone (a time in a skipped DST hour maps to
+    the end of the gap, a repeated one to its first occurrence).
+    """
+    if not isinstance(value, str):
+        return None
+    parsed = _parse_utc(value, dt_util.DEFAULT_TIME_ZONE)
+    return dt_util.as_local(parsed) if parsed is not None else None
+
+
+def parse_event_span(start: Any, end: Any) -> tuple[datetime, datetime] | None:
+    """Parse an event start/end pair into aware UTC datetimes, or None.
+
+    Values are parsed like :func:`parse_event_time`; results are memoized
+    per (start, end) pair and local time zone.
+    """
+    if not isinstance(start, str) or not isinstance(end, str):
+        return None
+    return _parse_event_span(start, end, dt_util.DEFAULT_TIME_ZONE)
+
+
+@lru_cache(maxsize=EVENT_SPAN_CACHE_SIZE)
+def _parse_event_span(start: str, end: str, tz: tzinfo) -> tuple[datetime, datetime] | None:
+    """Parse a start/end pair in time zone *tz* (cached)."""
+    start_utc = _parse_utc(start, tz)
+    end_utc = _parse_utc(end, tz)
+    if start_utc is None or end_utc is None:
+        return None
+    return start_utc, end_utc
+
+
+def _parse_utc(value: str, tz: tzinfo) -> datetime | None:
+    """Parse an ISO date or datetime into an aware UTC datetime (naive = *tz*)."""
+    parsed = dt_util.parse_datetime(value.strip())
+    if parsed is None:
+        day = dt_util.parse_date(value.strip())
+        if day is None:
+            return None
+        return day_table(day, tz).start
+    if parsed.tzinfo is None:
+        return local_to_utc(parsed, tz)
+    return dt_util.as_utc(parsed)
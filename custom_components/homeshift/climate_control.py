@@ -0,0 +1,242 @@
+"""Direct climate entity control for the HomeShift integration.
+
+The thermostat mode is translated into an HVAC mode, and each day mode ×
+thermostat mode combination may define a setpoint or preset, applied to the
+configured climate entities.  Updates are planned first, then applied:
+
+- entities already in their target HVAC mode / setpoint / preset are skipped;
+- entities are grouped by target, one ``climate.set_hvac_mode``,
+  ``climate.set_temperature`` or ``climate.set_preset_mode`` call per group;
+- when a parallelism bound is configured, each group is sent in chunks of at
+  most that many entities, one chunk at a time, so TRVs on slow radio
+  networks never receive more commands at once than the mesh can carry;
+- a failing chunk (e.g. an unreachable TRV) is logged and the remaining
+  chunks are still sent.
+"""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .rate_limit import async_call_service
+
+_LOGGER = logging.getLogger(__name__)
+
+# HVAC mode used for entities that do not support the requested one
+FALLBACK_HVAC_MODE = "off"
+# Wildcard matching any day mode or thermostat mode key in the preset map
+PRESET_WILDCARD = "*"
+# Setpoints closer than this are considered equal (avoids float noise)
+TEMPERATURE_TOLERANCE = 0.05
+
+# (service, value) — value is a float setpoint or a preset name
+ClimateTarget = tuple[str, float | str]
+
+
+def parse_hvac_mode_map(raw: str) -> dict[str, str]:
+    """Parse 'ThermostatKey1:hvac_mode1, ...' into a dict (hvac modes lowercased)."""
+    mapping: dict[str, str] = {}
+    if not raw:
+        return mapping
+    for pair in raw.split(","):
+        pair = pair.strip()
+        if ":" not in pair:
+            continue
+        key, hvac_mode = pair.split(":", 1)
+        key = key.strip()
+        hvac_mode = hvac_mode.strip().lower()
+        if key and hvac_mode:
+            mapping[key] = hvac_mode
+    return mapping
+
+
+def parse_climate_presets(raw: str) -> dict[tuple[str, str], float | str]:
+    """Parse 'DayKey/ThermostatKey:target, ...' into {(day_key, thermostat_key): target}.
+
+    A numeric target is a setpoint, anything else a preset name.  Either key
+    may be "*" to match every mode, e.g. "Absence/*:away, Remote/Heating:20.5".
+    """
+    presets: dict[tuple[str, str], float | str] = {}
+    if not raw:
+        return presets
+    for pair in raw.split(","):
+        pair = pair.strip()
+        if ":" not in pair:
+            continue
+        modes, target = pair.rsplit(":", 1)
+        if "/" not in modes:
+            continue
+        day_key, thermostat_key = (part.strip() for part in modes.split("/", 1))
+        target = target.strip()
+        if not day_key or not thermostat_key or not target:
+            continue
+        try:
+            presets[(day_key, thermostat_key)] = float(target)
+        except ValueError:
+            presets[(day_key, thermostat_key)] = target
+    return presets
+
+
+def resolve_climate_target(
+    presets: dict[tuple[str, str], float | str],
+    day_key: str | None,
+    thermostat_key: str | None,
+) -> ClimateTarget | None:
+    """Return the (service, value) target for a mode combination, or None.
+
+    The most specific entry wins: exact pair, then day/*, then */thermostat,
+    then */*.
+    """
+    day_key = day_key or ""
+    thermostat_key = thermostat_key or ""
+    for key in (
+        (day_key, thermostat_key),
+        (day_key, PRESET_WILDCARD),
+        (PRESET_WILDCARD, thermostat_key),
+        (PRESET_WILDCARD, PRESET_WILDCARD),
+    ):
+        value = presets.get(key)
+        if value is not None:
+            service = "set_temperature" if isinstance(value, float) else "set_preset_mode"
+            return service, value
+    return None
+
+
+def plan_hvac_modes(hass: HomeAssistant, entity_ids: list[str], hvac_mode: str) -> dict[str, list[str]]:
+    """Return {target hvac_mode: [entity_id, ...]} for the entities that need a change.
+
+    Unavailable entities and entities already in their target mode are left
+    out.  An entity whose ``hvac_modes`` attribute does not list the requested
+    mode falls back to "off" (e.g. Ventilation on a radiator valve).
+    """
+    plan: dict[str, list[str]] = {}
+    for entity_id in entity_ids:
+        state = hass.states.get(entity_id)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            _LOGGER.debug("Climate '%s' unavailable, skipping", entity_id)
+            continue
+        supported = state.attributes.get("hvac_modes")
+        target = hvac_mode
+        if supported and hvac_mode not in supported:
+            target = FALLBACK_HVAC_MODE
+        if state.state == target:
+            continue
+        plan.setdefault(target, []).append(entity_id)
+    for entity_list in plan.values():
+        entity_list.sort()
+    return plan
+
+
+def plan_climate_targets(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    target: ClimateTarget,
+    skip: set[str] | frozenset[str] = frozenset(),
+    turned_on: set[str] | frozenset[str] = frozenset(),
+) -> list[str]:
+    """Return the entities whose setpoint or preset differs from *target*.
+
+    Entities in *skip* (e.g. those being switched off), unavailable or off
+    entities, and entities not offering the requested preset are left out.
+    Off entities in *turned_on* (being switched to a heating or cooling mode
+    by the same plan) count as on.
+    """
+    service, value = target
+    planned: list[str] = []
+    for entity_id in entity_ids:
+        if entity_id in skip:
+            continue
+        state = hass.states.get(entity_id)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            continue
+        if state.state == FALLBACK_HVAC_MODE and entity_id not in turned_on:
+            continue
+        if service == "set_temperature":
+            current = state.attributes.get("temperature")
+            try:
+                if current is not None and abs(float(current) - float(value)) < TEMPERATURE_TOLERANCE:
+                    continue
+            except (TypeError, ValueError):
+                pass
+        else:
+            supported = state.attributes.get("preset_modes")
+            if supported is not None and value not in supported:
+                _LOGGER.debug("Climate '%s' has no preset '%s', skipping", entity_id, value)
+                continue
+            if state.attributes.get("preset_mode") == value:
+                continue
+        planned.append(entity_id)
+    return sorted(planned)
+
+
+def switched_off(hass: HomeAssistant, entity_ids: list[str], plan: dict[str, list[str]]) -> set[str]:
+    """Return the entities that will be off once an HVAC plan is applied."""
+    planned = {entity_id for group in plan.values() for entity_id in group}
+    off = set(plan.get(FALLBACK_HVAC_MODE, []))
+    for entity_id in entity_ids:
+        if entity_id in planned:
+            continue
+        state = hass.states.get(entity_id)
+        if state is not None and state.state == FALLBACK_HVAC_MODE:
+            off.add(entity_id)
+    return off
+
+
+def switched_on(plan: dict[str, list[str]]) -> set[str]:
+    """Return the entities an HVAC plan switches to a mode other than off."""
+    return {entity_id for hvac_mode, group in plan.items() if hvac_mode != FALLBACK_HVAC_MODE for entity_id in group}
+
+
+def chunk(entity_ids: list[str], size: int) -> list[list[str]]:
+    """Split entity_ids into lists of at most *size* items (size <= 0: one list)."""
+    if size <= 0:
+        return [entity_ids] if entity_ids else []
+    return [entity_ids[i : i + size] for i in range(0, len(entity_ids), size)]
+
+
+async def async_apply_hvac_plan(hass: HomeAssistant, plan: dict[str, list[str]], max_parallel: int) -> None:
+    """Send one climate.set_hvac_mode call per target group (per chunk when bounded)."""
+    for hvac_mode, entity_ids in plan.items():
+        await _async_call_chunked(hass, "set_hvac_mode", {"hvac_mode": hvac_mode}, entity_ids, max_parallel)
+
+
+async def async_apply_climate_target(
+    hass: HomeAssistant,
+    target: ClimateTarget,
+    entity_ids: list[str],
+    max_parallel: int,
+) -> None:
+    """Send the climate.set_temperature / set_preset_mode calls for a target."""
+    service, value = target
+    data = {"temperature": value} if service == "set_temperature" else {"preset_mode": value}
+    await _async_call_chunked(hass, service, data, entity_ids, max_parallel)
+
+
+async def _async_call_chunked(
+    hass: HomeAssistant,
+    service: str,
+    data: dict,
+    entity_ids: list[str],
+    max_parallel: int,
+) -> None:
+    """Call a climate service once per chunk of entity_ids.
+
+    A chunk that fails is logged, so one unreachable entity does not stop
+    the others from being driven.
+    """
+    for batch in chunk(entity_ids, max_parallel):
+        _LOGGER.debug("climate.%s %s on %s", service, data, batch)
+        try:
+            await async_call_service(
+                hass,
+                "climate",
+                service,
+                {"entity_id": batch, **data},
+                # Wait for bounded chunks so at most max_parallel commands are in flight
+                blocking=max_parallel > 0,
+            )
+        except HomeAssistantError as err:
+            _LOGGER.warning("climate.%s failed on %s: %s", service, batch, err)
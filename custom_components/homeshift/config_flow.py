@@ -14,27 +14,53 @@ from homeassistant.helpers import selector
 from .const import (
     DOMAIN,
     CONF_CALENDAR_ENTITY,
+    CONF_CALENDAR_URL,
+    CONF_CLIMATE_ENTITIES,
+    CONF_CLIMATE_MAX_PARALLEL,
+    CONF_CLIMATE_PRESETS,
     CONF_HOLIDAY_CALENDAR,
+    CONF_HOLIDAY_COUNTRY,
+    CONF_HOLIDAY_SUBDIVISION,
+    CONF_HVAC_MODE_MAP,
     CONF_DAY_MODE_MAP,
     CONF_THERMOSTAT_MODE_MAP,
     CONF_SCHEDULERS_PER_MODE,
     CONF_SCAN_INTERVAL,
     CONF_MODE_DEFAULT,
     CONF_MODE_WEEKEND,
+    CONF_PRESENCE_ENTITIES,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
     CONF_MODE_HOLIDAY,
+    CONF_DAY_SEGMENTS,
+    CONF_MODE_RULES,
+    CONF_WEEKDAY_MODES,
+    CONF_EVENT_MATCH_FIELDS,
+    CONF_EVENT_MATCH_FOLD_ACCENTS,
+    CONF_EVENT_MATCH_MAX_DISTANCE,
     CONF_EVENT_MODE_MAP,
+    CONF_GUEST_ENTITIES,
     CONF_MODE_ABSENCE,
+    CONF_ZONES,
+    DEFAULT_CLIMATE_MAX_PARALLEL,
     DEFAULT_DAY_MODE_MAP,
+    DEFAULT_HVAC_MODE_MAP,
     DEFAULT_THERMOSTAT_MODE_MAP,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_MODE_DEFAULT,
     DEFAULT_MODE_WEEKEND,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
     DEFAULT_MODE_HOLIDAY,
     DEFAULT_MODE_ABSENCE,
     DEFAULT_EVENT_MODE_MAP,
     LOCALIZED_DEFAULTS,
     get_localized_defaults,
 )
+from .event_match import DEFAULT_MATCH_FIELDS, MATCH_FIELDS, MAX_FUZZY_DISTANCE
+from .ics_feed import is_feed_url
+from .public_holidays import get_provider, holiday_countries, normalize_code
+from .scheduler_index import get_scheduler_index
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,28 +68,63 @@ _LOGGER = logging.getLogger(__name__)
 _LOCALIZED_DEFAULTS = LOCALIZED_DEFAULTS
 _get_localized_defaults = get_localized_defaults
 
+# Search field of the schedulers form (not stored in the entry)
+SCHEDULER_FILTER = "scheduler_filter"
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
+# Optional calendars fields without a default: left out of the input when cleared
+_CALENDARS_CLEARABLE = (CONF_CALENDAR_ENTITY, CONF_HOLIDAY_CALENDAR, CONF_HOLIDAY_COUNTRY)
+
+
+def _with_cleared_calendars(user_input: dict[str, Any]) -> dict[str, Any]:
+    """Return the calendars input with its cleared optional fields set to ''.
+
+    An empty value (rather than a missing key) also overrides the entry data
+    from the options.
+    """
+    return {**{key: "" for key in _CALENDARS_CLEARABLE}, **user_input}
+
+
 def _calendars_schema(data: dict[str, Any]) -> vol.Schema:
     """Build the calendars & schedule form schema."""
     return vol.Schema(
         {
-            vol.Required(
+            vol.Optional(
                 CONF_CALENDAR_ENTITY,
-                default=data.get(CONF_CALENDAR_ENTITY, ""),
+                description={"suggested_value": data.get(CONF_CALENDAR_ENTITY)},
             ): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain="calendar"),
             ),
-            vol.Required(
+            vol.Optional(
+                CONF_CALENDAR_URL,
+                default=data.get(CONF_CALENDAR_URL, ""),
+            ): selector.TextSelector(
+                selector.TextSelectorConfig(type=selector.TextSelectorType.URL),
+            ),
+            vol.Optional(
                 CONF_HOLIDAY_CALENDAR,
-                default=data.get(CONF_HOLIDAY_CALENDAR, ""),
+                description={"suggested_value": data.get(CONF_HOLIDAY_CALENDAR)},
             ): selector.EntitySelector(
                 selector.EntitySelectorConfig(domain="calendar"),
             ),
+            vol.Optional(
+                CONF_HOLIDAY_COUNTRY,
+                description={"suggested_value": data.get(CONF_HOLIDAY_COUNTRY)},
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=holiday_countries(),
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                ),
+            ),
+            vol.Optional(
+                CONF_HOLIDAY_SUBDIVISION,
+                default=data.get(CONF_HOLIDAY_SUBDIVISION, ""),
+            ): selector.TextSelector(),
             vol.Optional(
                 CONF_SCAN_INTERVAL,
                 default=data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
@@ -194,6 +255,43 @@ def _mapping_schema(data: dict[str, Any]) -> vol.Schema:
                 CONF_EVENT_MODE_MAP,
                 default=data.get(CONF_EVENT_MODE_MAP, DEFAULT_EVENT_MODE_MAP),
             ): text,
+            vol.Optional(
+                CONF_EVENT_MATCH_FIELDS,
+                default=list(data.get(CONF_EVENT_MATCH_FIELDS) or DEFAULT_MATCH_FIELDS),
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=list(MATCH_FIELDS),
+                    multiple=True,
+                    mode=selector.SelectSelectorMode.LIST,
+                )
+            ),
+            vol.Optional(
+                CONF_EVENT_MATCH_FOLD_ACCENTS,
+                default=data.get(CONF_EVENT_MATCH_FOLD_ACCENTS, False),
+            ): selector.BooleanSelector(),
+            vol.Optional(
+                CONF_EVENT_MATCH_MAX_DISTANCE,
+                default=data.get(CONF_EVENT_MATCH_MAX_DISTANCE, 0),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=MAX_FUZZY_DISTANCE,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
+            vol.Optional(
+                CONF_DAY_SEGMENTS,
+                default=data.get(CONF_DAY_SEGMENTS, ""),
+            ): text,
+            vol.Optional(
+                CONF_WEEKDAY_MODES,
+                default=data.get(CONF_WEEKDAY_MODES, ""),
+            ): text,
+            vol.Optional(
+                CONF_MODE_RULES,
+                default=data.get(CONF_MODE_RULES, ""),
+            ): selector.TextSelector(selector.TextSelectorConfig(multiline=True)),
         }
     )
 
@@ -217,9 +315,20 @@ def _validate_calendars(hass, user_input: dict[str, Any]) -> dict[str, str]:
     cal = user_input.get(CONF_CALENDAR_ENTITY)
     if cal and not hass.states.get(cal):
         errors[CONF_CALENDAR_ENTITY] = "invalid_calendar"
+    # The work calendar is the entity or the feed URL; one of them is required
+    if not cal and not user_input.get(CONF_CALENDAR_URL):
+        errors["base"] = "calendar_required"
     hol = user_input.get(CONF_HOLIDAY_CALENDAR, "")
-    if not hass.states.get(hol):
+    # A holiday source is required: the calendar entity or a built-in country
+    if (hol or not user_input.get(CONF_HOLIDAY_COUNTRY)) and not hass.states.get(hol):
         errors[CONF_HOLIDAY_CALENDAR] = "invalid_calendar"
+    provider = get_provider(user_input.get(CONF_HOLIDAY_COUNTRY))
+    subdivision = normalize_code(user_input.get(CONF_HOLIDAY_SUBDIVISION))
+    if provider is not None and subdivision and subdivision not in provider.subdivisions:
+        errors[CONF_HOLIDAY_SUBDIVISION] = "invalid_subdivision"
+    url = user_input.get(CONF_CALENDAR_URL, "")
+    if url and not is_feed_url(url):
+        errors[CONF_CALENDAR_URL] = "invalid_url"
     return errors
 
 
@@ -229,25 +338,9 @@ def _parse_day_modes(data: dict[str, Any]) -> list[str]:
     return [v.strip() for v in _parse_day_mode_map(raw).values()]
 
 
-def _get_scheduler_options(hass) -> list[selector.SelectOptionDict]:
-    """Return SelectSelector options for scheduler-like switch entities."""
-    options: list[selector.SelectOptionDict] = []
-    for state in hass.states.async_all("switch"):
-        if "schedule" in state.entity_id.lower() or state.attributes.get("next_trigger") is not None:
-            friendly = state.attributes.get("friendly_name", state.entity_id)
-            options.append(
-                {
-                    "value": state.entity_id,
-                    "label": f"{friendly} ({state.entity_id})",
-                }
-            )
-    options.sort(key=lambda x: x["label"])
-    return options
-
-
-def _scheduler_selector(hass) -> selector.SelectSelector | selector.EntitySelector:
-    """Return the best selector for scheduler entities."""
-    opts = _get_scheduler_options(hass)
+def _scheduler_selector(hass, query: str = "", keep: list[str] | None = None) -> selector.SelectSelector | selector.EntitySelector:
+    """Return the best selector for scheduler entities (options from the shared index)."""
+    opts = get_scheduler_index(hass).search(query, keep)
     if opts:
         return selector.SelectSelector(
             selector.SelectSelectorConfig(
@@ -259,12 +352,21 @@ def _scheduler_selector(hass) -> selector.SelectSelector | selector.EntitySelect
     return selector.EntitySelector(selector.EntitySelectorConfig(domain="switch", multiple=True))
 
 
-def _schedulers_schema(hass, data: dict[str, Any]) -> vol.Schema:
-    """Build scheduler form schema – one multi-select per day mode."""
+def _schedulers_schema(hass, data: dict[str, Any], query: str = "") -> vol.Schema:
+    """Build scheduler form schema – a search field, then one multi-select per day mode.
+
+    Every multi-select shares one selector built from the cached scheduler
+    index, so rendering does not scan the switch states.
+    """
     day_modes = _parse_day_modes(data)
     current_schedulers: dict[str, list] = data.get(CONF_SCHEDULERS_PER_MODE, {})
-    sel = _scheduler_selector(hass)
-    schema_dict: dict = {}
+    selected = sorted({entity_id for entity_ids in current_schedulers.values() for entity_id in entity_ids})
+    sel = _scheduler_selector(hass, query, selected)
+    schema_dict: dict = {
+        vol.Optional(SCHEDULER_FILTER, default=query): selector.TextSelector(
+            selector.TextSelectorConfig(type=selector.TextSelectorType.SEARCH)
+        ),
+    }
     for mode in day_modes:
         current_value = current_schedulers.get(mode, [])
         schema_dict[vol.Optional(mode, default=current_value)] = sel
@@ -283,6 +385,110 @@ def _extract_schedulers(user_input: dict[str, Any], data: dict[str, Any]) -> dic
     return result
 
 
+def _presence_schema(data: dict[str, Any]) -> vol.Schema:
+    """Build the presence form schema."""
+    return vol.Schema(
+        {
+            vol.Optional(
+                CONF_PRESENCE_ENTITIES,
+                default=data.get(CONF_PRESENCE_ENTITIES, []),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["person", "device_tracker"], multiple=True),
+            ),
+            vol.Optional(
+                CONF_GUEST_ENTITIES,
+                default=data.get(CONF_GUEST_ENTITIES, []),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["person", "device_tracker", "input_boolean"], multiple=True),
+            ),
+        }
+    )
+
+
+def _commands_schema(data: dict[str, Any]) -> vol.Schema:
+    """Build the device command rate limiting form schema."""
+    return vol.Schema(
+        {
+            vol.Optional(
+                CONF_RATE_LIMIT,
+                default=data.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=100,
+                    step=0.5,
+                    unit_of_measurement="/s",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
+            vol.Optional(
+                CONF_RATE_BURST,
+                default=data.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=500,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
+        }
+    )
+
+
+def _climate_schema(data: dict[str, Any]) -> vol.Schema:
+    """Build the climate control form schema."""
+    return vol.Schema(
+        {
+            vol.Optional(
+                CONF_CLIMATE_ENTITIES,
+                default=data.get(CONF_CLIMATE_ENTITIES, []),
+            ): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain="climate", multiple=True),
+            ),
+            vol.Optional(
+                CONF_HVAC_MODE_MAP,
+                default=data.get(CONF_HVAC_MODE_MAP, DEFAULT_HVAC_MODE_MAP),
+            ): selector.TextSelector(selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT)),
+            vol.Optional(
+                CONF_CLIMATE_PRESETS,
+                default=data.get(CONF_CLIMATE_PRESETS, ""),
+            ): selector.TextSelector(selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT)),
+            vol.Optional(
+                CONF_CLIMATE_MAX_PARALLEL,
+                default=data.get(CONF_CLIMATE_MAX_PARALLEL, DEFAULT_CLIMATE_MAX_PARALLEL),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=50,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
+        }
+    )
+
+
+def _zones_schema(data: dict[str, Any]) -> vol.Schema:
+    """Build the zones form schema (zone name → zone config mapping)."""
+    return vol.Schema(
+        {
+            vol.Optional(
+                CONF_ZONES,
+                default=data.get(CONF_ZONES, {}),
+            ): selector.ObjectSelector(),
+        }
+    )
+
+
+def _validate_zones(user_input: dict[str, Any]) -> dict[str, str]:
+    """Return form errors when the zones mapping is not {name: {config}}."""
+    zones = user_input.get(CONF_ZONES) or {}
+    if not isinstance(zones, dict) or not all(isinstance(cfg, dict) for cfg in zones.values()):
+        return {CONF_ZONES: "invalid_zones"}
+    return {}
+
+
 # ---------------------------------------------------------------------------
 # Config flow (initial setup) – menu-based
 # ---------------------------------------------------------------------------
@@ -296,6 +502,7 @@ class HomeShiftConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         """Initialise the config flow."""
         self._data: dict[str, Any] = {}
+        self._scheduler_filter = ""
 
     def is_matching(self, _other_flow: Self) -> bool:
         """Return True if another in-progress flow matches this one (not used)."""
@@ -309,7 +516,7 @@ class HomeShiftConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     def _is_config_complete(self) -> bool:
         """Return True when the minimum required configuration is present."""
-        return bool(self._data.get(CONF_CALENDAR_ENTITY))
+        return bool(self._data.get(CONF_CALENDAR_ENTITY) or self._data.get(CONF_CALENDAR_URL))
 
     # -- entry point -------------------------------------------------------
 
@@ -327,7 +534,7 @@ class HomeShiftConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         _user_input: dict[str, Any] | None = None,
     ) -> config_entries.ConfigFlowResult:
         """Show the configuration menu."""
-        menu_options = ["calendars", "mapping", "schedulers"]
+        menu_options = ["calendars", "mapping", "schedulers", "climate", "presence", "zones", "commands"]
         if self._is_config_complete():
             menu_options.append("finalize")
         return self.async_show_menu(step_id="menu", menu_options=menu_options)
@@ -344,7 +551,7 @@ class HomeShiftConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             errors = _validate_calendars(self.hass, user_input)
             if not errors:
-                self._data.update(user_input)
+                self._data.update(_with_cleared_calendars(user_input))
                 return await self.async_step_menu()
 
         return self.async_show_form(
@@ -383,14 +590,90 @@ class HomeShiftConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self,
         user_input: dict[str, Any] | None = None,
     ) -> config_entries.ConfigFlowResult:
-        """Assign scheduler entities to each day mode."""
+        """Assign scheduler entities to each day mode.
+
+        Submitting a new search text narrows the options and shows the form
+        again; submitting with the same text saves the assignments.
+        """
         if user_input is not None:
             self._data[CONF_SCHEDULERS_PER_MODE] = _extract_schedulers(user_input, self._data)
-            return await self.async_step_menu()
+            query = user_input.get(SCHEDULER_FILTER, "")
+            if query == self._scheduler_filter:
+                return await self.async_step_menu()
+            self._scheduler_filter = query
 
         return self.async_show_form(
             step_id="schedulers",
-            data_schema=_schedulers_schema(self.hass, self._data),
+            data_schema=_schedulers_schema(self.hass, self._data, self._scheduler_filter),
+        )
+
+    # -- climate -----------------------------------------------------------
+
+    async def async_step_climate(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Select the climate entities driven by the thermostat mode."""
+        if user_input is not None:
+            self._data.update(user_input)
+            return await self.async_step_menu()
+
+        return self.async_show_form(
+            step_id="climate",
+            data_schema=_climate_schema(self._data),
+        )
+
+    # -- presence ----------------------------------------------------------
+
+    async def async_step_presence(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Select the resident and guest presence entities."""
+        if user_input is not None:
+            self._data.update(user_input)
+            return await self.async_step_menu()
+
+        return self.async_show_form(
+            step_id="presence",
+            data_schema=_presence_schema(self._data),
+        )
+
+    # -- commands ----------------------------------------------------------
+
+    async def async_step_commands(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Configure the rate limiting of device commands."""
+        if user_input is not None:
+            self._data.update(user_input)
+            return await self.async_step_menu()
+
+        return self.async_show_form(
+            step_id="commands",
+            data_schema=_commands_schema(self._data),
+        )
+
+    # -- zones -------------------------------------------------------------
+
+    async def async_step_zones(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Define zones with their own day modes and scheduler sets."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            errors = _validate_zones(user_input)
+            if not errors:
+                self._data[CONF_ZONES] = user_input.get(CONF_ZONES) or {}
+                return await self.async_step_menu()
+
+        return self.async_show_form(
+            step_id="zones",
+            data_schema=_zones_schema(self._data),
+            errors=errors,
         )
 
     # -- finalize ----------------------------------------------------------
@@ -424,12 +707,13 @@ class HomeShiftOptionsFlow(config_entries.OptionsFlow):
     def __init__(self) -> None:
         """Initialize options flow."""
         self._data: dict[str, Any] = {}
+        self._scheduler_filter = ""
 
     # -- helpers -----------------------------------------------------------
 
     def _is_config_complete(self) -> bool:
         """Return True when the minimum required configuration is present."""
-        return bool(self._data.get(CONF_CALENDAR_ENTITY))
+        return bool(self._data.get(CONF_CALENDAR_ENTITY) or self._data.get(CONF_CALENDAR_URL))
 
     def _effective_data(self) -> dict[str, Any]:
         """Return _data merged over localized defaults (for schema builders)."""
@@ -452,7 +736,7 @@ class HomeShiftOptionsFlow(config_entries.OptionsFlow):
         _user_input: dict[str, Any] | None = None,
     ) -> config_entries.ConfigFlowResult:
         """Show the options menu."""
-        menu_options = ["calendars", "mapping", "schedulers"]
+        menu_options = ["calendars", "mapping", "schedulers", "climate", "presence", "zones", "commands"]
         if self._is_config_complete():
             menu_options.append("finalize")
         return self.async_show_menu(step_id="menu", menu_options=menu_options)
@@ -469,7 +753,7 @@ class HomeShiftOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             errors = _validate_calendars(self.hass, user_input)
             if not errors:
-                self._data.update(user_input)
+                self._data.update(_with_cleared_calendars(user_input))
                 return await self.async_step_menu()
 
         return self.async_show_form(
@@ -508,14 +792,90 @@ class HomeShiftOptionsFlow(config_entries.OptionsFlow):
         self,
         user_input: dict[str, Any] | None = None,
     ) -> config_entries.ConfigFlowResult:
-        """Assign scheduler entities to each day mode."""
+        """Assign scheduler entities to each day mode.
+
+        Submitting a new search text narrows the options and shows the form
+        again; submitting with the same text saves the assignments.
+        """
         if user_input is not None:
             self._data[CONF_SCHEDULERS_PER_MODE] = _extract_schedulers(user_input, self._data)
-            return await self.async_step_menu()
+            query = user_input.get(SCHEDULER_FILTER, "")
+            if query == self._scheduler_filter:
+                return await self.async_step_menu()
+            self._scheduler_filter = query
 
         return self.async_show_form(
             step_id="schedulers",
-            data_schema=_schedulers_schema(self.hass, self._data),
+            data_schema=_schedulers_schema(self.hass, self._data, self._scheduler_filter),
+        )
+
+    # -- climate -----------------------------------------------------------
+
+    async def async_step_climate(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Select the climate entities driven by the thermostat mode."""
+        if user_input is not None:
+            self._data.update(user_input)
+            return await self.async_step_menu()
+
+        return self.async_show_form(
+            step_id="climate",
+            data_schema=_climate_schema(self._data),
+        )
+
+    # -- presence ----------------------------------------------------------
+
+    async def async_step_presence(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Select the resident and guest presence entities."""
+        if user_input is not None:
+            self._data.update(user_input)
+            return await self.async_step_menu()
+
+        return self.async_show_form(
+            step_id="presence",
+            data_schema=_presence_schema(self._data),
+        )
+
+    # -- commands ----------------------------------------------------------
+
+    async def async_step_commands(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Configure the rate limiting of device commands."""
+        if user_input is not None:
+            self._data.update(user_input)
+            return await self.async_step_menu()
+
+        return self.async_show_form(
+            step_id="commands",
+            data_schema=_commands_schema(self._data),
+        )
+
+    # -- zones -------------------------------------------------------------
+
+    async def async_step_zones(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> config_entries.ConfigFlowResult:
+        """Define zones with their own day modes and scheduler sets."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            errors = _validate_zones(user_input)
+            if not errors:
+                self._data[CONF_ZONES] = user_input.get(CONF_ZONES) or {}
+                return await self.async_step_menu()
+
+        return self.async_show_form(
+            step_id="zones",
+            data_schema=_zones_schema(self._data),
+            errors=errors,
         )
 
     # -- finalize ----------------------------------------------------------
@@ -5,18 +5,38 @@ DOMAIN = "homeshift"
 # Configuration keys
 CONF_CALENDAR_ENTITY = "calendar_entity"
 CONF_HOLIDAY_CALENDAR = "holiday_calendar"
+# Remote ICS / CalDAV feed read instead of the work calendar entity
+CONF_CALENDAR_URL = "calendar_url"
+# Built-in public holidays (country code, region), used instead of the holiday calendar
+CONF_HOLIDAY_COUNTRY = "holiday_country"
+CONF_HOLIDAY_SUBDIVISION = "holiday_subdivision"
 CONF_DAY_MODE_MAP = "day_mode_map"  # Mapping: internal key → display name (like thermostat)
 CONF_THERMOSTAT_MODE_MAP = "thermostat_mode_map"  # Mapping: internal key → display/scheduler tag
 CONF_SCHEDULERS_PER_MODE = "schedulers_per_mode"  # Scheduler entities per day mode
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_OVERRIDE_DURATION = "override_duration"  # minutes to lock auto-update after manual change
+CONF_CLIMATE_ENTITIES = "climate_entities"  # Climate entities driven by the thermostat mode
+CONF_HVAC_MODE_MAP = "hvac_mode_map"  # Mapping: thermostat mode key → climate hvac_mode
+CONF_CLIMATE_MAX_PARALLEL = "climate_max_parallel"  # Max climate entities per service call (0 = unbounded)
+CONF_CLIMATE_PRESETS = "climate_presets"  # Mapping: day mode key/thermostat mode key → setpoint or preset
+CONF_RATE_LIMIT = "rate_limit"  # Device commands per second per integration (0 = unlimited)
+CONF_RATE_BURST = "rate_burst"  # Device commands sent at once before rate limiting kicks in
+CONF_PRESENCE_ENTITIES = "presence_entities"  # person/device_tracker entities of the residents
+CONF_GUEST_ENTITIES = "guest_entities"  # Entities signalling guests at home (person, device_tracker, input_boolean)
+CONF_ZONES = "zones"  # Zone name → zone config (same keys as the entry, missing keys inherited)
 
 # Mode mapping configuration
 CONF_MODE_DEFAULT = "mode_default"  # Day mode key for regular work days
 CONF_MODE_WEEKEND = "mode_weekend"  # Day mode key for weekends
 CONF_MODE_HOLIDAY = "mode_holiday"  # Day mode key for holidays
 CONF_EVENT_MODE_MAP = "event_mode_map"  # Mapping: calendar event keyword → day mode key
+CONF_EVENT_MATCH_FIELDS = "event_match_fields"  # Event fields searched for keywords (summary, description, location, categories)
+CONF_EVENT_MATCH_FOLD_ACCENTS = "event_match_fold_accents"  # Compare event keywords without accents
+CONF_EVENT_MATCH_MAX_DISTANCE = "event_match_max_distance"  # Typos tolerated in event keywords (0 = exact)
 CONF_MODE_ABSENCE = "mode_absence"  # Day mode key that blocks automatic updates
+CONF_MODE_RULES = "mode_rules"  # Declarative rules "conditions => ModeKey", checked before the built-in priority
+CONF_DAY_SEGMENTS = "day_segments"  # Intra-day segments "name:HH:MM, ..."; events then apply to whole segments
+CONF_WEEKDAY_MODES = "weekday_modes"  # Mapping: weekday (range) → day mode key, checked before weekend/default
 
 # Default values (keys are stable English identifiers)
 DEFAULT_DAY_MODE_MAP = "Home:Home, Work:Work, Remote:Remote, Absence:Absence"
@@ -24,6 +44,10 @@ DEFAULT_THERMOSTAT_MODE_MAP = "Off:Off, Heating:Heating, Cooling:Cooling, Ventil
 # Internal key that means 'thermostat is off' — schedulers with any thermostat
 # tag are disabled when the thermostat mode matches this key.
 THERMOSTAT_OFF_KEY = "Off"
+DEFAULT_HVAC_MODE_MAP = "Off:off, Heating:heat, Cooling:cool, Ventilation:fan_only"
+DEFAULT_CLIMATE_MAX_PARALLEL = 4
+DEFAULT_RATE_LIMIT = 0  # 0 = disabled
+DEFAULT_RATE_BURST = 10
 DEFAULT_SCAN_INTERVAL = 60  # minutes
 DEFAULT_OVERRIDE_DURATION = 0  # 0 = disabled
 DEFAULT_MODE_DEFAULT = "Work"
@@ -32,6 +56,11 @@ DEFAULT_MODE_HOLIDAY = "Home"
 DEFAULT_EVENT_MODE_MAP = "Vacation:Home, Remote:Remote"
 DEFAULT_MODE_ABSENCE = "Absence"
 
+# Aggregated household presence states
+PRESENCE_ALL_AWAY = "all_away"
+PRESENCE_SOMEONE_HOME = "someone_home"
+PRESENCE_GUESTS = "guests"
+
 # Entity IDs
 SELECT_DAY_MODE = "day_mode"
 SELECT_THERMOSTAT_MODE = "thermostat_mode"
@@ -45,6 +74,35 @@ EVENT_PERIOD_ALL_DAY = "all_day"
 EVENT_PERIOD_MORNING = "morning"
 EVENT_PERIOD_AFTERNOON = "afternoon"
 
+# Calendar event cache shared by all entries (stored in hass.data[DOMAIN])
+DATA_CALENDAR_CACHE = "calendar_cache"
+DEFAULT_CALENDAR_CACHE_TTL = 900  # seconds
+CALENDAR_LOOKAHEAD_DAYS = 2  # window fetched from local midnight for upcoming events
+# Expired windows are served while refreshed in the background (stale-while-revalidate)
+CALENDAR_FETCH_TIMEOUT = 10  # seconds per get_events attempt
+CALENDAR_RETRY_ATTEMPTS = 4
+CALENDAR_RETRY_BASE_DELAY = 2  # seconds, doubled after each failed attempt
+CALENDAR_RETRY_MAX_DELAY = 60  # seconds
+CALENDAR_STALE_MAX_AGE = 86400  # seconds a window is still served after expiry
+# Failed attempts in a row before a calendar's circuit opens, and time it stays open
+CALENDAR_BREAKER_THRESHOLD = 5
+CALENDAR_BREAKER_RESET = 300  # seconds
+
+# On-disk snapshot of the event timeline, used while the calendar is unavailable
+TIMELINE_SNAPSHOT_VERSION = 1
+TIMELINE_SNAPSHOT_SAVE_DELAY = 30  # seconds
+
+# Device service call rate limiter shared by all entries (stored in hass.data[DOMAIN])
+DATA_RATE_LIMITER = "rate_limiter"
+
+# Scheduler discovery index shared by all entries (stored in hass.data[DOMAIN])
+DATA_SCHEDULER_INDEX = "scheduler_index"
+# Read-only view of the scheduler component's storage file (stored in hass.data[DOMAIN])
+DATA_SCHEDULER_STORAGE = "scheduler_storage"
+
+# Midday threshold of the default morning / afternoon day segments
+MIDDAY_HOUR = 13
+
 # Service names
 SERVICE_REFRESH_SCHEDULERS = "refresh_schedulers"
 SERVICE_SYNC_CALENDAR = "sync_calendar"
@@ -52,6 +110,17 @@ SERVICE_SYNC_CALENDAR = "sync_calendar"
 # Attributes
 ATTR_DAY_MODE = "day_mode"
 ATTR_THERMOSTAT_MODE = "thermostat_mode"
+ATTR_NEXT_EVENT = "next_event"
+ATTR_PRESENCE = "presence"
+ATTR_NEXT_TRANSITION = "next_transition"
+ATTR_SEGMENTS = "segments"
+ATTR_TIMELINE = "timeline"
+
+# Long-term statistics kinds (prefix of the external statistic ids)
+STATISTIC_KIND_DAY_MODE = "day_mode"
+STATISTIC_KIND_THERMOSTAT_MODE = "thermostat_mode"
+# Completed hours kept in memory while they cannot be pushed (oldest dropped first)
+STATISTICS_MAX_PENDING_HOURS = 48
 
 
 # ---------------------------------------------------------------------------
@@ -62,6 +131,8 @@ ATTR_THERMOSTAT_MODE = "thermostat_mode"
 # CONF_MODE_DEFAULT / WEEKEND / HOLIDAY / ABSENCE reference the **keys** above.
 # CONF_EVENT_MODE_MAP format: "EventKeyword:DayModeKey, ..." — both sides use
 # the keywords / keys defined above (locale-independent).
+# CONF_WEEKDAY_MODES format: "Mon-Thu:Work, Fri:Remote" — English day names
+# (or workday / weekend) and day mode keys; unlisted days use the defaults.
 
 LOCALIZED_DEFAULTS: dict[str, dict] = {
     "en": {
@@ -3,16 +3,28 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, date, timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    CALENDAR_LOOKAHEAD_DAYS,
     CONF_CALENDAR_ENTITY,
+    CONF_CALENDAR_URL,
+    CONF_CLIMATE_ENTITIES,
+    CONF_CLIMATE_MAX_PARALLEL,
     CONF_HOLIDAY_CALENDAR,
+    CONF_HOLIDAY_COUNTRY,
+    CONF_HOLIDAY_SUBDIVISION,
+    CONF_HVAC_MODE_MAP,
+    CONF_CLIMATE_PRESETS,
     CONF_DAY_MODE_MAP,
     CONF_THERMOSTAT_MODE_MAP,
     CONF_SCHEDULERS_PER_MODE,
@@ -21,9 +33,22 @@ from .const import (
     CONF_MODE_DEFAULT,
     CONF_MODE_WEEKEND,
     CONF_MODE_HOLIDAY,
+    CONF_EVENT_MATCH_FIELDS,
+    CONF_EVENT_MATCH_FOLD_ACCENTS,
+    CONF_EVENT_MATCH_MAX_DISTANCE,
     CONF_EVENT_MODE_MAP,
     CONF_MODE_ABSENCE,
+    CONF_DAY_SEGMENTS,
+    CONF_MODE_RULES,
+    CONF_WEEKDAY_MODES,
+    CONF_PRESENCE_ENTITIES,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    CONF_GUEST_ENTITIES,
+    CONF_ZONES,
+    DEFAULT_CLIMATE_MAX_PARALLEL,
     DEFAULT_DAY_MODE_MAP,
+    DEFAULT_HVAC_MODE_MAP,
     DEFAULT_THERMOSTAT_MODE_MAP,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_OVERRIDE_DURATION,
@@ -32,17 +57,60 @@ from .const import (
     DEFAULT_MODE_HOLIDAY,
     DEFAULT_EVENT_MODE_MAP,
     DEFAULT_MODE_ABSENCE,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
     EVENT_NONE,
     EVENT_PERIOD_ALL_DAY,
-    EVENT_PERIOD_MORNING,
-    EVENT_PERIOD_AFTERNOON,
-    THERMOSTAT_OFF_KEY,
+    MIDDAY_HOUR,  # noqa: F401 - re-exported
+    PRESENCE_ALL_AWAY,
 )
+from .calendar_cache import get_calendar_cache, next_event_after, parse_event_span
+from .climate_control import (
+    async_apply_climate_target,
+    async_apply_hvac_plan,
+    parse_climate_presets,
+    parse_hvac_mode_map,
+    plan_climate_targets,
+    plan_hvac_modes,
+    resolve_climate_target,
+    switched_off,
+    switched_on,
+)
+from .day_table import local_day_table
+from .evaluation import CalendarEvaluation
+from .event_match import DEFAULT_MATCH_FIELDS, EventMatcher, is_regex_keyword
+from .ics_feed import IcsFeed
+from .mode_statistics import ModeStatistics
+from .presence import PresenceTracker
+from .public_holidays import is_public_holiday
+from .rate_limit import get_rate_limiter
+from .rules import DecisionTable, build_decision_table
+from .segments import DEFAULT_SEGMENTS, Segment, parse_day_segments
+from .schedulers import async_apply_scheduler_changes, plan_scheduler_changes
+from .snapshot import TimelineSnapshot
+from .transitions import (
+    EventSpan,
+    Transition,
+    active_spans,
+    event_spans,
+    predict_next_transition,
+    SegmentMode,
+    segment_of,
+    segment_spans,
+    segment_timeline,
+    span_period,
+)
+from .zones import HomeShiftZone
 
 _LOGGER = logging.getLogger(__name__)
 
-# Midday threshold for determining morning vs afternoon half-days
-MIDDAY_HOUR = 13
+# Delay after a predicted transition before refreshing, so the calendar
+# entities have switched to their new event first
+TRANSITION_SETTLE_DELAY = timedelta(seconds=1)
+
+# Origin of the event timeline (timeline attribute)
+TIMELINE_SOURCE_CALENDAR = "calendar"
+TIMELINE_SOURCE_SNAPSHOT = "snapshot"
 
 
 class HomeShiftCoordinator(DataUpdateCoordinator):
@@ -76,12 +144,20 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
         self._day_mode: str = self._day_modes[0] if self._day_modes else "Home"
 
         self._current_event: str | None = None
-        self._event_period: str | None = None  # all_day, morning, afternoon
+        self._event_period: str | None = None  # all_day or a day segment name
+        # Intra-day segments; when configured, events apply to whole segments
+        self._segments: tuple[Segment, ...] = parse_day_segments(_config.get(CONF_DAY_SEGMENTS, ""))
+        self._segment_aligned: bool = bool(_config.get(CONF_DAY_SEGMENTS))
+        # Today's segments with their predicted entry mode
+        self._segment_timeline: list[SegmentMode] = []
         # Day-level event type: persists until midnight so the sensor doesn't
         # flicker back to EVENT_NONE between half-day events.
         # Stored as the matched event keyword (locale-independent) or EVENT_NONE.
         self._today_type: str = EVENT_NONE
         self._today_date: date | None = None
+        # Built-in public holidays, used instead of the holiday calendar entity
+        self._holiday_country: str = _config.get(CONF_HOLIDAY_COUNTRY) or ""
+        self._holiday_subdivision: str = _config.get(CONF_HOLIDAY_SUBDIVISION) or ""
         # Manual override duration (minutes) — mutable at runtime via number entity
         override_raw = _config.get(CONF_OVERRIDE_DURATION, DEFAULT_OVERRIDE_DURATION)
         try:
@@ -90,6 +166,13 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
             self._override_duration_minutes = DEFAULT_OVERRIDE_DURATION
         # Manual override: blocks auto-update until this datetime
         self._override_until: datetime | None = None
+        # True while the absence mode was entered automatically because everyone left
+        self._presence_absence = False
+        self._presence = PresenceTracker(
+            hass,
+            list(_config.get(CONF_PRESENCE_ENTITIES) or []),
+            list(_config.get(CONF_GUEST_ENTITIES) or []),
+        )
 
         # Parse thermostat mode map (InternalKey:DisplayValue, ...)
         thermostat_map_str = _config.get(CONF_THERMOSTAT_MODE_MAP, DEFAULT_THERMOSTAT_MODE_MAP)
@@ -97,6 +180,15 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
         self._thermostat_modes = list(self._thermostat_mode_map.values())
         self._thermostat_mode: str = self._thermostat_modes[0] if self._thermostat_modes else "Off"
 
+        # Climate entities driven directly by the thermostat mode
+        self._climate_entities: list[str] = list(_config.get(CONF_CLIMATE_ENTITIES) or [])
+        self._hvac_mode_map: dict[str, str] = parse_hvac_mode_map(_config.get(CONF_HVAC_MODE_MAP, DEFAULT_HVAC_MODE_MAP))
+        self._climate_presets = parse_climate_presets(_config.get(CONF_CLIMATE_PRESETS, ""))
+        try:
+            self._climate_max_parallel = max(0, int(_config.get(CONF_CLIMATE_MAX_PARALLEL, DEFAULT_CLIMATE_MAX_PARALLEL)))
+        except (ValueError, TypeError):
+            self._climate_max_parallel = DEFAULT_CLIMATE_MAX_PARALLEL
+
         # Mode mapping configuration — values are day mode keys, resolved to display names
         _mode_default_key = _config.get(CONF_MODE_DEFAULT, DEFAULT_MODE_DEFAULT)
         _mode_weekend_key = _config.get(CONF_MODE_WEEKEND, DEFAULT_MODE_WEEKEND)
@@ -110,15 +202,59 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
         raw_event_map = self.parse_event_mode_map(_config.get(CONF_EVENT_MODE_MAP, DEFAULT_EVENT_MODE_MAP))
         # Values in raw_event_map are keys (e.g. "Home", "Remote") — resolve to display
         self._event_mode_map: dict[str, str] = {kw: self._day_mode_map.get(mode_key, mode_key) for kw, mode_key in raw_event_map.items()}
+        # Event keywords compiled once for the configured event fields
+        self._event_matcher = EventMatcher(
+            self._event_mode_map,
+            _config.get(CONF_EVENT_MATCH_FIELDS) or DEFAULT_MATCH_FIELDS,
+            fold=bool(_config.get(CONF_EVENT_MATCH_FOLD_ACCENTS, False)),
+            max_distance=int(_config.get(CONF_EVENT_MATCH_MAX_DISTANCE, 0) or 0),
+        )
+        # Configured rules + built-in priority, compiled once into a lookup table
+        self._decision_table: DecisionTable = build_decision_table(
+            _config.get(CONF_MODE_RULES, ""),
+            self._day_mode_map,
+            self._event_mode_map,
+            self._mode_weekend,
+            self._mode_holiday,
+            self._mode_default,
+            mode_away=self._mode_absence,
+            raw_weekday_modes=_config.get(CONF_WEEKDAY_MODES, ""),
+            segments=self._segments,
+        )
+
+        # Zones: extra day-mode sets driven by the same calendar evaluation
+        self._zones: dict[str, HomeShiftZone] = {
+            name: self._build_zone(name, zone_config) for name, zone_config in (_config.get(CONF_ZONES) or {}).items() if isinstance(zone_config, dict)
+        }
+
+        # Events are fetched through the cache shared by every HomeShift entry
+        self._calendar_cache = get_calendar_cache(hass)
+        # A feed URL replaces the work calendar entity as the source of events
+        calendar_url = _config.get(CONF_CALENDAR_URL)
+        self._calendar_feed: IcsFeed | None = IcsFeed(hass, calendar_url) if calendar_url else None
+        self._next_event: dict | None = None
+        # Upcoming events of the main calendar, used to predict the next transition
+        self._event_spans: list[EventSpan] = []
+        # Last fetched events on disk, driving transitions while the calendar is unavailable
+        self._snapshot = TimelineSnapshot(hass, entry.entry_id)
+        self._timeline_fetched_at: datetime | None = None
+        self._timeline_source: str | None = None
+        self._timeline_stale = False
+        self._next_transition: Transition | None = None
+        self._unsub_transition: CALLBACK_TYPE | None = None
+
+        # Hourly time-per-mode counters, pushed to the recorder as external statistics
+        self._statistics = ModeStatistics(hass, entry.entry_id)
 
         _LOGGER.info(
             "HomeShift coordinator initialized — "
-            "calendar=%s, holiday_calendar=%s, scan_interval=%s min | "
+            "calendar=%s, holiday_calendar=%s, holiday_country=%s, scan_interval=%s min | "
             "day_mode_map=%s | "
             "mode_default=%s, mode_weekend=%s, mode_holiday=%s, mode_absence=%s | "
-            "thermostat_modes=%s | event_mode_map=%s",
+            "thermostat_modes=%s | event_mode_map=%s | zones=%s",
             _config.get(CONF_CALENDAR_ENTITY),
             _config.get(CONF_HOLIDAY_CALENDAR, "(missing)"),
+            _config.get(CONF_HOLIDAY_COUNTRY, "(none)"),
             scan_interval,
             self._day_mode_map,
             self._mode_default,
@@ -127,6 +263,7 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
             self._mode_absence,
             self._thermostat_modes,
             self._event_mode_map,
+            list(self._zones),
         )
 
     @property
@@ -134,6 +271,79 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
         """Return merged config: entry.data overridden by entry.options."""
         return {**self.entry.data, **self.entry.options}
 
+    @callback
+    def async_setup_listeners(self) -> None:
+        """Subscribe to the entities the coordinator depends on.
+
+        Also registers this entry's limits with the shared service call rate
+        limiter.  Listeners, limits and the transition timer are released when
+        the entry is unloaded.
+        """
+        for calendar_entity in (self._config.get(CONF_CALENDAR_ENTITY), self._config.get(CONF_HOLIDAY_CALENDAR)):
+            if calendar_entity:
+                self.entry.async_on_unload(self._calendar_cache.async_track(calendar_entity))
+        if self._presence.configured:
+            self.entry.async_on_unload(self._presence.async_start(self._async_presence_changed))
+        try:
+            rate = float(self._config.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT))
+            burst = int(self._config.get(CONF_RATE_BURST, DEFAULT_RATE_BURST))
+        except (ValueError, TypeError):
+            rate, burst = DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST
+        self.entry.async_on_unload(get_rate_limiter(self.hass).async_configure(self.entry.entry_id, rate, burst))
+        self.entry.async_on_unload(self._async_cancel_transition)
+
+    async def async_load_snapshot(self) -> None:
+        """Restore the event timeline saved before the last restart."""
+        spans, fetched_at = await self._snapshot.async_load()
+        if spans and not self._event_spans:
+            self._event_spans = spans
+            self._timeline_fetched_at = fetched_at
+            self._timeline_source = TIMELINE_SOURCE_SNAPSHOT
+            self._timeline_stale = True
+
+    @callback
+    def _async_presence_changed(self, presence: str) -> None:
+        """Re-evaluate the day mode as soon as the household presence changes."""
+        _LOGGER.debug("Presence is now '%s', requesting refresh", presence)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    def _build_zone(self, name: str, zone_config: dict) -> HomeShiftZone:
+        """Build a zone; keys missing from its config inherit the entry's values."""
+        config = {**self._config, **zone_config}
+        day_mode_map = self.parse_day_mode_map(config.get(CONF_DAY_MODE_MAP, DEFAULT_DAY_MODE_MAP))
+
+        def display(conf_key: str, default: str) -> str:
+            mode_key = config.get(conf_key, default)
+            return day_mode_map.get(mode_key, mode_key)
+
+        raw_event_map = self.parse_event_mode_map(config.get(CONF_EVENT_MODE_MAP, DEFAULT_EVENT_MODE_MAP))
+        event_mode_map = {kw: day_mode_map.get(mode_key, mode_key) for kw, mode_key in raw_event_map.items()}
+        # The entry's matcher already found the entry keywords; other keywords get their own
+        event_matcher = None
+        if list(event_mode_map) != list(self._event_mode_map):
+            event_matcher = EventMatcher(
+                event_mode_map,
+                self._event_matcher.fields,
+                fold=self._event_matcher.fold,
+                max_distance=self._event_matcher.max_distance,
+            )
+        return HomeShiftZone(
+            name,
+            day_mode_map=day_mode_map,
+            event_mode_map=event_mode_map,
+            mode_default=display(CONF_MODE_DEFAULT, DEFAULT_MODE_DEFAULT),
+            mode_weekend=display(CONF_MODE_WEEKEND, DEFAULT_MODE_WEEKEND),
+            mode_holiday=display(CONF_MODE_HOLIDAY, DEFAULT_MODE_HOLIDAY),
+            mode_absence=display(CONF_MODE_ABSENCE, DEFAULT_MODE_ABSENCE),
+            mode_rules=config.get(CONF_MODE_RULES, ""),
+            weekday_modes=config.get(CONF_WEEKDAY_MODES, ""),
+            # Segments are shared by the whole entry
+            segments=self._segments,
+            event_matcher=event_matcher,
+            # Never inherit the entry's own scheduler assignments
+            schedulers_per_mode=zone_config.get(CONF_SCHEDULERS_PER_MODE) or {},
+        )
+
     @staticmethod
     def parse_day_mode_map(raw: str) -> dict[str, str]:
         """Parse 'Key1:Display1, Key2:Display2' into an ordered dict.
@@ -159,7 +369,8 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
     def parse_event_mode_map(raw: str) -> dict[str, str]:
         """Parse 'Event1:ModeKey1, Event2:ModeKey2' into a dict.
 
-        Returns a case-insensitive-lookup dict (keys are lowered).
+        Returns a case-insensitive-lookup dict (keys are lowered, except
+        /regex/ keywords, which may contain colons but not commas).
         """
         mapping: dict[str, str] = {}
         if not raw:
@@ -168,11 +379,11 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
             pair = pair.strip()
             if ":" not in pair:
                 continue
-            event_key, mode_value = pair.split(":", 1)
+            event_key, mode_value = pair.rsplit(":", 1)
             event_key = event_key.strip()
             mode_value = mode_value.strip()
             if event_key and mode_value:
-                mapping[event_key.lower()] = mode_value
+                mapping[event_key if is_regex_keyword(event_key) else event_key.lower()] = mode_value
         return mapping
 
     @staticmethod
@@ -206,6 +417,43 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
         """Return configured day mode display values."""
         return self._day_modes
 
+    @property
+    def event_matcher(self) -> EventMatcher:
+        """Return the compiled event keyword matcher."""
+        return self._event_matcher
+
+    @property
+    def segment_timeline(self) -> list[dict[str, str]]:
+        """Return today's day segments with their start and predicted entry mode."""
+        return [segment.as_dict() for segment in self._segment_timeline]
+
+    @property
+    def timeline(self) -> dict[str, Any] | None:
+        """Return the origin and staleness of the event timeline, or None before the first fetch."""
+        if self._timeline_source is None:
+            return None
+        return {
+            "source": self._timeline_source,
+            "fetched_at": self._timeline_fetched_at.isoformat() if self._timeline_fetched_at else None,
+            "stale": self._timeline_stale,
+            "events": len(self._event_spans),
+        }
+
+    @property
+    def calendar_feed(self) -> IcsFeed | None:
+        """Return the remote calendar feed, when one is configured."""
+        return self._calendar_feed
+
+    @property
+    def decision_table(self) -> DecisionTable:
+        """Return the compiled day-mode rules."""
+        return self._decision_table
+
+    @property
+    def zones(self) -> dict[str, HomeShiftZone]:
+        """Return the configured zones (zone name -> zone)."""
+        return self._zones
+
     @property
     def day_mode_key(self) -> str | None:
         """Return the internal key (e.g. 'Work', 'Remote') for the current day mode."""
@@ -252,6 +500,21 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
         """Return current event period (all_day, morning, afternoon)."""
         return self._event_period
 
+    @property
+    def next_event(self) -> dict | None:
+        """Return the next upcoming calendar event (summary, start, end), or None."""
+        return self._next_event
+
+    @property
+    def next_transition(self) -> Transition | None:
+        """Return the next predicted day-mode change, or None."""
+        return self._next_transition
+
+    @property
+    def presence(self) -> str | None:
+        """Return the aggregated household presence, or None when not tracked."""
+        return self._presence.state
+
     @property
     def override_duration_minutes(self) -> int:
         """Return the current override duration in minutes (0 = disabled)."""
@@ -304,6 +567,7 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
             return
         old_mode = self._day_mode
         self._day_mode = resolved
+        self._presence_absence = False
         # Activate override to block automatic changes for the configured duration
         override_minutes = self._override_duration_minutes
         if override_minutes > 0:
@@ -319,11 +583,25 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
         else:
             self._override_until = None
             _LOGGER.info("Manual change: day_mode '%s' -> '%s' (key=%s)", old_mode, resolved, self.day_mode_key)
-        await self.async_refresh_schedulers()
+        self._track_statistics(dt_util.now())
+        self._async_schedule_transition(dt_util.now())
+        await self.async_refresh_schedulers(include_zones=False)
+        await self.async_refresh_climate(include_hvac=False)
         # Rebuild and broadcast the full data dict so downstream sensors pick up
         # the new day_mode and override_until immediately (rather than stale data).
         self.async_set_updated_data(self._build_result())
 
+    async def async_set_zone_day_mode(self, zone_name: str, mode: str) -> None:
+        """Set the day mode of one zone manually (from its select entity)."""
+        zone = self._zones.get(zone_name)
+        if zone is None:
+            _LOGGER.warning("Manual change ignored: unknown zone '%s' (zones: %s)", zone_name, list(self._zones))
+            return
+        if zone.set_day_mode(mode, dt_util.now(), self._override_duration_minutes):
+            self._async_schedule_transition(dt_util.now())
+            await self._async_refresh_zone_schedulers(zone)
+            self.async_set_updated_data(self._build_result())
+
     @property
     def thermostat_mode_key(self) -> str | None:
         """Return the internal key (e.g. 'Off', 'Heating') for the current thermostat mode.
@@ -376,37 +654,29 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
             resolved,
             self.thermostat_mode_key,
         )
+        self._track_statistics(dt_util.now())
         await self.async_refresh_schedulers()
+        await self.async_refresh_climate()
         self.async_set_updated_data(self._build_result())
 
     @staticmethod
-    def detect_event_period(start_time_str: str, end_time_str: str) -> str:
-        """Detect whether the event is all-day, morning, or afternoon.
-
-        All-day events have times at midnight boundaries (00:00:00).
-        Timed events are classified as:
+    def detect_event_period(
+        start_time_str: str, end_time_str: str, segments: tuple[Segment, ...] = DEFAULT_SEGMENTS
+    ) -> str:
+        """Detect the day segment an event falls in, or all_day.
+
+        Start and end may be dates or ISO 8601 datetimes, with or without
+        offset (naive values are local); they are parsed once per pair.
+        With the default segments, timed events are classified as:
           - morning: ends at or before MIDDAY_HOUR (13:00)
           - afternoon: starts at or after MIDDAY_HOUR (13:00)
-          - all_day: spans both morning and afternoon
+          - all_day: spans both morning and afternoon, or whole days
+        Unparsable values are all-day.
         """
-        try:
-            start_dt = datetime.strptime(start_time_str, "%Y-%m-%d %H:%M:%S")
-            end_dt = datetime.strptime(end_time_str, "%Y-%m-%d %H:%M:%S")
-        except (ValueError, TypeError):
+        parsed = parse_event_span(start_time_str, end_time_str)
+        if parsed is None:
             return EVENT_PERIOD_ALL_DAY
-
-        # All-day events: both start and end at midnight
-        if start_dt.hour == 0 and start_dt.minute == 0 and end_dt.hour == 0 and end_dt.minute == 0:
-            return EVENT_PERIOD_ALL_DAY
-
-        # Timed events: classify by time range
-        if end_dt.hour <= MIDDAY_HOUR and end_dt.minute == 0:
-            return EVENT_PERIOD_MORNING
-        if start_dt.hour >= MIDDAY_HOUR:
-            return EVENT_PERIOD_AFTERNOON
-
-        # Spans entire day or both halves
-        return EVENT_PERIOD_ALL_DAY
+        return span_period(EventSpan(*parsed, ""), segments)
 
     async def async_update_data(self) -> dict:
         """Public entry point for fetching data (delegates to _async_update_data).
@@ -432,29 +702,47 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
             self._day_mode,
         )
 
-        if not calendar_entity:
-            _LOGGER.warning("No calendar entity configured, skipping sync")
-            return self._build_result()
-
-        # Get calendar state
-        calendar_state = self.hass.states.get(calendar_entity)
-        if not calendar_state:
-            _LOGGER.warning("Calendar entity '%s' not found in Home Assistant states", calendar_entity)
-            return self._build_result()
-
-        _LOGGER.debug(
-            "Calendar '%s' -> state=%s | event='%s' | start=%s end=%s",
-            calendar_entity,
-            calendar_state.state,
-            calendar_state.attributes.get("message", ""),
-            calendar_state.attributes.get("start_time", ""),
-            calendar_state.attributes.get("end_time", ""),
-        )
+        # Without a calendar the mode follows the weekday modes, weekend,
+        # holiday and default only, and no events are fetched
+        calendar_state = None
+        # While the calendar is unavailable, events come from the last fetched timeline
+        outage = False
+        if self._calendar_feed is not None:
+            # The feed has no state: the current event comes from the fetched events
+            _LOGGER.debug("Reading events from the calendar feed %s", self._calendar_feed.redacted_url)
+        elif not calendar_entity:
+            _LOGGER.debug("No calendar entity configured, evaluating without events")
+        else:
+            calendar_state = self.hass.states.get(calendar_entity)
+            if calendar_state is None or calendar_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+                if self._event_spans:
+                    _LOGGER.info(
+                        "Calendar '%s' unavailable, using the event timeline fetched at %s",
+                        calendar_entity,
+                        self._timeline_fetched_at,
+                    )
+                    outage = True
+                    self._timeline_stale = True
+                    calendar_state = None
+                elif calendar_state is None:
+                    _LOGGER.warning("Calendar entity '%s' not found in Home Assistant states", calendar_entity)
+                    return self._build_result()
+
+        if calendar_state is not None:
+            _LOGGER.debug(
+                "Calendar '%s' -> state=%s | event='%s' | start=%s end=%s",
+                calendar_entity,
+                calendar_state.state,
+                calendar_state.attributes.get("message", ""),
+                calendar_state.attributes.get("start_time", ""),
+                calendar_state.attributes.get("end_time", ""),
+            )
 
         # Determine current event from calendar
         self._current_event = None
         self._event_period = None
         today_type = EVENT_NONE
+        match_texts: tuple[str, ...] = ()
 
         # Reset day-level event type at midnight (new calendar day)
         today = now.date()
@@ -463,28 +751,50 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
             self._today_type = EVENT_NONE
             self._today_date = today
 
-        if calendar_state.state == "on":
+        if calendar_state is not None and calendar_state.state == "on":
             event_message = calendar_state.attributes.get("message", "")
             event_start = calendar_state.attributes.get("start_time", "")
             event_end = calendar_state.attributes.get("end_time", "")
 
             if event_message:
                 self._current_event = event_message
-                self._event_period = self.detect_event_period(event_start, event_end)
-
-                # Match event message against configured event keywords (case-insensitive)
-                matched_keyword: str | None = None
-                for kw in self._event_mode_map:
-                    if kw in event_message.lower():
-                        matched_keyword = kw
-                        break
+                self._event_period = self.detect_event_period(event_start, event_end, self._segments)
+
+                match_texts = (self._event_matcher.text(calendar_state.attributes),)
+                matched_keyword = self._match_event_keyword(match_texts[0])
                 today_type = matched_keyword if matched_keyword is not None else event_message
                 # Persist the day-level type once a known event is seen for today
                 if today_type != EVENT_NONE:
                     self._today_type = today_type
 
-        # Auto-update mode (skip if absence mode or manual override is active)
-        if self._day_mode == self._mode_absence:
+        if self._calendar_feed is not None or (calendar_entity and (self._segment_aligned or outage)):
+            # Events apply to every segment they overlap, not only while running
+            if not outage:
+                await self._async_update_next_event(calendar_entity, now)
+            spans = self._spans_at(now)
+            active, span_type, span_period = self._span_event(spans)
+            if active is not None:
+                self._current_event, today_type, self._event_period = active.summary, span_type, span_period
+                match_texts = tuple(span.text for span in spans)
+                if self._match_event_keyword(active.text) is not None:
+                    self._today_type = today_type
+
+        # Evaluate the calendars once; the entry and every zone share the result
+        evaluation = CalendarEvaluation(
+            event_type=today_type,
+            match_texts=match_texts,
+            current_event=self._current_event,
+            event_period=self._event_period,
+            is_weekend=now.weekday() in (5, 6),
+            is_holiday=self._is_holiday(today),
+            presence=self._presence.state,
+            weekday=now.weekday(),
+            minute=now.hour * 60 + now.minute,
+        )
+
+        # Auto-update mode (skip if absence mode or manual override is active);
+        # an absence entered because everyone left ends when someone returns
+        if self._day_mode == self._mode_absence and not self._presence_absence:
             _LOGGER.debug(
                 "Periodic check: auto-update skipped, absence mode active ('%s')",
                 self._day_mode,
@@ -502,7 +812,7 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
                     self._override_until.strftime("%H:%M:%S"),
                 )
                 self._override_until = None
-            new_mode = await self._determine_mode(today_type)
+            new_mode = await self._determine_mode(evaluation)
             if new_mode and new_mode != self._day_mode and new_mode in self._day_modes:
                 _LOGGER.info(
                     "Auto mode change: day_mode '%s' -> '%s' (event=%s, period=%s)",
@@ -512,7 +822,9 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
                     self._event_period,
                 )
                 self._day_mode = new_mode
-                await self.async_refresh_schedulers()
+                self._presence_absence = new_mode == self._mode_absence and evaluation.presence == PRESENCE_ALL_AWAY
+                await self.async_refresh_schedulers(include_zones=False)
+                await self.async_refresh_climate(include_hvac=False)
             else:
                 _LOGGER.debug(
                     "Periodic check: day_mode unchanged ('%s') | event=%s, period=%s",
@@ -521,8 +833,27 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
                     self._event_period,
                 )
 
+        for zone in self._zones.values():
+            if zone.apply_evaluation(evaluation, now):
+                await self._async_refresh_zone_schedulers(zone)
+
+        if calendar_entity and self._calendar_feed is None and not self._segment_aligned and not outage:
+            await self._async_update_next_event(calendar_entity, now)
+        self._async_schedule_transition(now)
+
+        self._track_statistics(now)
+        await self._statistics.async_push_completed(now)
         return self._build_result()
 
+    @property
+    def statistics(self) -> ModeStatistics:
+        """Return the long-term mode statistics accumulator."""
+        return self._statistics
+
+    def _track_statistics(self, now: datetime) -> None:
+        """Record the current day/thermostat mode keys for long-term statistics."""
+        self._statistics.track(now, self.day_mode_key, self.thermostat_mode_key)
+
     def _build_result(self) -> dict:
         """Build the data dict returned by the coordinator."""
         return {
@@ -534,44 +865,157 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
             "thermostat_mode": self._thermostat_mode,
             "thermostat_mode_key": self.thermostat_mode_key,
             "override_until": self._override_until.isoformat() if self._override_until else None,
+            "zones": {name: zone.day_mode for name, zone in self._zones.items()},
+            "next_event": self._next_event,
+            "presence": self._presence.state,
+            "next_transition": self._next_transition.as_dict() if self._next_transition else None,
+            "segments": self.segment_timeline,
+            "timeline": self.timeline,
         }
 
-    async def _determine_mode(self, today_type: str) -> str | None:
-        """Determine the appropriate mode based on current state.
-
-        Uses configurable mappings instead of hardcoded values.
-        Priority:
-        1. Active calendar event matching event_mode_map -> mapped display mode
-        2. Weekend -> mode_weekend
-        3. Holiday calendar active -> mode_holiday
-        4. Default -> mode_default
+    def _match_event_keyword(self, text: str) -> str | None:
+        """Return the highest-priority event keyword found in an event match text."""
+        return self._event_matcher.match_text(text)
+
+    def _spans_at(self, at: datetime) -> list[EventSpan]:
+        """Return the events applying at *at*: running, or overlapping its segment when aligned."""
+        if self._segment_aligned and (segment := segment_of(at, self._segments)) is not None:
+            return segment_spans(self._event_spans, segment)
+        return active_spans(self._event_spans, at)
+
+    def _span_event(self, spans: list[EventSpan]) -> tuple[EventSpan | None, str, str | None]:
+        """Return the applying event (keyword matches first), its event type and period."""
+        active = next((span for span in spans if self._match_event_keyword(span.text) is not None), None)
+        if active is None and spans:
+            active = spans[0]
+        if active is None:
+            return None, EVENT_NONE, None
+        return active, self._match_event_keyword(active.text) or active.summary, span_period(active, self._segments)
+
+    def _predict_modes(self, at: datetime) -> tuple[str, ...]:
+        """Return the entry and zone day modes expected at *at* from the upcoming events.
+
+        The holiday calendar is only known for today, and a manual absence
+        keeps the entry in its current mode.
         """
-        now = dt_util.now()
-        is_weekend = now.weekday() in [5, 6]
+        spans = self._spans_at(at)
+        active, event_type, event_period = self._span_event(spans)
+        evaluation = CalendarEvaluation(
+            event_type=event_type,
+            match_texts=tuple(span.text for span in spans),
+            current_event=active.summary if active else None,
+            event_period=event_period,
+            is_weekend=at.weekday() in (5, 6),
+            is_holiday=self._is_holiday(at.date()),
+            presence=self._presence.state,
+            weekday=at.weekday(),
+            minute=at.hour * 60 + at.minute,
+        )
+        if self._day_mode == self._mode_absence and not self._presence_absence:
+            entry_mode = self._day_mode
+        else:
+            entry_mode = self._decision_table.lookup(evaluation) or self._day_mode
+        return (entry_mode, *(zone.determine_mode(evaluation) for zone in self._zones.values()))
+
+    @callback
+    def _async_schedule_transition(self, now: datetime) -> None:
+        """Predict the next transition and arm the single wakeup timer for it."""
+        self._async_cancel_transition()
+        self._next_transition = predict_next_transition(
+            now,
+            self._event_spans,
+            (self._day_mode, *(zone.day_mode for zone in self._zones.values())),
+            self._predict_modes,
+            self._override_until,
+            segments=self._segments,
+            event_edges=not self._segment_aligned,
+            time_edges={
+                edge
+                for table in (self._decision_table, *(zone.decision_table for zone in self._zones.values()))
+                for edge in table.time_edges
+            },
+        )
+        self._segment_timeline = segment_timeline(now, self._predict_modes, self._segments)
+        if self._next_transition is None:
+            return
+        _LOGGER.debug(
+            "Next transition at %s (%s) -> %s",
+            self._next_transition.at.isoformat(),
+            self._next_transition.reason,
+            self._next_transition.target,
+        )
+        self._unsub_transition = async_track_point_in_utc_time(
+            self.hass, self._async_transition_reached, self._next_transition.at + TRANSITION_SETTLE_DELAY
+        )
 
-        # Check holiday calendar
+    @callback
+    def _async_transition_reached(self, _now: datetime) -> None:
+        """Refresh when the predicted transition is reached (re-arms the timer)."""
+        self._unsub_transition = None
+        _LOGGER.debug("Transition reached (%s), requesting refresh", self._next_transition)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_cancel_transition(self) -> None:
+        """Cancel the pending transition timer, if any."""
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+    async def _async_update_next_event(self, calendar_entity: str | None, now: datetime) -> None:
+        """Look up the next upcoming event through the calendar feed or the shared cache.
+
+        The window always starts at local midnight (as a UTC instant, so DST
+        days are handled) so that every entry reading the same calendar hits
+        the same cache key.
+        """
+        window_start = local_day_table(now).start
+        window_end = local_day_table(now + timedelta(days=CALENDAR_LOOKAHEAD_DAYS)).start
+        try:
+            if self._calendar_feed is not None:
+                events = await self._calendar_feed.async_get_events(window_start, window_end)
+            else:
+                events = await self._calendar_cache.async_get_events(calendar_entity, window_start, window_end)
+        except HomeAssistantError as err:
+            _LOGGER.debug("Could not fetch upcoming events of '%s': %s", calendar_entity or "calendar feed", err)
+            self._timeline_stale = bool(self._event_spans)
+            return
+        self._event_spans = event_spans(events, self._event_matcher.fields)
+        self._timeline_fetched_at = now
+        self._timeline_source = TIMELINE_SOURCE_CALENDAR
+        self._timeline_stale = False
+        self._snapshot.async_save(self._event_spans, now)
+        upcoming = next_event_after(events, now)
+        self._next_event = {key: upcoming.get(key) for key in ("summary", "start", "end")} if upcoming else None
+
+    def _is_holiday(self, day: date) -> bool:
+        """Return True when *day* is a holiday.
+
+        With a holiday country, any day is looked up in the built-in public
+        holidays; the holiday calendar entity only tells about today.
+        """
+        if self._holiday_country:
+            return is_public_holiday(day, self._holiday_country, self._holiday_subdivision)
+        if day != self._today_date:
+            return False
         holiday_calendar = self._config.get(CONF_HOLIDAY_CALENDAR, "")
-        is_holiday = False
         holiday_state = self.hass.states.get(holiday_calendar)
-        if holiday_state and holiday_state.state == "on":
-            is_holiday = True
-
-        # 1. Check event_mode_map for the current event keyword
-        if today_type and today_type != EVENT_NONE:
-            mapped_mode = self._event_mode_map.get(today_type.lower())
-            if mapped_mode:
-                return mapped_mode
+        return bool(holiday_state and holiday_state.state == "on")
 
-        # 2. Weekend
-        if is_weekend:
-            return self._mode_weekend
+    async def _determine_mode(self, evaluation: CalendarEvaluation) -> str | None:
+        """Determine the appropriate mode for a calendar evaluation.
 
-        # 3. Holiday
-        if is_holiday:
-            return self._mode_holiday
-
-        # 4. Default (regular work day)
-        return self._mode_default
+        The configured rules (CONF_MODE_RULES) are checked first, then the
+        built-in priority:
+        0. Everyone away (presence entities configured) -> mode_absence
+        1. Active calendar event matching event_mode_map -> mapped display mode
+        2. Weekday listed in CONF_WEEKDAY_MODES (not a holiday) -> its mode
+        3. Weekend -> mode_weekend
+        4. Holiday calendar active -> mode_holiday
+        5. Default -> mode_default
+        Both are compiled into a decision table at config load (see rules.py).
+        """
+        return self._decision_table.lookup(evaluation)
 
     async def async_sync_calendar(self) -> None:
         """Check and set day type (called at daily check time and periodically).
@@ -586,7 +1030,7 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
         _LOGGER.info("Running scheduled day type check")
         await self.async_refresh()
 
-    async def async_refresh_schedulers(self) -> None:
+    async def async_refresh_schedulers(self, include_zones: bool = True) -> None:
         """Turn on scheduler switches for the active day mode, turn off all others.
 
         The configuration maps each day mode to a list of switch entity IDs
@@ -595,7 +1039,14 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
           2. Collect the switches that should be OFF (every other mode),
              excluding any that are also in the active list.
           3. Fire the switch.turn_on / switch.turn_off service calls.
+
+        Zones are refreshed the same way against their own scheduler sets
+        unless include_zones is False (entry-level day mode changes).
         """
+        if include_zones:
+            for zone in self._zones.values():
+                await self._async_refresh_zone_schedulers(zone)
+
         schedulers_per_mode: dict[str, list[str]] = self._config.get(CONF_SCHEDULERS_PER_MODE, {})
 
         if not schedulers_per_mode:
@@ -608,57 +1059,67 @@ class HomeShiftCoordinator(DataUpdateCoordinator):
             self._thermostat_mode,
         )
 
-        # Build activate / deactivate sets
-        to_enable: set[str] = set(schedulers_per_mode.get(self._day_mode, []))
-        to_disable: set[str] = set()
-        for mode, switches in schedulers_per_mode.items():
-            if mode != self._day_mode:
-                for sw in switches:
-                    if sw not in to_enable:  # never disable a shared switch
-                        to_disable.add(sw)
-
-        # When thermostat mode is Off, force-disable every scheduler that carries
-        # a thermostat-mode tag (e.g. "Chauffage", "Climatisation", …).
-        # Schedulers without any thermostat tag are left untouched.
-        thermostat_key = self.thermostat_mode_key
-        if thermostat_key == THERMOSTAT_OFF_KEY and self._thermostat_mode_map:
-            thermostat_tags: set[str] = set(self._thermostat_mode_map.values())
-            all_switches: set[str] = set()
-            for swlist in schedulers_per_mode.values():
-                all_switches.update(swlist)
-            for entity_id in all_switches:
-                state = self.hass.states.get(entity_id)
-                if state is None:
-                    continue
-                entity_tags: list = state.attributes.get("tags", []) or []
-                if set(entity_tags) & thermostat_tags:
-                    _LOGGER.debug(
-                        "Thermostat OFF: force-disabling scheduler '%s' (tags=%s)",
-                        entity_id,
-                        entity_tags,
-                    )
-                    to_disable.add(entity_id)
-                    to_enable.discard(entity_id)
-
-        # Turn off first so we don't have conflicting schedulers briefly active
-        if to_disable:
-            _LOGGER.debug("Turning OFF schedulers: %s", sorted(to_disable))
-            await self.hass.services.async_call(
-                "switch",
-                "turn_off",
-                {"entity_id": sorted(to_disable)},
-                blocking=False,
-            )
-
-        if to_enable:
-            _LOGGER.debug("Turning ON schedulers: %s", sorted(to_enable))
-            await self.hass.services.async_call(
-                "switch",
-                "turn_on",
-                {"entity_id": sorted(to_enable)},
-                blocking=False,
-            )
-        elif self._day_mode and schedulers_per_mode.get(self._day_mode) is not None:
+        to_enable, to_disable = plan_scheduler_changes(
+            self.hass,
+            schedulers_per_mode,
+            self._day_mode,
+            self.thermostat_mode_key,
+            self._thermostat_mode_map,
+        )
+        await async_apply_scheduler_changes(self.hass, to_enable, to_disable)
+        if not to_enable and self._day_mode and schedulers_per_mode.get(self._day_mode) is not None:
             _LOGGER.debug(
                 "No schedulers assigned to day_mode '%s'", self._day_mode
             )
+
+    async def _async_refresh_zone_schedulers(self, zone: HomeShiftZone) -> None:
+        """Apply the scheduler sets of one zone for its current day mode."""
+        if not zone.schedulers_per_mode:
+            return
+        _LOGGER.info("Refreshing schedulers: zone=%s, day_mode=%s", zone.name, zone.day_mode)
+        to_enable, to_disable = plan_scheduler_changes(
+            self.hass,
+            zone.schedulers_per_mode,
+            zone.day_mode,
+            self.thermostat_mode_key,
+            self._thermostat_mode_map,
+        )
+        await async_apply_scheduler_changes(self.hass, to_enable, to_disable)
+
+    async def async_refresh_climate(self, include_hvac: bool = True) -> None:
+        """Apply the current modes to the climate entities.
+
+        The HVAC mode follows the thermostat mode (skipped when include_hvac is
+        False, e.g. on day-mode changes); the setpoint or preset follows the
+        day mode × thermostat mode combination.  Only entities whose current
+        attributes differ from the target are updated, grouped per target.
+        """
+        if not self._climate_entities:
+            return
+        plan: dict[str, list[str]] = {}
+        hvac_mode = self._hvac_mode_map.get(self.thermostat_mode_key or "")
+        if include_hvac and hvac_mode:
+            plan = plan_hvac_modes(self.hass, self._climate_entities, hvac_mode)
+        elif include_hvac:
+            _LOGGER.debug("No hvac_mode mapped to thermostat mode '%s', skipping hvac refresh", self.thermostat_mode_key)
+
+        target = resolve_climate_target(self._climate_presets, self.day_mode_key, self.thermostat_mode_key)
+        to_target: list[str] = []
+        if target is not None:
+            skip = switched_off(self.hass, self._climate_entities, plan)
+            to_target = plan_climate_targets(self.hass, self._climate_entities, target, skip, switched_on(plan))
+
+        if not plan and not to_target:
+            _LOGGER.debug("Climate entities already match day_mode=%s, thermostat_mode=%s", self._day_mode, self._thermostat_mode)
+            return
+        _LOGGER.info(
+            "Refreshing climate: day_mode=%s, thermostat_mode=%s -> hvac %s, %s on %d entities",
+            self._day_mode,
+            self._thermostat_mode,
+            {mode: len(entity_ids) for mode, entity_ids in plan.items()},
+            target,
+            len(to_target),
+        )
+        await async_apply_hvac_plan(self.hass, plan, self._climate_max_parallel)
+        if target is not None and to_target:
+            await async_apply_climate_target(self.hass, target, to_target, self._climate_max_parallel)
@@ -0,0 +1,162 @@
+"""Per-day tables of the mode boundaries, as UTC instants.
+
+Wall-clock arithmetic such as ``now.replace(hour=13)`` is fragile on the two
+DST days of the year: on the spring day a local hour does not exist, on the
+autumn day one is repeated, and the day lasts 23 or 25 hours.  The boundary
+instants of a local day (midnight, the segment starts, next midnight) are therefore
+computed once per (day, time zone, segments) into a :class:`DayTable` of UTC
+instants, which timers and predictions compare against:
+
+- a local time falling in a skipped hour maps to the first instant after the
+  gap (e.g. 02:30 on the spring day in Europe/Paris -> 03:00 CEST);
+- a local time falling in a repeated hour maps to its first occurrence
+  (e.g. 02:30 on the autumn day -> 02:30 CEST, not CET);
+- the instant of the clock change, if any, is part of the table.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, tzinfo
+from functools import lru_cache
+
+from homeassistant.util import dt as dt_util
+
+from .segments import DEFAULT_SEGMENTS, Segment, segment_ranges
+
+UTC = dt_util.UTC
+# Resolution of the clock-change searches
+_PRECISION = timedelta(seconds=1)
+
+
+def _wall(instant: datetime, tz: tzinfo) -> datetime:
+    """Return the naive local wall-clock time of a UTC instant."""
+    return instant.astimezone(tz).replace(tzinfo=None)
+
+
+def is_skipped(local: datetime, tz: tzinfo) -> bool:
+    """Return True when a naive local time does not exist (spring-forward gap)."""
+    return _wall(local.replace(tzinfo=tz, fold=0).astimezone(UTC), tz) != local
+
+
+def is_repeated(local: datetime, tz: tzinfo) -> bool:
+    """Return True when a naive local time occurs twice (autumn fold)."""
+    first = local.replace(tzinfo=tz, fold=0)
+    second = local.replace(tzinfo=tz, fold=1)
+    return first.utcoffset() != second.utcoffset() and not is_skipped(local, tz)
+
+
+def local_to_utc(local: datetime, tz: tzinfo) -> datetime:
+    """Return the UTC instant of a naive local wall-clock time.
+
+    Skipped times map to the end of the gap, repeated times to their first
+    occurrence.
+    """
+    if not is_skipped(local, tz):
+        return local.replace(tzinfo=tz, fold=0).astimezone(UTC)
+    # Inside a gap fold=1 reads the time with the offset in force after it
+    # (too early) and fold=0 with the offset before it (too late): bisect
+    # for the first instant whose wall clock reaches the requested time.
+    low = local.replace(tzinfo=tz, fold=1).astimezone(UTC)
+    high = local.replace(tzinfo=tz, fold=0).astimezone(UTC)
+    low, high = min(low, high), max(low, high)
+    while high - low > _PRECISION:
+        middle = low + (high - low) / 2
+        if _wall(middle, tz) < local:
+            low = middle
+        else:
+            high = middle
+    return high.replace(microsecond=0)
+
+
+def _clock_change(start: datetime, end: datetime, tz: tzinfo) -> datetime | None:
+    """Return the UTC instant at which the UTC offset changes in [start, end), if any."""
+    if start.astimezone(tz).utcoffset() == end.astimezone(tz).utcoffset():
+        return None
+    low, high = start, end
+    offset = start.astimezone(tz).utcoffset()
+    while high - low > _PRECISION:
+        middle = low + (high - low) / 2
+        if middle.astimezone(tz).utcoffset() == offset:
+            low = middle
+        else:
+            high = middle
+    return high.replace(microsecond=0)
+
+
+@dataclass(frozen=True, slots=True)
+class DaySegment:
+    """One segment of a local day, as UTC instants."""
+
+    name: str
+    start: datetime
+    end: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class DayTable:
+    """Mode boundaries of one local day, as UTC instants."""
+
+    day: date
+    start: datetime
+    end: datetime
+    # Segment timeline from start to end (a segment wrapping around midnight
+    # appears at both ends of the day)
+    segments: tuple[DaySegment, ...] = ()
+    # UTC instant of the DST clock change during the day, if any
+    clock_change: datetime | None = None
+
+    def segment_at(self, instant: datetime) -> DaySegment | None:
+        """Return the segment containing an aware instant, if within the day."""
+        for segment in self.segments:
+            if segment.start <= instant < segment.end:
+                return segment
+        return None
+
+    def segment_start(self, name: str) -> datetime | None:
+        """Return the first start of a named segment after the start of the day, if any."""
+        return next((segment.start for segment in self.segments[1:] if segment.name == name), None)
+
+    @property
+    def length(self) -> timedelta:
+        """Return the length of the day (23, 24 or 25 hours)."""
+        return self.end - self.start
+
+    def contains(self, instant: datetime) -> bool:
+        """Return True when an aware instant falls within the day."""
+        return self.start <= instant < self.end
+
+
+@lru_cache(maxsize=64)
+def day_table(day: date, tz: tzinfo, segments: tuple[Segment, ...] = DEFAULT_SEGMENTS) -> DayTable:
+    """Return the (cached) table of a local day in time zone *tz*."""
+    start = local_to_utc(datetime.combine(day, time()), tz)
+    end = local_to_utc(datetime.combine(day + timedelta(days=1), time()), tz)
+
+    def instant(minute: int) -> datetime:
+        if minute == 0:
+            return start
+        if minute >= 24 * 60:
+            return end
+        return local_to_utc(datetime.combine(day, time(minute // 60, minute % 60)), tz)
+
+    timeline: list[DaySegment] = []
+    for low, high, name in segment_ranges(segments):
+        segment = DaySegment(name, instant(low), instant(high))
+        # Skipped local times can collapse a segment to nothing
+        if segment.start < segment.end:
+            timeline.append(segment)
+    return DayTable(
+        day=day,
+        start=start,
+        end=end,
+        segments=tuple(timeline),
+        clock_change=_clock_change(start, end, tz),
+    )
+
+
+def local_day_table(instant: datetime, segments: tuple[Segment, ...] = DEFAULT_SEGMENTS) -> DayTable:
+    """Return the table of the local day containing *instant* (naive = local)."""
+    tz = dt_util.DEFAULT_TIME_ZONE
+    if instant.tzinfo is not None:
+        instant = instant.astimezone(tz)
+    return day_table(instant.date(), tz, segments)
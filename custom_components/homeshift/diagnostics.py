@@ -0,0 +1,32 @@
+"""Diagnostics support for the HomeShift integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .calendar_cache import get_calendar_cache
+from .const import CONF_CALENDAR_URL, DOMAIN
+from .coordinator import HomeShiftCoordinator
+from .public_holidays import holiday_diagnostics
+from .rate_limit import get_rate_limiter
+
+# The feed URL can embed credentials or a private token
+TO_REDACT = {CONF_CALENDAR_URL}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: HomeShiftCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "config": async_redact_data({**entry.data, **entry.options}, TO_REDACT),
+        "data": coordinator.data,
+        "decision_table": coordinator.decision_table.dump(),
+        "event_matcher": coordinator.event_matcher.diagnostics(),
+        "calendar_cache": get_calendar_cache(hass).diagnostics(),
+        "calendar_feed": feed.diagnostics() if (feed := coordinator.calendar_feed) is not None else None,
+        "rate_limiter": get_rate_limiter(hass).diagnostics(),
+        "public_holidays": holiday_diagnostics(),
+    }
@@ -0,0 +1,36 @@
+"""Calendar evaluation shared by a HomeShift entry and all of its zones.
+
+The evaluation is turned into a day mode by the compiled rules of
+:mod:`.rules`.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .const import EVENT_NONE
+
+
+@dataclass(frozen=True, slots=True)
+class CalendarEvaluation:
+    """Inputs of the day-mode decision, computed once per update cycle.
+
+    The coordinator reads the calendar entities a single time per cycle and
+    hands the same evaluation to every zone, so the cost of an update grows
+    with the number of calendars rather than with the number of zones.
+    """
+
+    # Matched keyword of the active event (or its raw title, or EVENT_NONE)
+    event_type: str = EVENT_NONE
+    # Match texts of the applying events in priority order, so zones with
+    # their own keywords can match them (see event_match.event_text)
+    match_texts: tuple[str, ...] = ()
+    current_event: str | None = None
+    event_period: str | None = None
+    is_weekend: bool = False
+    is_holiday: bool = False
+    # Aggregated household presence (PRESENCE_*), None when not tracked
+    presence: str | None = None
+    # Weekday (Monday = 0) and minute of the day, for weekday and time-window rules
+    weekday: int | None = None
+    minute: int | None = None
+
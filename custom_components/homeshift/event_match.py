@@ -0,0 +1,203 @@
+"""Matching of calendar events against the configured event keywords.
+
+Events can be matched on several fields (summary, description, location,
+categories).  The configured fields of an event are normalized once into a
+single match text, one field per line, and every keyword is looked up in
+that text through one compiled pattern, so matching more fields costs one
+longer scan rather than one scan per field and keyword.
+
+Keywords keep their configured priority: when several match, the first one
+of the event mode map wins, as with the former substring loop.
+
+Optionally, keywords and texts are compared without accents ("Teletravail"
+matches "télétravail"), keywords written ``/pattern/`` are regular
+expressions, and plain keywords of at least :data:`FUZZY_MIN_LENGTH`
+characters also match with up to ``max_distance`` typos (edit distance),
+when no keyword matches exactly.  Patterns are compiled once per
+configuration, and the keyword found for a match text is kept in a bounded
+LRU cache, so a recurring event is matched only once.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import unicodedata
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+FIELD_SUMMARY = "summary"
+FIELD_DESCRIPTION = "description"
+FIELD_LOCATION = "location"
+FIELD_CATEGORIES = "categories"
+MATCH_FIELDS = (FIELD_SUMMARY, FIELD_DESCRIPTION, FIELD_LOCATION, FIELD_CATEGORIES)
+DEFAULT_MATCH_FIELDS: tuple[str, ...] = (FIELD_SUMMARY,)
+
+# Match texts whose matched keyword is remembered by an EventMatcher
+MATCH_CACHE_SIZE = 512
+# Shortest plain keyword matched with typos
+FUZZY_MIN_LENGTH = 5
+MAX_FUZZY_DISTANCE = 3
+
+# Keys holding a field in calendar.get_events results and calendar entity
+# state attributes (the state calls the summary "message")
+_FIELD_KEYS: dict[str, tuple[str, ...]] = {
+    FIELD_SUMMARY: ("summary", "message"),
+    FIELD_DESCRIPTION: ("description",),
+    FIELD_LOCATION: ("location",),
+    FIELD_CATEGORIES: ("categories",),
+}
+
+
+def normalize(value: str) -> str:
+    """Return the comparison form of a text (case-folded, single-spaced)."""
+    return " ".join(value.casefold().split())
+
+
+def fold_accents(value: str) -> str:
+    """Return a text without its accents and other combining marks."""
+    return "".join(char for char in unicodedata.normalize("NFKD", value) if not unicodedata.combining(char))
+
+
+def is_regex_keyword(keyword: str) -> bool:
+    """Return True for a keyword written as /pattern/."""
+    return len(keyword) > 2 and keyword.startswith("/") and keyword.endswith("/")
+
+
+def within_distance(keyword: str, text: str, max_distance: int) -> bool:
+    """Return True when *keyword* occurs in *text* with at most *max_distance* edits.
+
+    Approximate substring search (Sellers): the match may start anywhere in
+    the text, so the first row is all zeros.
+    """
+    previous = [0] * (len(text) + 1)
+    for index, char in enumerate(keyword, start=1):
+        current = [index]
+        for position, text_char in enumerate(text, start=1):
+            current.append(
+                min(
+                    previous[position] + 1,
+                    current[position - 1] + 1,
+                    previous[position - 1] + (char != text_char),
+                )
+            )
+        previous = current
+    return min(previous) <= max_distance
+
+
+def _field_value(event: Mapping[str, Any], field: str) -> str:
+    """Return the raw text of one field of an event ("" when absent)."""
+    for key in _FIELD_KEYS.get(field, (field,)):
+        value = event.get(key)
+        if value:
+            if isinstance(value, (list, tuple, set, frozenset)):
+                return ", ".join(str(item) for item in value)
+            return str(value)
+    return ""
+
+
+def event_text(event: Mapping[str, Any], fields: Iterable[str] = DEFAULT_MATCH_FIELDS) -> str:
+    """Return the normalized match text of an event, one line per field."""
+    return "\n".join(normalize(_field_value(event, field)) for field in fields)
+
+
+class EventMatcher:
+    """Configured event keywords compiled into a single pattern."""
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        fields: Iterable[str] = DEFAULT_MATCH_FIELDS,
+        fold: bool = False,
+        max_distance: int = 0,
+        cache_size: int = MATCH_CACHE_SIZE,
+    ) -> None:
+        """Compile the keywords (in priority order) for the given fields."""
+        self.fields = tuple(field for field in fields if field in MATCH_FIELDS) or DEFAULT_MATCH_FIELDS
+        self.fold = fold
+        self.max_distance = max(0, min(int(max_distance), MAX_FUZZY_DISTANCE))
+        # Comparison form -> configured keyword, and compiled regex keywords,
+        # both in priority order (one ordered list drives the priority)
+        self._keywords: dict[str, str] = {}
+        self._regexes: dict[str, re.Pattern[str]] = {}
+        self._order: list[tuple[str, str | None]] = []
+        for keyword in keywords:
+            if is_regex_keyword(keyword):
+                try:
+                    self._regexes[keyword] = re.compile(keyword[1:-1], re.IGNORECASE)
+                except re.error as err:
+                    _LOGGER.warning("Ignoring event keyword '%s': %s", keyword, err)
+                    continue
+                self._order.append((keyword, None))
+                continue
+            normalized = self._normalize(keyword)
+            if normalized and normalized not in self._keywords:
+                self._keywords[normalized] = keyword
+                self._order.append((keyword, normalized))
+        # Longest first, so a keyword is not hidden by one of its prefixes
+        alternatives = sorted(self._keywords, key=len, reverse=True)
+        self._pattern = re.compile("|".join(map(re.escape, alternatives))) if alternatives else None
+        self._fuzzy = [
+            (normalized, keyword)
+            for normalized, keyword in self._keywords.items()
+            if self.max_distance and len(normalized) >= FUZZY_MIN_LENGTH
+        ]
+        self._cached_match = lru_cache(maxsize=cache_size)(self._match)
+
+    def _normalize(self, value: str) -> str:
+        """Return the comparison form of a text for this matcher."""
+        value = normalize(value)
+        return fold_accents(value) if self.fold else value
+
+    def text(self, event: Mapping[str, Any]) -> str:
+        """Return the match text of an event for the configured fields."""
+        return event_text(event, self.fields)
+
+    @property
+    def keywords(self) -> list[str]:
+        """Return the configured keywords in priority order."""
+        return [keyword for keyword, _normalized in self._order]
+
+    def match_text(self, text: str) -> str | None:
+        """Return the highest-priority keyword found in a match text, or None (cached)."""
+        return self._cached_match(text)
+
+    def _match(self, text: str) -> str | None:
+        """Match a text: exact and regex keywords by priority, then typos.
+
+        Regular expressions see the text with its accents.
+        """
+        original = text
+        if self.fold:
+            text = fold_accents(text)
+        found: set[str] = set()
+        if self._pattern is not None:
+            found = {match.group(0) for match in self._pattern.finditer(text)}
+        if found or self._regexes:
+            for keyword, normalized in self._order:
+                if normalized is None:
+                    if self._regexes[keyword].search(original):
+                        return keyword
+                # A keyword overlapping a longer match is not reported by the scan
+                elif normalized in found or (found and normalized in text):
+                    return keyword
+        for normalized, keyword in self._fuzzy:
+            if any(within_distance(normalized, line, self.max_distance) for line in text.split("\n")):
+                return keyword
+        return None
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the matcher settings and cache counters for the diagnostics download."""
+        return {
+            "fields": list(self.fields),
+            "fold_accents": self.fold,
+            "max_distance": self.max_distance,
+            "keywords": self.keywords,
+            "cache": self._cached_match.cache_info()._asdict(),
+        }
+
+    def match(self, event: Mapping[str, Any]) -> str | None:
+        """Return the highest-priority keyword found in an event, or None."""
+        return self.match_text(self.text(event))
@@ -0,0 +1,371 @@
+"""Compact public holiday tables.
+
+A country's holidays are a short table of rules rather than a list of dates:
+
+- a fixed date (``fixed``), e.g. 14 July;
+- a number of days after Easter Sunday (``easter``), e.g. Ascension;
+- the first given weekday on or after / on or before a date
+  (``weekday_after`` / ``weekday_before``), e.g. Thanksgiving, the fourth
+  Thursday of November, is the first Thursday on or after 22 November.
+
+Rules can be limited to a range of years, and subdivisions (regions,
+states, departments) add their own rules to the national ones.  Countries
+moving a holiday that falls on a weekend to a weekday (``substitute``) also
+list the substitute day.  The dates of a year are only computed when asked
+for, see :mod:`.public_holidays` for the cached lookups.
+"""
+from __future__ import annotations
+
+from calendar import MONDAY, SATURDAY, THURSDAY, WEDNESDAY
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import MAXYEAR, MINYEAR, date, timedelta
+
+# Weekend holidays are not moved
+SUBSTITUTE_NONE = ""
+# Moved to the next weekday that is not already a holiday (United Kingdom)
+SUBSTITUTE_NEXT_WEEKDAY = "next_weekday"
+# Saturday moved to Friday, Sunday to Monday (United States)
+SUBSTITUTE_NEAREST_WEEKDAY = "nearest_weekday"
+
+
+def easter_sunday(year: int) -> date:
+    """Return the date of Easter Sunday (Gregorian calendar, anonymous algorithm)."""
+    golden = year % 19
+    century, year_of_century = divmod(year, 100)
+    leap_centuries, leftover = divmod(century, 4)
+    correction = (century + 8) // 25
+    moon = (19 * golden + century - leap_centuries - (century - correction + 1) // 3 + 15) % 30
+    leap_years, leftover_years = divmod(year_of_century, 4)
+    weekday = (32 + 2 * leftover + 2 * leap_years - moon - leftover_years) % 7
+    shift = (golden + 11 * moon + 22 * weekday) // 451
+    month, day = divmod(moon + weekday - 7 * shift + 114, 31)
+    return date(year, month, day + 1)
+
+
+@dataclass(frozen=True, slots=True)
+class HolidayRule:
+    """One holiday of a table.
+
+    The date is (month, day), or *easter* days after Easter Sunday.  With a
+    *weekday*, it is the first such weekday on or after that date (on or
+    before it when *before*).
+    """
+
+    name: str
+    month: int = 0
+    day: int = 0
+    easter: int | None = None
+    weekday: int | None = None
+    before: bool = False
+    # First and last year the holiday exists
+    since: int = MINYEAR
+    until: int = MAXYEAR
+    # Moved to a weekday when it falls on a weekend (see HolidayTable.substitute)
+    observed: bool = False
+
+    def in_year(self, year: int) -> date | None:
+        """Return the date of the holiday in *year*, or None when it does not exist then."""
+        if not self.since <= year <= self.until:
+            return None
+        if self.easter is not None:
+            return easter_sunday(year) + timedelta(days=self.easter)
+        day = date(year, self.month, self.day)
+        if self.weekday is None:
+            return day
+        if self.before:
+            return day - timedelta(days=(day.weekday() - self.weekday) % 7)
+        return day + timedelta(days=(self.weekday - day.weekday()) % 7)
+
+
+def fixed(month: int, day: int, name: str, **options) -> HolidayRule:
+    """Return a holiday on the same date every year."""
+    return HolidayRule(name, month, day, **options)
+
+
+def easter(offset: int, name: str, **options) -> HolidayRule:
+    """Return a holiday *offset* days after Easter Sunday."""
+    return HolidayRule(name, easter=offset, **options)
+
+
+def weekday_after(month: int, day: int, weekday: int, name: str, **options) -> HolidayRule:
+    """Return a holiday on the first *weekday* on or after (month, day)."""
+    return HolidayRule(name, month, day, weekday=weekday, **options)
+
+
+def weekday_before(month: int, day: int, weekday: int, name: str, **options) -> HolidayRule:
+    """Return a holiday on the last *weekday* on or before (month, day)."""
+    return HolidayRule(name, month, day, weekday=weekday, before=True, **options)
+
+
+@dataclass(frozen=True, slots=True)
+class HolidayTable:
+    """Holiday rules of one country."""
+
+    country: str
+    rules: tuple[HolidayRule, ...]
+    # Subdivision code -> rules added to the national ones
+    subdivisions: Mapping[str, tuple[HolidayRule, ...]] = field(default_factory=dict)
+    # Subdivision used when none is configured
+    default_subdivision: str = ""
+    substitute: str = SUBSTITUTE_NONE
+
+    def holidays(self, year: int, subdivision: str = "") -> dict[date, str]:
+        """Return the holidays of *year* by date, with their names.
+
+        With substitute days, the neighbouring years are computed too, as
+        1 January on a Saturday can be observed on 31 December.
+        """
+        rules = self.rules + tuple(self.subdivisions.get(subdivision or self.default_subdivision, ()))
+        found: dict[date, str] = {}
+        weekend: list[tuple[date, str]] = []
+        for rule_year in (year - 1, year, year + 1) if self.substitute else (year,):
+            for rule in rules:
+                day = rule.in_year(rule_year)
+                if day is None:
+                    continue
+                found.setdefault(day, rule.name)
+                if rule.observed and day.weekday() >= SATURDAY:
+                    weekend.append((day, rule.name))
+        for day, name in sorted(weekend):
+            found.setdefault(self._substitute_day(day, found), f"{name} (observed)")
+        return {day: name for day, name in sorted(found.items()) if day.year == year}
+
+    def _substitute_day(self, day: date, found: Mapping[date, str]) -> date:
+        """Return the weekday a weekend holiday is observed on."""
+        if self.substitute == SUBSTITUTE_NEAREST_WEEKDAY:
+            return day - timedelta(days=1) if day.weekday() == SATURDAY else day + timedelta(days=1)
+        day += timedelta(days=1)
+        while day.weekday() >= SATURDAY or day in found:
+            day += timedelta(days=1)
+        return day
+
+
+# ---------------------------------------------------------------------------
+# Tables
+# ---------------------------------------------------------------------------
+
+_FR_SLAVERY_ABOLITION = "Abolition de l'esclavage"
+_FR_ALSACE_MOSELLE = (easter(-2, "Vendredi saint"), fixed(12, 26, "Saint-Étienne"))
+
+FRANCE = HolidayTable(
+    "FR",
+    (
+        fixed(1, 1, "Jour de l'an"),
+        easter(1, "Lundi de Pâques"),
+        fixed(5, 1, "Fête du Travail"),
+        fixed(5, 8, "Victoire 1945"),
+        easter(39, "Ascension"),
+        easter(50, "Lundi de Pentecôte"),
+        fixed(7, 14, "Fête nationale"),
+        fixed(8, 15, "Assomption"),
+        fixed(11, 1, "Toussaint"),
+        fixed(11, 11, "Armistice 1918"),
+        fixed(12, 25, "Noël"),
+    ),
+    {
+        # Departments: Alsace-Moselle, then overseas
+        "57": _FR_ALSACE_MOSELLE,
+        "67": _FR_ALSACE_MOSELLE,
+        "68": _FR_ALSACE_MOSELLE,
+        "971": (fixed(5, 27, _FR_SLAVERY_ABOLITION),),
+        "972": (fixed(5, 22, _FR_SLAVERY_ABOLITION),),
+        "973": (fixed(6, 10, _FR_SLAVERY_ABOLITION),),
+        "974": (fixed(12, 20, _FR_SLAVERY_ABOLITION),),
+        "976": (fixed(4, 27, _FR_SLAVERY_ABOLITION),),
+        "977": (fixed(10, 9, _FR_SLAVERY_ABOLITION),),
+        "978": (fixed(5, 28, _FR_SLAVERY_ABOLITION),),
+    },
+)
+
+BELGIUM = HolidayTable(
+    "BE",
+    (
+        fixed(1, 1, "Jour de l'an"),
+        easter(1, "Lundi de Pâques"),
+        fixed(5, 1, "Fête du Travail"),
+        easter(39, "Ascension"),
+        easter(50, "Lundi de Pentecôte"),
+        fixed(7, 21, "Fête nationale"),
+        fixed(8, 15, "Assomption"),
+        fixed(11, 1, "Toussaint"),
+        fixed(11, 11, "Armistice"),
+        fixed(12, 25, "Noël"),
+    ),
+)
+
+LUXEMBOURG = HolidayTable(
+    "LU",
+    (
+        fixed(1, 1, "Jour de l'an"),
+        easter(1, "Lundi de Pâques"),
+        fixed(5, 1, "Fête du Travail"),
+        fixed(5, 9, "Journée de l'Europe", since=2019),
+        easter(39, "Ascension"),
+        easter(50, "Lundi de Pentecôte"),
+        fixed(6, 23, "Fête nationale"),
+        fixed(8, 15, "Assomption"),
+        fixed(11, 1, "Toussaint"),
+        fixed(12, 25, "Noël"),
+        fixed(12, 26, "Saint-Étienne"),
+    ),
+)
+
+_DE_EPIPHANY = fixed(1, 6, "Heilige Drei Könige")
+_DE_CORPUS_CHRISTI = easter(60, "Fronleichnam")
+_DE_ALL_SAINTS = fixed(11, 1, "Allerheiligen")
+_DE_REFORMATION = fixed(10, 31, "Reformationstag")
+_DE_REFORMATION_2018 = fixed(10, 31, "Reformationstag", since=2018)
+
+GERMANY = HolidayTable(
+    "DE",
+    (
+        fixed(1, 1, "Neujahr"),
+        easter(-2, "Karfreitag"),
+        easter(1, "Ostermontag"),
+        fixed(5, 1, "Tag der Arbeit"),
+        easter(39, "Christi Himmelfahrt"),
+        easter(50, "Pfingstmontag"),
+        fixed(10, 3, "Tag der Deutschen Einheit", since=1990),
+        # Reformation anniversary, nationwide once
+        fixed(10, 31, "Reformationstag", since=2017, until=2017),
+        fixed(12, 25, "1. Weihnachtstag"),
+        fixed(12, 26, "2. Weihnachtstag"),
+    ),
+    {
+        "BW": (_DE_EPIPHANY, _DE_CORPUS_CHRISTI, _DE_ALL_SAINTS),
+        "BY": (_DE_EPIPHANY, _DE_CORPUS_CHRISTI, _DE_ALL_SAINTS),
+        "BE": (fixed(3, 8, "Internationaler Frauentag", since=2019),),
+        "BB": (easter(0, "Ostersonntag"), easter(49, "Pfingstsonntag"), _DE_REFORMATION),
+        "HB": (_DE_REFORMATION_2018,),
+        "HH": (_DE_REFORMATION_2018,),
+        "HE": (_DE_CORPUS_CHRISTI,),
+        "MV": (fixed(3, 8, "Internationaler Frauentag", since=2023), _DE_REFORMATION),
+        "NI": (_DE_REFORMATION_2018,),
+        "NW": (_DE_CORPUS_CHRISTI, _DE_ALL_SAINTS),
+        "RP": (_DE_CORPUS_CHRISTI, _DE_ALL_SAINTS),
+        "SL": (_DE_CORPUS_CHRISTI, fixed(8, 15, "Mariä Himmelfahrt"), _DE_ALL_SAINTS),
+        "SN": (_DE_REFORMATION, weekday_before(11, 22, WEDNESDAY, "Buß- und Bettag")),
+        "ST": (_DE_EPIPHANY, _DE_REFORMATION),
+        "SH": (_DE_REFORMATION_2018,),
+        "TH": (fixed(9, 20, "Weltkindertag", since=2019), _DE_REFORMATION),
+    },
+)
+
+AUSTRIA = HolidayTable(
+    "AT",
+    (
+        fixed(1, 1, "Neujahr"),
+        fixed(1, 6, "Heilige Drei Könige"),
+        easter(1, "Ostermontag"),
+        fixed(5, 1, "Staatsfeiertag"),
+        easter(39, "Christi Himmelfahrt"),
+        easter(50, "Pfingstmontag"),
+        easter(60, "Fronleichnam"),
+        fixed(8, 15, "Mariä Himmelfahrt"),
+        fixed(10, 26, "Nationalfeiertag"),
+        fixed(11, 1, "Allerheiligen"),
+        fixed(12, 8, "Mariä Empfängnis"),
+        fixed(12, 25, "Christtag"),
+        fixed(12, 26, "Stefanitag"),
+    ),
+)
+
+SPAIN = HolidayTable(
+    "ES",
+    (
+        fixed(1, 1, "Año Nuevo"),
+        fixed(1, 6, "Epifanía del Señor"),
+        easter(-2, "Viernes Santo"),
+        fixed(5, 1, "Fiesta del Trabajo"),
+        fixed(8, 15, "Asunción de la Virgen"),
+        fixed(10, 12, "Fiesta Nacional de España"),
+        fixed(11, 1, "Todos los Santos"),
+        fixed(12, 6, "Día de la Constitución"),
+        fixed(12, 8, "Inmaculada Concepción"),
+        fixed(12, 25, "Natividad del Señor"),
+    ),
+    {
+        # Regional holidays set every year by decree are not listed
+        "CT": (
+            easter(1, "Dilluns de Pasqua"),
+            fixed(6, 24, "Sant Joan"),
+            fixed(9, 11, "Diada Nacional de Catalunya"),
+            fixed(12, 26, "Sant Esteve"),
+        ),
+    },
+)
+
+ITALY = HolidayTable(
+    "IT",
+    (
+        fixed(1, 1, "Capodanno"),
+        fixed(1, 6, "Epifania"),
+        easter(0, "Pasqua"),
+        easter(1, "Lunedì dell'Angelo"),
+        fixed(4, 25, "Festa della Liberazione"),
+        fixed(5, 1, "Festa del Lavoro"),
+        fixed(6, 2, "Festa della Repubblica"),
+        fixed(8, 15, "Ferragosto"),
+        fixed(11, 1, "Ognissanti"),
+        fixed(12, 8, "Immacolata Concezione"),
+        fixed(12, 25, "Natale"),
+        fixed(12, 26, "Santo Stefano"),
+    ),
+    {"BZ": (easter(50, "Lunedì di Pentecoste"),)},
+)
+
+_GB_EASTER_MONDAY = easter(1, "Easter Monday")
+_GB_SUMMER_BANK_HOLIDAY = weekday_before(8, 31, MONDAY, "Summer bank holiday")
+
+UNITED_KINGDOM = HolidayTable(
+    "GB",
+    (
+        fixed(1, 1, "New Year's Day", observed=True),
+        easter(-2, "Good Friday"),
+        weekday_after(5, 1, MONDAY, "Early May bank holiday"),
+        weekday_before(5, 31, MONDAY, "Spring bank holiday"),
+        fixed(12, 25, "Christmas Day", observed=True),
+        fixed(12, 26, "Boxing Day", observed=True),
+    ),
+    {
+        "ENG": (_GB_EASTER_MONDAY, _GB_SUMMER_BANK_HOLIDAY),
+        "WLS": (_GB_EASTER_MONDAY, _GB_SUMMER_BANK_HOLIDAY),
+        "SCT": (
+            fixed(1, 2, "2nd January", observed=True),
+            weekday_after(8, 1, MONDAY, "Summer bank holiday"),
+            fixed(11, 30, "St Andrew's Day", observed=True),
+        ),
+        "NIR": (
+            fixed(3, 17, "St Patrick's Day", observed=True),
+            _GB_EASTER_MONDAY,
+            fixed(7, 12, "Battle of the Boyne", observed=True),
+            _GB_SUMMER_BANK_HOLIDAY,
+        ),
+    },
+    default_subdivision="ENG",
+    substitute=SUBSTITUTE_NEXT_WEEKDAY,
+)
+
+UNITED_STATES = HolidayTable(
+    "US",
+    (
+        fixed(1, 1, "New Year's Day", observed=True),
+        weekday_after(1, 15, MONDAY, "Martin Luther King Jr. Day", since=1986),
+        weekday_after(2, 15, MONDAY, "Washington's Birthday"),
+        weekday_before(5, 31, MONDAY, "Memorial Day"),
+        fixed(6, 19, "Juneteenth", since=2021, observed=True),
+        fixed(7, 4, "Independence Day", observed=True),
+        weekday_after(9, 1, MONDAY, "Labor Day"),
+        weekday_after(10, 8, MONDAY, "Columbus Day"),
+        fixed(11, 11, "Veterans Day", observed=True),
+        weekday_after(11, 22, THURSDAY, "Thanksgiving"),
+        fixed(12, 25, "Christmas Day", observed=True),
+    ),
+    substitute=SUBSTITUTE_NEAREST_WEEKDAY,
+)
+
+HOLIDAY_TABLES: dict[str, HolidayTable] = {
+    table.country: table
+    for table in (FRANCE, BELGIUM, LUXEMBOURG, GERMANY, AUSTRIA, SPAIN, ITALY, UNITED_KINGDOM, UNITED_STATES)
+}
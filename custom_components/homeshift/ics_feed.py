@@ -0,0 +1,510 @@
+"""Work calendar read directly from an ICS or CalDAV URL.
+
+Instead of a calendar entity, HomeShift can read the work calendar from a
+remote iCalendar feed (an ``.ics`` export, or a CalDAV collection that
+returns ICS on a plain GET).  :class:`IcsFeed` polls it through Home
+Assistant's shared aiohttp session:
+
+- requests are conditional (``If-None-Match`` with the last ``ETag``,
+  ``If-Modified-Since`` with the last ``Last-Modified``), so an unchanged
+  feed costs a 304 and the body is only parsed again after a 200;
+- ``Cache-Control: max-age`` (minus ``Age``) or ``Expires`` tell how long
+  the feed is fresh; no request is sent before that;
+- the parsed events are expanded into the requested window in the
+  ``calendar.get_events`` format, so the rest of the coordinator does not
+  know where they come from.
+
+Recurring events are expanded by ``dateutil.rrule`` (every RFC 5545 RRULE
+part, including BYDAY on any frequency, BYMONTHDAY, BYSETPOS and WKST), with
+EXDATE and RECURRENCE-ID exceptions.  Rules dateutil cannot read only yield
+their first occurrence.  Expansion starts from the occurrences near the
+requested window.  Parsing and expansion run in the executor.
+
+The URL may carry credentials, so it is only ever logged or shown without
+its path and user info (:func:`redact_url`).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import urlsplit
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import aiohttp
+from dateutil.rrule import rrule, rrulestr
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+
+from .calendar_cache import parse_event_span
+from .const import CALENDAR_FETCH_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+# Occurrences examined per recurring event and window before giving up (runaway rules)
+MAX_RECURRENCE_STEPS = 5000
+
+IcsValue = date | datetime
+
+
+@dataclass(frozen=True, slots=True)
+class IcsEvent:
+    """One VEVENT of a feed."""
+
+    uid: str
+    summary: str
+    start: IcsValue
+    end: IcsValue
+    description: str = ""
+    location: str = ""
+    categories: tuple[str, ...] = ()
+    rrule: Mapping[str, str] | None = None
+    exdates: frozenset[datetime] = field(default_factory=frozenset)
+    # Start of the occurrence of a recurring event this event replaces
+    recurrence_id: IcsValue | None = None
+
+
+def redact_url(url: str) -> str:
+    """Return a URL without credentials, path or query (safe to log)."""
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    if parts.port:
+        host = f"{host}:{parts.port}"
+    return f"{parts.scheme}://{host}/…"
+
+
+def normalize_url(url: str) -> str:
+    """Return the http(s) URL of a feed (webcal:// is served over https)."""
+    url = url.strip()
+    if url.lower().startswith("webcal://"):
+        return "https://" + url[len("webcal://") :]
+    return url
+
+
+def is_feed_url(url: str) -> bool:
+    """Return True for an http, https or webcal URL with a host."""
+    parts = urlsplit(normalize_url(url))
+    return parts.scheme in ("http", "https") and bool(parts.hostname)
+
+
+def cache_lifetime(headers: Mapping[str, str], now: datetime | None = None) -> float:
+    """Return how many seconds a response stays fresh according to its headers.
+
+    ``no-cache`` / ``no-store`` or no usable header mean 0 (revalidate on
+    every poll).
+    """
+    directives: dict[str, str] = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _sep, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    if "no-cache" in directives or "no-store" in directives:
+        return 0.0
+    try:
+        age = float(headers.get("Age", 0))
+    except ValueError:
+        age = 0.0
+    if "max-age" in directives:
+        try:
+            return max(0.0, float(directives["max-age"]) - age)
+        except ValueError:
+            return 0.0
+    if "Expires" in headers:
+        try:
+            expires = parsedate_to_datetime(headers["Expires"])
+            reference = parsedate_to_datetime(headers["Date"]) if "Date" in headers else now or datetime.now(timezone.utc)
+        except (TypeError, ValueError):
+            return 0.0
+        return max(0.0, (expires - reference).total_seconds())
+    return 0.0
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+
+def _unfold(text: str) -> list[str]:
+    """Return the logical lines of an ICS text (continuation lines joined)."""
+    lines: list[str] = []
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        elif raw:
+            lines.append(raw)
+    return lines
+
+
+def _split_property(line: str) -> tuple[str, dict[str, str], str]:
+    """Split 'NAME;PARAM=X:value' into its name, parameters and value."""
+    head, _sep, value = line.partition(":")
+    name, *params = head.split(";")
+    parameters: dict[str, str] = {}
+    for param in params:
+        key, _sep, param_value = param.partition("=")
+        parameters[key.upper()] = param_value.strip('"')
+    return name.upper(), parameters, value
+
+
+def _unescape(value: str) -> str:
+    """Undo the TEXT escapes of RFC 5545."""
+    return value.replace("\\n", "\n").replace("\\N", "\n").replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+
+
+def _split_list(value: str) -> list[str]:
+    """Split a comma-separated TEXT list, keeping escaped commas."""
+    items, current, escaped = [], "", False
+    for char in value:
+        if escaped:
+            current += "\\" + char
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ",":
+            items.append(_unescape(current))
+            current = ""
+        else:
+            current += char
+    items.append(_unescape(current))
+    return [item.strip() for item in items if item.strip()]
+
+
+def parse_ics_value(value: str, params: Mapping[str, str]) -> IcsValue | None:
+    """Parse a DATE or DATE-TIME value (UTC, TZID or floating)."""
+    value = value.strip()
+    try:
+        if params.get("VALUE") == "DATE" or len(value) == 8:
+            return datetime.strptime(value, "%Y%m%d").date()
+        if value.endswith("Z"):
+            return datetime.strptime(value[:-1], "%Y%m%dT%H%M%S").replace(tzinfo=timezone.utc)
+        parsed = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    except ValueError:
+        return None
+    if tzid := params.get("TZID"):
+        try:
+            return parsed.replace(tzinfo=ZoneInfo(tzid))
+        except (ZoneInfoNotFoundError, ValueError):
+            _LOGGER.debug("Unknown TZID '%s', reading %s as local time", tzid, value)
+    return parsed
+
+
+def _parse_duration(value: str) -> timedelta | None:
+    """Parse a simple ISO 8601 duration such as P1D, PT1H30M or P2W."""
+    value = value.strip().upper()
+    sign = -1 if value.startswith("-") else 1
+    value = value.lstrip("+-")
+    if not value.startswith("P"):
+        return None
+    amounts = {"W": 0, "D": 0, "H": 0, "M": 0, "S": 0}
+    number, in_time = "", False
+    for char in value[1:]:
+        if char == "T":
+            in_time = True
+        elif char.isdigit():
+            number += char
+        elif char in amounts and number:
+            # M is minutes only after T (months are not valid in durations)
+            amounts["M" if in_time and char == "M" else char] += int(number)
+            number = ""
+        else:
+            return None
+    return sign * timedelta(weeks=amounts["W"], days=amounts["D"], hours=amounts["H"], minutes=amounts["M"], seconds=amounts["S"])
+
+
+def parse_ics(text: str) -> list[IcsEvent]:
+    """Return the events of an ICS text; events without a valid start are skipped."""
+    events: list[IcsEvent] = []
+    props: dict[str, tuple[dict[str, str], str]] | None = None
+    exdates: list[datetime | date] = []
+    categories: list[str] = []
+    depth = 0
+    for line in _unfold(text):
+        name, params, value = _split_property(line)
+        if name == "BEGIN":
+            if value.upper() == "VEVENT" and props is None:
+                props, exdates, categories, depth = {}, [], [], 0
+            elif props is not None:
+                # Nested component (VALARM): its properties are not the event's
+                depth += 1
+            continue
+        if name == "END" and props is not None:
+            if depth:
+                depth -= 1
+            elif value.upper() == "VEVENT":
+                if (event := _build_event(props, exdates, categories)) is not None:
+                    events.append(event)
+                props = None
+            continue
+        if props is None or depth:
+            continue
+        if name == "EXDATE":
+            exdates.extend(
+                parsed for item in value.split(",") if (parsed := parse_ics_value(item, params)) is not None
+            )
+        elif name == "CATEGORIES":
+            categories.extend(_split_list(value))
+        else:
+            props.setdefault(name, (params, value))
+    return events
+
+
+def _build_event(
+    props: Mapping[str, tuple[dict[str, str], str]],
+    exdates: list[IcsValue],
+    categories: list[str],
+) -> IcsEvent | None:
+    """Build an event from its properties."""
+    if "DTSTART" not in props:
+        return None
+    start = parse_ics_value(props["DTSTART"][1], props["DTSTART"][0])
+    if start is None:
+        return None
+    end: IcsValue | None = None
+    if "DTEND" in props:
+        end = parse_ics_value(props["DTEND"][1], props["DTEND"][0])
+    elif "DURATION" in props and (duration := _parse_duration(props["DURATION"][1])) is not None:
+        end = start + duration
+    if end is None or type(end) is not type(start):
+        end = start + timedelta(days=1) if not isinstance(start, datetime) else start
+    rrule: dict[str, str] | None = None
+    if "RRULE" in props:
+        rrule = {}
+        for part in props["RRULE"][1].split(";"):
+            key, _sep, part_value = part.partition("=")
+            rrule[key.upper()] = part_value.upper()
+    recurrence_id = None
+    if "RECURRENCE-ID" in props:
+        recurrence_id = parse_ics_value(props["RECURRENCE-ID"][1], props["RECURRENCE-ID"][0])
+    return IcsEvent(
+        uid=props.get("UID", ({}, ""))[1],
+        summary=_unescape(props.get("SUMMARY", ({}, ""))[1]),
+        start=start,
+        end=end,
+        description=_unescape(props.get("DESCRIPTION", ({}, ""))[1]),
+        location=_unescape(props.get("LOCATION", ({}, ""))[1]),
+        categories=tuple(categories),
+        rrule=rrule,
+        exdates=frozenset(_instant(value) for value in exdates),
+        recurrence_id=recurrence_id,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Expansion
+# ---------------------------------------------------------------------------
+
+
+def _format(value: IcsValue) -> str:
+    """Return a value as calendar.get_events formats it (dates, or ISO datetimes)."""
+    return value.isoformat()
+
+
+def _instant(value: IcsValue) -> datetime:
+    """Return the UTC instant a value starts at (dates and floating times are local)."""
+    parsed = parse_event_span(_format(value), _format(value))
+    if parsed is None:
+        raise ValueError(f"invalid time {value!r}")
+    return parsed[0]
+
+
+def _recurrence(event: IcsEvent) -> rrule | None:
+    """Return the dateutil rule of a recurring event, or None when it cannot be read.
+
+    UNTIL is left to :func:`_occurrences`, which compares instants whatever
+    the mix of dates, floating and zoned times.
+    """
+    parts = ";".join(f"{key}={value}" for key, value in (event.rrule or {}).items() if key != "UNTIL")
+    start = event.start
+    dtstart = start if isinstance(start, datetime) else datetime(start.year, start.month, start.day)
+    try:
+        recurrence = rrulestr(parts, dtstart=dtstart)
+    except (ValueError, TypeError) as err:
+        _LOGGER.debug("Recurrence of '%s' not expanded (%s): %s", event.summary, event.rrule, err)
+        return None
+    return recurrence if isinstance(recurrence, rrule) else None
+
+
+def _occurrence_starts(event: IcsEvent, after: datetime | None = None) -> Iterator[IcsValue]:
+    """Yield the starts of a recurring event in order (without exceptions).
+
+    Occurrences starting more than a day before *after* are skipped.
+    """
+    recurrence = _recurrence(event)
+    if recurrence is None:
+        yield event.start
+        return
+    start = event.start
+    floating = not isinstance(start, datetime) or start.tzinfo is None
+    if after is None:
+        starts: Iterator[datetime] = iter(recurrence)
+    else:
+        # Dates and floating times recur in local wall-clock time; one day short absorbs time zones
+        if floating:
+            after = dt_util.as_local(after).replace(tzinfo=None)
+        starts = recurrence.xafter(after - timedelta(days=1), inc=True)
+    for occurrence in starts:
+        yield occurrence if isinstance(start, datetime) else occurrence.date()
+
+
+def _occurrences(
+    event: IcsEvent, replaced: set[datetime], after: datetime | None = None
+) -> Iterator[tuple[IcsValue, IcsValue]]:
+    """Yield the (start, end) values of an event, recurring or not.
+
+    Recurring events may skip the occurrences ending before *after*.
+    """
+    if not event.rrule:
+        yield event.start, event.end
+        return
+    duration = event.end - event.start
+    until: datetime | None = None
+    if "UNTIL" in event.rrule and (until_value := parse_ics_value(event.rrule["UNTIL"], {})) is not None:
+        until = _instant(until_value) if isinstance(until_value, datetime) else _instant(until_value + timedelta(days=1)) - timedelta(microseconds=1)
+    starts = _occurrence_starts(event, after - duration if after is not None else None)
+    for steps, start in enumerate(starts):
+        if steps >= MAX_RECURRENCE_STEPS:
+            return
+        instant = _instant(start)
+        if until is not None and instant > until:
+            return
+        if instant in event.exdates or instant in replaced:
+            continue
+        yield start, start + duration
+
+
+def expand_events(events: list[IcsEvent], start: datetime, end: datetime) -> list[dict[str, Any]]:
+    """Return the occurrences overlapping [start, end) in the calendar.get_events format."""
+    replaced: dict[str, set[datetime]] = {}
+    for event in events:
+        if event.recurrence_id is not None:
+            replaced.setdefault(event.uid, set()).add(_instant(event.recurrence_id))
+    result: list[tuple[datetime, dict[str, Any]]] = []
+    for event in events:
+        # Occurrences replaced by a RECURRENCE-ID event are left to that event
+        exceptions = replaced.get(event.uid, set()) if event.recurrence_id is None else set()
+        for occurrence_start, occurrence_end in _occurrences(event, exceptions, start):
+            span = parse_event_span(_format(occurrence_start), _format(occurrence_end))
+            if span is None:
+                continue
+            if span[0] >= end:
+                # Occurrences come in order: the next ones are later still
+                break
+            if span[1] > start:
+                result.append(
+                    (
+                        span[0],
+                        {
+                            "uid": event.uid,
+                            "summary": event.summary,
+                            "start": _format(occurrence_start),
+                            "end": _format(occurrence_end),
+                            "description": event.description,
+                            "location": event.location,
+                            "categories": list(event.categories),
+                        },
+                    )
+                )
+    result.sort(key=lambda item: item[0])
+    return [item for _start, item in result]
+
+
+# ---------------------------------------------------------------------------
+# Feed
+# ---------------------------------------------------------------------------
+
+
+class IcsFeed:
+    """Conditional poller of a remote ICS feed."""
+
+    def __init__(self, hass: HomeAssistant, url: str, session: aiohttp.ClientSession | None = None) -> None:
+        """Initialize the feed (nothing is read until the first request)."""
+        self.hass = hass
+        self.url = normalize_url(url)
+        self._session = session
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._fresh_until: float | None = None
+        self._events: list[IcsEvent] = []
+        # Last expansion: ((parse number, start, end), events)
+        self._expanded: tuple[tuple[int, datetime, datetime], list[dict[str, Any]]] | None = None
+        self.requests = 0
+        self.not_modified = 0
+        self.parses = 0
+
+    @property
+    def redacted_url(self) -> str:
+        """Return the URL without credentials or path."""
+        return redact_url(self.url)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the pooled session shared with the rest of Home Assistant."""
+        if self._session is None:
+            self._session = async_get_clientsession(self.hass)
+        return self._session
+
+    @property
+    def fresh(self) -> bool:
+        """Return True while the server's cache headers say the feed is fresh."""
+        return self._fresh_until is not None and time.monotonic() < self._fresh_until
+
+    async def async_refresh(self) -> bool:
+        """Send a conditional request; return True when the feed was parsed again."""
+        headers = {"Accept": "text/calendar"}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        self.requests += 1
+        try:
+            async with asyncio.timeout(CALENDAR_FETCH_TIMEOUT):
+                async with self.session.get(self.url, headers=headers) as response:
+                    self._fresh_until = time.monotonic() + cache_lifetime(response.headers)
+                    if response.status == HTTPStatus.NOT_MODIFIED:
+                        self.not_modified += 1
+                        self._etag = response.headers.get("ETag", self._etag)
+                        _LOGGER.debug("Calendar feed %s not modified", self.redacted_url)
+                        return False
+                    response.raise_for_status()
+                    body = await response.read()
+                    charset = response.charset or "utf-8"
+                    self._etag = response.headers.get("ETag")
+                    self._last_modified = response.headers.get("Last-Modified")
+        except (aiohttp.ClientError, TimeoutError) as err:
+            self._fresh_until = None
+            # The error text can contain the URL, hence only its type
+            raise HomeAssistantError(f"Could not read the calendar feed {self.redacted_url}: {type(err).__name__}") from None
+        self._events = await self.hass.async_add_executor_job(parse_ics, body.decode(charset, errors="replace"))
+        self.parses += 1
+        _LOGGER.debug("Calendar feed %s parsed: %d events", self.redacted_url, len(self._events))
+        return True
+
+    async def async_get_events(self, start: datetime, end: datetime) -> list[dict[str, Any]]:
+        """Return the events in [start, end), polling the feed unless it is fresh."""
+        if not self.fresh:
+            await self.async_refresh()
+        key = (self.parses, start, end)
+        if self._expanded is None or self._expanded[0] != key:
+            self._expanded = (key, await self.hass.async_add_executor_job(expand_events, self._events, start, end))
+        return self._expanded[1]
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the feed counters for the diagnostics download (URL redacted)."""
+        return {
+            "url": self.redacted_url,
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "parses": self.parses,
+            "events": len(self._events),
+            "etag": self._etag is not None,
+            "last_modified": self._last_modified,
+            "fresh": self.fresh,
+        }
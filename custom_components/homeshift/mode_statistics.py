@@ -0,0 +1,180 @@
+"""Long-term mode statistics for HomeShift.
+
+The coordinator reports every mode sample to :class:`ModeStatistics`, which
+accumulates the time spent in each day mode and thermostat mode into compact
+hourly counters.  Completed hours are pushed to the recorder as external
+statistics (``homeshift:<kind>_<entry>_<mode>``), so questions such as
+"hours in Remote this month" become a cheap statistics query instead of a
+scan of the select entity's state history.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from homeassistant.const import UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, STATISTIC_KIND_DAY_MODE, STATISTIC_KIND_THERMOSTAT_MODE, STATISTICS_MAX_PENDING_HOURS
+
+_LOGGER = logging.getLogger(__name__)
+
+_HOUR = timedelta(hours=1)
+
+
+def _hour_start(moment: datetime) -> datetime:
+    """Return the UTC top-of-hour containing *moment*."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+class ModeStatistics:
+    """Accumulate time spent per mode and push it as hourly external statistics.
+
+    Counters are kept per UTC hour as ``{(kind, mode_key): seconds}``.  Only
+    completed hours are pushed, each one exactly once; the cumulative ``sum``
+    column continues from the last value stored by the recorder.  An hour is
+    dropped once pushed; while the recorder is missing or failing, at most
+    STATISTICS_MAX_PENDING_HOURS completed hours are kept.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the accumulator for one config entry."""
+        self.hass = hass
+        self._entry_slug = slugify(entry_id)
+        # Hour start (UTC) -> {(kind, mode_key): seconds spent}
+        self._buckets: dict[datetime, dict[tuple[str, str], float]] = {}
+        self._last_sample: datetime | None = None
+        self._current: dict[str, str | None] = {
+            STATISTIC_KIND_DAY_MODE: None,
+            STATISTIC_KIND_THERMOSTAT_MODE: None,
+        }
+        # statistic_id -> (last pushed hour start, cumulative sum in hours)
+        self._sums: dict[str, tuple[datetime | None, float]] = {}
+
+    @property
+    def pending_hours(self) -> list[datetime]:
+        """Return the hour starts that still hold unpushed counters."""
+        return sorted(self._buckets)
+
+    def bucket(self, hour: datetime) -> dict[tuple[str, str], float]:
+        """Return a copy of the counters for the hour starting at *hour* (UTC)."""
+        return dict(self._buckets.get(hour, {}))
+
+    def statistic_id(self, kind: str, mode_key: str) -> str:
+        """Return the external statistic id for a mode key."""
+        return f"{DOMAIN}:{kind}_{self._entry_slug}_{slugify(mode_key)}"
+
+    def track(self, now: datetime, day_mode_key: str | None, thermostat_mode_key: str | None) -> None:
+        """Record a mode sample.
+
+        The time elapsed since the previous sample is credited to the modes that
+        were active *before* this call, split across hour boundaries; the given
+        keys then become the active modes.
+        """
+        now_utc = dt_util.as_utc(now)
+        if self._last_sample is not None and now_utc > self._last_sample:
+            self._accumulate(self._last_sample, now_utc)
+        self._last_sample = now_utc
+        self._current[STATISTIC_KIND_DAY_MODE] = day_mode_key
+        self._current[STATISTIC_KIND_THERMOSTAT_MODE] = thermostat_mode_key
+
+    def _accumulate(self, start: datetime, end: datetime) -> None:
+        """Credit [start, end) to the currently active modes, hour by hour."""
+        active = [(kind, key) for kind, key in self._current.items() if key]
+        if not active:
+            return
+        cursor = start
+        while cursor < end:
+            hour = _hour_start(cursor)
+            slice_end = min(end, hour + _HOUR)
+            seconds = (slice_end - cursor).total_seconds()
+            counters = self._buckets.setdefault(hour, {})
+            for counter in active:
+                counters[counter] = counters.get(counter, 0.0) + seconds
+            cursor = slice_end
+
+    async def async_push_completed(self, now: datetime) -> None:
+        """Push every completed hour to the recorder and drop its counters.
+
+        Counters are only dropped once every statistic was pushed; hours
+        already pushed are skipped on the next attempt.
+        """
+        current_hour = _hour_start(dt_util.as_utc(now))
+        completed = [hour for hour in sorted(self._buckets) if hour < current_hour]
+        if len(completed) > STATISTICS_MAX_PENDING_HOURS:
+            dropped = completed[:-STATISTICS_MAX_PENDING_HOURS]
+            _LOGGER.warning("Dropping %d unpushed hour(s) of mode statistics", len(dropped))
+            for hour in dropped:
+                del self._buckets[hour]
+            completed = completed[-STATISTICS_MAX_PENDING_HOURS:]
+        if not completed:
+            return
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug("Recorder not loaded, keeping %d hour(s) of mode statistics in memory", len(completed))
+            return
+
+        # statistic_id -> (kind, mode_key, [(hour, hours_spent), ...])
+        series: dict[str, tuple[str, str, list[tuple[datetime, float]]]] = {}
+        for hour in completed:
+            for (kind, key), seconds in self._buckets[hour].items():
+                stat_id = self.statistic_id(kind, key)
+                series.setdefault(stat_id, (kind, key, []))[2].append((hour, seconds / 3600))
+
+        failed = False
+        for stat_id, (kind, key, rows) in series.items():
+            if stat_id in self._sums:
+                last_hour, total = self._sums[stat_id]
+            else:
+                try:
+                    last_hour, total = await self._async_get_last_sum(stat_id)
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    _LOGGER.warning("Could not read the last mode statistics of %s, retrying later: %s", stat_id, err)
+                    failed = True
+                    continue
+            statistics = []
+            for hour, hours_spent in rows:
+                if last_hour is not None and hour <= last_hour:
+                    continue
+                total += hours_spent
+                last_hour = hour
+                statistics.append({"start": hour, "state": round(hours_spent, 4), "sum": round(total, 4)})
+            self._sums[stat_id] = (last_hour, total)
+            if statistics:
+                self._async_add_statistics(stat_id, kind, key, statistics)
+        if not failed:
+            for hour in completed:
+                del self._buckets[hour]
+
+    async def _async_get_last_sum(self, stat_id: str) -> tuple[datetime | None, float]:
+        """Return the last hour and cumulative sum stored by the recorder for *stat_id*.
+
+        Only queried the first time a statistic is pushed; the running total is
+        kept in memory afterwards.
+        """
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.recorder import get_instance
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.recorder.statistics import get_last_statistics
+
+        last = await get_instance(self.hass).async_add_executor_job(get_last_statistics, self.hass, 1, stat_id, True, {"sum"})
+        if not last.get(stat_id):
+            return None, 0.0
+        row = last[stat_id][0]
+        return dt_util.utc_from_timestamp(row["start"]), float(row.get("sum") or 0.0)
+
+    def _async_add_statistics(self, stat_id: str, kind: str, key: str, statistics: list[dict]) -> None:
+        """Queue the rows for *stat_id* in the recorder."""
+        # pylint: disable-next=import-outside-toplevel
+        from homeassistant.components.recorder.statistics import async_add_external_statistics
+
+        metadata = {
+            "has_mean": False,
+            "has_sum": True,
+            "name": f"HomeShift {kind.replace('_', ' ')} {key}",
+            "source": DOMAIN,
+            "statistic_id": stat_id,
+            "unit_of_measurement": UnitOfTime.HOURS,
+        }
+        _LOGGER.debug("Pushing %d hour(s) of mode statistics for %s", len(statistics), stat_id)
+        async_add_external_statistics(self.hass, metadata, statistics)
@@ -0,0 +1,140 @@
+"""Household presence aggregation for the HomeShift integration.
+
+The configured ``person`` / ``device_tracker`` entities (residents) and guest
+entities are reduced to a single presence state:
+
+- ``all_away``: no resident and no guest is home;
+- ``guests``: at least one guest is home;
+- ``someone_home``: at least one resident is home, no guest.
+
+The sets of entities currently home are seeded once from the state machine,
+then maintained incrementally from state-change events: each event costs one
+set insertion or removal, never a scan of every tracker.
+
+An entity that is missing, ``unknown`` or ``unavailable`` (typically while Home
+Assistant starts or a tracker integration reloads) is not counted as away:
+as long as nobody is known to be home and such an entity remains, the
+previous presence state is kept (None right after start), so the house does
+not switch to absence before every tracker has reported.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+from homeassistant.const import STATE_HOME, STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import PRESENCE_ALL_AWAY, PRESENCE_GUESTS, PRESENCE_SOMEONE_HOME
+
+_LOGGER = logging.getLogger(__name__)
+
+# States counting as "home": person/device_tracker "home", input_boolean/binary_sensor "on"
+_HOME_STATES = frozenset({STATE_HOME, STATE_ON})
+# States telling nothing about presence
+_UNKNOWN_STATES = frozenset({STATE_UNKNOWN, STATE_UNAVAILABLE})
+
+
+def is_home(state: State | None) -> bool:
+    """Return True when a presence entity state means "at home"."""
+    return state is not None and state.state in _HOME_STATES
+
+
+def is_reported(state: State | None) -> bool:
+    """Return True when a presence entity state is known (home or away)."""
+    return state is not None and state.state not in _UNKNOWN_STATES
+
+
+class PresenceTracker:
+    """Incrementally maintained household presence state."""
+
+    def __init__(self, hass: HomeAssistant, residents: list[str], guests: list[str]) -> None:
+        """Initialize the tracker (nothing is read until async_start)."""
+        self.hass = hass
+        self._residents = frozenset(residents)
+        # An entity listed in both lists counts as a resident
+        self._guests = frozenset(guests) - self._residents
+        self._residents_home: set[str] = set()
+        self._guests_home: set[str] = set()
+        # Entities missing, unknown or unavailable
+        self._unreported: set[str] = set()
+        self._state: str | None = None
+
+    @property
+    def configured(self) -> bool:
+        """Return True when at least one presence entity is configured."""
+        return bool(self._residents or self._guests)
+
+    @property
+    def state(self) -> str | None:
+        """Return the aggregated presence state, or None when not started/configured."""
+        return self._state
+
+    @property
+    def residents_home(self) -> int:
+        """Return the number of residents currently home."""
+        return len(self._residents_home)
+
+    @property
+    def guests_home(self) -> int:
+        """Return the number of guests currently home."""
+        return len(self._guests_home)
+
+    @callback
+    def async_start(self, on_change: Callable[[str | None], None]) -> CALLBACK_TYPE:
+        """Seed the counts, then follow state changes; return the unsubscribe callback.
+
+        *on_change* is called with the new aggregated state whenever it changes.
+        """
+        for entity_id in self._residents | self._guests:
+            self._set_home(entity_id, self.hass.states.get(entity_id))
+        self._state = self._aggregate()
+        _LOGGER.debug(
+            "Presence tracking started: %s (residents home=%d, guests home=%d, unreported=%d)",
+            self._state,
+            self.residents_home,
+            self.guests_home,
+            len(self._unreported),
+        )
+
+        @callback
+        def _async_state_changed(event: Event) -> None:
+            if self.async_update_entity(event.data["entity_id"], event.data.get("new_state")):
+                on_change(self._state)
+
+        return async_track_state_change_event(self.hass, list(self._residents | self._guests), _async_state_changed)
+
+    @callback
+    def async_update_entity(self, entity_id: str, new_state: State | None) -> bool:
+        """Apply one entity state; return True when the aggregated state changed."""
+        self._set_home(entity_id, new_state)
+        new_presence = self._aggregate()
+        if new_presence == self._state:
+            return False
+        _LOGGER.info("Presence changed: %s -> %s (%s)", self._state, new_presence, entity_id)
+        self._state = new_presence
+        return True
+
+    def _set_home(self, entity_id: str, state: State | None) -> None:
+        """Add or remove one entity from its home set."""
+        home_set = self._residents_home if entity_id in self._residents else self._guests_home
+        if is_reported(state):
+            self._unreported.discard(entity_id)
+        else:
+            self._unreported.add(entity_id)
+        if is_home(state):
+            home_set.add(entity_id)
+        else:
+            home_set.discard(entity_id)
+
+    def _aggregate(self) -> str | None:
+        """Reduce the home sets to a presence state."""
+        if self._guests_home:
+            return PRESENCE_GUESTS
+        if self._residents_home:
+            return PRESENCE_SOMEONE_HOME
+        if self._unreported:
+            # Nobody known home but not every entity reported: keep the previous state
+            return self._state
+        return PRESENCE_ALL_AWAY
@@ -0,0 +1,108 @@
+"""Built-in public holidays.
+
+Instead of a holiday calendar entity, HomeShift can compute the public
+holidays of a country (and subdivision) for any year.  Each country has a
+:class:`HolidayProvider`; the built-in ones read the compact rule tables of
+:mod:`.holiday_tables` (fixed dates, Easter-based feasts, nth weekdays,
+regional additions, weekend substitute days).  Other providers implement
+:meth:`HolidayProvider.holidays` and are plugged in with
+:func:`register_provider`.
+
+The holidays of a (country, subdivision, year) are only computed when first
+looked up and kept as a frozenset in a bounded LRU cache shared by all
+entries, so a holiday check is a set lookup, without any calendar entity or
+file, and entries in different countries only pay for the years they use.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import date
+from functools import lru_cache
+from typing import Any
+
+from .holiday_tables import HOLIDAY_TABLES, HolidayTable
+
+# (country, subdivision, year) holiday sets kept in memory
+HOLIDAY_CACHE_SIZE = 128
+
+
+class HolidayProvider(ABC):
+    """Source of the public holidays of one country."""
+
+    country: str = ""
+
+    @property
+    def subdivisions(self) -> tuple[str, ...]:
+        """Return the subdivision codes with their own holidays."""
+        return ()
+
+    @abstractmethod
+    def holidays(self, year: int, subdivision: str = "") -> dict[date, str]:
+        """Return the holidays of *year* by date, with their names."""
+
+
+class TableHolidayProvider(HolidayProvider):
+    """Holiday provider reading a rule table."""
+
+    def __init__(self, table: HolidayTable) -> None:
+        """Initialize the provider for a table."""
+        self.country = table.country
+        self._table = table
+
+    @property
+    def subdivisions(self) -> tuple[str, ...]:
+        """Return the subdivision codes of the table."""
+        return tuple(self._table.subdivisions)
+
+    def holidays(self, year: int, subdivision: str = "") -> dict[date, str]:
+        """Return the holidays of *year* computed from the table."""
+        return self._table.holidays(year, subdivision)
+
+
+_PROVIDERS: dict[str, HolidayProvider] = {country: TableHolidayProvider(table) for country, table in HOLIDAY_TABLES.items()}
+
+
+def normalize_code(code: str | None) -> str:
+    """Return the lookup form of a country or subdivision code."""
+    return (code or "").strip().upper()
+
+
+def register_provider(provider: HolidayProvider) -> None:
+    """Add or replace the provider of a country."""
+    _PROVIDERS[normalize_code(provider.country)] = provider
+    public_holidays.cache_clear()
+
+
+def get_provider(country: str | None) -> HolidayProvider | None:
+    """Return the provider of a country, or None."""
+    return _PROVIDERS.get(normalize_code(country))
+
+
+def holiday_countries() -> list[str]:
+    """Return the countries with a provider, sorted."""
+    return sorted(_PROVIDERS)
+
+
+def holiday_names(country: str, year: int, subdivision: str = "") -> dict[date, str]:
+    """Return the public holidays of *year* by date, with their names (not cached)."""
+    provider = get_provider(country)
+    return provider.holidays(year, normalize_code(subdivision)) if provider is not None else {}
+
+
+@lru_cache(maxsize=HOLIDAY_CACHE_SIZE)
+def public_holidays(country: str, year: int, subdivision: str = "") -> frozenset[date]:
+    """Return the public holidays of *year* (cached per country, subdivision and year).
+
+    Codes are expected in their normalized form, see :func:`is_public_holiday`.
+    """
+    return frozenset(holiday_names(country, year, subdivision))
+
+
+def is_public_holiday(day: date, country: str, subdivision: str = "") -> bool:
+    """Return True when *day* is a public holiday of *country*."""
+    return day in public_holidays(normalize_code(country), day.year, normalize_code(subdivision))
+
+
+def holiday_diagnostics() -> dict[str, Any]:
+    """Return the providers and cache counters for the diagnostics download."""
+    return {"countries": holiday_countries(), "cache": public_holidays.cache_info()._asdict()}
@@ -0,0 +1,249 @@
+"""Token-bucket rate limiting of the service calls HomeShift sends to devices.
+
+Every switch or climate command HomeShift emits goes through one
+:class:`ServiceCallLimiter` stored in ``hass.data[DOMAIN]`` and shared by all
+entries:
+
+- one token is one entity command; each integration (zwave_js, zha, …) has
+  its own bucket, so a burst for a Zigbee mesh never delays Z-Wave devices;
+- a call is split per integration and queued; one background task per
+  integration drains its queue in order, in batches as large as the available
+  tokens allow, so the caller (a refresh, a mode change) returns as soon as
+  the commands are queued instead of sleeping for tokens;
+- a failing batch is logged and the queue keeps draining;
+- the number of entity commands waiting is kept per integration (queue
+  depth) and reported in diagnostics.
+
+Buckets are keyed by the integration owning the called entity in the entity
+registry. Scheduler switches all belong to the ``scheduler`` integration and
+share its bucket: toggling them only changes scheduler state, the device
+commands they trigger later are not paced here.
+
+The limiter is disabled (calls pass straight through) until an entry
+configures a rate; when several entries do, the strictest one applies.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+
+from .const import DATA_RATE_LIMITER, DEFAULT_RATE_BURST, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bucket used for entities missing from the entity registry
+UNKNOWN_INTEGRATION = "unknown"
+
+# (domain, service, data, entity_ids, blocking) waiting in an integration queue
+QueuedCall = tuple[str, str, dict[str, Any], list[str], bool]
+
+
+def get_rate_limiter(hass: HomeAssistant) -> ServiceCallLimiter:
+    """Return the domain-wide service call limiter, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    limiter = domain_data.get(DATA_RATE_LIMITER)
+    if limiter is None:
+        limiter = domain_data[DATA_RATE_LIMITER] = ServiceCallLimiter(hass)
+    return limiter
+
+
+async def async_call_service(
+    hass: HomeAssistant,
+    domain: str,
+    service: str,
+    data: dict[str, Any],
+    blocking: bool = False,
+) -> None:
+    """Send a device service call through the shared rate limiter.
+
+    When a rate is configured the call is only queued: it is sent later by the
+    limiter, and its errors are logged there.
+    """
+    await get_rate_limiter(hass).async_call(domain, service, data, blocking)
+
+
+class TokenBucket:
+    """Token bucket refilled at *rate* tokens per second, holding at most *burst*."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        # Waiters are served in arrival order
+        self._lock = asyncio.Lock()
+        self.queue_depth = 0
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def async_acquire(self, wanted: int) -> int:
+        """Wait for at least one token; take and return up to *wanted* of them."""
+        self.queue_depth += wanted
+        try:
+            async with self._lock:
+                while True:
+                    self._refill()
+                    if self._tokens >= 1:
+                        granted = min(wanted, int(self._tokens))
+                        self._tokens -= granted
+                        return granted
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+        finally:
+            self.queue_depth -= wanted
+
+
+class ServiceCallLimiter:
+    """Per-integration token buckets in front of hass.services.async_call."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize a disabled limiter."""
+        self.hass = hass
+        # entry_id -> (rate, burst) requested by that entry
+        self._settings: dict[str, tuple[float, int]] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._queues: dict[str, deque[QueuedCall]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.throttled = 0
+
+    @property
+    def rate(self) -> float:
+        """Return the effective rate (entity commands per second, 0 = disabled)."""
+        rates = [rate for rate, _burst in self._settings.values()]
+        return min(rates) if rates else 0.0
+
+    @property
+    def burst(self) -> int:
+        """Return the effective bucket size."""
+        bursts = [burst for _rate, burst in self._settings.values()]
+        return min(bursts) if bursts else DEFAULT_RATE_BURST
+
+    @callback
+    def async_configure(self, entry_id: str, rate: float, burst: int) -> CALLBACK_TYPE:
+        """Apply an entry's limits until the returned callback is called (rate <= 0: none)."""
+        if rate > 0:
+            self._settings[entry_id] = (float(rate), max(1, int(burst)))
+        else:
+            self._settings.pop(entry_id, None)
+        # Rebuild the buckets with the new effective limits on next use
+        self._buckets.clear()
+
+        @callback
+        def _async_remove() -> None:
+            if self._settings.pop(entry_id, None) is not None:
+                self._buckets.clear()
+            if not self._settings:
+                # Last limited entry unloaded: drop what it left queued
+                self._async_cancel_workers()
+
+        return _async_remove
+
+    @callback
+    def _async_cancel_workers(self) -> None:
+        """Cancel the queue workers and forget the queued calls."""
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        self._queues.clear()
+
+    def _bucket(self, integration: str) -> TokenBucket:
+        """Return the bucket of an integration."""
+        bucket = self._buckets.get(integration)
+        if bucket is None:
+            bucket = self._buckets[integration] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def _group_by_integration(self, entity_ids: list[str]) -> dict[str, list[str]]:
+        """Group entity ids by the integration providing them."""
+        registry = er.async_get(self.hass)
+        groups: dict[str, list[str]] = {}
+        for entity_id in entity_ids:
+            entry = registry.async_get(entity_id)
+            groups.setdefault(entry.platform if entry else UNKNOWN_INTEGRATION, []).append(entity_id)
+        return groups
+
+    async def async_call(self, domain: str, service: str, data: dict[str, Any], blocking: bool = False) -> None:
+        """Send a service call, or queue it per integration when a rate is configured."""
+        entity_ids = data.get("entity_id")
+        if self.rate <= 0 or not entity_ids:
+            self.calls += 1
+            await self.hass.services.async_call(domain, service, data, blocking=blocking)
+            return
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        for integration, group in self._group_by_integration(entity_ids).items():
+            self._queues.setdefault(integration, deque()).append((domain, service, data, group, blocking))
+            worker = self._workers.get(integration)
+            if worker is None or worker.done():
+                self._workers[integration] = self.hass.async_create_background_task(
+                    self._async_drain(integration), f"{DOMAIN} rate limiter {integration}"
+                )
+
+    async def async_wait(self) -> None:
+        """Wait until every queued call has been sent."""
+        while workers := [worker for worker in self._workers.values() if not worker.done()]:
+            await asyncio.wait(workers)
+
+    async def _async_drain(self, integration: str) -> None:
+        """Send the queued calls of one integration, in order, until its queue is empty."""
+        queue = self._queues[integration]
+        while queue:
+            domain, service, data, entity_ids, blocking = queue.popleft()
+            await self._async_call_paced(integration, domain, service, data, entity_ids, blocking)
+
+    async def _async_call_paced(
+        self,
+        integration: str,
+        domain: str,
+        service: str,
+        data: dict[str, Any],
+        entity_ids: list[str],
+        blocking: bool,
+    ) -> None:
+        """Send the calls of one integration as fast as its bucket allows."""
+        remaining = list(entity_ids)
+        while remaining:
+            if self.rate <= 0:
+                # Limits removed while queued: send the rest at once
+                batch, remaining = remaining, []
+            else:
+                granted = await self._bucket(integration).async_acquire(len(remaining))
+                batch, remaining = remaining[:granted], remaining[granted:]
+            if remaining:
+                self.throttled += 1
+                _LOGGER.debug("%s.%s throttled for %s: %d entities waiting", domain, service, integration, len(remaining))
+            self.calls += 1
+            try:
+                await self.hass.services.async_call(domain, service, {**data, "entity_id": batch}, blocking=blocking)
+            except HomeAssistantError as err:
+                _LOGGER.warning("%s.%s failed on %s: %s", domain, service, batch, err)
+
+    def _queue_depth(self, integration: str) -> int:
+        """Return the number of entity commands of an integration not sent yet."""
+        bucket = self._buckets.get(integration)
+        waiting = bucket.queue_depth if bucket else 0
+        return waiting + sum(len(call[3]) for call in self._queues.get(integration, ()))
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return limiter settings and counters for the diagnostics download."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "calls": self.calls,
+            "throttled": self.throttled,
+            "queue_depth": {
+                integration: self._queue_depth(integration) for integration in {**self._buckets, **self._queues}
+            },
+        }
@@ -0,0 +1,441 @@
+"""Declarative day-mode rules compiled into a decision table.
+
+A rule is a set of conditions and a day mode; the first matching rule wins.
+Rules are written one per line (or separated by ";") as
+``condition & condition => ModeKey``:
+
+- ``days=mon-fri`` / ``days=sat,sun`` / ``days=workday`` / ``days=weekend``;
+- ``holiday=yes`` / ``holiday=no``;
+- ``event=<keyword>[,<keyword>]`` (``none``: no event, ``any``: any event);
+- ``period=all_day,<segment>`` (event period: ``morning``, ``afternoon``
+  with the default day segments);
+- ``segment=<segment>[,<segment>]`` (current day segment);
+- ``time=HH:MM-HH:MM`` (may wrap around midnight);
+- ``presence=all_away,someone_home,guests``;
+- ``*`` matches everything.
+
+The configured rules are followed by the built-in priority (everyone away,
+event mapping, weekday modes, weekend, holiday, default), so an empty rule
+list behaves as before.  Weekday modes (``Mon-Thu:Work, Fri:Remote``) give a
+fixed weekly pattern without recurring calendar events; they do not apply on
+public holidays.  At config load the values of each discrete input (weekday,
+holiday, event keyword, period, time slot, presence) are grouped into the
+classes every rule treats alike (workdays and weekend, say, or a single class
+for an input no rule looks at), and the rules are evaluated once for every
+combination of classes into :class:`DecisionTable`, so a lookup is a single
+dict access however many rules there are.  :meth:`DecisionTable.dump` returns
+the rules, the classes and the compiled table for review (diagnostics).
+"""
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import reduce
+from itertools import product
+from operator import and_
+from typing import Any
+
+from .const import (
+    EVENT_NONE,
+    EVENT_PERIOD_ALL_DAY,
+    PRESENCE_ALL_AWAY,
+    PRESENCE_GUESTS,
+    PRESENCE_SOMEONE_HOME,
+)
+from .evaluation import CalendarEvaluation
+from .segments import DEFAULT_SEGMENTS, MINUTES_PER_DAY, Segment, segment_names, segment_window
+
+_LOGGER = logging.getLogger(__name__)
+
+WEEKDAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+_WEEKDAY_GROUPS = {"workday": frozenset(range(5)), "weekend": frozenset({5, 6}), "daily": frozenset(range(7))}
+# Event condition matching any active event
+EVENT_ANY = "any"
+# Event dimension value of an active event matching no keyword
+EVENT_OTHER = "*other*"
+PRESENCES: tuple[str | None, ...] = (None, PRESENCE_ALL_AWAY, PRESENCE_SOMEONE_HOME, PRESENCE_GUESTS)
+
+_TRUE = frozenset({"yes", "true", "on", "1"})
+_FALSE = frozenset({"no", "false", "off", "0"})
+
+# (weekday, holiday, event, period, time slot, presence)
+DecisionKey = tuple[int, bool, str, str | None, int | None, str | None]
+DIMENSIONS = ("weekday", "holiday", "event", "period", "time", "presence")
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """One day-mode rule; None conditions match anything."""
+
+    mode: str
+    weekdays: frozenset[int] | None = None
+    holiday: bool | None = None
+    # Lowercase keywords, EVENT_NONE or EVENT_ANY
+    events: frozenset[str] | None = None
+    periods: frozenset[str] | None = None
+    # [start, end) in minutes since midnight; start > end wraps around midnight
+    window: tuple[int, int] | None = None
+    # Windows of the day segments the rule is restricted to
+    segments: tuple[tuple[int, int], ...] | None = None
+    presence: frozenset[str] | None = None
+    text: str = ""
+
+    def accepts(self, dimension: int, value: Any, slot: tuple[int, int] | None = None) -> bool:
+        """Return True when the condition on one dimension of a key holds (slot: the time range)."""
+        if dimension == 0:
+            return self.weekdays is None or value in self.weekdays
+        if dimension == 1:
+            return self.holiday is None or value == self.holiday
+        if dimension == 2:
+            return self.events is None or value in self.events or (EVENT_ANY in self.events and value != EVENT_NONE)
+        if dimension == 3:
+            return self.periods is None or value in self.periods
+        if dimension == 4:
+            if self.window is not None and not _inside(self.window, slot):
+                return False
+            return self.segments is None or any(_inside(window, slot) for window in self.segments)
+        return self.presence is None or value in self.presence
+
+    def matches(self, key: DecisionKey, slot: tuple[int, int] | None) -> bool:
+        """Return True when the rule applies to a decision key (slot: its time range)."""
+        return all(self.accepts(dimension, value, slot) for dimension, value in enumerate(key))
+
+    @property
+    def edges(self) -> set[int]:
+        """Return the minutes at which the rule's windows start or end."""
+        windows = [self.window] if self.window else []
+        return {edge for window in (*windows, *(self.segments or ())) for edge in window}
+
+
+def _inside(window: tuple[int, int], slot: tuple[int, int] | None) -> bool:
+    """Return True when a time slot lies within a (possibly wrapping) window."""
+    if slot is None:
+        return False
+    start, end = window
+    low, high = slot
+    return (start <= low and high <= end) if start < end else (low >= start or high <= end)
+
+
+def periods(segments: tuple[Segment, ...]) -> tuple[str | None, ...]:
+    """Return the event periods of a segment configuration (None: no event)."""
+    return (None, EVENT_PERIOD_ALL_DAY, *segment_names(segments))
+
+
+def _parse_minutes(value: str) -> int:
+    """Parse "HH:MM" into minutes since midnight ("24:00" allowed)."""
+    hours, _, minutes = value.strip().partition(":")
+    total = int(hours) * 60 + int(minutes or 0)
+    if not 0 <= total <= MINUTES_PER_DAY:
+        raise ValueError(f"invalid time '{value}'")
+    return total
+
+
+def _parse_weekdays(value: str) -> frozenset[int]:
+    """Parse "mon-fri", "sat,sun", "workday" or "weekend" into weekday numbers."""
+    days: set[int] = set()
+    for part in value.split(","):
+        part = part.strip().lower()
+        if part in _WEEKDAY_GROUPS:
+            days |= _WEEKDAY_GROUPS[part]
+        elif "-" in part:
+            first, last = (WEEKDAY_NAMES.index(name.strip()[:3]) for name in part.split("-", 1))
+            days.update(range(first, last + 1) if first <= last else [*range(first, 7), *range(0, last + 1)])
+        else:
+            days.add(WEEKDAY_NAMES.index(part[:3]))
+    return frozenset(days)
+
+
+def _parse_choices(value: str, allowed: Iterable[str | None]) -> frozenset[str]:
+    """Parse a comma-separated list restricted to *allowed* values."""
+    allowed_set = {choice for choice in allowed if choice is not None}
+    choices = frozenset(part.strip().lower() for part in value.split(",") if part.strip())
+    unknown = choices - allowed_set
+    if unknown:
+        raise ValueError(f"unknown value(s) {sorted(unknown)}")
+    return choices
+
+
+def parse_rule(text: str, mode: str, segments: tuple[Segment, ...] = DEFAULT_SEGMENTS) -> Rule:
+    """Parse the condition part of a rule; raise ValueError when invalid."""
+    conditions: dict[str, Any] = {}
+    for condition in text.split("&"):
+        condition = condition.strip()
+        if not condition or condition == "*":
+            continue
+        name, sep, value = condition.partition("=")
+        name = name.strip().lower()
+        if not sep or not value.strip():
+            raise ValueError(f"condition '{condition}' is not name=value")
+        if name == "days":
+            conditions["weekdays"] = _parse_weekdays(value)
+        elif name == "holiday":
+            flag = value.strip().lower()
+            if flag not in _TRUE | _FALSE:
+                raise ValueError(f"holiday must be yes or no, not '{value}'")
+            conditions["holiday"] = flag in _TRUE
+        elif name == "event":
+            events = {part.strip().lower() for part in value.split(",") if part.strip()}
+            conditions["events"] = frozenset(EVENT_NONE if event == EVENT_NONE.lower() else event for event in events)
+        elif name == "period":
+            conditions["periods"] = _parse_choices(value, periods(segments))
+        elif name == "segment":
+            names = _parse_choices(value, segment_names(segments))
+            conditions["segments"] = tuple(segment_window(segments, name) for name in sorted(names))
+        elif name == "time":
+            start, dash, end = value.partition("-")
+            if not dash:
+                raise ValueError(f"time must be HH:MM-HH:MM, not '{value}'")
+            conditions["window"] = (_parse_minutes(start), _parse_minutes(end))
+        elif name == "presence":
+            conditions["presence"] = _parse_choices(value, PRESENCES)
+        else:
+            raise ValueError(f"unknown condition '{name}'")
+    return Rule(mode=mode, text=text.strip(), **conditions)
+
+
+def parse_rules(raw: str, day_mode_map: dict[str, str], segments: tuple[Segment, ...] = DEFAULT_SEGMENTS) -> list[Rule]:
+    """Parse 'conditions => ModeKey' lines; invalid rules are logged and skipped.
+
+    Mode keys are resolved to display names through *day_mode_map*.
+    """
+    rules: list[Rule] = []
+    if not raw:
+        return rules
+    for line in re.split(r"[;\n]", raw):
+        line = line.strip()
+        if not line:
+            continue
+        conditions, sep, mode_key = line.rpartition("=>")
+        mode_key = mode_key.strip()
+        if not sep or not mode_key:
+            _LOGGER.warning("Ignoring day-mode rule '%s': expected 'conditions => ModeKey'", line)
+            continue
+        try:
+            rules.append(parse_rule(conditions, day_mode_map.get(mode_key, mode_key), segments))
+        except ValueError as err:
+            _LOGGER.warning("Ignoring day-mode rule '%s': %s", line, err)
+    return rules
+
+
+def parse_weekday_modes(raw: str, day_mode_map: dict[str, str]) -> tuple[str | None, ...]:
+    """Parse 'Mon-Thu:Work, Fri:Remote' into one display mode (or None) per weekday.
+
+    Mode keys are resolved through *day_mode_map*; invalid pairs are logged
+    and skipped, later pairs win.
+    """
+    modes: list[str | None] = [None] * 7
+    if not raw:
+        return tuple(modes)
+    for pair in raw.split(","):
+        pair = pair.strip()
+        if not pair:
+            continue
+        days, sep, mode_key = pair.rpartition(":")
+        mode_key = mode_key.strip()
+        try:
+            if not sep or not mode_key:
+                raise ValueError("expected 'Day:ModeKey'")
+            weekdays = _parse_weekdays(days)
+        except ValueError as err:
+            _LOGGER.warning("Ignoring weekday mode '%s': %s", pair, err)
+            continue
+        for weekday in weekdays:
+            modes[weekday] = day_mode_map.get(mode_key, mode_key)
+    return tuple(modes)
+
+
+def default_rules(
+    event_mode_map: dict[str, str],
+    mode_weekend: str,
+    mode_holiday: str,
+    mode_default: str,
+    mode_away: str | None = None,
+    weekday_modes: Sequence[str | None] = (),
+) -> list[Rule]:
+    """Return the built-in priority as rules.
+
+    0. Everyone away (presence tracked) -> mode_away, when given
+    1. Active calendar event matching event_mode_map -> mapped display mode
+    2. Weekday listed in weekday_modes (not a holiday) -> its mode
+    3. Weekend -> mode_weekend
+    4. Holiday calendar active -> mode_holiday
+    5. Default -> mode_default
+    """
+    rules: list[Rule] = []
+    if mode_away:
+        rules.append(Rule(mode_away, presence=frozenset({PRESENCE_ALL_AWAY}), text="presence=all_away"))
+    rules.extend(Rule(mode, events=frozenset({keyword}), text=f"event={keyword}") for keyword, mode in event_mode_map.items())
+    # One rule per mode, in weekday order of first appearance
+    days_per_mode: dict[str, list[int]] = {}
+    for weekday, mode in enumerate(weekday_modes):
+        if mode:
+            days_per_mode.setdefault(mode, []).append(weekday)
+    rules.extend(
+        Rule(
+            mode,
+            weekdays=frozenset(days),
+            holiday=False,
+            text=f"days={','.join(WEEKDAY_NAMES[day] for day in days)} & holiday=no",
+        )
+        for mode, days in days_per_mode.items()
+    )
+    rules.append(Rule(mode_weekend, weekdays=_WEEKDAY_GROUPS["weekend"], text="days=weekend"))
+    rules.append(Rule(mode_holiday, holiday=True, text="holiday=yes"))
+    rules.append(Rule(mode_default, text="*"))
+    return rules
+
+
+class DecisionTable:
+    """Rules evaluated once for every combination of the inputs they tell apart."""
+
+    def __init__(self, rules: Iterable[Rule], segments: tuple[Segment, ...] = DEFAULT_SEGMENTS) -> None:
+        """Compile the rules (first match wins)."""
+        self.rules = tuple(rules)
+        self._periods = periods(segments)
+        keywords = sorted(
+            {event for rule in self.rules if rule.events for event in rule.events} - {EVENT_NONE, EVENT_ANY}
+        )
+        self._events: tuple[str, ...] = (EVENT_NONE, EVENT_OTHER, *keywords)
+        self._keywords = frozenset(keywords)
+        edges = sorted({0, MINUTES_PER_DAY}.union(*(rule.edges for rule in self.rules)))
+        self.slots: list[tuple[int, int]] = list(zip(edges, edges[1:]))
+        # Minute of the day -> slot index
+        self._slot_of_minute: list[int] = [
+            index for index, (low, high) in enumerate(self.slots) for _minute in range(low, high)
+        ]
+        # Per dimension, value -> first value every rule treats the same way
+        # (an input no rule looks at collapses to a single class), and each
+        # class's bit mask of the rules whose condition on that input holds
+        self._classes: list[dict[Any, Any]] = []
+        masks: list[dict[Any, int]] = []
+        values = (range(7), (False, True), self._events, self._periods, (None, *range(len(self.slots))), PRESENCES)
+        for dimension, dimension_values in enumerate(values):
+            representatives: dict[int, Any] = {}
+            classes: dict[Any, Any] = {}
+            for value in dimension_values:
+                slot = self._slot(value) if dimension == 4 else None
+                mask = sum(1 << index for index, rule in enumerate(self.rules) if rule.accepts(dimension, value, slot))
+                classes[value] = representatives.setdefault(mask, value)
+            self._classes.append(classes)
+            masks.append({value: mask for mask, value in representatives.items()})
+        # The first matching rule of a cell is the lowest bit set in every mask
+        self._table: dict[DecisionKey, str | None] = {}
+        for cell in product(*(dimension_masks.items() for dimension_masks in masks)):
+            matching = reduce(and_, (mask for _value, mask in cell))
+            cell_key = tuple(value for value, _mask in cell)
+            self._table[cell_key] = self.rules[(matching & -matching).bit_length() - 1].mode if matching else None
+
+    def _slot(self, index: int | None) -> tuple[int, int] | None:
+        """Return the time range of a slot index (None: no time of day)."""
+        return self.slots[index] if index is not None else None
+
+    @property
+    def time_edges(self) -> list[int]:
+        """Return the minutes of the day at which a time window starts or ends."""
+        return [low for low, _high in self.slots[1:]]
+
+    def key(self, evaluation: CalendarEvaluation) -> DecisionKey:
+        """Return the decision key of an evaluation.
+
+        Without a weekday, the weekend flag picks Saturday or Monday; without
+        a minute of the day, time-window rules do not apply.
+        """
+        weekday = evaluation.weekday
+        if weekday is None:
+            weekday = 5 if evaluation.is_weekend else 0
+        event_type = evaluation.event_type
+        if not event_type or event_type == EVENT_NONE:
+            event = EVENT_NONE
+        elif event_type in self._keywords:
+            event = event_type
+        elif event_type.lower() in self._keywords:
+            event = event_type.lower()
+        else:
+            event = EVENT_OTHER
+        period = evaluation.event_period if evaluation.event_period in self._periods else None
+        presence = evaluation.presence if evaluation.presence in PRESENCES else None
+        minute = evaluation.minute
+        slot = self._slot_of_minute[minute] if minute is not None and 0 <= minute < MINUTES_PER_DAY else None
+        return (weekday, evaluation.is_holiday, event, period, slot, presence)
+
+    def lookup(self, evaluation: CalendarEvaluation) -> str | None:
+        """Return the day mode display name for an evaluation."""
+        key = self.key(evaluation)
+        return self._table[tuple(classes[value] for classes, value in zip(self._classes, key))]
+
+    def __len__(self) -> int:
+        """Return the number of compiled entries."""
+        return len(self._table)
+
+    def dump(self) -> dict[str, Any]:
+        """Return the rules, the input classes and the compiled table, for review."""
+
+        def _label(dimension: int, value: Any) -> str:
+            if dimension == 0:
+                return WEEKDAY_NAMES[value]
+            if dimension == 1:
+                return "yes" if value else "no"
+            if dimension == 4:
+                if value is None:
+                    return "-"
+                low, high = self.slots[value]
+                return f"{low // 60:02d}:{low % 60:02d}-{high // 60:02d}:{high % 60:02d}"
+            return "-" if value is None else str(value)
+
+        # Class representative -> "mon,tue,wed" (all its values)
+        labels = [
+            {
+                representative: ",".join(_label(dimension, value) for value, rep in classes.items() if rep == representative)
+                for representative in dict.fromkeys(classes.values())
+            }
+            for dimension, classes in enumerate(self._classes)
+        ]
+        return {
+            "rules": [f"{rule.text or '*'} => {rule.mode}" for rule in self.rules],
+            "dimensions": {
+                name: list(dimension_labels.values())
+                for name, dimension_labels in zip(DIMENSIONS, labels)
+                if len(dimension_labels) > 1
+            },
+            "time_slots": [_label(4, index) for index in range(len(self.slots))],
+            "size": len(self._table),
+            "table": {
+                "|".join(
+                    f"{name}={dimension_labels[value]}"
+                    for name, dimension_labels, value in zip(DIMENSIONS, labels, cell)
+                    if len(dimension_labels) > 1
+                )
+                or "*": mode
+                for cell, mode in self._table.items()
+            },
+        }
+
+
+def build_decision_table(
+    raw_rules: str,
+    day_mode_map: dict[str, str],
+    event_mode_map: dict[str, str],
+    mode_weekend: str,
+    mode_holiday: str,
+    mode_default: str,
+    mode_away: str | None = None,
+    raw_weekday_modes: str = "",
+    segments: tuple[Segment, ...] = DEFAULT_SEGMENTS,
+) -> DecisionTable:
+    """Compile the configured rules followed by the built-in priority."""
+    return DecisionTable(
+        [
+            *parse_rules(raw_rules, day_mode_map, segments),
+            *default_rules(
+                event_mode_map,
+                mode_weekend,
+                mode_holiday,
+                mode_default,
+                mode_away,
+                parse_weekday_modes(raw_weekday_modes, day_mode_map),
+            ),
+        ],
+        segments,
+    )
@@ -0,0 +1,312 @@
+"""Indexed discovery of scheduler switches.
+
+Scanning every switch state each time the schedulers form is rendered gets
+slow on large installs.  :class:`SchedulerIndex`, stored in
+``hass.data[DOMAIN]`` and shared by all entries, is built once from the
+entity registry:
+
+- a switch is a scheduler when it is provided by the ``scheduler``
+  integration or its entity id contains "schedule";
+- scheduler tags (from the scheduler storage file when it could be read,
+  else once per build from the state attributes) group the
+  entries and are indexed tag -> entity ids, as are areas (entity area, else
+  device area) and labels;
+- the select options (grouped by tag, sorted) are computed once per build;
+- any switch entity-registry update, any device-registry update (device
+  area changes), any change of a switch's ``tags`` attribute and any reload
+  of the scheduler storage drop the index, which is rebuilt on the next
+  lookup.
+
+These listeners are reference-counted: each loaded entry tracks the index
+(:meth:`SchedulerIndex.async_track`) and they are removed with the last one.
+While no entry tracks it, nothing would tell the index it is stale, so it is
+rebuilt on every lookup (e.g. in the config flow of a first entry).
+
+Day modes may select schedulers with "tag:<tag>", "area:<area_id>" or
+"label:<label_id>" items next to plain entity ids.  :meth:`resolve` turns a
+selection into entity ids through the index and memoizes the result until
+the next rebuild, so a refresh costs the same however the selection is
+written.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import selector
+
+from .const import DATA_SCHEDULER_INDEX, DOMAIN
+from .scheduler_storage import get_scheduler_storage
+
+_LOGGER = logging.getLogger(__name__)
+
+# Integration providing the scheduler-card switches
+SCHEDULER_PLATFORM = "scheduler"
+# Group label of schedulers without any tag
+UNTAGGED_GROUP = "—"
+# Prefixes of the selection items that target several schedulers at once
+SELECTION_TAG = "tag"
+SELECTION_AREA = "area"
+SELECTION_LABEL = "label"
+SELECTION_KINDS = (SELECTION_TAG, SELECTION_AREA, SELECTION_LABEL)
+
+
+def parse_selection_item(item: str) -> tuple[str, str] | None:
+    """Return (kind, value) for a "tag:/area:/label:" item, None for an entity id."""
+    kind, sep, value = item.partition(":")
+    if sep and kind in SELECTION_KINDS and value:
+        return kind, value
+    return None
+
+
+def get_scheduler_index(hass: HomeAssistant) -> SchedulerIndex:
+    """Return the domain-wide scheduler index, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    index = domain_data.get(DATA_SCHEDULER_INDEX)
+    if index is None:
+        index = domain_data[DATA_SCHEDULER_INDEX] = SchedulerIndex(hass)
+    return index
+
+
+def is_scheduler(entry: er.RegistryEntry) -> bool:
+    """Return True for registry entries of scheduler switches."""
+    return entry.domain == "switch" and (entry.platform == SCHEDULER_PLATFORM or "schedule" in entry.entity_id.lower())
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerInfo:
+    """Indexed data of one scheduler switch."""
+
+    entity_id: str
+    name: str
+    tags: tuple[str, ...] = ()
+    area_id: str | None = None
+    labels: tuple[str, ...] = ()
+
+    @property
+    def group(self) -> str:
+        """Return the group shown in the options (first tag)."""
+        return self.tags[0] if self.tags else UNTAGGED_GROUP
+
+    @property
+    def label(self) -> str:
+        """Return the option label."""
+        return f"{self.group} · {self.name} ({self.entity_id})"
+
+
+class SchedulerIndex:
+    """Lazily built index of the scheduler switches."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty index."""
+        self.hass = hass
+        self._schedulers: dict[str, SchedulerInfo] | None = None
+        # kind -> value -> entity ids (kinds: SELECTION_*)
+        self._by_kind: dict[str, dict[str, frozenset[str]]] = {kind: {} for kind in SELECTION_KINDS}
+        # selection tuple -> resolved entity ids, valid until the next rebuild
+        self._resolved: dict[tuple[str, ...], frozenset[str]] = {}
+        self._options: list[selector.SelectOptionDict] = []
+        # Lowercase "label" per entity id, used by search()
+        self._haystacks: dict[str, str] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._trackers = 0
+        self.builds = 0
+
+    @callback
+    def async_track(self) -> CALLBACK_TYPE:
+        """Keep the index up to date until the returned callback is called.
+
+        Tracking is reference-counted so several entries share one set of
+        listeners, removed with the last one.
+        """
+        self._trackers += 1
+        if self._trackers == 1:
+            # Changes made while untracked were not followed
+            self.async_invalidate()
+            self._unsubs = self._async_listen()
+
+        @callback
+        def _async_untrack() -> None:
+            self._trackers -= 1
+            if self._trackers == 0:
+                for unsub in self._unsubs:
+                    unsub()
+                self._unsubs = []
+
+        return _async_untrack
+
+    @callback
+    def _async_listen(self) -> list[CALLBACK_TYPE]:
+        """Drop the index on registry updates, tag changes and storage reloads."""
+
+        @callback
+        def _async_updated(event: Event) -> None:
+            if self._schedulers is not None:
+                _LOGGER.debug("Scheduler index invalidated (%s %s)", event.data.get("action"), event.data.get("entity_id"))
+            self.async_invalidate()
+
+        @callback
+        def _is_switch_update(event_data) -> bool:
+            return str(event_data.get("entity_id", "")).startswith("switch.")
+
+        @callback
+        def _is_tag_change(event_data) -> bool:
+            old_state, new_state = event_data.get("old_state"), event_data.get("new_state")
+            return (
+                _is_switch_update(event_data)
+                and old_state is not None
+                and new_state is not None
+                and old_state.attributes.get("tags") != new_state.attributes.get("tags")
+            )
+
+        return [
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+                _async_updated,
+                event_filter=_is_switch_update,
+            ),
+            self.hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, _async_updated),
+            self.hass.bus.async_listen(EVENT_STATE_CHANGED, _async_updated, event_filter=_is_tag_change),
+            get_scheduler_storage(self.hass).async_add_listener(self.async_invalidate),
+        ]
+
+    @callback
+    def async_invalidate(self) -> None:
+        """Drop the index; it is rebuilt on the next lookup."""
+        self._schedulers = None
+
+    def _ensure_built(self) -> dict[str, SchedulerInfo]:
+        """Build the index when needed and return the schedulers by entity id."""
+        if self._schedulers is not None and self._trackers:
+            return self._schedulers
+        schedulers: dict[str, SchedulerInfo] = {}
+        device_registry = dr.async_get(self.hass)
+        storage_data = get_scheduler_storage(self.hass).data
+        for entry in er.async_get(self.hass).entities.values():
+            if not is_scheduler(entry):
+                continue
+            state = self.hass.states.get(entry.entity_id)
+            attributes = state.attributes if state is not None else {}
+            name = attributes.get("friendly_name") or entry.name or entry.original_name or entry.entity_id
+            if storage_data is not None and entry.entity_id in storage_data.by_entity:
+                tags = storage_data.tags_of(entry.entity_id)
+            else:
+                tags = tuple(str(tag) for tag in (attributes.get("tags") or []))
+            area_id = entry.area_id
+            if area_id is None and entry.device_id:
+                device = device_registry.async_get(entry.device_id)
+                area_id = device.area_id if device else None
+            labels = tuple(sorted(getattr(entry, "labels", None) or ()))
+            schedulers[entry.entity_id] = SchedulerInfo(entry.entity_id, str(name), tags, area_id, labels)
+
+        by_kind: dict[str, dict[str, set[str]]] = {kind: {} for kind in SELECTION_KINDS}
+        for info in schedulers.values():
+            for tag in info.tags:
+                by_kind[SELECTION_TAG].setdefault(tag, set()).add(info.entity_id)
+            if info.area_id:
+                by_kind[SELECTION_AREA].setdefault(info.area_id, set()).add(info.entity_id)
+            for label in info.labels:
+                by_kind[SELECTION_LABEL].setdefault(label, set()).add(info.entity_id)
+        ordered = sorted(schedulers.values(), key=lambda info: (info.group == UNTAGGED_GROUP, info.group, info.name))
+
+        self._by_kind = {
+            kind: {value: frozenset(entity_ids) for value, entity_ids in values.items()} for kind, values in by_kind.items()
+        }
+        self._resolved = {}
+        self._options = self._selection_options() + [{"value": info.entity_id, "label": info.label} for info in ordered]
+        self._haystacks = {option["value"]: option["label"].lower() for option in self._options}
+        self._schedulers = schedulers
+        self.builds += 1
+        _LOGGER.debug(
+            "Scheduler index built: %d schedulers, %d tags, %d areas, %d labels",
+            len(schedulers),
+            len(self._by_kind[SELECTION_TAG]),
+            len(self._by_kind[SELECTION_AREA]),
+            len(self._by_kind[SELECTION_LABEL]),
+        )
+        return schedulers
+
+    def _selection_options(self) -> list[selector.SelectOptionDict]:
+        """Return the tag/area/label options, each with its scheduler count."""
+        area_registry = ar.async_get(self.hass)
+        options: list[selector.SelectOptionDict] = []
+        for tag, entity_ids in sorted(self._by_kind[SELECTION_TAG].items()):
+            options.append({"value": f"{SELECTION_TAG}:{tag}", "label": f"Tag: {tag} ({len(entity_ids)})"})
+        for area_id, entity_ids in sorted(self._by_kind[SELECTION_AREA].items()):
+            area = area_registry.async_get_area(area_id)
+            name = area.name if area else area_id
+            options.append({"value": f"{SELECTION_AREA}:{area_id}", "label": f"Area: {name} ({len(entity_ids)})"})
+        for label_id, entity_ids in sorted(self._by_kind[SELECTION_LABEL].items()):
+            options.append({"value": f"{SELECTION_LABEL}:{label_id}", "label": f"Label: {label_id} ({len(entity_ids)})"})
+        return options
+
+    @property
+    def schedulers(self) -> dict[str, SchedulerInfo]:
+        """Return the indexed schedulers by entity id."""
+        return self._ensure_built()
+
+    @property
+    def tags(self) -> list[str]:
+        """Return every scheduler tag, sorted."""
+        self._ensure_built()
+        return sorted(self._by_kind[SELECTION_TAG])
+
+    def entities_with_tag(self, tag: str) -> frozenset[str]:
+        """Return the schedulers carrying *tag*."""
+        self._ensure_built()
+        return self._by_kind[SELECTION_TAG].get(tag, frozenset())
+
+    def resolve(self, selection: Iterable[str]) -> frozenset[str]:
+        """Return the entity ids selected by entity ids and tag:/area:/label: items.
+
+        A selection made only of entity ids is returned as-is without building
+        the index.
+        """
+        key = tuple(selection)
+        if not any(parse_selection_item(item) for item in key):
+            return frozenset(key)
+        self._ensure_built()
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            entity_ids: set[str] = set()
+            for item in key:
+                parsed = parse_selection_item(item)
+                if parsed is None:
+                    entity_ids.add(item)
+                else:
+                    kind, value = parsed
+                    entity_ids |= self._by_kind[kind].get(value, frozenset())
+            resolved = self._resolved[key] = frozenset(entity_ids)
+        return resolved
+
+    def resolve_map(self, schedulers_per_mode: dict[str, list[str]]) -> dict[str, frozenset[str]]:
+        """Resolve every mode of a schedulers-per-mode map."""
+        return {mode: self.resolve(selection) for mode, selection in schedulers_per_mode.items()}
+
+    def options(self) -> list[selector.SelectOptionDict]:
+        """Return the select options, grouped by tag (shared, do not mutate)."""
+        self._ensure_built()
+        return self._options
+
+    def search(self, query: str, keep: list[str] | None = None) -> list[selector.SelectOptionDict]:
+        """Return the options whose label contains every word of *query*.
+
+        Entity ids in *keep* (e.g. the current selection) are always included
+        so a filtered form never drops an existing assignment.
+        """
+        self._ensure_built()
+        words = query.lower().split()
+        if not words:
+            return self._options
+        kept = set(keep or ())
+        return [
+            option
+            for option in self._options
+            if option["value"] in kept or all(word in self._haystacks[option["value"]] for word in words)
+        ]
@@ -0,0 +1,339 @@
+"""Read-only loader for the scheduler component's storage file.
+
+The scheduler integration keeps its schedules (tags, weekdays, timeslots and
+actions) in ``.storage/scheduler.storage``.  Instead of reading tags one
+entity at a time from state attributes, HomeShift parses that file once into
+:class:`SchedulerStorageData`:
+
+- schedules by id, with their switch entity id;
+- tag -> entity ids and weekday -> entity ids indexes;
+- overlap checks between schedules acting on the same entity.
+
+:class:`SchedulerStorage`, shared in ``hass.data[DOMAIN]``, polls the file's
+modification time while at least one entry tracks it and re-parses it only
+when it changed.  The file is never written.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DATA_SCHEDULER_STORAGE, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEDULER_STORAGE_FILE = "scheduler.storage"
+# How often the file's modification time is checked
+STORAGE_POLL_INTERVAL = timedelta(seconds=30)
+
+# Weekday keywords of the scheduler component -> Python weekdays (Monday = 0)
+WEEKDAY_KEYWORDS: dict[str, frozenset[int]] = {
+    "mon": frozenset({0}),
+    "tue": frozenset({1}),
+    "wed": frozenset({2}),
+    "thu": frozenset({3}),
+    "fri": frozenset({4}),
+    "sat": frozenset({5}),
+    "sun": frozenset({6}),
+    "workday": frozenset(range(5)),
+    "weekend": frozenset({5, 6}),
+    "daily": frozenset(range(7)),
+}
+
+
+def schedule_entity_id(schedule_id: str) -> str:
+    """Return the switch entity id the scheduler component gives a schedule."""
+    return f"switch.schedule_{schedule_id}"
+
+
+def _minutes(value: str | None) -> int | None:
+    """Convert "HH:MM[:SS]" to minutes since midnight (None for sun-relative or missing times)."""
+    if not value:
+        return None
+    parts = value.split(":")
+    try:
+        return int(parts[0]) * 60 + int(parts[1])
+    except (IndexError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class TimeSlot:
+    """One timeslot of a schedule."""
+
+    # Minutes since midnight; stop None for single-time slots
+    start: int
+    stop: int | None
+    # (entity_id, attribute, value) "is" conditions that must all hold
+    requires: frozenset[tuple[str, str, str]] = frozenset()
+
+    @property
+    def end(self) -> int | None:
+        """Return the stop minute, a stop at or before the start meaning midnight."""
+        if self.stop is None:
+            return None
+        return self.stop if self.stop > self.start else 24 * 60
+
+    def overlaps(self, other: TimeSlot) -> bool:
+        """Return True when both slots can be active at the same time."""
+        for entity_id, attribute, value in self.requires:
+            for other_entity_id, other_attribute, other_value in other.requires:
+                if (entity_id, attribute) == (other_entity_id, other_attribute) and value != other_value:
+                    # e.g. "thermostat is Chauffage" vs "thermostat is Climatisation"
+                    return False
+        end, other_end = self.end, other.end
+        if end is None or other_end is None:
+            return self.start == other.start
+        return self.start < other_end and other.start < end
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleInfo:
+    """One schedule of the scheduler component."""
+
+    schedule_id: str
+    entity_id: str
+    name: str
+    enabled: bool
+    weekdays: frozenset[int]
+    timeslots: tuple[TimeSlot, ...]
+    # Entities acted upon by the timeslot actions
+    targets: frozenset[str]
+    tags: tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class SchedulerStorageData:
+    """Parsed scheduler storage with its indexes."""
+
+    schedules: dict[str, ScheduleInfo] = field(default_factory=dict)
+    by_entity: dict[str, ScheduleInfo] = field(default_factory=dict)
+    by_tag: dict[str, frozenset[str]] = field(default_factory=dict)
+    by_weekday: dict[int, frozenset[str]] = field(default_factory=dict)
+
+    def tags_of(self, entity_id: str) -> tuple[str, ...]:
+        """Return the tags of a scheduler switch (empty when unknown)."""
+        info = self.by_entity.get(entity_id)
+        return info.tags if info else ()
+
+    def conflicts(self, entity_ids: set[str] | frozenset[str]) -> list[tuple[str, str, str]]:
+        """Return (entity_id, entity_id, target) for schedules that would fight.
+
+        Two schedules conflict when they act on the same target entity, share
+        a weekday and have overlapping timeslots whose conditions do not
+        exclude each other (single-time slots overlap when they start at the
+        same minute).
+        """
+        infos = sorted((self.by_entity[e] for e in entity_ids if e in self.by_entity), key=lambda i: i.entity_id)
+        found: list[tuple[str, str, str]] = []
+        for position, first in enumerate(infos):
+            for second in infos[position + 1 :]:
+                if not first.weekdays & second.weekdays:
+                    continue
+                for target in sorted(first.targets & second.targets):
+                    if _slots_overlap(first.timeslots, second.timeslots):
+                        found.append((first.entity_id, second.entity_id, target))
+        return found
+
+
+def _slots_overlap(first: tuple[TimeSlot, ...], second: tuple[TimeSlot, ...]) -> bool:
+    """Return True when any timeslot of *first* overlaps one of *second*."""
+    return any(slot.overlaps(other) for slot in first for other in second)
+
+
+def _required_conditions(slot: dict[str, Any]) -> frozenset[tuple[str, str, str]]:
+    """Return the "is" conditions that must all hold for a timeslot to run."""
+    conditions = slot.get("conditions") or []
+    # With "or", no single condition is required (unless there is only one)
+    if slot.get("condition_type") == "or" and len(conditions) > 1:
+        return frozenset()
+    return frozenset(
+        (str(condition.get("entity_id")), str(condition.get("attribute", "state")), str(condition.get("value")))
+        for condition in conditions
+        if condition.get("match_type") == "is"
+    )
+
+
+def parse_scheduler_storage(raw: dict[str, Any], entity_id_of: Callable[[str], str] = schedule_entity_id) -> SchedulerStorageData:
+    """Parse the content of scheduler.storage into indexed data."""
+    payload = raw.get("data") or {}
+    tags_by_schedule: dict[str, list[str]] = {}
+    for tag in payload.get("tags") or []:
+        for schedule_id in tag.get("schedules") or []:
+            tags_by_schedule.setdefault(schedule_id, []).append(str(tag.get("name")))
+
+    data = SchedulerStorageData()
+    by_tag: dict[str, set[str]] = {}
+    by_weekday: dict[int, set[str]] = {day: set() for day in range(7)}
+    for schedule in payload.get("schedules") or []:
+        schedule_id = schedule.get("schedule_id")
+        if not schedule_id:
+            continue
+        weekdays: frozenset[int] = frozenset()
+        for keyword in schedule.get("weekdays") or []:
+            weekdays |= WEEKDAY_KEYWORDS.get(str(keyword).lower(), frozenset())
+        timeslots: list[TimeSlot] = []
+        targets: set[str] = set()
+        for slot in schedule.get("timeslots") or []:
+            start = _minutes(slot.get("start"))
+            if start is not None:
+                timeslots.append(TimeSlot(start, _minutes(slot.get("stop")), _required_conditions(slot)))
+            for action in slot.get("actions") or []:
+                target = action.get("entity_id")
+                if isinstance(target, str):
+                    targets.add(target)
+                elif isinstance(target, list):
+                    targets.update(str(item) for item in target)
+        info = ScheduleInfo(
+            schedule_id=schedule_id,
+            entity_id=entity_id_of(schedule_id),
+            name=str(schedule.get("name") or schedule_id),
+            enabled=bool(schedule.get("enabled", True)),
+            weekdays=weekdays,
+            timeslots=tuple(timeslots),
+            targets=frozenset(targets),
+            tags=tuple(tags_by_schedule.get(schedule_id, [])),
+        )
+        data.schedules[schedule_id] = info
+        data.by_entity[info.entity_id] = info
+        for tag in info.tags:
+            by_tag.setdefault(tag, set()).add(info.entity_id)
+        for day in weekdays:
+            by_weekday[day].add(info.entity_id)
+    data.by_tag = {tag: frozenset(entity_ids) for tag, entity_ids in by_tag.items()}
+    data.by_weekday = {day: frozenset(entity_ids) for day, entity_ids in by_weekday.items()}
+    return data
+
+
+def _read_storage(path: str, known_mtime: float | None) -> tuple[float, dict[str, Any]] | None:
+    """Return (mtime, content) when the file changed since known_mtime (executor).
+
+    Raises FileNotFoundError when the file does not exist.
+    """
+    mtime = os.stat(path).st_mtime
+    if mtime == known_mtime:
+        return None
+    with open(path, encoding="utf-8") as file:
+        return mtime, json.load(file)
+
+
+def get_scheduler_storage(hass: HomeAssistant) -> SchedulerStorage:
+    """Return the domain-wide scheduler storage reader, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    storage = domain_data.get(DATA_SCHEDULER_STORAGE)
+    if storage is None:
+        storage = domain_data[DATA_SCHEDULER_STORAGE] = SchedulerStorage(hass)
+    return storage
+
+
+class SchedulerStorage:
+    """Watched, read-only view of scheduler.storage."""
+
+    def __init__(self, hass: HomeAssistant, path: str | None = None) -> None:
+        """Initialize the reader (nothing is read until async_load)."""
+        self.hass = hass
+        self.path = path or hass.config.path(".storage", SCHEDULER_STORAGE_FILE)
+        self._data: SchedulerStorageData | None = None
+        self._mtime: float | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._poll_unsub: CALLBACK_TYPE | None = None
+        self._trackers = 0
+        self.loads = 0
+
+    @property
+    def loaded(self) -> bool:
+        """Return True once the storage file has been parsed."""
+        return self._data is not None
+
+    @property
+    def data(self) -> SchedulerStorageData | None:
+        """Return the parsed storage, or None when the file is missing or unreadable."""
+        return self._data
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call *listener* after every reload until the returned callback is called."""
+        self._listeners.append(listener)
+
+        @callback
+        def _async_remove() -> None:
+            self._listeners.remove(listener)
+
+        return _async_remove
+
+    async def async_load(self) -> bool:
+        """Re-parse the file if its modification time changed; return True when reloaded.
+
+        When the file disappears, the parsed data is dropped and the listeners
+        are notified, so no stale schedule keeps driving the plans.
+        """
+        try:
+            result = await self.hass.async_add_executor_job(_read_storage, self.path, self._mtime)
+        except FileNotFoundError:
+            if self._data is None and self._mtime is None:
+                return False
+            _LOGGER.info("Scheduler storage '%s' was removed", self.path)
+            self._data = None
+            self._mtime = None
+            self._notify()
+            return True
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Could not read scheduler storage '%s': %s", self.path, err)
+            return False
+        if result is None:
+            return False
+        self._mtime, raw = result
+        registry = er.async_get(self.hass)
+
+        def _entity_id_of(schedule_id: str) -> str:
+            # Follow renamed switches through the registry (scheduler unique_id = schedule_id)
+            return registry.async_get_entity_id("switch", "scheduler", schedule_id) or schedule_entity_id(schedule_id)
+
+        self._data = parse_scheduler_storage(raw, _entity_id_of)
+        self.loads += 1
+        _LOGGER.debug(
+            "Scheduler storage loaded: %d schedules, %d tags",
+            len(self._data.schedules),
+            len(self._data.by_tag),
+        )
+        self._notify()
+        return True
+
+    def _notify(self) -> None:
+        """Call the listeners after the data changed."""
+        for listener in self._listeners:
+            listener()
+
+    async def async_track(self) -> CALLBACK_TYPE:
+        """Load the file and watch it until the returned callback is called.
+
+        Watching is reference-counted so several entries share one poller.
+        The poller is started before the first load is awaited, so entries
+        set up concurrently never start a second one.
+        """
+        self._trackers += 1
+        if self._poll_unsub is None:
+
+            async def _async_poll(_now) -> None:
+                await self.async_load()
+
+            self._poll_unsub = async_track_time_interval(self.hass, _async_poll, STORAGE_POLL_INTERVAL)
+            await self.async_load()
+
+        @callback
+        def _async_untrack() -> None:
+            self._trackers -= 1
+            if self._trackers <= 0 and self._poll_unsub is not None:
+                self._poll_unsub()
+                self._poll_unsub = None
+
+        return _async_untrack
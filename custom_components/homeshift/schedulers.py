@@ -0,0 +1,94 @@
+"""Scheduler switch handling shared by the coordinator and its zones."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import HomeAssistant
+
+from .const import THERMOSTAT_OFF_KEY
+from .rate_limit import async_call_service
+from .scheduler_index import get_scheduler_index
+from .scheduler_storage import get_scheduler_storage
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def plan_scheduler_changes(
+    hass: HomeAssistant,
+    schedulers_per_mode: dict[str, list[str]],
+    day_mode: str,
+    thermostat_mode_key: str | None,
+    thermostat_mode_map: dict[str, str],
+) -> tuple[set[str], set[str]]:
+    """Return the (to_enable, to_disable) switch sets for a day mode.
+
+    Selections are resolved to entity ids first (tag:/area:/label: items go
+    through the scheduler index).
+
+    1. The switches of the active day mode are enabled.
+    2. The switches of every other mode are disabled, except those also
+       listed for the active mode (shared switches are never turned off).
+    3. When the thermostat mode is Off, every scheduler carrying a
+       thermostat-mode tag (e.g. "Chauffage", "Climatisation", …) is
+       force-disabled.  Schedulers without any thermostat tag are untouched.
+       Tags come from the scheduler storage file when it could be read, else
+       from the state attributes.
+
+    Schedules to be enabled together that act on the same entity at
+    overlapping times (per the storage file) are reported as conflicts.
+    """
+    resolved = get_scheduler_index(hass).resolve_map(schedulers_per_mode)
+    to_enable: set[str] = set(resolved.get(day_mode, ()))
+    to_disable: set[str] = set()
+    for mode, switches in resolved.items():
+        if mode != day_mode:
+            for sw in switches:
+                if sw not in to_enable:  # never disable a shared switch
+                    to_disable.add(sw)
+
+    storage_data = get_scheduler_storage(hass).data
+    if thermostat_mode_key == THERMOSTAT_OFF_KEY and thermostat_mode_map:
+        thermostat_tags: set[str] = set(thermostat_mode_map.values())
+        all_switches: set[str] = set()
+        for swlist in resolved.values():
+            all_switches.update(swlist)
+        for entity_id in all_switches:
+            if storage_data is not None and entity_id in storage_data.by_entity:
+                entity_tags: list = list(storage_data.tags_of(entity_id))
+            else:
+                state = hass.states.get(entity_id)
+                if state is None:
+                    continue
+                entity_tags = state.attributes.get("tags", []) or []
+            if set(entity_tags) & thermostat_tags:
+                _LOGGER.debug(
+                    "Thermostat OFF: force-disabling scheduler '%s' (tags=%s)",
+                    entity_id,
+                    entity_tags,
+                )
+                to_disable.add(entity_id)
+                to_enable.discard(entity_id)
+
+    if storage_data is not None:
+        for first, second, target in storage_data.conflicts(to_enable):
+            _LOGGER.warning(
+                "Schedulers '%s' and '%s' both act on '%s' at overlapping times in day_mode '%s'",
+                first,
+                second,
+                target,
+                day_mode,
+            )
+
+    return to_enable, to_disable
+
+
+async def async_apply_scheduler_changes(hass: HomeAssistant, to_enable: set[str], to_disable: set[str]) -> None:
+    """Fire the switch.turn_off / switch.turn_on service calls for a plan."""
+    # Turn off first so we don't have conflicting schedulers briefly active
+    if to_disable:
+        _LOGGER.debug("Turning OFF schedulers: %s", sorted(to_disable))
+        await async_call_service(hass, "switch", "turn_off", {"entity_id": sorted(to_disable)})
+
+    if to_enable:
+        _LOGGER.debug("Turning ON schedulers: %s", sorted(to_enable))
+        await async_call_service(hass, "switch", "turn_on", {"entity_id": sorted(to_enable)})
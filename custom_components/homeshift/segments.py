@@ -0,0 +1,119 @@
+"""Configurable intra-day segments.
+
+The day is split into named segments, each running from its start time to
+the start of the next one, for example::
+
+    night:00:00, morning:06:00, lunch:12:00, afternoon:13:30, evening:18:00
+
+When the first segment does not start at midnight, the last one wraps
+around it (``morning:06:00, evening:18:00`` makes ``evening`` run from 18:00
+to 06:00).  Without configuration the day has two segments, ``morning`` and
+``afternoon``, split at MIDDAY_HOUR.
+
+An event covers the segments its time range overlaps: it is ``all_day``
+when it covers all of them (or several), otherwise its period is the name
+of the one segment it falls in.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from .const import EVENT_PERIOD_AFTERNOON, EVENT_PERIOD_ALL_DAY, EVENT_PERIOD_MORNING, MIDDAY_HOUR
+
+_LOGGER = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class Segment:
+    """Named part of the day starting at *start* minutes after midnight."""
+
+    name: str
+    start: int
+
+
+DEFAULT_SEGMENTS: tuple[Segment, ...] = (
+    Segment(EVENT_PERIOD_MORNING, 0),
+    Segment(EVENT_PERIOD_AFTERNOON, MIDDAY_HOUR * 60),
+)
+
+
+def parse_day_segments(raw: str) -> tuple[Segment, ...]:
+    """Parse 'name:HH:MM, ...' into segments sorted by start.
+
+    An empty or invalid definition falls back to DEFAULT_SEGMENTS.
+    """
+    if not raw or not raw.strip():
+        return DEFAULT_SEGMENTS
+    segments: dict[str, Segment] = {}
+    starts: set[int] = set()
+    try:
+        for pair in raw.split(","):
+            pair = pair.strip()
+            if not pair:
+                continue
+            name, sep, start = pair.partition(":")
+            name = name.strip().lower()
+            if not sep or not name or name == EVENT_PERIOD_ALL_DAY:
+                raise ValueError(f"invalid segment '{pair}'")
+            hours, _, minutes = start.strip().partition(":")
+            minute = int(hours) * 60 + int(minutes or 0)
+            if not 0 <= minute < MINUTES_PER_DAY:
+                raise ValueError(f"invalid start time in '{pair}'")
+            if name in segments or minute in starts:
+                raise ValueError(f"duplicate segment '{pair}'")
+            segments[name] = Segment(name, minute)
+            starts.add(minute)
+    except ValueError as err:
+        _LOGGER.warning("Ignoring day segments '%s': %s", raw, err)
+        return DEFAULT_SEGMENTS
+    if not segments:
+        return DEFAULT_SEGMENTS
+    return tuple(sorted(segments.values(), key=lambda segment: segment.start))
+
+
+def segment_names(segments: tuple[Segment, ...]) -> tuple[str, ...]:
+    """Return the segment names in day order."""
+    return tuple(segment.name for segment in segments)
+
+
+def segment_window(segments: tuple[Segment, ...], name: str) -> tuple[int, int]:
+    """Return the [start, end) minutes of a segment (start > end wraps around midnight)."""
+    for index, segment in enumerate(segments):
+        if segment.name == name:
+            if index + 1 < len(segments):
+                return (segment.start, segments[index + 1].start)
+            first = segments[0].start
+            return (segment.start, first if first else MINUTES_PER_DAY)
+    raise ValueError(f"unknown segment '{name}'")
+
+
+def segment_ranges(segments: tuple[Segment, ...]) -> list[tuple[int, int, str]]:
+    """Return the (start, end, name) ranges covering the day from 00:00 to 24:00."""
+    ranges: list[tuple[int, int, str]] = []
+    if segments[0].start > 0:
+        ranges.append((0, segments[0].start, segments[-1].name))
+    for index, segment in enumerate(segments):
+        end = segments[index + 1].start if index + 1 < len(segments) else MINUTES_PER_DAY
+        ranges.append((segment.start, end, segment.name))
+    return ranges
+
+
+def covered_segments(segments: tuple[Segment, ...], start: int, end: int) -> frozenset[str]:
+    """Return the names of the segments overlapping the minutes [start, end) of a day."""
+    return frozenset(name for low, high, name in segment_ranges(segments) if start < high and low < end)
+
+
+def classify_period(segments: tuple[Segment, ...], start: int, end: int, days: int = 0) -> str:
+    """Return the period of an event from *start* to *end* minutes, *days* later.
+
+    Events ending on a later day (other than at its midnight) are all-day.
+    """
+    if days > 1 or (days == 1 and end > 0):
+        return EVENT_PERIOD_ALL_DAY
+    covered = covered_segments(segments, start, end + days * MINUTES_PER_DAY)
+    if len(covered) == 1 and len(segments) > 1:
+        return next(iter(covered))
+    return EVENT_PERIOD_ALL_DAY
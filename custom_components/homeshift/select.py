@@ -9,8 +9,18 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, SELECT_DAY_MODE, SELECT_THERMOSTAT_MODE
+from .const import (
+    ATTR_NEXT_EVENT,
+    ATTR_NEXT_TRANSITION,
+    ATTR_PRESENCE,
+    ATTR_SEGMENTS,
+    ATTR_TIMELINE,
+    DOMAIN,
+    SELECT_DAY_MODE,
+    SELECT_THERMOSTAT_MODE,
+)
 from .coordinator import HomeShiftCoordinator
+from .zones import HomeShiftZone
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,12 +33,12 @@ async def async_setup_entry(
     """Set up HomeShift select entities."""
     coordinator: HomeShiftCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        [
-            HomeShiftSelect(coordinator, entry),
-            HomeShiftThermostatSelect(coordinator, entry),
-        ]
-    )
+    entities: list[SelectEntity] = [
+        HomeShiftSelect(coordinator, entry),
+        HomeShiftThermostatSelect(coordinator, entry),
+    ]
+    entities.extend(HomeShiftZoneSelect(coordinator, entry, zone) for zone in coordinator.zones.values())
+    async_add_entities(entities)
 
 
 class HomeShiftSelect(CoordinatorEntity[HomeShiftCoordinator], SelectEntity):
@@ -52,7 +62,14 @@ class HomeShiftSelect(CoordinatorEntity[HomeShiftCoordinator], SelectEntity):
     @property
     def extra_state_attributes(self) -> dict:
         """Expose the key→display map so custom cards can translate mode keys."""
-        return {"day_mode_map": self.coordinator.day_mode_map}
+        return {
+            "day_mode_map": self.coordinator.day_mode_map,
+            ATTR_NEXT_EVENT: self.coordinator.next_event,
+            ATTR_PRESENCE: self.coordinator.presence,
+            ATTR_NEXT_TRANSITION: transition.as_dict() if (transition := self.coordinator.next_transition) else None,
+            ATTR_SEGMENTS: self.coordinator.segment_timeline,
+            ATTR_TIMELINE: self.coordinator.timeline,
+        }
 
     def select_option(self, option: str) -> None:
         """Change the selected option (sync stub — async_select_option is used)."""
@@ -108,3 +125,46 @@ class HomeShiftThermostatSelect(CoordinatorEntity[HomeShiftCoordinator], SelectE
             "manufacturer": "Gamso",
             "model": "HomeShift Controller",
         }
+
+
+class HomeShiftZoneSelect(CoordinatorEntity[HomeShiftCoordinator], SelectEntity):
+    """Representation of the Day Mode select entity of one zone."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator: HomeShiftCoordinator, entry: ConfigEntry, zone: HomeShiftZone) -> None:
+        """Initialize the select entity."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_{SELECT_DAY_MODE}_{zone.slug}"
+        self._attr_name = f"{zone.name} Day Mode"
+        self._attr_options = zone.day_modes
+        self._entry = entry
+        self._zone = zone
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the current selected option."""
+        return self._zone.day_mode
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Expose the zone key→display map, like the entry-level day mode select."""
+        return {"zone": self._zone.name, "day_mode_map": self._zone.day_mode_map}
+
+    def select_option(self, option: str) -> None:
+        """Change the selected option (sync stub — async_select_option is used)."""
+        raise NotImplementedError
+
+    async def async_select_option(self, option: str) -> None:
+        """Change the selected option."""
+        await self.coordinator.async_set_zone_day_mode(self._zone.name, option)
+
+    @property
+    def device_info(self):
+        """Return device information."""
+        return {
+            "identifiers": {(DOMAIN, self._entry.entry_id)},
+            "name": "HomeShift",
+            "manufacturer": "Gamso",
+            "model": "HomeShift Controller",
+        }
@@ -0,0 +1,93 @@
+"""On-disk snapshot of the event timeline.
+
+The day modes of the coming hours are compiled from the upcoming calendar
+events (see transitions).  The last fetched events are kept in the entry's
+storage so that, while the calendar entity is unavailable or before it is
+loaded after a restart, the coordinator keeps driving transitions from them.
+
+Events are stored in a compact form, one row per event::
+
+    {"fetched_at": "2026-03-04T07:00:00+00:00",
+     "spans": [[1772604000, 1772640000, "Télétravail", "télétravail"], ...]}
+
+with start and end as UTC epoch seconds.  Modes themselves are not stored:
+they are compiled again from the events, so rule changes apply at once.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, TIMELINE_SNAPSHOT_SAVE_DELAY, TIMELINE_SNAPSHOT_VERSION
+from .transitions import EventSpan
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def encode_spans(spans: Iterable[EventSpan]) -> list[list[Any]]:
+    """Return the compact rows of event spans."""
+    return [[int(span.start.timestamp()), int(span.end.timestamp()), span.summary, span.text] for span in spans]
+
+
+def decode_spans(rows: Iterable[Any]) -> list[EventSpan]:
+    """Return the event spans of compact rows, skipping malformed ones."""
+    spans: list[EventSpan] = []
+    for row in rows:
+        try:
+            start, end, summary, text = row
+            spans.append(
+                EventSpan(
+                    datetime.fromtimestamp(int(start), timezone.utc),
+                    datetime.fromtimestamp(int(end), timezone.utc),
+                    str(summary),
+                    str(text),
+                )
+            )
+        except (TypeError, ValueError, OverflowError):
+            continue
+    spans.sort(key=lambda span: span.start)
+    return spans
+
+
+class TimelineSnapshot:
+    """Last fetched event timeline of one entry, persisted in .storage."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the snapshot (nothing is read until async_load)."""
+        self._store: Store[dict[str, Any]] = Store(hass, TIMELINE_SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}.timeline")
+        self._loaded = False
+        self._data: dict[str, Any] = {}
+
+    @property
+    def loaded(self) -> bool:
+        """Return True once the snapshot has been read (saving starts then)."""
+        return self._loaded
+
+    async def async_load(self) -> tuple[list[EventSpan], datetime | None]:
+        """Read the snapshot; return its spans and fetch time (empty when missing)."""
+        try:
+            data = await self._store.async_load()
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Could not read the timeline snapshot: %s", err)
+            data = None
+        self._loaded = True
+        if not isinstance(data, dict):
+            return [], None
+        spans = decode_spans(data.get("spans") or [])
+        fetched_at = dt_util.parse_datetime(data.get("fetched_at") or "")
+        _LOGGER.debug("Timeline snapshot loaded: %d events fetched at %s", len(spans), fetched_at)
+        return spans, fetched_at
+
+    @callback
+    def async_save(self, spans: Iterable[EventSpan], fetched_at: datetime) -> None:
+        """Schedule a write of the timeline (writes within the delay are merged)."""
+        if not self._loaded:
+            return
+        self._data = {"fetched_at": dt_util.as_utc(fetched_at).isoformat(), "spans": encode_spans(spans)}
+        self._store.async_delay_save(lambda: self._data, TIMELINE_SNAPSHOT_SAVE_DELAY)
@@ -0,0 +1,202 @@
+"""Prediction of the next moment the day mode can change.
+
+The day mode only depends on the calendar events, the weekday, the holiday
+calendar, presence and the manual override, so it can only change at a few
+known instants:
+
+- the start or end of a calendar event (unless events are aligned on
+  segments, see below);
+- the start of each day segment (morning / afternoon by default);
+- the edges of the time windows used by the day-mode rules;
+- midnight (new day: weekday, holiday and today_type change);
+- the expiry of a manual override.
+
+:func:`predict_next_transition` walks these candidates in order and returns
+the first one at which the predicted mode differs from the current one
+(midnight and override expiry are always kept).  The coordinator exposes the
+result and arms a single timer for it instead of waking up on every poll.
+
+Candidates are UTC instants taken from the day's :class:`DayTable`, so
+segment starts and midnight stay correct on DST days.  When the day segments
+are configured, an event applies to every segment it overlaps
+(:func:`segment_spans`), so modes only change at segment edges.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, time
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .calendar_cache import parse_event_span
+from .day_table import DaySegment, local_day_table, local_to_utc
+from .event_match import DEFAULT_MATCH_FIELDS, event_text
+from .segments import DEFAULT_SEGMENTS, Segment, classify_period
+
+REASON_EVENT_START = "event_start"
+REASON_EVENT_END = "event_end"
+REASON_SEGMENT = "segment"
+REASON_MIDNIGHT = "midnight"
+REASON_OVERRIDE_END = "override_end"
+REASON_TIME_WINDOW = "time_window"
+
+# Reasons kept even when the predicted mode does not change
+_ALWAYS_KEPT = frozenset({REASON_MIDNIGHT, REASON_OVERRIDE_END})
+
+
+@dataclass(frozen=True, slots=True)
+class EventSpan:
+    """Start and end of one calendar event, as UTC instants.
+
+    UTC avoids the wall-clock arithmetic Python applies between datetimes
+    sharing a tzinfo, which is wrong across a DST change.
+    """
+
+    start: datetime
+    end: datetime
+    summary: str
+    # Normalized text of the matched fields (see event_match)
+    text: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class Transition:
+    """Next predicted day-mode change."""
+
+    # UTC instant
+    at: datetime
+    reason: str
+    # Predicted day mode display name after the transition
+    target: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the attribute form of the transition."""
+        return {"at": dt_util.as_local(self.at).isoformat(), "reason": self.reason, "target": self.target}
+
+
+@dataclass(frozen=True, slots=True)
+class SegmentMode:
+    """Day segment with the entry mode predicted for it."""
+
+    name: str
+    # UTC instant
+    start: datetime
+    mode: str
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the attribute form of the segment."""
+        return {"segment": self.name, "start": dt_util.as_local(self.start).isoformat(), "mode": self.mode}
+
+
+def event_spans(events: list[dict[str, Any]], fields: Iterable[str] = DEFAULT_MATCH_FIELDS) -> list[EventSpan]:
+    """Return the spans of the events with a parsable start and end, by start.
+
+    The match text of each event is built once here from *fields*.
+    """
+    fields = tuple(fields)
+    spans: list[EventSpan] = []
+    for event in events:
+        parsed = parse_event_span(event.get("start"), event.get("end"))
+        if parsed is not None:
+            spans.append(EventSpan(*parsed, str(event.get("summary") or ""), event_text(event, fields)))
+    spans.sort(key=lambda span: span.start)
+    return spans
+
+
+def active_spans(spans: list[EventSpan], at: datetime) -> list[EventSpan]:
+    """Return the events running at *at* (end exclusive)."""
+    at = dt_util.as_utc(at)
+    return [span for span in spans if span.start <= at < span.end]
+
+
+def span_period(span: EventSpan, segments: tuple[Segment, ...] = DEFAULT_SEGMENTS) -> str:
+    """Return the period (all_day or segment name) of an event span in local time."""
+    start, end = dt_util.as_local(span.start), dt_util.as_local(span.end)
+    return classify_period(
+        segments,
+        start.hour * 60 + start.minute,
+        end.hour * 60 + end.minute,
+        (end.date() - start.date()).days,
+    )
+
+
+def segment_timeline(
+    now: datetime,
+    predict: Callable[[datetime], tuple[str, ...]],
+    segments: tuple[Segment, ...] = DEFAULT_SEGMENTS,
+) -> list[SegmentMode]:
+    """Return the segments of the day of *now* with the entry mode predicted at their start."""
+    return [
+        SegmentMode(segment.name, segment.start, predict(dt_util.as_local(segment.start))[0])
+        for segment in local_day_table(now, segments).segments
+    ]
+
+
+def segment_of(at: datetime, segments: tuple[Segment, ...] = DEFAULT_SEGMENTS) -> DaySegment | None:
+    """Return the day segment containing *at* (naive = local)."""
+    return local_day_table(at, segments).segment_at(dt_util.as_utc(at))
+
+
+def segment_spans(spans: list[EventSpan], segment: DaySegment) -> list[EventSpan]:
+    """Return the events overlapping a day segment."""
+    return [span for span in spans if span.start < segment.end and segment.start < span.end]
+
+
+def transition_candidates(
+    now: datetime,
+    spans: list[EventSpan],
+    segments: tuple[Segment, ...] = DEFAULT_SEGMENTS,
+    time_edges: Iterable[int] = (),
+    event_edges: bool = True,
+) -> list[tuple[datetime, str]]:
+    """Return the (UTC instant, reason) candidates after *now* up to the next midnight, sorted.
+
+    *time_edges* are the minutes of the day at which a rule time window
+    starts or ends; *event_edges* False leaves the event boundaries out
+    (events aligned on segments).
+    """
+    table = local_day_table(now, segments)
+    now = dt_util.as_utc(now)
+    candidates: list[tuple[datetime, str]] = [(table.end, REASON_MIDNIGHT)]
+    for segment in table.segments[1:]:
+        if now < segment.start:
+            candidates.append((segment.start, REASON_SEGMENT))
+    for minute in time_edges:
+        edge = local_to_utc(datetime.combine(table.day, time(minute // 60, minute % 60)), dt_util.DEFAULT_TIME_ZONE)
+        if now < edge < table.end:
+            candidates.append((edge, REASON_TIME_WINDOW))
+    for span in spans if event_edges else ():
+        if now < span.start < table.end:
+            candidates.append((span.start, REASON_EVENT_START))
+        if now < span.end < table.end:
+            candidates.append((span.end, REASON_EVENT_END))
+    candidates.sort(key=lambda candidate: candidate[0])
+    return candidates
+
+
+def predict_next_transition(
+    now: datetime,
+    spans: list[EventSpan],
+    current: tuple[str, ...],
+    predict: Callable[[datetime], tuple[str, ...]],
+    override_until: datetime | None = None,
+    segments: tuple[Segment, ...] = DEFAULT_SEGMENTS,
+    time_edges: Iterable[int] = (),
+    event_edges: bool = True,
+) -> Transition | None:
+    """Return the next instant at which the modes can change.
+
+    *current* holds the current modes (entry first, then zones) and
+    *predict* returns the modes expected at a given local time, in the same
+    order.  While a manual override is active nothing changes before it
+    expires, so the expiry is the next transition.
+    """
+    if override_until is not None and override_until > now:
+        return Transition(dt_util.as_utc(override_until), REASON_OVERRIDE_END, predict(dt_util.as_local(override_until))[0])
+    for at, reason in transition_candidates(now, spans, segments, time_edges, event_edges):
+        predicted = predict(dt_util.as_local(at))
+        if reason in _ALWAYS_KEPT or predicted != current:
+            return Transition(at, reason, predicted[0])
+    return None
@@ -0,0 +1,187 @@
+"""Per-zone day modes for the HomeShift integration.
+
+A single config entry can define several zones (e.g. "Upstairs", "Office"),
+each with its own day mode map, mode assignments and scheduler sets.  Zones do
+not read the calendars themselves: the coordinator evaluates the calendars
+once per cycle and hands the same :class:`CalendarEvaluation` to every zone.
+A zone with its own event keywords matches them against the event match
+texts of the evaluation with its own :class:`EventMatcher`, so substring,
+accent-folded and fuzzy matches work as for the entry.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from homeassistant.util import slugify
+
+from .const import EVENT_NONE, PRESENCE_ALL_AWAY
+from .evaluation import CalendarEvaluation
+from .event_match import EventMatcher
+from .rules import DecisionTable, build_decision_table
+from .segments import DEFAULT_SEGMENTS, Segment
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HomeShiftZone:
+    """Day-mode state of one zone of a HomeShift entry."""
+
+    def __init__(
+        self,
+        name: str,
+        day_mode_map: dict[str, str],
+        event_mode_map: dict[str, str],
+        mode_default: str,
+        mode_weekend: str,
+        mode_holiday: str,
+        mode_absence: str,
+        schedulers_per_mode: dict[str, list[str]],
+        mode_rules: str = "",
+        weekday_modes: str = "",
+        segments: tuple[Segment, ...] = DEFAULT_SEGMENTS,
+        event_matcher: EventMatcher | None = None,
+    ) -> None:
+        """Initialize the zone.
+
+        Mode arguments are display names; event_mode_map maps lowercase event
+        keywords to display names (same shape as the coordinator's own maps).
+        mode_rules and weekday_modes use mode keys of the zone's day_mode_map.
+        event_matcher matches the zone's keywords; without it the entry's
+        matched event type is used as is.
+        """
+        self.name = name
+        self.slug = slugify(name)
+        self._day_mode_map = day_mode_map
+        self._day_modes: list[str] = list(day_mode_map.values())
+        self._day_mode: str = self._day_modes[0] if self._day_modes else "Home"
+        self._event_mode_map = event_mode_map
+        self._mode_default = mode_default
+        self._mode_weekend = mode_weekend
+        self._mode_holiday = mode_holiday
+        self._mode_absence = mode_absence
+        self._event_matcher = event_matcher
+        self._decision_table: DecisionTable = build_decision_table(
+            mode_rules,
+            day_mode_map,
+            event_mode_map,
+            mode_weekend,
+            mode_holiday,
+            mode_default,
+            mode_away=mode_absence,
+            raw_weekday_modes=weekday_modes,
+            segments=segments,
+        )
+        self.schedulers_per_mode = schedulers_per_mode
+        self._override_until: datetime | None = None
+        # True while the absence mode was entered because everyone left
+        self._presence_absence = False
+
+    @property
+    def day_mode_map(self) -> dict[str, str]:
+        """Return the zone day mode map (internal_key -> display_value)."""
+        return self._day_mode_map
+
+    @property
+    def day_modes(self) -> list[str]:
+        """Return the zone day mode display values."""
+        return self._day_modes
+
+    @property
+    def day_mode(self) -> str:
+        """Return the current zone day mode."""
+        return self._day_mode
+
+    @day_mode.setter
+    def day_mode(self, value: str) -> None:
+        """Set the zone day mode directly (test setup only)."""
+        self._day_mode = value
+
+    @property
+    def day_mode_key(self) -> str | None:
+        """Return the internal key for the current zone day mode."""
+        for key, display in self._day_mode_map.items():
+            if display == self._day_mode:
+                return key
+        return None
+
+    @property
+    def decision_table(self) -> DecisionTable:
+        """Return the zone's compiled day-mode rules."""
+        return self._decision_table
+
+    @property
+    def override_until(self) -> datetime | None:
+        """Return the datetime when the zone manual override expires, or None."""
+        return self._override_until
+
+    def resolve_display(self, mode: str) -> str | None:
+        """Resolve a display value or internal key to a zone display value."""
+        if mode in self._day_modes:
+            return mode
+        mode_lower = mode.lower()
+        for key, display in self._day_mode_map.items():
+            if key.lower() == mode_lower:
+                return display
+        return None
+
+    def zone_evaluation(self, evaluation: CalendarEvaluation) -> CalendarEvaluation:
+        """Return the evaluation with the event type matched against the zone's keywords.
+
+        The first applying event matching a zone keyword wins; otherwise an
+        active event keeps its raw title, which matches no keyword rule.
+        """
+        if self._event_matcher is None or not evaluation.match_texts:
+            return evaluation
+        keyword = next(
+            (match for text in evaluation.match_texts if (match := self._event_matcher.match_text(text)) is not None),
+            None,
+        )
+        if keyword is None:
+            if evaluation.event_type == EVENT_NONE:
+                return evaluation
+            keyword = evaluation.current_event or evaluation.event_type
+        return replace(evaluation, event_type=keyword)
+
+    def determine_mode(self, evaluation: CalendarEvaluation) -> str:
+        """Return the zone day mode for a shared calendar evaluation."""
+        return self._decision_table.lookup(self.zone_evaluation(evaluation)) or self._day_mode
+
+    def apply_evaluation(self, evaluation: CalendarEvaluation, now: datetime) -> bool:
+        """Auto-update the zone day mode; return True when it changed.
+
+        Like the entry itself, a zone in its absence mode or under an active
+        manual override keeps its current mode, unless the absence was entered
+        automatically because everyone left.
+        """
+        if self._day_mode == self._mode_absence and not self._presence_absence:
+            return False
+        if self._override_until is not None:
+            if now < self._override_until:
+                return False
+            self._override_until = None
+        new_mode = self.determine_mode(evaluation)
+        if new_mode == self._day_mode or new_mode not in self._day_modes:
+            return False
+        _LOGGER.info("Auto mode change: zone '%s' day_mode '%s' -> '%s'", self.name, self._day_mode, new_mode)
+        self._day_mode = new_mode
+        self._presence_absence = new_mode == self._mode_absence and evaluation.presence == PRESENCE_ALL_AWAY
+        return True
+
+    def set_day_mode(self, mode: str, now: datetime, override_minutes: int) -> bool:
+        """Set the zone day mode manually; return False for unknown modes."""
+        resolved = self.resolve_display(mode)
+        if resolved is None:
+            _LOGGER.warning(
+                "Manual change ignored: zone '%s' day_mode '%s' does not match any configured mode %s",
+                self.name,
+                mode,
+                self._day_modes,
+            )
+            return False
+        _LOGGER.info("Manual change: zone '%s' day_mode '%s' -> '%s'", self.name, self._day_mode, resolved)
+        self._day_mode = resolved
+        self._presence_absence = False
+        self._override_until = now + timedelta(minutes=override_minutes) if override_minutes > 0 else None
+        return True
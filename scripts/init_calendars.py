@@ -1,85 +1,400 @@
 #!/usr/bin/env python3
 """Script pour initialiser les calendriers locaux dans Home Assistant.
 
-Ce script crée automatiquement :
-1. Un calendrier local "Télétravail"
-2. Un calendrier local "Jours fériés"
+Ce script :
+1. Crée les calendriers locaux manquants ("Télétravail", "Jours fériés"),
+   tous en même temps
+2. Importe les événements des fichiers calendars/*.ics, par lots, sans
+   créer de doublons (une deuxième exécution n'ajoute rien)
+
+Toutes les requêtes passent par une seule session aiohttp (connexions
+réutilisées) ; les événements sont envoyés par la connexion WebSocket de
+Home Assistant, seule API qui accepte les événements récurrents (RRULE).
 
 Utilisation:
-    python scripts/init_calendars.py <ha_url> <api_token>
-    
+    python scripts/init_calendars.py <ha_url> <api_token> [--check-only] [--no-import] [--batch-size N]
+
 Exemple:
     python scripts/init_calendars.py http://localhost:8123 eyJhbGc...
 """
 
 import argparse
-import json
+import asyncio
 import sys
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
 from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import aiohttp
+
+CALENDARS_DIR = Path(__file__).resolve().parent.parent / "calendars"
+
+# Calendriers créés par défaut, et fichier .ics importé dans chacun
+CALENDAR_FILES = {
+    "Télétravail": "teletravail.ics",
+    "Jours fériés": "jours_feries_fr.ics",
+}
+
+DEFAULT_BATCH_SIZE = 50
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+# Attente de l'apparition des entités des calendriers créés
+ENTITY_WAIT_ATTEMPTS = 20
+ENTITY_WAIT_DELAY = 0.5
+
+
+# ---------------------------------------------------------------------------
+# Lecture des fichiers ICS
+# ---------------------------------------------------------------------------
+
+
+def _ics_value(value: str, params: dict) -> str:
+    """Convertit une valeur DATE / DATE-TIME ICS au format ISO accepté par Home Assistant.
+
+    Args:
+        value: Valeur ICS (ex: 20260106, 20260106T090000Z)
+        params: Paramètres de la propriété (VALUE, TZID)
+
+    Returns:
+        Date ou date-heure ISO 8601
+    """
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value, "%Y%m%d").date().isoformat()
+    if value.endswith("Z"):
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ").isoformat() + "+00:00"
+    moment = datetime.strptime(value, "%Y%m%dT%H%M%S")
+    try:
+        if "TZID" in params:
+            moment = moment.replace(tzinfo=ZoneInfo(params["TZID"]))
+    except (ZoneInfoNotFoundError, ValueError):
+        pass
+    return moment.isoformat()
+
+
+def read_ics(path: Path) -> tuple[str | None, list[dict]]:
+    """Lit un fichier .ics.
+
+    Les événements sont dédoublonnés par UID (et RECURRENCE-ID).
+
+    Args:
+        path: Chemin du fichier
+
+    Returns:
+        Nom du calendrier (X-WR-CALNAME) et liste des événements au format
+        de l'API calendrier de Home Assistant
+    """
+    lines: list[str] = []
+    for raw in path.read_text(encoding="utf-8").splitlines():
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        elif raw:
+            lines.append(raw)
+
+    name = None
+    events: dict[tuple[str, str], dict] = {}
+    props: dict | None = None
+    for line in lines:
+        head, _, value = line.partition(":")
+        prop, *raw_params = head.split(";")
+        params = dict(param.partition("=")[::2] for param in raw_params)
+        prop = prop.upper()
+        if prop == "X-WR-CALNAME":
+            name = value.strip()
+        elif prop == "BEGIN" and value == "VEVENT":
+            props = {}
+        elif prop == "END" and value == "VEVENT" and props is not None:
+            if "DTSTART" in props and "SUMMARY" in props:
+                start = _ics_value(*props["DTSTART"])
+                if "DTEND" in props:
+                    end = _ics_value(*props["DTEND"])
+                elif len(start) == 10:
+                    end = (date.fromisoformat(start) + timedelta(days=1)).isoformat()
+                else:
+                    end = start
+                event = {"summary": props["SUMMARY"][0].replace("\\,", ",").replace("\\;", ";"), "dtstart": start, "dtend": end}
+                if "DESCRIPTION" in props:
+                    event["description"] = props["DESCRIPTION"][0].replace("\\n", "\n").replace("\\,", ",")
+                if "LOCATION" in props:
+                    event["location"] = props["LOCATION"][0].replace("\\,", ",")
+                if "RRULE" in props:
+                    event["rrule"] = props["RRULE"][0]
+                uid = props.get("UID", ("", {}))[0] or f"{start}-{event['summary']}"
+                recurrence_id = props.get("RECURRENCE-ID", ("", {}))[0]
+                events.setdefault((uid, recurrence_id), event)
+            props = None
+        elif props is not None:
+            props.setdefault(prop, (value.strip(), params))
+    return name, list(events.values())
+
 
-import requests
+def event_key(summary: str, start: str) -> tuple[str, str]:
+    """Clé d'un événement : titre et début (les UID sont réattribués par Home Assistant).
 
+    Args:
+        summary: Titre de l'événement
+        start: Début ISO (date ou date-heure)
+
+    Returns:
+        Clé de comparaison
+    """
+    if len(start) > 10:
+        # Heure flottante = heure locale de la machine (en général celle de Home Assistant)
+        start = datetime.fromisoformat(start).astimezone(timezone.utc).isoformat(timespec="minutes")
+    return summary.strip().casefold(), start
+
+
+# ---------------------------------------------------------------------------
+# API Home Assistant
+# ---------------------------------------------------------------------------
+
+
+async def get_local_calendars(session: aiohttp.ClientSession, ha_url: str) -> list:
+    """Récupère la liste des calendriers existants.
+
+    Args:
+        session: Session HTTP (en-tête d'authentification inclus)
+        ha_url: URL de Home Assistant
+
+    Returns:
+        Liste des calendriers ({"entity_id", "name"})
+    """
+    async with session.get(f"{ha_url}/api/calendars") as response:
+        response.raise_for_status()
+        return await response.json()
+
+
+async def create_local_calendar(session: aiohttp.ClientSession, ha_url: str, name: str) -> bool:
+    """Crée un calendrier local via le flux de configuration de l'intégration local_calendar.
 
-def create_local_calendar(ha_url: str, token: str, name: str) -> bool:
-    """Crée un calendrier local via l'API Home Assistant.
-    
     Args:
-        ha_url: URL de Home Assistant (ex: http://localhost:8123)
-        token: Token d'authentification
+        session: Session HTTP
+        ha_url: URL de Home Assistant
         name: Nom du calendrier
-        
+
     Returns:
         True si succès, False sinon
     """
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-    
-    # Slugify le nom pour l'entity_id
-    slug = name.lower().replace(" ", "_").replace("é", "e").replace("è", "e").replace("ê", "e")
-    
-    data = {
-        "action": "create",
-        "name": name,
-    }
-    
-    url = f"{ha_url}/api/calendars"
-    
     try:
-        response = requests.post(url, json=data, headers=headers, timeout=5)
-        response.raise_for_status()
-        print(f"✓ Calendrier '{name}' créé avec succès")
-        return True
-    except requests.exceptions.RequestException as err:
+        async with session.post(f"{ha_url}/api/config/config_entries/flow", json={"handler": "local_calendar"}) as response:
+            response.raise_for_status()
+            flow = await response.json()
+        async with session.post(f"{ha_url}/api/config/config_entries/flow/{flow['flow_id']}", json={"calendar_name": name}) as response:
+            response.raise_for_status()
+            result = await response.json()
+    except (aiohttp.ClientError, KeyError) as err:
         print(f"✗ Erreur lors de la création du calendrier '{name}': {err}")
         return False
+    if result.get("type") != "create_entry":
+        print(f"✗ Calendrier '{name}' non créé: {result.get('errors') or result.get('reason')}")
+        return False
+    print(f"✓ Calendrier '{name}' créé avec succès")
+    return True
+
 
+async def get_calendar_events(session: aiohttp.ClientSession, ha_url: str, entity_id: str, start: str, end: str) -> list:
+    """Récupère les événements d'un calendrier entre deux dates.
 
-def get_local_calendars(ha_url: str, token: str) -> list:
-    """Récupère la liste des calendriers locaux existants.
-    
     Args:
+        session: Session HTTP
         ha_url: URL de Home Assistant
-        token: Token d'authentification
-        
+        entity_id: Entité calendrier
+        start: Début ISO de la période
+        end: Fin ISO de la période
+
     Returns:
-        Liste des calendriers
+        Liste des événements (occurrences des événements récurrents incluses)
     """
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-    
-    url = f"{ha_url}/api/calendars"
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=5)
+    async with session.get(f"{ha_url}/api/calendars/{entity_id}", params={"start": start, "end": end}) as response:
         response.raise_for_status()
-        return response.json() if response.text else []
-    except requests.exceptions.RequestException as err:
-        print(f"Erreur lors de la récupération des calendriers: {err}")
-        return []
+        return await response.json()
+
+
+async def wait_for_calendars(session: aiohttp.ClientSession, ha_url: str, names: list[str]) -> dict[str, str]:
+    """Attend que les entités des calendriers apparaissent.
+
+    Args:
+        session: Session HTTP
+        ha_url: URL de Home Assistant
+        names: Noms des calendriers attendus
+
+    Returns:
+        Nom du calendrier -> entity_id (calendriers trouvés seulement)
+    """
+    found: dict[str, str] = {}
+    for _ in range(ENTITY_WAIT_ATTEMPTS):
+        found = {cal.get("name", ""): cal["entity_id"] for cal in await get_local_calendars(session, ha_url)}
+        if all(name in found for name in names):
+            break
+        await asyncio.sleep(ENTITY_WAIT_DELAY)
+    return {name: found[name] for name in names if name in found}
+
+
+class WebSocketClient:
+    """Connexion WebSocket authentifiée, avec envoi de commandes par lots."""
+
+    def __init__(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Initialise le client."""
+        self.ws = ws
+        self._next_id = 1
+
+    @classmethod
+    async def connect(cls, session: aiohttp.ClientSession, ha_url: str, token: str) -> "WebSocketClient":
+        """Ouvre et authentifie la connexion.
+
+        Args:
+            session: Session HTTP
+            ha_url: URL de Home Assistant
+            token: Token d'authentification
+
+        Returns:
+            Client connecté
+        """
+        ws = await session.ws_connect(f"{ha_url}/api/websocket")
+        await ws.receive_json()  # auth_required
+        await ws.send_json({"type": "auth", "access_token": token})
+        message = await ws.receive_json()
+        if message.get("type") != "auth_ok":
+            await ws.close()
+            raise aiohttp.ClientError(f"authentification WebSocket refusée ({message.get('message')})")
+        return cls(ws)
+
+    async def call_batch(self, commands: list[dict]) -> list[dict]:
+        """Envoie des commandes sans attendre, puis récupère leurs résultats.
+
+        Args:
+            commands: Commandes (sans "id")
+
+        Returns:
+            Résultats dans l'ordre des commandes
+        """
+        ids = []
+        for command in commands:
+            ids.append(self._next_id)
+            await self.ws.send_json({**command, "id": self._next_id})
+            self._next_id += 1
+        results: dict[int, dict] = {}
+        while len(results) < len(ids):
+            message = await self.ws.receive_json()
+            if message.get("type") == "result" and message.get("id") in ids:
+                results[message["id"]] = message
+        return [results[command_id] for command_id in ids]
+
+    async def close(self) -> None:
+        """Ferme la connexion."""
+        await self.ws.close()
+
+
+async def import_events(
+    session: aiohttp.ClientSession,
+    client: WebSocketClient,
+    ha_url: str,
+    entity_id: str,
+    events: list[dict],
+    batch_size: int,
+) -> tuple[int, int]:
+    """Importe les événements absents du calendrier, par lots.
+
+    Args:
+        session: Session HTTP
+        client: Client WebSocket authentifié
+        ha_url: URL de Home Assistant
+        entity_id: Entité calendrier
+        events: Événements lus dans le fichier .ics
+        batch_size: Nombre d'événements par lot
+
+    Returns:
+        Nombre d'événements importés et d'événements déjà présents
+    """
+    if not events:
+        return 0, 0
+    starts = sorted(event["dtstart"][:10] for event in events)
+    period_end = (date.fromisoformat(max(event["dtend"][:10] for event in events)) + timedelta(days=1)).isoformat()
+    existing = await get_calendar_events(session, ha_url, entity_id, f"{starts[0]}T00:00:00", f"{period_end}T00:00:00")
+    present = {event_key(event.get("summary", ""), event["start"].get("dateTime") or event["start"].get("date")) for event in existing}
+    missing = [event for event in events if event_key(event["summary"], event["dtstart"]) not in present]
+
+    imported = 0
+    pending = iter(missing)
+    while batch := list(islice(pending, batch_size)):
+        results = await client.call_batch([{"type": "calendar/event/create", "entity_id": entity_id, "event": event} for event in batch])
+        for event, result in zip(batch, results):
+            if result.get("success"):
+                imported += 1
+            else:
+                print(f"  ✗ '{event['summary']}' ({event['dtstart']}): {result.get('error', {}).get('message')}")
+    return imported, len(events) - len(missing)
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Initialise les calendriers.
+
+    Args:
+        args: Arguments de la ligne de commande
+
+    Returns:
+        Code de sortie
+    """
+    ha_url = args.ha_url.rstrip("/")
+    headers = {"Authorization": f"Bearer {args.token}"}
+
+    print(f"Connexion à Home Assistant: {ha_url}")
+
+    # Une seule session : toutes les requêtes réutilisent les mêmes connexions
+    async with aiohttp.ClientSession(headers=headers, timeout=REQUEST_TIMEOUT) as session:
+        # Vérifier la connexion
+        try:
+            async with session.get(f"{ha_url}/api/") as response:
+                response.raise_for_status()
+            print("✓ Authentification réussie\n")
+            existing = await get_local_calendars(session, ha_url)
+        except aiohttp.ClientError as err:
+            print(f"✗ Erreur de connexion: {err}")
+            return 1
+
+        existing_names = [cal.get("name", "") for cal in existing]
+        print(f"Calendriers existants: {existing_names if existing_names else 'Aucun'}\n")
+
+        if args.check_only:
+            return 0
+
+        # Fichiers à importer : calendrier connu, sinon nom du fichier (X-WR-CALNAME)
+        files: dict[str, list[dict]] = {}
+        if not args.no_import:
+            known = {filename: name for name, filename in CALENDAR_FILES.items()}
+            for path in sorted(CALENDARS_DIR.glob("*.ics")):
+                file_name, events = read_ics(path)
+                files.setdefault(known.get(path.name) or file_name or path.stem, []).extend(events)
+
+        # Créer les calendriers manquants en parallèle
+        wanted = list(dict.fromkeys([*CALENDAR_FILES, *files]))
+        for name in wanted:
+            if name in existing_names:
+                print(f"⊘ Calendrier '{name}' existe déjà")
+        missing = [name for name in wanted if name not in existing_names]
+        created = await asyncio.gather(*(create_local_calendar(session, ha_url, name) for name in missing))
+        created_count = sum(created)
+
+        imported_count = 0
+        if files:
+            entity_ids = await wait_for_calendars(session, ha_url, list(files))
+            try:
+                client = await WebSocketClient.connect(session, ha_url, args.token)
+            except aiohttp.ClientError as err:
+                print(f"✗ Erreur de connexion WebSocket: {err}")
+                return 1
+            try:
+                for name, events in files.items():
+                    if name not in entity_ids:
+                        print(f"✗ Calendrier '{name}' introuvable, import ignoré")
+                        continue
+                    imported, skipped = await import_events(session, client, ha_url, entity_ids[name], events, args.batch_size)
+                    imported_count += imported
+                    print(f"✓ '{name}': {imported} événement(s) importé(s), {skipped} déjà présent(s)")
+            finally:
+                await client.close()
+
+    print(f"\n✓ Initialisation terminée ({created_count} calendrier(s) créé(s), {imported_count} événement(s) importé(s))")
+    return 0
 
 
 def main():
@@ -100,48 +415,20 @@ def main():
         action="store_true",
         help="Vérifier seulement, ne pas créer",
     )
-    
+    parser.add_argument(
+        "--no-import",
+        action="store_true",
+        help="Créer les calendriers sans importer les fichiers .ics",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Nombre d'événements envoyés par lot (défaut: {DEFAULT_BATCH_SIZE})",
+    )
+
     args = parser.parse_args()
-    
-    ha_url = args.ha_url.rstrip("/")
-    token = args.token
-    
-    print(f"Connexion à Home Assistant: {ha_url}")
-    
-    # Vérifier la connexion
-    try:
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.get(f"{ha_url}/api/", headers=headers, timeout=5)
-        response.raise_for_status()
-        print("✓ Authentification réussie\n")
-    except requests.exceptions.RequestException as err:
-        print(f"✗ Erreur de connexion: {err}")
-        sys.exit(1)
-    
-    # Vérifier les calendriers existants
-    existing = get_local_calendars(ha_url, token)
-    existing_names = [cal.get("name", "") for cal in existing]
-    
-    print(f"Calendriers existants: {existing_names if existing_names else 'Aucun'}\n")
-    
-    if args.check_only:
-        return
-    
-    # Créer les calendriers manquants
-    calendars_to_create = [
-        "Télétravail",
-        "Jours fériés",
-    ]
-    
-    created_count = 0
-    for calendar_name in calendars_to_create:
-        if calendar_name not in existing_names:
-            if create_local_calendar(ha_url, token, calendar_name):
-                created_count += 1
-        else:
-            print(f"⊘ Calendrier '{calendar_name}' existe déjà")
-    
-    print(f"\n✓ Initialisation terminée ({created_count} créé(s))")
+    sys.exit(asyncio.run(run(args)))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""Test de charge de l'intégration HomeShift avec de nombreuses entrées.
+
+Ce script :
+1. Démarre un Home Assistant en mémoire (vraie machine à états, vrais
+   services et bus d'événements, aucune autre intégration), peuplé d'un
+   volume réaliste d'entités : capteurs, schedulers, thermostats
+2. Crée N entrées HomeShift (une par appartement), chacune avec son propre
+   calendrier de travail, ses schedulers et ses thermostats ; une entrée sur
+   deux utilise les jours fériés intégrés, les autres un calendrier partagé,
+   et une sur trois découpe la journée en segments
+3. Fait avancer une horloge simulée sur plusieurs jours : à chaque pas, les
+   calendriers et une partie des capteurs changent d'état, puis chaque
+   coordinateur est mis à jour
+4. Affiche la mémoire (pic, et par entrée, via tracemalloc), les percentiles
+   de durée d'une mise à jour et le temps pendant lequel la boucle asyncio
+   est restée bloquée
+
+Le service calendar.get_events est simulé à partir d'événements générés
+(télétravail, demi-journées, vacances, réunions), identiques d'une exécution
+à l'autre pour une même graine. tracemalloc ralentit l'exécution : comparer
+les durées avec --no-memory.
+
+Utilisation:
+    python scripts/load_test.py [--entries N] [--days D] [--step MIN] [--concurrent] [--no-memory]
+
+Exemple:
+    python scripts/load_test.py --entries 50 --days 14
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.homeshift.const import (  # noqa: E402
+    CONF_CALENDAR_ENTITY,
+    CONF_CLIMATE_ENTITIES,
+    CONF_DAY_MODE_MAP,
+    CONF_DAY_SEGMENTS,
+    CONF_HOLIDAY_CALENDAR,
+    CONF_HOLIDAY_COUNTRY,
+    CONF_SCHEDULERS_PER_MODE,
+    DOMAIN,
+    LOCALIZED_DEFAULTS,
+)
+from custom_components.homeshift.coordinator import HomeShiftCoordinator  # noqa: E402
+from custom_components.homeshift.public_holidays import is_public_holiday  # noqa: E402
+from custom_components.homeshift.scheduler_storage import get_scheduler_storage  # noqa: E402
+
+DEFAULT_ENTRIES = 20
+DEFAULT_DAYS = 7
+DEFAULT_STEP = 30  # minutes simulées entre deux mises à jour
+DEFAULT_SENSORS = 30  # capteurs sans rapport avec HomeShift, par appartement
+DEFAULT_CHURN = 0.2  # part des capteurs qui changent d'état à chaque pas
+DEFAULT_SEED = 42
+TIME_ZONE = "Europe/Paris"
+HOLIDAY_CALENDAR = "calendar.jours_feries"
+ROOMS = ("salon", "chambre", "bureau")
+DAY_SEGMENTS = "morning:0:00, afternoon:12:00"
+
+# Surveillance de la boucle : période de réveil et seuil d'un blocage
+LOOP_PROBE_INTERVAL = 0.005
+LOOP_STALL_THRESHOLD = 0.1
+
+
+# ---------------------------------------------------------------------------
+# Horloge et événements simulés
+# ---------------------------------------------------------------------------
+
+
+class SimulatedClock:
+    """Horloge simulée remplaçant dt_util.now / dt_util.utcnow."""
+
+    def __init__(self, start: datetime) -> None:
+        """Initialise l'horloge à un instant local."""
+        self.current = start
+
+    def now(self, time_zone=None) -> datetime:
+        """Retourne l'instant simulé (dans le fuseau demandé)."""
+        return self.current.astimezone(time_zone or dt_util.DEFAULT_TIME_ZONE)
+
+    def utcnow(self) -> datetime:
+        """Retourne l'instant simulé en UTC."""
+        return dt_util.as_utc(self.current)
+
+
+def _local(day: date, hour: int) -> datetime:
+    """Retourne l'instant local d'une heure pleine d'un jour."""
+    return datetime(day.year, day.month, day.day, hour, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+
+def generate_events(rng: random.Random, first_day: date, days: int) -> list[dict]:
+    """Génère les événements d'un calendrier de travail.
+
+    Args:
+        rng: Générateur aléatoire de l'appartement
+        first_day: Premier jour simulé
+        days: Nombre de jours (une semaine de marge est ajoutée de chaque côté)
+
+    Returns:
+        Événements triés par début, au format interne
+        {"summary", "start", "end", "all_day", "description", "location"}
+    """
+    events: list[dict] = []
+    vacation_start = first_day + timedelta(days=rng.randrange(max(days, 1)))
+    vacation_days = rng.choice((0, 0, 2, 5))
+    for offset in range(-7, days + 7):
+        day = first_day + timedelta(days=offset)
+        if vacation_start <= day < vacation_start + timedelta(days=vacation_days):
+            if day == vacation_start:
+                events.append(
+                    {
+                        "summary": "Vacances",
+                        "start": _local(day, 0),
+                        "end": _local(day + timedelta(days=vacation_days), 0),
+                        "all_day": True,
+                        "description": "",
+                        "location": "",
+                    }
+                )
+            continue
+        if day.weekday() >= 5:
+            continue
+        draw = rng.random()
+        if draw < 0.3:
+            start, end = (0, 24) if draw < 0.2 else rng.choice(((8, 12), (13, 18)))
+            events.append(
+                {
+                    "summary": "Télétravail",
+                    "start": _local(day, start),
+                    "end": _local(day, 0) + timedelta(hours=end),
+                    "all_day": (start, end) == (0, 24),
+                    "description": "",
+                    "location": "",
+                }
+            )
+        if rng.random() < 0.5:
+            hour = rng.randrange(9, 17)
+            events.append(
+                {
+                    "summary": "Réunion d'équipe",
+                    "start": _local(day, hour),
+                    "end": _local(day, hour + 1),
+                    "all_day": False,
+                    "description": "Point hebdomadaire",
+                    "location": "Salle 2",
+                }
+            )
+    events.sort(key=lambda event: event["start"])
+    return events
+
+
+def event_response(event: dict) -> dict:
+    """Retourne un événement au format de la réponse de calendar.get_events."""
+    if event["all_day"]:
+        start, end = event["start"].date().isoformat(), event["end"].date().isoformat()
+    else:
+        start, end = event["start"].isoformat(), event["end"].isoformat()
+    return {
+        "summary": event["summary"],
+        "start": start,
+        "end": end,
+        "description": event["description"],
+        "location": event["location"],
+    }
+
+
+def calendar_state(events: list[dict], now: datetime) -> tuple[str, dict]:
+    """Retourne l'état et les attributs d'une entité calendrier à un instant.
+
+    Comme dans Home Assistant, l'entité est "on" pendant un événement et
+    décrit l'événement en cours, sinon le prochain.
+    """
+    current = next((event for event in events if event["start"] <= now < event["end"]), None)
+    shown = current or next((event for event in events if event["start"] > now), None)
+    if shown is None:
+        return "off", {}
+    return "on" if current else "off", {
+        "message": shown["summary"],
+        "all_day": shown["all_day"],
+        "start_time": shown["start"].strftime("%Y-%m-%d %H:%M:%S"),
+        "end_time": shown["end"].strftime("%Y-%m-%d %H:%M:%S"),
+        "description": shown["description"],
+        "location": shown["location"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Home Assistant simulé
+# ---------------------------------------------------------------------------
+
+
+class Apartment:
+    """Entités et entrée HomeShift d'un appartement."""
+
+    def __init__(self, index: int, rng: random.Random, first_day: date, days: int, sensors: int) -> None:
+        """Prépare les entités de l'appartement."""
+        self.index = index
+        self.calendar = f"calendar.travail_apt_{index:04d}"
+        self.events = generate_events(rng, first_day, days)
+        self.climates = [f"climate.apt_{index:04d}_{room}" for room in ROOMS]
+        self.sensors = [f"sensor.apt_{index:04d}_capteur_{number:02d}" for number in range(sensors)]
+        display_modes = _display_modes()
+        self.schedulers = {
+            mode: [f"switch.schedule_apt_{index:04d}_{key.lower()}_{kind}" for kind in ("chauffage", "eclairage")]
+            for key, mode in display_modes.items()
+        }
+        self.coordinator: HomeShiftCoordinator | None = None
+
+    def entry(self) -> ConfigEntry:
+        """Retourne l'entrée de configuration de l'appartement."""
+        data = {
+            **LOCALIZED_DEFAULTS["fr"],
+            CONF_CALENDAR_ENTITY: self.calendar,
+            CONF_SCHEDULERS_PER_MODE: self.schedulers,
+            CONF_CLIMATE_ENTITIES: self.climates,
+        }
+        if self.index % 2:
+            data[CONF_HOLIDAY_CALENDAR] = HOLIDAY_CALENDAR
+        else:
+            data[CONF_HOLIDAY_COUNTRY] = "FR"
+        if self.index % 3 == 0:
+            data[CONF_DAY_SEGMENTS] = DAY_SEGMENTS
+        return ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title=f"Appartement {self.index}",
+            data=data,
+            source="user",
+            entry_id=f"apt{self.index:04d}",
+        )
+
+
+def _display_modes() -> dict[str, str]:
+    """Retourne les modes jour (clé -> nom affiché) des valeurs par défaut françaises."""
+    pairs = (pair.partition(":") for pair in LOCALIZED_DEFAULTS["fr"][CONF_DAY_MODE_MAP].split(","))
+    return {key.strip(): display.strip() for key, _, display in pairs}
+
+
+def populate(hass: HomeAssistant, apartments: list[Apartment], now: datetime) -> int:
+    """Crée les entités de tous les appartements.
+
+    Returns:
+        Nombre d'entités créées
+    """
+    count = 0
+    for apartment in apartments:
+        state, attributes = calendar_state(apartment.events, now)
+        hass.states.async_set(apartment.calendar, state, attributes)
+        for switches in apartment.schedulers.values():
+            for entity_id in switches:
+                tags = ["Chauffage"] if entity_id.endswith("chauffage") else []
+                hass.states.async_set(entity_id, "off", {"tags": tags, "next_trigger": None, "friendly_name": entity_id})
+        for entity_id in apartment.climates:
+            hass.states.async_set(
+                entity_id,
+                "heat",
+                {
+                    "hvac_modes": ["off", "heat", "cool", "fan_only"],
+                    "preset_modes": ["eco", "comfort", "away"],
+                    "temperature": 19.0,
+                    "current_temperature": 20.5,
+                },
+            )
+        for entity_id in apartment.sensors:
+            hass.states.async_set(entity_id, "20.0", {"unit_of_measurement": "°C", "device_class": "temperature"})
+        count += 1 + sum(map(len, apartment.schedulers.values())) + len(apartment.climates) + len(apartment.sensors)
+    hass.states.async_set(HOLIDAY_CALENDAR, "off", {"message": "", "all_day": True})
+    return count + 1
+
+
+def register_services(hass: HomeAssistant, apartments: list[Apartment], counters: dict[str, int]) -> None:
+    """Enregistre les services appelés par HomeShift (calendar, switch, climate)."""
+    events_by_calendar = {apartment.calendar: apartment.events for apartment in apartments}
+
+    async def get_events(call: ServiceCall) -> dict:
+        counters["get_events"] += 1
+        start = dt_util.parse_datetime(call.data["start_date_time"])
+        end = dt_util.parse_datetime(call.data["end_date_time"])
+        entity_ids = call.data["entity_id"]
+        if isinstance(entity_ids, str):
+            entity_ids = [entity_ids]
+        return {
+            entity_id: {
+                "events": [
+                    event_response(event)
+                    for event in events_by_calendar.get(entity_id, ())
+                    if event["start"] < end and start < event["end"]
+                ]
+            }
+            for entity_id in entity_ids
+        }
+
+    def _entity_ids(call: ServiceCall) -> list[str]:
+        entity_ids = call.data.get("entity_id", [])
+        return [entity_ids] if isinstance(entity_ids, str) else list(entity_ids)
+
+    async def switch_service(call: ServiceCall) -> None:
+        counters["switch"] += 1
+        for entity_id in _entity_ids(call):
+            state = hass.states.get(entity_id)
+            hass.states.async_set(entity_id, "on" if call.service == "turn_on" else "off", state.attributes if state else None)
+
+    async def climate_service(call: ServiceCall) -> None:
+        counters["climate"] += 1
+        for entity_id in _entity_ids(call):
+            state = hass.states.get(entity_id)
+            if state is None:
+                continue
+            attributes = dict(state.attributes)
+            if "temperature" in call.data:
+                attributes["temperature"] = call.data["temperature"]
+            if "preset_mode" in call.data:
+                attributes["preset_mode"] = call.data["preset_mode"]
+            hass.states.async_set(entity_id, call.data.get("hvac_mode", state.state), attributes)
+
+    hass.services.async_register("calendar", "get_events", get_events, supports_response=SupportsResponse.ONLY)
+    for service in ("turn_on", "turn_off"):
+        hass.services.async_register("switch", service, switch_service)
+    for service in ("set_hvac_mode", "set_temperature", "set_preset_mode"):
+        hass.services.async_register("climate", service, climate_service)
+
+
+def advance(hass: HomeAssistant, apartments: list[Apartment], now: datetime, rng: random.Random, churn: float) -> None:
+    """Met à jour les calendriers, le calendrier des jours fériés et une partie des capteurs."""
+    for apartment in apartments:
+        state, attributes = calendar_state(apartment.events, now)
+        hass.states.async_set(apartment.calendar, state, attributes)
+        for entity_id in rng.sample(apartment.sensors, int(len(apartment.sensors) * churn)):
+            hass.states.async_set(entity_id, f"{rng.uniform(17, 24):.1f}", {"unit_of_measurement": "°C", "device_class": "temperature"})
+    holiday = is_public_holiday(now.date(), "FR")
+    hass.states.async_set(HOLIDAY_CALENDAR, "on" if holiday else "off", {"message": "Jour férié" if holiday else "", "all_day": True})
+
+
+# ---------------------------------------------------------------------------
+# Mesures
+# ---------------------------------------------------------------------------
+
+
+class LoopMonitor:
+    """Mesure les retards de réveil d'une tâche pour estimer les blocages de la boucle."""
+
+    def __init__(self, interval: float = LOOP_PROBE_INTERVAL, threshold: float = LOOP_STALL_THRESHOLD) -> None:
+        """Initialise le moniteur."""
+        self.interval = interval
+        self.threshold = threshold
+        self.lags: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _probe(self) -> None:
+        """Se réveille à intervalle régulier et note le retard de chaque réveil."""
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+
+    def start(self) -> None:
+        """Démarre la surveillance."""
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+
+    async def stop(self) -> None:
+        """Arrête la surveillance."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    @property
+    def blocked(self) -> float:
+        """Retourne le temps total (s) pendant lequel la boucle n'a pas pu réveiller la sonde."""
+        return sum(self.lags)
+
+    @property
+    def stalls(self) -> int:
+        """Retourne le nombre de blocages plus longs que le seuil."""
+        return sum(1 for lag in self.lags if lag >= self.threshold)
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """Retourne les percentiles 50, 95, 99 et le maximum d'une série.
+
+    Args:
+        values: Durées en secondes
+
+    Returns:
+        {"p50", "p95", "p99", "max"} en millisecondes
+    """
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    if len(values) == 1:
+        return {key: values[0] * 1000 for key in ("p50", "p95", "p99", "max")}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": cuts[49] * 1000, "p95": cuts[94] * 1000, "p99": cuts[98] * 1000, "max": max(values) * 1000}
+
+
+def _mib(size: int) -> str:
+    """Formate une taille en Mio."""
+    return f"{size / 1024 / 1024:.1f} Mio"
+
+
+def _memory() -> int:
+    """Retourne la mémoire allouée actuellement (0 sans tracemalloc)."""
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+# ---------------------------------------------------------------------------
+# Exécution
+# ---------------------------------------------------------------------------
+
+
+async def timed_update(coordinator: HomeShiftCoordinator, latencies: list[float]) -> None:
+    """Met à jour un coordinateur et note la durée de la mise à jour."""
+    started = time.perf_counter()
+    await coordinator.async_update_data()
+    latencies.append(time.perf_counter() - started)
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Déroule le test de charge.
+
+    Returns:
+        Code de sortie
+    """
+    config_dir = tempfile.mkdtemp(prefix="homeshift-load-")
+    hass = HomeAssistant(config_dir)
+    if hasattr(hass.config, "async_set_time_zone"):
+        await hass.config.async_set_time_zone(TIME_ZONE)
+    else:
+        hass.config.set_time_zone(TIME_ZONE)
+    hass.config.language = "fr"
+
+    # Démarrage demain à minuit : les minuteries des transitions ne se
+    # déclenchent pas pendant le test (elles visent des instants futurs)
+    first_day = dt_util.now().date() + timedelta(days=1)
+    clock = SimulatedClock(_local(first_day, 0))
+    rng = random.Random(args.seed)
+
+    if not args.no_memory:
+        tracemalloc.start()
+    apartments = [
+        Apartment(index, random.Random(args.seed + index), first_day, args.days, args.sensors) for index in range(args.entries)
+    ]
+    counters = {"get_events": 0, "switch": 0, "climate": 0}
+    entity_count = populate(hass, apartments, clock.current)
+    register_services(hass, apartments, counters)
+    gc.collect()
+    baseline = _memory()
+    print(f"Home Assistant simulé: {entity_count} entités, {args.entries} entrée(s), {args.days} jour(s), pas de {args.step} min")
+
+    latencies: list[float] = []
+    monitor = LoopMonitor()
+    with patch.object(dt_util, "now", clock.now), patch.object(dt_util, "utcnow", clock.utcnow):
+        setup_started = time.perf_counter()
+        hass.data.setdefault(DOMAIN, {})
+        for apartment in apartments:
+            entry = apartment.entry()
+            entry.async_on_unload(await get_scheduler_storage(hass).async_track())
+            coordinator = HomeShiftCoordinator(hass, entry)
+            coordinator.async_setup_listeners()
+            await coordinator.async_load_snapshot()
+            await coordinator.async_update_data()
+            hass.data[DOMAIN][entry.entry_id] = coordinator
+            apartment.coordinator = coordinator
+        setup_time = time.perf_counter() - setup_started
+        gc.collect()
+        after_setup = _memory()
+        print(f"✓ Entrées créées en {setup_time:.2f} s")
+
+        monitor.start()
+        steps = args.days * 24 * 60 // args.step
+        run_started = time.perf_counter()
+        for _ in range(steps):
+            clock.current += timedelta(minutes=args.step)
+            advance(hass, apartments, clock.current, rng, args.churn)
+            coordinators = [apartment.coordinator for apartment in apartments]
+            if args.concurrent:
+                await asyncio.gather(*(timed_update(coordinator, latencies) for coordinator in coordinators))
+            else:
+                # Comme avec les minuteries de Home Assistant, la boucle
+                # reprend la main entre deux entrées
+                for coordinator in coordinators:
+                    await timed_update(coordinator, latencies)
+                    await asyncio.sleep(0)
+            # Laisse passer les tâches en attente (revalidations, écritures d'état)
+            await asyncio.sleep(0)
+        run_time = time.perf_counter() - run_started
+        await monitor.stop()
+
+    current_memory, peak_memory = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    top = tracemalloc.take_snapshot() if tracemalloc.is_tracing() and args.top else None
+    tracemalloc.stop()
+
+    print("\nMises à jour")
+    print(f"  {len(latencies)} mise(s) à jour en {run_time:.2f} s ({len(latencies) / run_time:.0f}/s)")
+    print("  durée: " + ", ".join(f"{key} {value:.2f} ms" for key, value in percentiles(latencies).items()))
+    print(f"  appels: {counters['get_events']} get_events, {counters['switch']} switch, {counters['climate']} climate")
+
+    print("\nBoucle asyncio")
+    lag = percentiles(monitor.lags)
+    print(f"  bloquée {monitor.blocked:.2f} s sur {run_time:.2f} s ({100 * monitor.blocked / run_time:.0f} %)")
+    print(f"  retard de réveil: p99 {lag['p99']:.1f} ms, max {lag['max']:.1f} ms, {monitor.stalls} blocage(s) ≥ {LOOP_STALL_THRESHOLD * 1000:.0f} ms")
+
+    if args.no_memory:
+        print("\nMémoire: non mesurée (--no-memory)")
+    else:
+        print("\nMémoire (tracemalloc)")
+        print(f"  Home Assistant et entités: {_mib(baseline)}")
+        print(f"  entrées: {_mib(after_setup - baseline)} ({(after_setup - baseline) / max(args.entries, 1) / 1024:.0f} Kio par entrée)")
+        print(f"  fin: {_mib(current_memory)}, pic: {_mib(peak_memory)}")
+        if top is not None:
+            print("  principales allocations de l'intégration:")
+            integration = tracemalloc.Filter(True, str(ROOT / "custom_components" / "*"))
+            for stat in top.filter_traces([integration]).statistics("lineno")[: args.top]:
+                print(f"    {stat.size / 1024:8.0f} Kio  {stat.traceback}")
+
+    await hass.async_stop(force=True)
+    return 0
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Test de charge de HomeShift : mémoire, durée des mises à jour et blocages de la boucle"
+    )
+    parser.add_argument(
+        "--entries",
+        type=int,
+        default=DEFAULT_ENTRIES,
+        help=f"Nombre d'entrées HomeShift (défaut: {DEFAULT_ENTRIES})",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=DEFAULT_DAYS,
+        help=f"Nombre de jours simulés (défaut: {DEFAULT_DAYS})",
+    )
+    parser.add_argument(
+        "--step",
+        type=int,
+        default=DEFAULT_STEP,
+        help=f"Minutes simulées entre deux mises à jour (défaut: {DEFAULT_STEP})",
+    )
+    parser.add_argument(
+        "--sensors",
+        type=int,
+        default=DEFAULT_SENSORS,
+        help=f"Capteurs sans rapport avec HomeShift par appartement (défaut: {DEFAULT_SENSORS})",
+    )
+    parser.add_argument(
+        "--churn",
+        type=float,
+        default=DEFAULT_CHURN,
+        help=f"Part des capteurs qui changent d'état à chaque pas (défaut: {DEFAULT_CHURN})",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Mettre à jour toutes les entrées en même temps plutôt que l'une après l'autre",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Ne pas mesurer la mémoire (tracemalloc ralentit les mises à jour)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=0,
+        help="Afficher les N lignes de l'intégration qui allouent le plus de mémoire",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"Graine des événements et changements d'état simulés (défaut: {DEFAULT_SEED})",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Afficher les journaux de l'intégration",
+    )
+
+    args = parser.parse_args()
+    if args.entries < 1 or args.days < 1 or args.step < 1:
+        parser.error("--entries, --days et --step doivent être positifs")
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """Shared fixtures and helpers for HomeShift coordinator tests."""
 from __future__ import annotations
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from custom_components.homeshift.const import (
     CONF_CALENDAR_ENTITY,
@@ -55,9 +55,15 @@ _FRAME_PATCH.start()
 
 
 def make_mock_hass() -> MagicMock:
-    """Return a MagicMock hass with language='fr' for get_localized_defaults."""
+    """Return a MagicMock hass with language='fr' for get_localized_defaults.
+
+    hass.data is a real dict (domain-level caches live there) and service calls
+    are awaitable, returning an empty response.
+    """
     hass = MagicMock()
     hass.config.language = "fr"
+    hass.data = {}
+    hass.services.async_call = AsyncMock(return_value={})
     return hass
 
 
@@ -0,0 +1,249 @@
+"""Tests for the domain-level calendar event cache (TTL, invalidation, single-flight)."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.homeshift.calendar_cache import (
+    BREAKER_CLOSED,
+    BREAKER_OPEN,
+    CalendarEventCache,
+    CircuitBreaker,
+    backoff_delay,
+    get_calendar_cache,
+    next_event_after,
+)
+from custom_components.homeshift.const import (
+    CALENDAR_BREAKER_THRESHOLD,
+    CALENDAR_STALE_MAX_AGE,
+    DATA_CALENDAR_CACHE,
+    DOMAIN,
+)
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+
+from .conftest import make_mock_hass, make_mock_entry, make_calendar_state
+
+START = datetime(2026, 3, 4, 0, 0, 0)
+END = datetime(2026, 3, 6, 0, 0, 0)
+EVENTS = [
+    {"summary": "Télétravail", "start": "2026-03-04T13:00:00+01:00", "end": "2026-03-04T18:00:00+01:00"},
+    {"summary": "Vacances", "start": "2026-03-05", "end": "2026-03-06"},
+]
+
+
+def _hass_with_events(events=None):
+    hass = make_mock_hass()
+    hass.services.async_call.return_value = {"calendar.teletravail": {"events": events if events is not None else EVENTS}}
+    return hass
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class TestCalendarEventCache:
+    """Verify hits, misses, expiry and invalidation."""
+
+    def test_second_request_is_a_hit(self):
+        """Second request is a hit."""
+        hass = _hass_with_events()
+        cache = CalendarEventCache(hass)
+        first = _run(cache.async_get_events("calendar.teletravail", START, END))
+        second = _run(cache.async_get_events("calendar.teletravail", START, END))
+        assert first == second == EVENTS
+        assert hass.services.async_call.await_count == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_service_called_with_window(self):
+        """Service called with window."""
+        hass = _hass_with_events()
+        _run(CalendarEventCache(hass).async_get_events("calendar.teletravail", START, END))
+        call = hass.services.async_call.call_args
+        assert call.args[:2] == ("calendar", "get_events")
+        assert call.args[2]["entity_id"] == "calendar.teletravail"
+        assert call.kwargs == {"blocking": True, "return_response": True}
+
+    def test_expired_entry_served_while_refetched(self):
+        """Expired entry is returned at once and refetched in the background."""
+        hass = _hass_with_events()
+        cache = CalendarEventCache(hass, ttl=60)
+        with patch("custom_components.homeshift.calendar_cache.time.monotonic", return_value=1000.0):
+            _run(cache.async_get_events("calendar.teletravail", START, END))
+        hass.services.async_call.return_value = {"calendar.teletravail": {"events": EVENTS[:1]}}
+        with patch("custom_components.homeshift.calendar_cache.time.monotonic", return_value=1061.0):
+            assert _run(cache.async_get_events("calendar.teletravail", START, END)) == EVENTS
+            assert cache.diagnostics()["in_flight"] == 1
+            _run(asyncio.sleep(0))
+        assert hass.services.async_call.await_count == 2
+        assert (cache.misses, cache.stale_hits) == (1, 1)
+        assert _run(cache.async_get_events("calendar.teletravail", START, END)) == EVENTS[:1]
+
+    def test_invalidate_marks_only_that_calendar_stale(self):
+        """Invalidate marks only that calendar stale."""
+        hass = _hass_with_events()
+        cache = CalendarEventCache(hass)
+        _run(cache.async_get_events("calendar.teletravail", START, END))
+        _run(cache.async_get_events("calendar.jours_feries", START, END))
+        cache.async_invalidate("calendar.teletravail")
+        assert cache.diagnostics()["entries"] == 2
+        assert cache.diagnostics()["live_entries"] == 1
+        assert cache.invalidations == 1
+
+    def test_aged_windows_swept_on_insert(self):
+        """Windows never read again are dropped once a new window is stored after the stale max age."""
+        hass = _hass_with_events()
+        cache = CalendarEventCache(hass, ttl=60)
+        with patch("custom_components.homeshift.calendar_cache.time.monotonic", return_value=1000.0):
+            _run(cache.async_get_events("calendar.teletravail", START, END))
+        later = 1000.0 + 60 + CALENDAR_STALE_MAX_AGE + 1
+        with patch("custom_components.homeshift.calendar_cache.time.monotonic", return_value=later):
+            _run(cache.async_get_events("calendar.teletravail", END, datetime(2026, 3, 8, 0, 0, 0)))
+        assert cache.diagnostics()["entries"] == 1
+        assert cache.evictions == 1
+
+    def test_concurrent_requests_share_one_fetch(self):
+        """Concurrent requests share one fetch."""
+        hass = make_mock_hass()
+        release = asyncio.Event()
+
+        async def slow_call(*_args, **_kwargs):
+            await release.wait()
+            return {"calendar.teletravail": {"events": EVENTS}}
+
+        hass.services.async_call.side_effect = slow_call
+        cache = CalendarEventCache(hass)
+
+        async def scenario():
+            waiters = [asyncio.ensure_future(cache.async_get_events("calendar.teletravail", START, END)) for _ in range(5)]
+            await asyncio.sleep(0)
+            assert cache.diagnostics()["in_flight"] == 1
+            release.set()
+            return await asyncio.gather(*waiters)
+
+        results = _run(scenario())
+        assert all(result == EVENTS for result in results)
+        assert hass.services.async_call.await_count == 1
+        assert (cache.misses, cache.coalesced) == (1, 4)
+        assert cache.diagnostics()["in_flight"] == 0
+
+    def test_failed_fetch_not_cached(self):
+        """Failed fetch not cached."""
+        hass = make_mock_hass()
+        hass.services.async_call.side_effect = [RuntimeError("boom"), {"calendar.teletravail": {"events": EVENTS}}]
+        cache = CalendarEventCache(hass)
+        try:
+            _run(cache.async_get_events("calendar.teletravail", START, END))
+        except RuntimeError:
+            pass
+        assert _run(cache.async_get_events("calendar.teletravail", START, END)) == EVENTS
+
+    def test_refresh_retries_with_backoff(self):
+        """A failing background refresh is retried and keeps the cached events meanwhile."""
+        hass = _hass_with_events()
+        cache = CalendarEventCache(hass, ttl=60, retry_base_delay=0)
+        _run(cache.async_get_events("calendar.teletravail", START, END))
+        cache.async_invalidate("calendar.teletravail")
+        hass.services.async_call.side_effect = [HomeAssistantError("timeout"), {"calendar.teletravail": {"events": []}}]
+
+        async def scenario():
+            events = await cache.async_get_events("calendar.teletravail", START, END)
+            await asyncio.gather(*cache._inflight.values())
+            return events
+
+        assert _run(scenario()) == EVENTS
+        assert (cache.retries, cache.failures) == (1, 1)
+        assert _run(cache.async_get_events("calendar.teletravail", START, END)) == []
+        assert cache.diagnostics()["breakers"] == {"calendar.teletravail": BREAKER_CLOSED}
+
+    def test_slow_first_read_times_out(self):
+        """A window never read waits at most the fetch timeout."""
+        hass = make_mock_hass()
+        release = asyncio.Event()
+
+        async def slow_call(*_args, **_kwargs):
+            await release.wait()
+            return {"calendar.teletravail": {"events": EVENTS}}
+
+        hass.services.async_call.side_effect = slow_call
+        cache = CalendarEventCache(hass, fetch_timeout=0.01)
+        with pytest.raises(HomeAssistantError):
+            _run(cache.async_get_events("calendar.teletravail", START, END))
+        assert cache.diagnostics()["in_flight"] == 0
+        assert cache.diagnostics()["entries"] == 0
+
+    def test_open_circuit_stops_reads(self):
+        """After repeated failures the calendar is not called until it cools down."""
+        hass = make_mock_hass()
+        hass.services.async_call.side_effect = HomeAssistantError("unavailable")
+        cache = CalendarEventCache(hass)
+        for _ in range(CALENDAR_BREAKER_THRESHOLD):
+            with pytest.raises(HomeAssistantError):
+                _run(cache.async_get_events("calendar.teletravail", START, END))
+        assert cache.breaker("calendar.teletravail").state == BREAKER_OPEN
+        with pytest.raises(HomeAssistantError):
+            _run(cache.async_get_events("calendar.teletravail", START, END))
+        assert hass.services.async_call.await_count == CALENDAR_BREAKER_THRESHOLD
+
+    def test_cache_shared_through_hass_data(self):
+        """Cache shared through hass data."""
+        hass = make_mock_hass()
+        cache = get_calendar_cache(hass)
+        assert get_calendar_cache(hass) is cache
+        assert hass.data[DOMAIN][DATA_CALENDAR_CACHE] is cache
+
+
+class TestBackoff:
+    """Verify the retry delays and the circuit breaker."""
+
+    def test_delay_is_jittered_below_exponential_cap(self):
+        """Delays stay within [0, min(cap, base * 2**attempt)]."""
+        delays = [backoff_delay(attempt, 2, 10) for attempt in range(6) for _ in range(20)]
+        assert all(0 <= delay <= 10 for delay in delays)
+        assert all(backoff_delay(1, 2, 60) <= 4 for _ in range(20))
+
+    def test_breaker_half_opens_after_cooldown(self):
+        """A cooled-down breaker lets one trial through; its failure reopens it."""
+        breaker = CircuitBreaker(threshold=2, reset_timeout=60)
+        with patch("custom_components.homeshift.calendar_cache.time.monotonic", return_value=1000.0):
+            breaker.record_failure()
+            assert breaker.allow()
+            breaker.record_failure()
+            assert not breaker.allow()
+        with patch("custom_components.homeshift.calendar_cache.time.monotonic", return_value=1061.0):
+            assert breaker.allow()
+            assert not breaker.allow()
+            breaker.record_failure()
+            assert breaker.state == BREAKER_OPEN
+        with patch("custom_components.homeshift.calendar_cache.time.monotonic", return_value=1122.0):
+            assert breaker.allow()
+            breaker.record_success()
+            assert breaker.state == BREAKER_CLOSED
+
+
+class TestNextEvent:
+    """Verify the next upcoming event lookup."""
+
+    def test_next_event_after_now(self):
+        """Next event after now."""
+        assert next_event_after(EVENTS, datetime(2026, 3, 4, 10, 0, 0))["summary"] == "Télétravail"
+        assert next_event_after(EVENTS, datetime(2026, 3, 4, 14, 0, 0))["summary"] == "Vacances"
+        assert next_event_after(EVENTS, datetime(2026, 3, 5, 10, 0, 0)) is None
+
+    def test_entries_share_one_fetch(self):
+        """Entries share one fetch."""
+        hass = _hass_with_events()
+        hass.states.get.return_value = make_calendar_state(state="off")
+        coordinators = [HomeShiftCoordinator(hass, make_mock_entry()) for _ in range(3)]
+
+        with patch("custom_components.homeshift.coordinator.dt_util") as mock_dt:
+            mock_dt.now.return_value = datetime(2026, 3, 4, 10, 0, 0)
+            for coordinator in coordinators:
+                _run(coordinator.async_update_data())
+
+        get_events = [c for c in hass.services.async_call.call_args_list if c.args[1] == "get_events"]
+        assert len(get_events) == 1
+        assert coordinators[2].next_event["summary"] == "Télétravail"
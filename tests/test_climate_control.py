@@ -0,0 +1,271 @@
+"""Tests for direct climate control: HVAC planning, grouping, chunking and coordinator wiring."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.homeshift.climate_control import (
+    async_apply_climate_target,
+    async_apply_hvac_plan,
+    chunk,
+    parse_climate_presets,
+    parse_hvac_mode_map,
+    plan_climate_targets,
+    plan_hvac_modes,
+    resolve_climate_target,
+)
+from custom_components.homeshift.const import (
+    CONF_CLIMATE_ENTITIES,
+    CONF_CLIMATE_MAX_PARALLEL,
+    CONF_CLIMATE_PRESETS,
+    DEFAULT_HVAC_MODE_MAP,
+)
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+
+from .conftest import make_mock_hass, make_mock_entry
+
+
+def _climate_state(state: str, hvac_modes=("off", "heat", "cool", "fan_only"), **attributes) -> MagicMock:
+    mock_state = MagicMock()
+    mock_state.state = state
+    mock_state.attributes = {"hvac_modes": list(hvac_modes), **attributes}
+    return mock_state
+
+
+def _hass_with_climates(states: dict) -> MagicMock:
+    hass = make_mock_hass()
+    hass.states.get.side_effect = states.get
+    return hass
+
+
+class TestParseHvacModeMap:
+    """Tests for parse_hvac_mode_map."""
+
+    def test_default_map(self):
+        """Default map."""
+        assert parse_hvac_mode_map(DEFAULT_HVAC_MODE_MAP) == {
+            "Off": "off",
+            "Heating": "heat",
+            "Cooling": "cool",
+            "Ventilation": "fan_only",
+        }
+
+    def test_hvac_modes_lowercased_and_bad_pairs_ignored(self):
+        """Hvac modes lowercased and bad pairs ignored."""
+        assert parse_hvac_mode_map("Heating:HEAT, Bad, :off") == {"Heating": "heat"}
+
+
+class TestPlanHvacModes:
+    """Verify that only entities needing a change are planned."""
+
+    def test_entities_already_in_mode_skipped(self):
+        """Entities already in mode skipped."""
+        hass = _hass_with_climates({
+            "climate.salon": _climate_state("heat"),
+            "climate.chambre": _climate_state("off"),
+            "climate.bureau": _climate_state("off"),
+        })
+        plan = plan_hvac_modes(hass, ["climate.salon", "climate.chambre", "climate.bureau"], "heat")
+        assert plan == {"heat": ["climate.bureau", "climate.chambre"]}
+
+    def test_unsupported_mode_falls_back_to_off(self):
+        """Unsupported mode falls back to off."""
+        hass = _hass_with_climates({
+            "climate.clim": _climate_state("cool"),
+            "climate.trv": _climate_state("heat", hvac_modes=("off", "heat")),
+        })
+        plan = plan_hvac_modes(hass, ["climate.clim", "climate.trv"], "fan_only")
+        assert plan == {"fan_only": ["climate.clim"], "off": ["climate.trv"]}
+
+    def test_unavailable_and_missing_entities_skipped(self):
+        """Unavailable and missing entities skipped."""
+        hass = _hass_with_climates({"climate.salon": _climate_state("unavailable")})
+        assert not plan_hvac_modes(hass, ["climate.salon", "climate.missing"], "heat")
+
+
+class TestApplyHvacPlan:
+    """Verify batching of the service calls."""
+
+    def test_chunk(self):
+        """Chunk."""
+        assert chunk(["a", "b", "c"], 2) == [["a", "b"], ["c"]]
+        assert chunk(["a", "b", "c"], 0) == [["a", "b", "c"]]
+        assert not chunk([], 2)
+
+    def test_one_call_per_group_when_unbounded(self):
+        """One call per group when unbounded."""
+        hass = make_mock_hass()
+        plan = {"heat": ["climate.a", "climate.b", "climate.c"], "off": ["climate.d"]}
+        asyncio.get_event_loop().run_until_complete(async_apply_hvac_plan(hass, plan, 0))
+        calls = hass.services.async_call.call_args_list
+        assert [(c.args[2]["hvac_mode"], c.args[2]["entity_id"]) for c in calls] == [
+            ("heat", ["climate.a", "climate.b", "climate.c"]),
+            ("off", ["climate.d"]),
+        ]
+
+    def test_bounded_calls_are_chunked_and_blocking(self):
+        """Bounded calls are chunked and blocking."""
+        hass = make_mock_hass()
+        plan = {"heat": [f"climate.trv_{i}" for i in range(5)]}
+        asyncio.get_event_loop().run_until_complete(async_apply_hvac_plan(hass, plan, 2))
+        calls = hass.services.async_call.call_args_list
+        assert [len(c.args[2]["entity_id"]) for c in calls] == [2, 2, 1]
+        assert all(c.kwargs["blocking"] for c in calls)
+
+
+class TestClimatePresets:
+    """Verify the day mode × thermostat mode setpoint/preset pipeline."""
+
+    def test_parse_numeric_and_preset_targets(self):
+        """Parse numeric and preset targets."""
+        assert parse_climate_presets("Remote/Heating:20.5, Absence/*:away, bad, Work:19") == {
+            ("Remote", "Heating"): 20.5,
+            ("Absence", "*"): "away",
+        }
+
+    def test_most_specific_target_wins(self):
+        """Most specific target wins."""
+        presets = parse_climate_presets("*/*:eco, */Heating:19, Remote/*:comfort, Remote/Heating:20.5")
+        assert resolve_climate_target(presets, "Remote", "Heating") == ("set_temperature", 20.5)
+        assert resolve_climate_target(presets, "Remote", "Cooling") == ("set_preset_mode", "comfort")
+        assert resolve_climate_target(presets, "Work", "Heating") == ("set_temperature", 19.0)
+        assert resolve_climate_target(presets, "Work", "Off") == ("set_preset_mode", "eco")
+        assert resolve_climate_target({}, "Work", "Off") is None
+
+    def test_only_differing_setpoints_planned(self):
+        """Only differing setpoints planned."""
+        hass = _hass_with_climates({
+            "climate.salon": _climate_state("heat", temperature=20.5),
+            "climate.chambre": _climate_state("heat", temperature=18.0),
+            "climate.cuisine": _climate_state("off", temperature=16.0),
+        })
+        entity_ids = ["climate.salon", "climate.chambre", "climate.cuisine"]
+        assert plan_climate_targets(hass, entity_ids, ("set_temperature", 20.5)) == ["climate.chambre"]
+
+    def test_presets_skip_current_and_unsupported(self):
+        """Presets skip current and unsupported."""
+        hass = _hass_with_climates({
+            "climate.salon": _climate_state("heat", preset_mode="eco", preset_modes=["eco", "comfort"]),
+            "climate.chambre": _climate_state("heat", preset_mode="comfort", preset_modes=["eco", "comfort"]),
+            "climate.trv": _climate_state("heat", preset_modes=["boost"]),
+        })
+        entity_ids = ["climate.salon", "climate.chambre", "climate.trv"]
+        assert plan_climate_targets(hass, entity_ids, ("set_preset_mode", "eco")) == ["climate.chambre"]
+
+    def test_skipped_entities_excluded(self):
+        """Skipped entities excluded."""
+        hass = _hass_with_climates({"climate.salon": _climate_state("heat", temperature=17.0)})
+        assert not plan_climate_targets(hass, ["climate.salon"], ("set_temperature", 20.0), {"climate.salon"})
+
+    def test_failing_chunk_does_not_stop_the_others(self):
+        """An unreachable entity fails its chunk only; the next chunks are still sent."""
+        hass = make_mock_hass()
+        hass.services.async_call.side_effect = [HomeAssistantError("TRV unreachable"), None, None]
+        entity_ids = [f"climate.trv_{i:02d}" for i in range(6)]
+        asyncio.get_event_loop().run_until_complete(
+            async_apply_climate_target(hass, ("set_temperature", 19.0), entity_ids, 2)
+        )
+        calls = hass.services.async_call.call_args_list
+        assert [c.args[2]["entity_id"] for c in calls] == [entity_ids[0:2], entity_ids[2:4], entity_ids[4:6]]
+
+    def test_target_applied_in_chunks(self):
+        """Target applied in chunks."""
+        hass = make_mock_hass()
+        entity_ids = [f"climate.trv_{i:02d}" for i in range(40)]
+        asyncio.get_event_loop().run_until_complete(
+            async_apply_climate_target(hass, ("set_temperature", 19.0), entity_ids, 20)
+        )
+        calls = hass.services.async_call.call_args_list
+        assert len(calls) == 2
+        assert all(c.args[1] == "set_temperature" and c.args[2]["temperature"] == 19.0 for c in calls)
+
+
+class TestCoordinatorClimate:
+    """Verify that thermostat mode changes drive the climate entities."""
+
+    def test_thermostat_change_sets_hvac_mode(self):
+        """Thermostat change sets hvac mode."""
+        hass = _hass_with_climates({
+            "climate.salon": _climate_state("off"),
+            "climate.chambre": _climate_state("heat"),
+        })
+        entry = make_mock_entry()
+        entry.data[CONF_CLIMATE_ENTITIES] = ["climate.salon", "climate.chambre"]
+        entry.data[CONF_CLIMATE_MAX_PARALLEL] = 0
+        coordinator = HomeShiftCoordinator(hass, entry)
+
+        asyncio.get_event_loop().run_until_complete(coordinator.async_set_thermostat_mode("Chauffage"))
+
+        climate_calls = [c for c in hass.services.async_call.call_args_list if c.args[0] == "climate"]
+        assert len(climate_calls) == 1
+        assert climate_calls[0].args[1] == "set_hvac_mode"
+        assert climate_calls[0].args[2] == {"entity_id": ["climate.salon"], "hvac_mode": "heat"}
+
+    def test_no_climate_entities_no_calls(self):
+        """No climate entities no calls."""
+        hass = make_mock_hass()
+        coordinator = HomeShiftCoordinator(hass, make_mock_entry())
+        asyncio.get_event_loop().run_until_complete(coordinator.async_set_thermostat_mode("Chauffage"))
+        assert not [c for c in hass.services.async_call.call_args_list if c.args[0] == "climate"]
+
+    def test_day_mode_change_applies_setpoint_only(self):
+        """Day mode change applies setpoint only."""
+        hass = _hass_with_climates({
+            "climate.salon": _climate_state("off", temperature=17.0),
+            "climate.chambre": _climate_state("heat", temperature=17.0),
+            "climate.bureau": _climate_state("heat", temperature=20.5),
+        })
+        entry = make_mock_entry()
+        entry.data[CONF_CLIMATE_ENTITIES] = ["climate.salon", "climate.chambre", "climate.bureau"]
+        entry.data[CONF_CLIMATE_PRESETS] = "Remote/*:20.5"
+        coordinator = HomeShiftCoordinator(hass, entry)
+
+        with patch("custom_components.homeshift.coordinator.dt_util") as mock_dt:
+            mock_dt.now.return_value = datetime(2026, 3, 4, 9, 0, 0)
+            asyncio.get_event_loop().run_until_complete(coordinator.async_set_day_mode("Remote"))
+
+        climate_calls = [c for c in hass.services.async_call.call_args_list if c.args[0] == "climate"]
+        assert [(c.args[1], c.args[2]["entity_id"]) for c in climate_calls] == [
+            ("set_temperature", ["climate.chambre"]),
+        ]
+
+    def test_entities_switched_off_get_no_setpoint(self):
+        """Entities switched off get no setpoint."""
+        hass = _hass_with_climates({
+            "climate.salon": _climate_state("heat", temperature=17.0),
+            "climate.trv": _climate_state("heat", hvac_modes=("off", "heat"), temperature=17.0),
+        })
+        entry = make_mock_entry()
+        entry.data[CONF_CLIMATE_ENTITIES] = ["climate.salon", "climate.trv"]
+        entry.data[CONF_CLIMATE_MAX_PARALLEL] = 0
+        entry.data[CONF_CLIMATE_PRESETS] = "*/Cooling:24"
+        coordinator = HomeShiftCoordinator(hass, entry)
+
+        asyncio.get_event_loop().run_until_complete(coordinator.async_set_thermostat_mode("Cooling"))
+
+        climate_calls = [c for c in hass.services.async_call.call_args_list if c.args[0] == "climate"]
+        assert [(c.args[1], c.args[2]["entity_id"]) for c in climate_calls] == [
+            ("set_hvac_mode", ["climate.salon"]),
+            ("set_hvac_mode", ["climate.trv"]),
+            ("set_temperature", ["climate.salon"]),
+        ]
+
+    def test_entities_switched_on_get_setpoint(self):
+        """Entities switched from off to heat also get the setpoint of the new mode."""
+        hass = _hass_with_climates({"climate.salon": _climate_state("off", temperature=17.0)})
+        entry = make_mock_entry()
+        entry.data[CONF_CLIMATE_ENTITIES] = ["climate.salon"]
+        entry.data[CONF_CLIMATE_MAX_PARALLEL] = 0
+        entry.data[CONF_CLIMATE_PRESETS] = "*/Heating:20"
+        coordinator = HomeShiftCoordinator(hass, entry)
+
+        asyncio.get_event_loop().run_until_complete(coordinator.async_set_thermostat_mode("Chauffage"))
+
+        climate_calls = [c for c in hass.services.async_call.call_args_list if c.args[0] == "climate"]
+        assert [(c.args[1], c.args[2]) for c in climate_calls] == [
+            ("set_hvac_mode", {"entity_id": ["climate.salon"], "hvac_mode": "heat"}),
+            ("set_temperature", {"entity_id": ["climate.salon"], "temperature": 20.0}),
+        ]
@@ -16,6 +16,7 @@ from __future__ import annotations
 from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
+from custom_components.homeshift.calendar_cache import _parse_event_span
 from custom_components.homeshift.coordinator import HomeShiftCoordinator
 from custom_components.homeshift.const import (
     CONF_CALENDAR_ENTITY,
@@ -125,6 +126,35 @@ class TestDetectEventPeriod:
         result = HomeShiftCoordinator.detect_event_period("", "")
         assert result == EVENT_PERIOD_ALL_DAY
 
+    def test_morning_event_ending_at_half_past_twelve(self):
+        """An event ending at 12:30 is a morning event, not all day."""
+        result = HomeShiftCoordinator.detect_event_period("2026-03-12 08:00:00", "2026-03-12 12:30:00")
+        assert result == EVENT_PERIOD_MORNING
+
+    def test_iso_dates(self):
+        """Date-only values describe an all-day event."""
+        assert HomeShiftCoordinator.detect_event_period("2026-03-03", "2026-03-04") == EVENT_PERIOD_ALL_DAY
+
+    def test_iso_with_offset(self):
+        """Offsets are honoured: 09:00-05:00 is 14:00 in the (UTC) local time zone."""
+        assert (
+            HomeShiftCoordinator.detect_event_period("2026-03-12T08:00:00Z", "2026-03-12T11:30:00Z")
+            == EVENT_PERIOD_MORNING
+        )
+        assert (
+            HomeShiftCoordinator.detect_event_period("2026-03-12T09:00:00-05:00", "2026-03-12T12:00:00-05:00")
+            == EVENT_PERIOD_AFTERNOON
+        )
+
+    def test_parsing_is_memoized(self):
+        """The same start/end pair is parsed once."""
+        before = _parse_event_span.cache_info()
+        for _ in range(3):
+            HomeShiftCoordinator.detect_event_period("2026-05-07 08:15:00", "2026-05-07 09:45:00")
+        after = _parse_event_span.cache_info()
+        assert after.misses - before.misses == 1
+        assert after.hits - before.hits == 2
+
 
 # ---------------------------------------------------------------------------
 # parse_event_mode_map unit tests
@@ -0,0 +1,104 @@
+"""Tests for the per-day UTC transition tables (DST handling)."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.homeshift.calendar_cache import parse_event_time
+from custom_components.homeshift.day_table import day_table, is_repeated, is_skipped, local_day_table, local_to_utc
+from custom_components.homeshift.transitions import REASON_SEGMENT, REASON_MIDNIGHT, transition_candidates
+
+PARIS = ZoneInfo("Europe/Paris")
+SPRING = date(2026, 3, 29)
+AUTUMN = date(2026, 10, 25)
+
+
+def _utc(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _paris():
+    """Run every test in the Europe/Paris time zone."""
+    dt_util.set_default_time_zone(PARIS)
+    yield
+    dt_util.set_default_time_zone(dt_util.UTC)
+
+
+class TestLocalToUtc:
+    """Verify skipped and repeated local times."""
+
+    def test_regular_time(self):
+        """An ordinary local time converts with the day's offset."""
+        assert local_to_utc(datetime(2026, 3, 4, 13, 0), PARIS) == _utc(date(2026, 3, 4), 12)
+
+    def test_skipped_time_maps_to_end_of_gap(self):
+        """02:30 does not exist on the spring day: 03:00 CEST is used."""
+        local = datetime(2026, 3, 29, 2, 30)
+        assert is_skipped(local, PARIS)
+        assert local_to_utc(local, PARIS) == _utc(SPRING, 1)
+
+    def test_repeated_time_maps_to_first_occurrence(self):
+        """02:30 occurs twice on the autumn day: the CEST one is used."""
+        local = datetime(2026, 10, 25, 2, 30)
+        assert is_repeated(local, PARIS)
+        assert not is_repeated(datetime(2026, 10, 25, 3, 30), PARIS)
+        assert local_to_utc(local, PARIS) == _utc(AUTUMN, 0, 30)
+
+
+class TestDayTable:
+    """Verify the boundaries of ordinary and DST days."""
+
+    def test_ordinary_day(self):
+        """A winter day lasts 24 hours without clock change."""
+        table = day_table(date(2026, 3, 4), PARIS)
+        assert table.start == _utc(date(2026, 3, 3), 23)
+        assert table.segment_start("afternoon") == _utc(date(2026, 3, 4), 12)
+        assert table.length == timedelta(hours=24)
+        assert table.clock_change is None
+
+    def test_spring_day(self):
+        """The spring day lasts 23 hours and the afternoon starts at 11:00 UTC."""
+        table = day_table(SPRING, PARIS)
+        assert table.length == timedelta(hours=23)
+        assert table.segment_start("afternoon") == _utc(SPRING, 11)
+        assert table.clock_change == _utc(SPRING, 1)
+
+    def test_autumn_day(self):
+        """The autumn day lasts 25 hours and the afternoon starts at 12:00 UTC."""
+        table = day_table(AUTUMN, PARIS)
+        assert table.length == timedelta(hours=25)
+        assert table.segment_start("afternoon") == _utc(AUTUMN, 12)
+        assert table.end == _utc(AUTUMN, 23)
+        assert table.clock_change == _utc(AUTUMN, 1)
+
+    def test_tables_are_cached(self):
+        """The same table object is returned for the same day."""
+        assert day_table(SPRING, PARIS) is day_table(SPRING, PARIS)
+
+    def test_local_day_of_utc_instant(self):
+        """A UTC instant late in the evening belongs to the next local day."""
+        assert local_day_table(_utc(date(2026, 3, 3), 23, 30)).day == date(2026, 3, 4)
+
+
+class TestDstTransitions:
+    """Verify predictions and event parsing on DST days."""
+
+    def test_candidates_on_spring_day(self):
+        """Segment and midnight candidates follow the shortened day."""
+        now = datetime(2026, 3, 29, 1, 30, tzinfo=PARIS)
+        assert transition_candidates(now, []) == [(_utc(SPRING, 11), REASON_SEGMENT), (_utc(SPRING, 22), REASON_MIDNIGHT)]
+
+    def test_naive_event_time_in_gap(self):
+        """A naive event time inside the skipped hour maps to the end of the gap."""
+        assert parse_event_time("2026-03-29T02:30:00") == _utc(SPRING, 1)
+
+    def test_all_day_event_on_autumn_day(self):
+        """An all-day event on the autumn day spans 25 hours."""
+        # Subtract in UTC: same-tzinfo arithmetic would ignore the DST change
+        start = dt_util.as_utc(parse_event_time("2026-10-25"))
+        end = dt_util.as_utc(parse_event_time("2026-10-26"))
+        assert end - start == timedelta(hours=25)
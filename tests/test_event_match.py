@@ -0,0 +1,125 @@
+"""Tests for event keyword matching over several event fields."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+from custom_components.homeshift.const import CONF_EVENT_MATCH_FIELDS
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+from custom_components.homeshift.event_match import EventMatcher, event_text, fold_accents, within_distance
+from custom_components.homeshift.transitions import event_spans
+
+from .conftest import make_calendar_state, make_mock_entry, make_mock_hass
+
+EVENT = {
+    "summary": "Réunion d'équipe",
+    "description": "Ordre du jour",
+    "location": "Site B — TLT",
+    "categories": ["Travail", "TLT"],
+}
+
+
+class TestEventText:
+    """Verify the normalized match text."""
+
+    def test_one_line_per_field(self):
+        """Fields are case-folded, single-spaced and joined line by line."""
+        text = event_text({"summary": "  Foo   BAR ", "categories": ["A", "b"]}, ("summary", "location", "categories"))
+        assert text == "foo bar\n\na, b"
+
+    def test_state_message_is_the_summary(self):
+        """The calendar entity's message attribute is read as the summary."""
+        assert event_text({"message": "Télétravail"}) == "télétravail"
+
+
+class TestEventMatcher:
+    """Verify the compiled keyword index."""
+
+    def test_summary_only_by_default(self):
+        """Without configuration, only the summary is searched."""
+        assert EventMatcher(["tlt"]).match(EVENT) is None
+
+    def test_location_and_categories(self):
+        """Configured fields are searched in one pass."""
+        assert EventMatcher(["tlt"], ("summary", "location")).match(EVENT) == "tlt"
+        assert EventMatcher(["travail"], ("categories",)).match(EVENT) == "travail"
+
+    def test_priority_order(self):
+        """The first configured keyword wins, even inside a longer match."""
+        matcher = EventMatcher(["télé", "télétravail"])
+        assert matcher.match({"summary": "Télétravail"}) == "télé"
+        matcher = EventMatcher(["vacances", "télétravail"])
+        assert matcher.match({"summary": "Télétravail puis vacances"}) == "vacances"
+
+    def test_unknown_fields_are_ignored(self):
+        """Unknown field names fall back to the summary."""
+        assert EventMatcher(["x"], ("attendees",)).fields == ("summary",)
+
+    def test_span_text(self):
+        """Event spans carry the match text of the configured fields."""
+        span = event_spans([{**EVENT, "start": "2026-03-04", "end": "2026-03-05"}], ("location",))[0]
+        assert span.text == "site b — tlt"
+
+
+class TestTolerantMatch:
+    """Verify accent-folded, regex and fuzzy matching."""
+
+    def test_accent_folding(self):
+        """Folded keywords and titles match whatever their accents."""
+        assert fold_accents("Télétravail à Noël") == "Teletravail a Noel"
+        assert EventMatcher(["télétravail"]).match({"summary": "Teletravail"}) is None
+        assert EventMatcher(["télétravail"], fold=True).match({"summary": "TELETRAVAIL"}) == "télétravail"
+
+    def test_regex_keyword(self):
+        """A /pattern/ keyword is a case-insensitive regular expression."""
+        matcher = EventMatcher(["/^t[eé]l[eé]?travail\\b/", "vacances"])
+        assert matcher.match({"summary": "Teletravail jeudi"}) == "/^t[eé]l[eé]?travail\\b/"
+        assert matcher.match({"summary": "Jour de télétravail"}) is None
+
+    def test_invalid_regex_is_ignored(self):
+        """A keyword that does not compile is dropped."""
+        assert EventMatcher(["/(/", "vacances"]).keywords == ["vacances"]
+
+    def test_edit_distance(self):
+        """Approximate substring search counts insertions, deletions and substitutions."""
+        assert within_distance("télétravail", "jour de télétravial", 2)
+        assert not within_distance("télétravail", "jour de travail", 2)
+
+    def test_typos_only_without_exact_match(self):
+        """Typos are tolerated for long keywords, after every exact keyword."""
+        matcher = EventMatcher(["télétravail", "vacances"], max_distance=1)
+        assert matcher.match({"summary": "Télétravial"}) is None
+        assert EventMatcher(["télétravail"], max_distance=2).match({"summary": "Télétravial"}) == "télétravail"
+        assert matcher.match({"summary": "Télétravai puis vacances"}) == "vacances"
+        assert EventMatcher(["tlt"], max_distance=1).match({"summary": "tat"}) is None
+
+    def test_match_cache(self):
+        """A recurring title is matched once."""
+        matcher = EventMatcher(["télétravail"], fold=True, max_distance=1)
+        for _ in range(3):
+            matcher.match({"summary": "Teletravail"})
+        cache = matcher.diagnostics()["cache"]
+        assert (cache["misses"], cache["hits"]) == (1, 2)
+
+
+class TestCoordinatorMatch:
+    """Verify the coordinator matches the configured fields."""
+
+    def test_location_code(self):
+        """A work-location code in the location selects the mapped mode."""
+        hass = make_mock_hass()
+        calendar_state = make_calendar_state("on", "Réunion", "2026-03-04 00:00:00", "2026-03-05 00:00:00")
+        calendar_state.attributes["location"] = "Télétravail (domicile)"
+        hass.states.get.side_effect = lambda entity_id: calendar_state if entity_id == "calendar.teletravail" else None
+        entry = make_mock_entry()
+        entry.data[CONF_EVENT_MATCH_FIELDS] = ["summary", "location"]
+        coordinator = HomeShiftCoordinator(hass, entry)
+        with (
+            patch("custom_components.homeshift.coordinator.dt_util") as mock_dt,
+            patch("custom_components.homeshift.coordinator.async_track_point_in_utc_time"),
+        ):
+            mock_dt.now.return_value = datetime(2026, 3, 4, 9, 0)
+            asyncio.get_event_loop().run_until_complete(coordinator.async_update_data())
+        assert coordinator.day_mode == "Télétravail"
+        assert coordinator.current_event == "Réunion"
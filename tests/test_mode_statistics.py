@@ -0,0 +1,152 @@
+"""Tests for ModeStatistics: hourly time-per-mode counters and recorder push."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.homeshift.const import (
+    STATISTIC_KIND_DAY_MODE,
+    STATISTIC_KIND_THERMOSTAT_MODE,
+    STATISTICS_MAX_PENDING_HOURS,
+)
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+from custom_components.homeshift.mode_statistics import ModeStatistics
+
+from .conftest import make_mock_hass, make_mock_entry
+
+UTC = timezone.utc
+
+
+def _utc(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 3, 12, hour, minute, tzinfo=UTC)
+
+
+class TestModeStatisticsAccumulation:
+    """Verify that elapsed time is credited to the right mode and hour."""
+
+    def test_first_sample_records_nothing(self):
+        """First sample records nothing."""
+        stats = ModeStatistics(MagicMock(), "entry")
+        stats.track(_utc(9), "Work", "Heating")
+        assert not stats.pending_hours
+
+    def test_elapsed_time_credited_to_previous_modes(self):
+        """Elapsed time credited to previous modes."""
+        stats = ModeStatistics(MagicMock(), "entry")
+        stats.track(_utc(9, 0), "Work", "Heating")
+        stats.track(_utc(9, 30), "Remote", "Heating")
+        bucket = stats.bucket(_utc(9))
+        assert bucket[(STATISTIC_KIND_DAY_MODE, "Work")] == 1800
+        assert bucket[(STATISTIC_KIND_THERMOSTAT_MODE, "Heating")] == 1800
+        assert (STATISTIC_KIND_DAY_MODE, "Remote") not in bucket
+
+    def test_interval_split_across_hours(self):
+        """Interval split across hours."""
+        stats = ModeStatistics(MagicMock(), "entry")
+        stats.track(_utc(9, 45), "Work", None)
+        stats.track(_utc(11, 15), "Work", None)
+        assert stats.pending_hours == [_utc(9), _utc(10), _utc(11)]
+        assert stats.bucket(_utc(9))[(STATISTIC_KIND_DAY_MODE, "Work")] == 900
+        assert stats.bucket(_utc(10))[(STATISTIC_KIND_DAY_MODE, "Work")] == 3600
+        assert stats.bucket(_utc(11))[(STATISTIC_KIND_DAY_MODE, "Work")] == 900
+        assert (STATISTIC_KIND_THERMOSTAT_MODE, None) not in stats.bucket(_utc(10))
+
+    def test_statistic_id_is_slugified(self):
+        """Statistic id is slugified."""
+        stats = ModeStatistics(MagicMock(), "01ABC")
+        assert stats.statistic_id(STATISTIC_KIND_DAY_MODE, "Remote") == "homeshift:day_mode_01abc_remote"
+
+
+class TestModeStatisticsPush:
+    """Verify that completed hours are pushed once with a running sum."""
+
+    def _stats(self) -> tuple[ModeStatistics, list]:
+        hass = MagicMock()
+        hass.config.components = {"recorder"}
+        stats = ModeStatistics(hass, "entry")
+        pushed: list = []
+        stats._async_get_last_sum = AsyncMock(return_value=(None, 10.0))  # pylint: disable=protected-access
+        stats._async_add_statistics = lambda stat_id, kind, key, rows: pushed.append((stat_id, rows))  # pylint: disable=protected-access
+        return stats, pushed
+
+    def test_only_completed_hours_pushed(self):
+        """Only completed hours pushed."""
+        stats, pushed = self._stats()
+        stats.track(_utc(9, 0), "Work", None)
+        stats.track(_utc(10, 30), "Work", None)
+        asyncio.get_event_loop().run_until_complete(stats.async_push_completed(_utc(10, 30)))
+
+        assert len(pushed) == 1
+        stat_id, rows = pushed[0]
+        assert stat_id == "homeshift:day_mode_entry_work"
+        assert rows == [{"start": _utc(9), "state": 1.0, "sum": 11.0}]
+        assert stats.pending_hours == [_utc(10)]
+
+    def test_running_sum_continues_without_recorder_query(self):
+        """Running sum continues without recorder query."""
+        stats, pushed = self._stats()
+        stats.track(_utc(9, 0), "Work", None)
+        stats.track(_utc(10, 0), "Work", None)
+        asyncio.get_event_loop().run_until_complete(stats.async_push_completed(_utc(10, 0)))
+        stats.track(_utc(11, 0), "Work", None)
+        asyncio.get_event_loop().run_until_complete(stats.async_push_completed(_utc(11, 0)))
+
+        assert [rows[0]["sum"] for _, rows in pushed] == [11.0, 12.0]
+        stats._async_get_last_sum.assert_awaited_once()  # pylint: disable=protected-access
+
+    def test_no_push_without_recorder(self):
+        """No push without recorder."""
+        stats, pushed = self._stats()
+        stats.hass.config.components = set()
+        stats.track(_utc(9, 0), "Work", None)
+        stats.track(_utc(10, 30), "Work", None)
+        asyncio.get_event_loop().run_until_complete(stats.async_push_completed(_utc(10, 30)))
+        assert not pushed
+        assert stats.pending_hours == [_utc(9), _utc(10)]
+
+    def test_backlog_capped_without_recorder(self):
+        """Without recorder, only the latest completed hours are kept."""
+        stats, pushed = self._stats()
+        stats.hass.config.components = set()
+        stats.track(datetime(2026, 3, 10, 0, 0, tzinfo=UTC), "Work", None)
+        stats.track(_utc(10, 30), "Work", None)
+        asyncio.get_event_loop().run_until_complete(stats.async_push_completed(_utc(10, 30)))
+        assert len(stats.pending_hours) == STATISTICS_MAX_PENDING_HOURS + 1
+        assert stats.pending_hours[0] == datetime(2026, 3, 10, 10, tzinfo=UTC)
+
+    def test_failed_query_keeps_hours(self):
+        """Hours are kept when the recorder query fails, and pushed once on retry."""
+        stats, pushed = self._stats()
+        stats._async_get_last_sum.side_effect = [RuntimeError("database locked"), (None, 10.0)]  # pylint: disable=protected-access
+        stats.track(_utc(9, 0), "Work", None)
+        stats.track(_utc(10, 30), "Work", None)
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(stats.async_push_completed(_utc(10, 30)))
+        assert not pushed
+        assert stats.pending_hours == [_utc(9), _utc(10)]
+
+        loop.run_until_complete(stats.async_push_completed(_utc(10, 30)))
+        assert pushed == [("homeshift:day_mode_entry_work", [{"start": _utc(9), "state": 1.0, "sum": 11.0}])]
+        assert stats.pending_hours == [_utc(10)]
+
+
+class TestCoordinatorStatistics:
+    """Verify that the coordinator reports mode changes to the accumulator."""
+
+    def test_manual_change_credits_previous_mode(self):
+        """Manual change credits previous mode."""
+        hass = make_mock_hass()
+        coordinator = HomeShiftCoordinator(hass, make_mock_entry())
+        coordinator.day_mode = "Travail"
+        loop = asyncio.get_event_loop()
+
+        with patch("custom_components.homeshift.coordinator.dt_util") as mock_dt:
+            mock_dt.now.return_value = _utc(9, 0)
+            loop.run_until_complete(coordinator.async_set_thermostat_mode("Heating"))
+            mock_dt.now.return_value = _utc(9, 20)
+            loop.run_until_complete(coordinator.async_set_day_mode("Télétravail"))
+
+        bucket = coordinator.statistics.bucket(_utc(9))
+        assert bucket[(STATISTIC_KIND_DAY_MODE, "Work")] == 1200
+        assert bucket[(STATISTIC_KIND_THERMOSTAT_MODE, "Heating")] == 1200
@@ -0,0 +1,187 @@
+"""Tests for the incremental household presence aggregation and its effect on the day mode."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from custom_components.homeshift.const import (
+    CONF_GUEST_ENTITIES,
+    CONF_PRESENCE_ENTITIES,
+    PRESENCE_ALL_AWAY,
+    PRESENCE_GUESTS,
+    PRESENCE_SOMEONE_HOME,
+)
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+from custom_components.homeshift.presence import PresenceTracker
+
+from .conftest import DEFAULT_MODE_ABSENCE, DEFAULT_MODE_DEFAULT, make_calendar_state, make_mock_entry, make_mock_hass
+
+RESIDENTS = ["person.alice", "person.bob"]
+GUESTS = ["input_boolean.guests"]
+
+
+def _state(value: str) -> MagicMock:
+    mock_state = MagicMock()
+    mock_state.state = value
+    return mock_state
+
+
+def _hass(states: dict[str, str]) -> MagicMock:
+    hass = make_mock_hass()
+    calendar_state = make_calendar_state(state="off")
+    hass.states.get.side_effect = lambda entity_id: _state(states[entity_id]) if entity_id in states else calendar_state
+    # Refreshes requested by presence changes are driven explicitly by the tests
+    hass.async_create_task.side_effect = lambda coro: coro.close()
+    return hass
+
+
+def _start(tracker: PresenceTracker, on_change=None):
+    """Start the tracker and return the state-change listener it registered."""
+    with patch("custom_components.homeshift.presence.async_track_state_change_event") as mock_track:
+        tracker.async_start(on_change or (lambda _presence: None))
+    return mock_track.call_args.args[2]
+
+
+def _event(entity_id: str, value: str) -> MagicMock:
+    event = MagicMock()
+    event.data = {"entity_id": entity_id, "new_state": _state(value)}
+    return event
+
+
+class TestPresenceTracker:
+    """Verify the aggregated presence state and its incremental updates."""
+
+    def test_seeded_from_current_states(self):
+        """Seeded from current states."""
+        tracker = PresenceTracker(_hass({"person.alice": "home", "person.bob": "not_home"}), RESIDENTS, [])
+        _start(tracker)
+        assert tracker.state == PRESENCE_SOMEONE_HOME
+        assert tracker.residents_home == 1
+
+    def test_not_configured(self):
+        """Not configured."""
+        tracker = PresenceTracker(make_mock_hass(), [], [])
+        assert not tracker.configured
+        assert tracker.state is None
+
+    def test_guests_take_precedence(self):
+        """Guests take precedence."""
+        tracker = PresenceTracker(_hass({"person.alice": "not_home", "input_boolean.guests": "on"}), RESIDENTS, GUESTS)
+        _start(tracker)
+        assert tracker.state == PRESENCE_GUESTS
+
+    def test_on_change_only_when_aggregate_changes(self):
+        """On change only when aggregate changes."""
+        changes: list[str] = []
+        hass = _hass({"person.alice": "home", "person.bob": "home"})
+        tracker = PresenceTracker(hass, RESIDENTS, GUESTS)
+        listener = _start(tracker, changes.append)
+
+        listener(_event("person.alice", "Work"))
+        assert not changes
+        listener(_event("person.bob", "not_home"))
+        assert changes == [PRESENCE_ALL_AWAY]
+        listener(_event("input_boolean.guests", "on"))
+        assert changes == [PRESENCE_ALL_AWAY, PRESENCE_GUESTS]
+
+    def test_unreported_trackers_hold_presence_at_startup(self):
+        """Unknown or unavailable trackers do not count as away."""
+        changes: list[str] = []
+        hass = _hass({"person.alice": "unknown", "person.bob": "not_home", "input_boolean.guests": "unavailable"})
+        tracker = PresenceTracker(hass, RESIDENTS, GUESTS)
+        listener = _start(tracker, changes.append)
+        assert tracker.state is None
+
+        listener(_event("person.alice", "not_home"))
+        assert tracker.state is None
+        listener(_event("input_boolean.guests", "off"))
+        assert changes == [PRESENCE_ALL_AWAY]
+
+    def test_unavailable_tracker_keeps_previous_state(self):
+        """A tracker going unavailable keeps the previous state until it reports again."""
+        changes: list[str] = []
+        tracker = PresenceTracker(_hass({"person.alice": "home", "person.bob": "not_home"}), RESIDENTS, [])
+        listener = _start(tracker, changes.append)
+
+        listener(_event("person.alice", "unavailable"))
+        assert tracker.state == PRESENCE_SOMEONE_HOME
+        listener(_event("person.alice", "not_home"))
+        assert changes == [PRESENCE_ALL_AWAY]
+
+    def test_events_do_not_rescan_states(self):
+        """Events do not rescan states."""
+        hass = _hass({})
+        residents = [f"device_tracker.phone_{i}" for i in range(200)]
+        tracker = PresenceTracker(hass, residents, [])
+        listener = _start(tracker)
+        reads = hass.states.get.call_count
+
+        listener(_event("device_tracker.phone_7", "home"))
+        assert tracker.state == PRESENCE_SOMEONE_HOME
+        assert hass.states.get.call_count == reads
+
+
+class TestCoordinatorPresence:
+    """Verify that presence drives the absence mode."""
+
+    def _coordinator(self, hass) -> HomeShiftCoordinator:
+        entry = make_mock_entry()
+        entry.data[CONF_PRESENCE_ENTITIES] = RESIDENTS
+        entry.data[CONF_GUEST_ENTITIES] = GUESTS
+        coordinator = HomeShiftCoordinator(hass, entry)
+        coordinator.async_setup_listeners()
+        return coordinator
+
+    def _update(self, coordinator: HomeShiftCoordinator) -> dict:
+        with patch("custom_components.homeshift.coordinator.dt_util") as mock_dt:
+            mock_dt.now.return_value = datetime(2026, 3, 4, 10, 0, 0)
+            return asyncio.get_event_loop().run_until_complete(coordinator.async_update_data())
+
+    def test_everyone_away_switches_to_absence_and_back(self):
+        """Everyone away switches to absence and back."""
+        states = {"person.alice": "not_home", "person.bob": "not_home"}
+        with patch("custom_components.homeshift.presence.async_track_state_change_event") as mock_track:
+            coordinator = self._coordinator(_hass(states))
+        listener = mock_track.call_args.args[2]
+
+        result = self._update(coordinator)
+        assert coordinator.day_mode == DEFAULT_MODE_ABSENCE
+        assert result["presence"] == PRESENCE_ALL_AWAY
+
+        listener(_event("person.alice", "home"))
+        self._update(coordinator)
+        assert coordinator.day_mode == DEFAULT_MODE_DEFAULT
+
+    def test_startup_with_unknown_trackers_keeps_calendar_mode(self):
+        """Trackers not yet reported at startup do not switch to absence."""
+        states = {"person.alice": "unknown", "person.bob": "unavailable"}
+        with patch("custom_components.homeshift.presence.async_track_state_change_event"):
+            coordinator = self._coordinator(_hass(states))
+
+        result = self._update(coordinator)
+        assert coordinator.day_mode == DEFAULT_MODE_DEFAULT
+        assert result["presence"] is None
+
+    def test_manual_absence_still_blocks(self):
+        """Manual absence still blocks."""
+        states = {"person.alice": "home", "person.bob": "home"}
+        with patch("custom_components.homeshift.presence.async_track_state_change_event"):
+            coordinator = self._coordinator(_hass(states))
+        with patch("custom_components.homeshift.coordinator.dt_util") as mock_dt:
+            mock_dt.now.return_value = datetime(2026, 3, 4, 9, 0, 0)
+            asyncio.get_event_loop().run_until_complete(coordinator.async_set_day_mode(DEFAULT_MODE_ABSENCE))
+
+        self._update(coordinator)
+        assert coordinator.day_mode == DEFAULT_MODE_ABSENCE
+
+    def test_presence_change_requests_refresh(self):
+        """Presence change requests refresh."""
+        hass = _hass({"person.alice": "home", "person.bob": "not_home"})
+        with patch("custom_components.homeshift.presence.async_track_state_change_event") as mock_track:
+            coordinator = self._coordinator(hass)
+        listener = mock_track.call_args.args[2]
+        with patch.object(coordinator, "async_request_refresh", MagicMock()) as mock_refresh:
+            listener(_event("person.alice", "not_home"))
+        mock_refresh.assert_called_once()
+        hass.async_create_task.assert_called_once()
@@ -0,0 +1,199 @@
+"""Tests for the built-in public holidays and their use by the coordinator."""
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.homeshift.const import CONF_HOLIDAY_CALENDAR, CONF_HOLIDAY_COUNTRY, CONF_HOLIDAY_SUBDIVISION
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+from custom_components.homeshift.ics_feed import parse_ics
+from custom_components.homeshift.holiday_tables import easter_sunday
+from custom_components.homeshift.public_holidays import (
+    _PROVIDERS,
+    HOLIDAY_CACHE_SIZE,
+    HolidayProvider,
+    get_provider,
+    holiday_names,
+    is_public_holiday,
+    public_holidays,
+    register_provider,
+)
+
+from .conftest import DEFAULT_MODE_DEFAULT, DEFAULT_MODE_HOLIDAY, make_calendar_state, make_mock_entry, make_mock_hass
+
+JOURS_FERIES_ICS = Path(__file__).parent.parent / "calendars" / "jours_feries_fr.ics"
+
+
+class TestEaster:
+    """Easter Sunday computus."""
+
+    @pytest.mark.parametrize(
+        ("year", "expected"),
+        [
+            (2024, date(2024, 3, 31)),
+            (2025, date(2025, 4, 20)),
+            (2026, date(2026, 4, 5)),
+            (2038, date(2038, 4, 25)),
+            (2285, date(2285, 3, 22)),
+        ],
+    )
+    def test_known_dates(self, year, expected):
+        """Known Easter dates, including the earliest and latest possible ones."""
+        assert easter_sunday(year) == expected
+
+
+class TestFrenchHolidays:
+    """French public holidays by year and department."""
+
+    def test_matches_bundled_calendar(self):
+        """The national holidays of 2026 are those of the bundled ICS calendar."""
+        events = parse_ics(JOURS_FERIES_ICS.read_text(encoding="utf-8"))
+        assert public_holidays("FR", 2026) == {event.start for event in events}
+
+    def test_movable_feasts(self):
+        """Easter Monday, Ascension and Whit Monday follow Easter."""
+        names = holiday_names("FR", 2025)
+        assert names[date(2025, 4, 21)] == "Lundi de Pâques"
+        assert names[date(2025, 5, 29)] == "Ascension"
+        assert names[date(2025, 6, 9)] == "Lundi de Pentecôte"
+        assert len(names) == 11
+
+    def test_alsace_moselle(self):
+        """Alsace-Moselle adds Good Friday and St Stephen's Day."""
+        holidays = public_holidays("FR", 2026, "57")
+        assert date(2026, 4, 3) in holidays
+        assert date(2026, 12, 26) in holidays
+        assert date(2026, 4, 3) not in public_holidays("FR", 2026)
+
+    def test_overseas_department(self):
+        """An overseas department adds its abolition of slavery day."""
+        assert public_holidays("FR", 2026, "974") - public_holidays("FR", 2026) == {date(2026, 12, 20)}
+
+    def test_cached_per_year(self):
+        """A year is computed once and kept as a frozen set in a bounded cache."""
+        holidays = public_holidays("FR", 2031)
+        assert isinstance(holidays, frozenset)
+        assert public_holidays("FR", 2031) is holidays
+        assert public_holidays.cache_info().maxsize == HOLIDAY_CACHE_SIZE
+
+    def test_is_public_holiday(self):
+        """Lookups by country; unknown countries have no holidays."""
+        assert is_public_holiday(date(2026, 7, 14), "fr")
+        assert is_public_holiday(date(2026, 12, 26), "FR", " 67 ")
+        assert not is_public_holiday(date(2026, 7, 15), "FR")
+        assert not is_public_holiday(date(2026, 7, 14), "XX")
+
+
+class TestHolidayTables:
+    """Holiday tables of the other built-in countries."""
+
+    def test_weekday_rules(self):
+        """Holidays on the nth or last weekday of a month."""
+        names = holiday_names("US", 2026)
+        assert names[date(2026, 11, 26)] == "Thanksgiving"
+        assert names[date(2026, 5, 25)] == "Memorial Day"
+        assert holiday_names("DE", 2026, "SN")[date(2026, 11, 18)] == "Buß- und Bettag"
+
+    def test_nearest_weekday_substitute(self):
+        """US holidays on a Saturday are observed the Friday before, even across years."""
+        assert date(2026, 7, 3) in public_holidays("US", 2026)
+        assert holiday_names("US", 2021)[date(2021, 12, 31)] == "New Year's Day (observed)"
+
+    def test_next_weekday_substitute(self):
+        """UK holidays on a weekend move to the next free weekday."""
+        assert public_holidays("GB", 2027) >= {date(2027, 12, 27), date(2027, 12, 28)}
+        assert public_holidays("GB", 2022, "SCT") >= {date(2022, 1, 3), date(2022, 1, 4)}
+
+    def test_subdivisions(self):
+        """Subdivisions add their holidays; GB defaults to England."""
+        assert date(2026, 6, 4) in public_holidays("DE", 2026, "BY")
+        assert date(2026, 6, 4) not in public_holidays("DE", 2026)
+        assert date(2027, 3, 29) in public_holidays("GB", 2027)
+        assert date(2027, 3, 29) not in public_holidays("GB", 2027, "SCT")
+
+    def test_year_range(self):
+        """Rules limited to some years."""
+        assert date(2017, 10, 31) in public_holidays("DE", 2017)
+        assert date(2018, 10, 31) not in public_holidays("DE", 2018)
+        assert date(2018, 5, 9) not in public_holidays("LU", 2018)
+        assert date(2019, 5, 9) in public_holidays("LU", 2019)
+
+    def test_register_provider(self):
+        """A custom provider adds a country."""
+
+        class IslandProvider(HolidayProvider):
+            country = "zz"
+
+            def holidays(self, year, subdivision=""):
+                return {date(year, 3, 3): "Island Day"}
+
+        register_provider(IslandProvider())
+        try:
+            assert is_public_holiday(date(2026, 3, 3), "ZZ")
+            assert get_provider("zz").subdivisions == ()
+        finally:
+            _PROVIDERS.pop("ZZ")
+            public_holidays.cache_clear()
+
+    def test_provider_must_implement_holidays(self):
+        """A provider without holidays() fails when created, not on first lookup."""
+
+        class IncompleteProvider(HolidayProvider):
+            country = "zz"
+
+        with pytest.raises(TypeError):
+            IncompleteProvider()
+
+
+class TestCoordinatorHolidays:
+    """Coordinator with a holiday country instead of a holiday calendar."""
+
+    def _coordinator(self, hass, **data):
+        entry = make_mock_entry(holiday_calendar="")
+        entry.data.update(data)
+        coordinator = HomeShiftCoordinator(hass, entry)
+        coordinator.day_mode = DEFAULT_MODE_DEFAULT
+        return coordinator
+
+    def _update(self, coordinator, now):
+        with patch("custom_components.homeshift.coordinator.dt_util") as mock_dt:
+            mock_dt.now.return_value = now
+            asyncio.get_event_loop().run_until_complete(coordinator.async_update_data())
+
+    def test_holiday_without_calendar(self):
+        """Ascension is a holiday without any holiday calendar entity."""
+        hass = make_mock_hass()
+        hass.states.get.side_effect = lambda entity_id: make_calendar_state(state="off") if entity_id == "calendar.teletravail" else None
+        coordinator = self._coordinator(hass, **{CONF_HOLIDAY_COUNTRY: "FR"})
+
+        self._update(coordinator, datetime(2026, 5, 14, 10, 0, 0))
+
+        assert coordinator.day_mode == DEFAULT_MODE_HOLIDAY
+        assert all(entity_id != "" for (entity_id,), _kwargs in hass.states.get.call_args_list)
+
+    def test_regional_holiday(self):
+        """Good Friday is only a holiday in the configured region."""
+        hass = make_mock_hass()
+        hass.states.get.return_value = make_calendar_state(state="off")
+        national = self._coordinator(hass, **{CONF_HOLIDAY_COUNTRY: "FR"})
+        regional = self._coordinator(hass, **{CONF_HOLIDAY_COUNTRY: "FR", CONF_HOLIDAY_SUBDIVISION: "68"})
+
+        for coordinator in (national, regional):
+            self._update(coordinator, datetime(2026, 4, 3, 10, 0, 0))
+
+        assert national.day_mode == DEFAULT_MODE_DEFAULT
+        assert regional.day_mode == DEFAULT_MODE_HOLIDAY
+
+    def test_predicts_tomorrow(self):
+        """With a country, holidays are known ahead, so predictions see them."""
+        hass = make_mock_hass()
+        hass.states.get.return_value = make_calendar_state(state="off")
+        coordinator = self._coordinator(hass, **{CONF_HOLIDAY_COUNTRY: "FR", CONF_HOLIDAY_CALENDAR: "calendar.jours_feries"})
+        coordinator._today_date = date(2026, 5, 13)
+
+        assert coordinator._is_holiday(date(2026, 5, 14))
+        assert not coordinator._is_holiday(date(2026, 5, 13))
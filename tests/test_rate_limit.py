@@ -0,0 +1,142 @@
+"""Tests for the token-bucket rate limiter shared by HomeShift device service calls."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.homeshift.rate_limit import ServiceCallLimiter, TokenBucket, get_rate_limiter
+from custom_components.homeshift.schedulers import async_apply_scheduler_changes
+
+from .conftest import make_mock_hass
+
+PLATFORMS = {"switch.zw_1": "zwave_js", "switch.zw_2": "zwave_js", "switch.zb_1": "zha"}
+
+
+def _registry() -> MagicMock:
+    registry = MagicMock()
+
+    def _get(entity_id: str):
+        platform = PLATFORMS.get(entity_id) or ("zha" if entity_id.startswith("switch.zb_") else None)
+        return MagicMock(platform=platform) if platform else None
+
+    registry.async_get.side_effect = _get
+    return registry
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _hass() -> MagicMock:
+    """Return a mock hass running the limiter's background tasks on the test loop."""
+    hass = make_mock_hass()
+    hass.async_create_background_task.side_effect = lambda coro, _name: asyncio.get_event_loop().create_task(coro)
+    return hass
+
+
+class TestTokenBucket:
+    """Verify token accounting."""
+
+    def test_grants_up_to_available_tokens(self):
+        """Grants up to available tokens."""
+        bucket = TokenBucket(rate=1.0, burst=5)
+        assert _run(bucket.async_acquire(3)) == 3
+        assert _run(bucket.async_acquire(10)) == 2
+
+    def test_waits_for_refill(self):
+        """Waits for refill."""
+        bucket = TokenBucket(rate=200.0, burst=1)
+        assert _run(bucket.async_acquire(1)) == 1
+        assert _run(bucket.async_acquire(1)) == 1
+        assert bucket.queue_depth == 0
+
+
+class TestServiceCallLimiter:
+    """Verify per-integration pacing of service calls."""
+
+    def test_disabled_limiter_passes_through(self):
+        """Disabled limiter passes through."""
+        hass = make_mock_hass()
+        _run(async_apply_scheduler_changes(hass, {"switch.zw_1", "switch.zb_1"}, set()))
+        hass.services.async_call.assert_called_once_with(
+            "switch", "turn_on", {"entity_id": ["switch.zb_1", "switch.zw_1"]}, blocking=False
+        )
+
+    def test_calls_split_per_integration(self):
+        """Calls split per integration."""
+        hass = _hass()
+        limiter = get_rate_limiter(hass)
+        limiter.async_configure("entry", 10.0, 10)
+        with patch("custom_components.homeshift.rate_limit.er.async_get", return_value=_registry()):
+            _run(async_apply_scheduler_changes(hass, set(PLATFORMS) | {"switch.other"}, set()))
+            _run(limiter.async_wait())
+        batches = sorted(c.args[2]["entity_id"] for c in hass.services.async_call.call_args_list)
+        assert batches == [["switch.other"], ["switch.zb_1"], ["switch.zw_1", "switch.zw_2"]]
+
+    def test_burst_smoothed_in_token_sized_batches(self):
+        """Burst smoothed in token sized batches."""
+        hass = _hass()
+        limiter = get_rate_limiter(hass)
+        limiter.async_configure("entry", 500.0, 4)
+        entity_ids = [f"switch.zb_{i:02d}" for i in range(10)]
+        with patch("custom_components.homeshift.rate_limit.er.async_get", return_value=_registry()):
+            _run(limiter.async_call("switch", "turn_on", {"entity_id": entity_ids}))
+            _run(limiter.async_wait())
+        batches = [c.args[2]["entity_id"] for c in hass.services.async_call.call_args_list]
+        assert len(batches[0]) == 4
+        assert [e for batch in batches for e in batch] == entity_ids
+        assert limiter.throttled >= 1
+        assert limiter.diagnostics()["queue_depth"] == {"zha": 0}
+
+    def test_call_returns_once_queued(self):
+        """The caller does not wait for tokens; queued calls keep their order."""
+        hass = _hass()
+        limiter = get_rate_limiter(hass)
+        limiter.async_configure("entry", 50.0, 1)
+        with patch("custom_components.homeshift.rate_limit.er.async_get", return_value=_registry()):
+            _run(async_apply_scheduler_changes(hass, {"switch.zb_1", "switch.zb_2"}, {"switch.zb_3"}))
+            # Only the first batch could be sent, the rest waits for tokens in the background
+            assert hass.services.async_call.call_count == 1
+            assert limiter.diagnostics()["queue_depth"] == {"zha": 2}
+        calls = [(c.args[1], c.args[2]["entity_id"]) for c in hass.services.async_call.call_args_list]
+        assert calls == [("turn_off", ["switch.zb_3"])]
+        _run(limiter.async_wait())
+        calls = [(c.args[1], c.args[2]["entity_id"]) for c in hass.services.async_call.call_args_list]
+        assert calls == [("turn_off", ["switch.zb_3"]), ("turn_on", ["switch.zb_1"]), ("turn_on", ["switch.zb_2"])]
+
+    def test_failing_batch_does_not_stop_the_queue(self):
+        """A failing batch is logged and the following calls are still sent."""
+        hass = _hass()
+        hass.services.async_call.side_effect = [HomeAssistantError("unreachable"), {}]
+        limiter = get_rate_limiter(hass)
+        limiter.async_configure("entry", 10.0, 10)
+        with patch("custom_components.homeshift.rate_limit.er.async_get", return_value=_registry()):
+            _run(async_apply_scheduler_changes(hass, {"switch.zb_1"}, {"switch.zb_2"}))
+            _run(limiter.async_wait())
+        assert hass.services.async_call.call_count == 2
+
+    def test_unloading_last_entry_cancels_queued_calls(self):
+        """Unloading the last limited entry cancels what it left queued."""
+        hass = _hass()
+        limiter = get_rate_limiter(hass)
+        remove = limiter.async_configure("entry", 0.01, 1)
+        with patch("custom_components.homeshift.rate_limit.er.async_get", return_value=_registry()):
+            _run(limiter.async_call("switch", "turn_on", {"entity_id": ["switch.zb_1", "switch.zb_2"]}))
+            _run(asyncio.sleep(0))
+        remove()
+        _run(limiter.async_wait())
+        assert hass.services.async_call.call_count == 1
+        assert limiter.diagnostics()["queue_depth"] == {}
+
+    def test_strictest_entry_applies_until_unloaded(self):
+        """Strictest entry applies until unloaded."""
+        limiter = ServiceCallLimiter(make_mock_hass())
+        remove = limiter.async_configure("a", 2.0, 20)
+        limiter.async_configure("b", 5.0, 5)
+        assert (limiter.rate, limiter.burst) == (2.0, 5)
+        remove()
+        assert (limiter.rate, limiter.burst) == (5.0, 5)
+        limiter.async_configure("b", 0, 5)
+        assert limiter.rate == 0
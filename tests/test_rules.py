@@ -0,0 +1,192 @@
+"""Tests for the declarative day-mode rules and their decision table."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.homeshift.const import (
+    CONF_CALENDAR_ENTITY,
+    CONF_MODE_RULES,
+    CONF_WEEKDAY_MODES,
+    EVENT_NONE,
+    EVENT_PERIOD_MORNING,
+    PRESENCE_ALL_AWAY,
+)
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+from custom_components.homeshift.evaluation import CalendarEvaluation
+from custom_components.homeshift.rules import (
+    EVENT_OTHER,
+    PRESENCES,
+    build_decision_table,
+    parse_rule,
+    parse_rules,
+    parse_weekday_modes,
+)
+
+from .conftest import make_mock_entry, make_mock_hass
+
+DAY_MODES = {"Home": "Maison", "Work": "Travail", "Remote": "Télétravail", "Absence": "Absence"}
+EVENTS = {"vacances": "Maison", "télétravail": "Télétravail"}
+
+
+def _table(rules: str = "", weekday_modes: str = ""):
+    return build_decision_table(
+        rules, DAY_MODES, EVENTS, "Maison", "Maison", "Travail", mode_away="Absence", raw_weekday_modes=weekday_modes
+    )
+
+
+def _evaluation(weekday: int = 2, event: str = EVENT_NONE, **kwargs) -> CalendarEvaluation:
+    return CalendarEvaluation(event_type=event, is_weekend=weekday >= 5, weekday=weekday, **kwargs)
+
+
+class TestParse:
+    """Verify the rule grammar."""
+
+    def test_conditions(self):
+        """Every condition kind is parsed."""
+        rule = parse_rule("days=mon-wed,fri & holiday=no & event=Vacances & time=22:00-06:00 & presence=guests", "Maison")
+        assert rule.weekdays == frozenset({0, 1, 2, 4})
+        assert rule.holiday is False
+        assert rule.events == frozenset({"vacances"})
+        assert rule.window == (22 * 60, 6 * 60)
+        assert rule.presence == frozenset({"guests"})
+
+    def test_mode_key_resolution(self):
+        """Mode keys are resolved to display names, rules split on ';' and newlines."""
+        rules = parse_rules("days=fri => Remote; days=weekend => Home\n* => Work", DAY_MODES)
+        assert [rule.mode for rule in rules] == ["Télétravail", "Maison", "Travail"]
+
+    def test_invalid_rules_are_skipped(self):
+        """Rules with an unknown condition or no mode are ignored."""
+        rules = parse_rules("color=blue => Home; days=mon; period=evening => Home; days=tue => Remote", DAY_MODES)
+        assert [rule.text for rule in rules] == ["days=tue"]
+
+    def test_invalid_weekday(self):
+        """An unknown day name is rejected."""
+        with pytest.raises(ValueError):
+            parse_rule("days=someday", "Maison")
+
+
+class TestDecisionTable:
+    """Verify the compiled lookups."""
+
+    def test_built_in_priority(self):
+        """Without rules, the table follows away > event > weekend > holiday > default."""
+        table = _table()
+        assert table.lookup(_evaluation()) == "Travail"
+        assert table.lookup(_evaluation(is_holiday=True)) == "Maison"
+        assert table.lookup(_evaluation(5)) == "Maison"
+        assert table.lookup(_evaluation(5, "Télétravail")) == "Télétravail"
+        assert table.lookup(_evaluation(event="Dentiste")) == "Travail"
+        assert table.lookup(_evaluation(event="Télétravail", presence=PRESENCE_ALL_AWAY)) == "Absence"
+
+    def test_user_rule_comes_first(self):
+        """A configured rule overrides the built-in priority."""
+        table = _table("days=fri & event=none => Remote")
+        assert table.lookup(_evaluation(4)) == "Télétravail"
+        assert table.lookup(_evaluation(4, "Vacances")) == "Maison"
+        assert table.lookup(_evaluation(3)) == "Travail"
+
+    def test_period_and_any_event(self):
+        """Period and 'any' event conditions match the active event."""
+        table = _table("event=any & period=morning => Home")
+        assert table.lookup(_evaluation(event="Dentiste", event_period=EVENT_PERIOD_MORNING)) == "Maison"
+        assert table.lookup(_evaluation(event="Dentiste")) == "Travail"
+
+    def test_time_window_wraps_midnight(self):
+        """A window across midnight applies at both ends of the day only."""
+        table = _table("time=21:30-07:00 => Home")
+        assert table.time_edges == [7 * 60, 21 * 60 + 30]
+        assert table.lookup(_evaluation(minute=6 * 60 + 59)) == "Maison"
+        assert table.lookup(_evaluation(minute=12 * 60)) == "Travail"
+        assert table.lookup(_evaluation(minute=22 * 60)) == "Maison"
+        # Without a time of day the window never applies
+        assert table.lookup(_evaluation()) == "Travail"
+
+    def test_dump(self):
+        """The dump lists the rules, the input classes and one entry per combination of classes."""
+        dump = _table("time=08:00-12:00 => Remote").dump()
+        assert dump["rules"][0] == "time=08:00-12:00 => Télétravail"
+        assert dump["rules"][-1] == "* => Travail"
+        assert dump["dimensions"]["weekday"] == ["mon,tue,wed,thu,fri", "sat,sun"]
+        assert dump["dimensions"]["time"] == ["-,00:00-08:00,12:00-24:00", "08:00-12:00"]
+        # No rule tells "no event" from an unmapped event, nor looks at the period
+        assert dump["dimensions"]["event"] == ["None,*other*", "télétravail", "vacances"]
+        assert "period" not in dump["dimensions"]
+        assert dump["time_slots"] == ["00:00-08:00", "08:00-12:00", "12:00-24:00"]
+        assert dump["size"] == len(dump["table"]) == 2 * 2 * 3 * 2 * 2
+        key = "weekday=mon,tue,wed,thu,fri|holiday=no|event=None,*other*|time=08:00-12:00|presence=-,someone_home,guests"
+        assert dump["table"][key] == "Télétravail"
+
+    def test_classes_match_every_input(self):
+        """Compiling per class gives the first matching rule of every raw combination."""
+        table = _table(
+            "days=fri & event=none & time=13:00-18:00 => Remote; event=any & period=morning => Home; "
+            "presence=guests & holiday=yes => Work; segment=afternoon & days=weekend => Remote",
+            "Mon-Tue:Remote",
+        )
+        assert len(table) < 7 * 2 * 5 * 5 * 5 * 4
+        for key in itertools.product(range(7), (False, True), table._events, table._periods, (None, *range(len(table.slots))), PRESENCES):
+            slot = table.slots[key[4]] if key[4] is not None else None
+            expected = next((rule.mode for rule in table.rules if rule.matches(key, slot)), None)
+            evaluation = CalendarEvaluation(
+                event_type=key[2] if key[2] != EVENT_OTHER else "Dentiste",
+                event_period=key[3],
+                is_holiday=key[1],
+                is_weekend=key[0] >= 5,
+                weekday=key[0],
+                presence=key[5],
+                minute=slot[0] if slot else None,
+            )
+            assert table.lookup(evaluation) == expected, key
+
+
+class TestWeekdayModes:
+    """Verify the per-weekday default modes."""
+
+    def test_parse(self):
+        """Ranges and groups fill the seven slots, later pairs win."""
+        modes = parse_weekday_modes("workday:Work, Fri:Remote, Sun:Home, Someday:Home", DAY_MODES)
+        assert modes == ("Travail", "Travail", "Travail", "Travail", "Télétravail", None, "Maison")
+
+    def test_priority(self):
+        """Weekday modes come after events and before weekend, not on holidays."""
+        table = _table(weekday_modes="Fri:Remote, Sat:Work")
+        assert table.lookup(_evaluation(4)) == "Télétravail"
+        assert table.lookup(_evaluation(4, "Vacances")) == "Maison"
+        assert table.lookup(_evaluation(4, is_holiday=True)) == "Maison"
+        assert table.lookup(_evaluation(5)) == "Travail"
+        assert table.lookup(_evaluation(3)) == "Travail"
+        assert "days=fri & holiday=no => Télétravail" in table.dump()["rules"]
+
+    def test_without_calendar(self):
+        """Without a calendar entity the weekly pattern applies and no events are read."""
+        hass = make_mock_hass()
+        entry = make_mock_entry()
+        entry.data[CONF_CALENDAR_ENTITY] = ""
+        entry.data[CONF_WEEKDAY_MODES] = "Fri:Remote"
+        coordinator = HomeShiftCoordinator(hass, entry)
+        with (
+            patch("custom_components.homeshift.coordinator.dt_util") as mock_dt,
+            patch("custom_components.homeshift.coordinator.async_track_point_in_utc_time"),
+        ):
+            mock_dt.now.return_value = datetime(2026, 3, 6, 9, 0)
+            asyncio.get_event_loop().run_until_complete(coordinator.async_update_data())
+        assert coordinator.day_mode == "Télétravail"
+        hass.services.async_call.assert_not_called()
+
+
+class TestCoordinatorRules:
+    """Verify the coordinator compiles the configured rules."""
+
+    def test_rules_from_config(self):
+        """A Friday rule changes the coordinator decision."""
+        entry = make_mock_entry()
+        entry.data[CONF_MODE_RULES] = "days=fri => Remote"
+        coordinator = HomeShiftCoordinator(make_mock_hass(), entry)
+        assert coordinator.decision_table.lookup(_evaluation(4)) == "Télétravail"
+        assert coordinator.decision_table.lookup(_evaluation(3)) == "Travail"
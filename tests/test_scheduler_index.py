@@ -0,0 +1,221 @@
+"""Tests for the cached scheduler discovery index."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from custom_components.homeshift.scheduler_index import UNTAGGED_GROUP, get_scheduler_index
+from custom_components.homeshift.scheduler_storage import get_scheduler_storage
+from custom_components.homeshift.schedulers import plan_scheduler_changes
+
+from .conftest import make_mock_hass
+
+TAGS = {
+    "switch.schedule_salon": ["Chauffage"],
+    "switch.schedule_bureau": ["Chauffage", "Bureau"],
+    "switch.schedule_clim": ["Climatisation"],
+    "switch.schedule_untagged": [],
+}
+
+
+def _entry(entity_id: str, platform: str = "scheduler", area_id=None, device_id=None, labels=()) -> MagicMock:
+    entry = MagicMock()
+    entry.entity_id = entity_id
+    entry.domain = entity_id.split(".")[0]
+    entry.platform = platform
+    entry.name = None
+    entry.original_name = entity_id.split(".")[1]
+    entry.area_id = area_id
+    entry.device_id = device_id
+    entry.labels = set(labels)
+    return entry
+
+
+def _registry(extra: list[MagicMock] | None = None) -> MagicMock:
+    registry = MagicMock()
+    entries = [_entry(entity_id) for entity_id in TAGS] + (extra or [])
+    registry.entities = {entry.entity_id: entry for entry in entries}
+    return registry
+
+
+def _hass() -> MagicMock:
+    hass = make_mock_hass()
+
+    def _state(entity_id: str):
+        state = MagicMock()
+        state.attributes = {"friendly_name": entity_id.split("_", 1)[1].title(), "tags": TAGS.get(entity_id, [])}
+        return state
+
+    hass.states.get.side_effect = _state
+    return hass
+
+
+def _registries(registry):
+    """Patch the entity, device and area registries used by the index."""
+    device_registry = MagicMock()
+    device_registry.async_get.side_effect = lambda device_id: MagicMock(area_id=f"area_of_{device_id}")
+    area_registry = MagicMock()
+    area_registry.async_get_area.side_effect = lambda area_id: MagicMock()
+    return (
+        patch("custom_components.homeshift.scheduler_index.er.async_get", return_value=registry),
+        patch("custom_components.homeshift.scheduler_index.dr.async_get", return_value=device_registry),
+        patch("custom_components.homeshift.scheduler_index.ar.async_get", return_value=area_registry),
+    )
+
+
+def _index(hass, registry):
+    er_patch, dr_patch, ar_patch = _registries(registry)
+    with er_patch, dr_patch, ar_patch:
+        index = get_scheduler_index(hass)
+        index.async_track()
+        index.options()
+    return index
+
+
+class TestSchedulerIndex:
+    """Verify discovery, grouping, search and invalidation."""
+
+    def test_discovers_schedulers_only(self):
+        """Discovers schedulers only."""
+        registry = _registry([_entry("switch.lampe", "hue"), _entry("light.schedule_x", "hue"), _entry("switch.schedule_legacy", "template")])
+        index = _index(_hass(), registry)
+        assert sorted(index.schedulers) == sorted([*TAGS, "switch.schedule_legacy"])
+
+    def test_options_grouped_by_tag(self):
+        """Options grouped by tag."""
+        index = _index(_hass(), _registry())
+        labels = [option["label"] for option in index.options() if option["value"].startswith("switch.")]
+        assert labels[0].startswith("Chauffage · ")
+        assert labels[-1].startswith(f"{UNTAGGED_GROUP} · ")
+        assert index.entities_with_tag("Chauffage") == {"switch.schedule_salon", "switch.schedule_bureau"}
+        assert index.tags == ["Bureau", "Chauffage", "Climatisation"]
+
+    def test_search_keeps_selection(self):
+        """Search keeps selection."""
+        index = _index(_hass(), _registry())
+        found = [option["value"] for option in index.search("chauffage salon", keep=["switch.schedule_clim"])]
+        assert found == ["switch.schedule_salon", "switch.schedule_clim"]
+        assert index.search("") is index.options()
+
+    def test_built_once_until_registry_update(self):
+        """Built once until registry update."""
+        hass = _hass()
+        registry = _registry()
+        index = _index(hass, registry)
+        index.options()
+        index.search("salon")
+        assert index.builds == 1
+
+        listener = hass.bus.async_listen.call_args_list[0].args[1]
+        event_filter = hass.bus.async_listen.call_args_list[0].kwargs["event_filter"]
+        assert not event_filter({"action": "update", "entity_id": "light.salon"})
+        assert event_filter({"action": "create", "entity_id": "switch.schedule_new"})
+        listener(MagicMock(data={"action": "create", "entity_id": "switch.schedule_new"}))
+
+        registry.entities["switch.schedule_new"] = _entry("switch.schedule_new")
+        er_patch, dr_patch, ar_patch = _registries(registry)
+        with er_patch, dr_patch, ar_patch:
+            assert "switch.schedule_new" in index.schedulers
+        assert index.builds == 2
+
+    def test_tag_attribute_change_invalidates(self):
+        """A change of a switch's tags attribute drops the index."""
+        hass = _hass()
+        index = _index(hass, _registry())
+        listener = hass.bus.async_listen.call_args_list[2].args[1]
+        event_filter = hass.bus.async_listen.call_args_list[2].kwargs["event_filter"]
+        old_state = MagicMock(attributes={"tags": ["Chauffage"]})
+        new_state = MagicMock(attributes={"tags": ["Chauffage"]})
+        data = {"entity_id": "switch.schedule_salon", "old_state": old_state, "new_state": new_state}
+        assert not event_filter(data)
+        new_state.attributes = {"tags": ["Salon"]}
+        assert event_filter(data)
+        listener(MagicMock(data=data))
+
+        er_patch, dr_patch, ar_patch = _registries(_registry())
+        with er_patch, dr_patch, ar_patch:
+            index.options()
+        assert index.builds == 2
+
+    def test_shared_across_entries(self):
+        """Shared across entries, listening until the last one unloads."""
+        hass = _hass()
+        index = get_scheduler_index(hass)
+        assert get_scheduler_index(hass) is index
+        untrack_first = index.async_track()
+        untrack_second = index.async_track()
+        assert hass.bus.async_listen.call_count == 3
+
+        untrack_first()
+        hass.bus.async_listen.return_value.assert_not_called()
+        untrack_second()
+        assert hass.bus.async_listen.return_value.call_count == 3
+        assert not get_scheduler_storage(hass)._listeners
+
+    def test_untracked_index_rebuilt_on_lookup(self):
+        """Without any entry tracking it, the index is rebuilt on every lookup."""
+        hass = _hass()
+        er_patch, dr_patch, ar_patch = _registries(_registry())
+        with er_patch, dr_patch, ar_patch:
+            index = get_scheduler_index(hass)
+            index.options()
+            index.options()
+        assert index.builds == 2
+        hass.bus.async_listen.assert_not_called()
+
+
+class TestSchedulerSelection:
+    """Verify tag/area/label selections resolved through the index."""
+
+    def _registry(self) -> MagicMock:
+        return _registry([
+            _entry("switch.schedule_sdb", area_id="salle_de_bain", labels=["eco"]),
+            _entry("switch.schedule_cuisine", device_id="thermostat_cuisine", labels=["eco"]),
+        ])
+
+    def test_selection_options_listed_first(self):
+        """Selection options listed first."""
+        index = _index(_hass(), self._registry())
+        values = [option["value"] for option in index.options()]
+        assert values[:3] == ["tag:Bureau", "tag:Chauffage", "tag:Climatisation"]
+        assert "area:salle_de_bain" in values
+        assert "area:area_of_thermostat_cuisine" in values
+        assert "label:eco" in values
+
+    def test_resolve_mixed_selection(self):
+        """Resolve mixed selection."""
+        index = _index(_hass(), self._registry())
+        assert index.resolve(["tag:Climatisation", "label:eco", "switch.manual"]) == {
+            "switch.schedule_clim",
+            "switch.schedule_sdb",
+            "switch.schedule_cuisine",
+            "switch.manual",
+        }
+        assert index.resolve(["area:area_of_thermostat_cuisine"]) == {"switch.schedule_cuisine"}
+        assert index.resolve(["tag:Unknown"]) == frozenset()
+
+    def test_plain_entity_ids_do_not_build_index(self):
+        """Plain entity ids do not build index."""
+        index = get_scheduler_index(_hass())
+        assert index.resolve(["switch.a", "switch.b"]) == {"switch.a", "switch.b"}
+        assert index.builds == 0
+
+    def test_resolution_memoized_until_rebuild(self):
+        """Resolution memoized until rebuild."""
+        index = _index(_hass(), self._registry())
+        first = index.resolve(["tag:Chauffage"])
+        assert index.resolve(["tag:Chauffage"]) is first
+
+    def test_scheduler_plan_uses_tag_selection(self):
+        """Scheduler plan uses tag selection."""
+        hass = _hass()
+        index = _index(hass, self._registry())
+        to_enable, to_disable = plan_scheduler_changes(
+            hass,
+            {"Travail": ["tag:Chauffage"], "Maison": ["label:eco"]},
+            "Travail",
+            "Heating",
+            {},
+        )
+        assert to_enable == {"switch.schedule_salon", "switch.schedule_bureau"}
+        assert to_disable == {"switch.schedule_sdb", "switch.schedule_cuisine"}
+        assert index.builds == 1
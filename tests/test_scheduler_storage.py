@@ -0,0 +1,263 @@
+"""Tests for the scheduler storage file reader."""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.homeshift.const import DATA_SCHEDULER_STORAGE, DOMAIN, THERMOSTAT_OFF_KEY
+from custom_components.homeshift.scheduler_storage import (
+    SchedulerStorage,
+    TimeSlot,
+    get_scheduler_storage,
+    parse_scheduler_storage,
+)
+from custom_components.homeshift.schedulers import plan_scheduler_changes
+
+from .conftest import make_mock_hass
+
+DEV_STORAGE = Path(__file__).parent.parent / ".devcontainer" / "scheduler.storage"
+
+
+def _slot(start, stop, actions=("climate.salon",), conditions=None, condition_type=None) -> dict:
+    return {
+        "start": start,
+        "stop": stop,
+        "conditions": conditions or [],
+        "condition_type": condition_type,
+        "actions": [{"service": "climate.set_temperature", "entity_id": target} for target in actions],
+    }
+
+
+def _raw(schedules: list[dict], tags: dict[str, list[str]] | None = None) -> dict:
+    return {
+        "version": 1,
+        "data": {
+            "schedules": schedules,
+            "tags": [{"name": name, "schedules": ids} for name, ids in (tags or {}).items()],
+        },
+    }
+
+
+def _schedule(schedule_id, timeslots, weekdays=("daily",)) -> dict:
+    return {"schedule_id": schedule_id, "name": schedule_id, "weekdays": list(weekdays), "timeslots": timeslots, "enabled": True}
+
+
+def _mode_is(value: str) -> list[dict]:
+    return [{"entity_id": "input_select.mode_thermostat", "attribute": "state", "value": value, "match_type": "is"}]
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+class TestParseSchedulerStorage:
+    """Verify parsing and indexing of the storage content."""
+
+    def test_parses_devcontainer_storage(self):
+        """Parses the sample storage shipped with the devcontainer."""
+        data = parse_scheduler_storage(json.loads(DEV_STORAGE.read_text(encoding="utf-8")))
+        assert len(data.schedules) == 24
+        assert len(data.by_tag["Chauffage"]) == 17
+        assert "Volet" in data.tags_of("switch.schedule_ea9150")
+        # Every sample schedule is "daily"
+        assert all(len(data.by_weekday[day]) == 24 for day in range(7))
+
+    def test_devcontainer_modes_have_no_conflicts(self):
+        """Heating/cooling schedules guarded by the thermostat mode do not conflict."""
+        data = parse_scheduler_storage(json.loads(DEV_STORAGE.read_text(encoding="utf-8")))
+        for mode in ("Maison", "Travail", "Télétravail", "Absence"):
+            assert data.conflicts(data.by_tag[mode]) == []
+
+    def test_weekday_keywords(self):
+        """Workday and weekend keywords expand to their days."""
+        data = parse_scheduler_storage(
+            _raw([_schedule("a", [], ["workday"]), _schedule("b", [], ["weekend"]), _schedule("c", [], ["mon", "sun"])])
+        )
+        assert data.schedules["a"].weekdays == frozenset(range(5))
+        assert data.by_weekday[5] == {"switch.schedule_b"}
+        assert data.by_weekday[6] == {"switch.schedule_b", "switch.schedule_c"}
+
+    def test_stop_at_midnight_means_end_of_day(self):
+        """A stop at or before the start runs until midnight."""
+        assert TimeSlot(15 * 60 + 30, 0).end == 24 * 60
+        assert TimeSlot(15 * 60 + 30, 0).overlaps(TimeSlot(23 * 60, 23 * 60 + 30))
+
+    def test_entity_id_mapper(self):
+        """Schedule ids are mapped through the given callable."""
+        data = parse_scheduler_storage(_raw([_schedule("a", [])]), lambda schedule_id: f"switch.renamed_{schedule_id}")
+        assert "switch.renamed_a" in data.by_entity
+
+
+class TestConflicts:
+    """Verify overlap detection between schedules."""
+
+    def test_overlapping_slots_on_same_target(self):
+        """Overlapping unconditioned slots on one entity conflict."""
+        data = parse_scheduler_storage(
+            _raw([_schedule("a", [_slot("06:00:00", "09:00:00")]), _schedule("b", [_slot("08:00:00", "10:00:00")])])
+        )
+        assert data.conflicts({"switch.schedule_a", "switch.schedule_b"}) == [
+            ("switch.schedule_a", "switch.schedule_b", "climate.salon")
+        ]
+
+    def test_no_conflict_for_other_target_day_or_time(self):
+        """Different targets, days or times do not conflict."""
+        data = parse_scheduler_storage(
+            _raw(
+                [
+                    _schedule("a", [_slot("06:00:00", "09:00:00")], ["workday"]),
+                    _schedule("b", [_slot("06:00:00", "09:00:00", ["climate.bureau"])]),
+                    _schedule("c", [_slot("06:00:00", "09:00:00")], ["weekend"]),
+                    _schedule("d", [_slot("09:00:00", "12:00:00")], ["workday"]),
+                ]
+            )
+        )
+        assert data.conflicts(set(data.by_entity)) == []
+
+    def test_exclusive_conditions_do_not_conflict(self):
+        """Slots requiring different values of one entity never run together."""
+        data = parse_scheduler_storage(
+            _raw(
+                [
+                    _schedule("a", [_slot("06:00:00", "09:00:00", conditions=_mode_is("Chauffage"))]),
+                    _schedule("b", [_slot("06:00:00", "09:00:00", conditions=_mode_is("Climatisation"))]),
+                    _schedule("c", [_slot("06:00:00", "09:00:00", conditions=_mode_is("Chauffage"))]),
+                ]
+            )
+        )
+        assert data.conflicts(set(data.by_entity)) == [("switch.schedule_a", "switch.schedule_c", "climate.salon")]
+
+    def test_or_conditions_are_not_exclusive(self):
+        """Conditions joined by "or" are not required individually."""
+        either = _mode_is("Chauffage") + _mode_is("Ventilation")
+        data = parse_scheduler_storage(
+            _raw(
+                [
+                    _schedule("a", [_slot("06:00:00", "09:00:00", conditions=either, condition_type="or")]),
+                    _schedule("b", [_slot("06:00:00", "09:00:00", conditions=_mode_is("Climatisation"))]),
+                ]
+            )
+        )
+        assert len(data.conflicts(set(data.by_entity))) == 1
+
+
+class TestSchedulerStorage:
+    """Verify loading, change detection and the shared instance."""
+
+    def _storage(self, tmp_path: Path) -> tuple[SchedulerStorage, Path, MagicMock]:
+        hass = make_mock_hass()
+        hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+        path = tmp_path / "scheduler.storage"
+        path.write_text(json.dumps(_raw([_schedule("a", [])], {"Chauffage": ["a"]})), encoding="utf-8")
+        return SchedulerStorage(hass, str(path)), path, hass
+
+    def _registry(self):
+        registry = MagicMock()
+        registry.async_get_entity_id.return_value = None
+        return patch("custom_components.homeshift.scheduler_storage.er.async_get", return_value=registry)
+
+    def test_reloads_only_when_modified(self, tmp_path):
+        """The file is parsed again only when its modification time changes."""
+        storage, path, _hass = self._storage(tmp_path)
+        listener = MagicMock()
+        storage.async_add_listener(listener)
+        with self._registry():
+            assert _run(storage.async_load()) is True
+            assert _run(storage.async_load()) is False
+            assert storage.data.tags_of("switch.schedule_a") == ("Chauffage",)
+
+            path.write_text(json.dumps(_raw([_schedule("a", [])], {"Salon": ["a"]})), encoding="utf-8")
+            stat = path.stat()
+            os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+            assert _run(storage.async_load()) is True
+        assert storage.loads == 2
+        assert listener.call_count == 2
+        assert storage.data.tags_of("switch.schedule_a") == ("Salon",)
+
+    def test_missing_file(self, tmp_path):
+        """A missing file leaves the storage unloaded."""
+        storage, path, _hass = self._storage(tmp_path)
+        path.unlink()
+        with self._registry():
+            assert _run(storage.async_load()) is False
+        assert not storage.loaded
+        assert storage.data is None
+
+    def test_removed_file_drops_data(self, tmp_path):
+        """Deleting the file clears the parsed data and notifies the listeners."""
+        storage, path, _hass = self._storage(tmp_path)
+        listener = MagicMock()
+        storage.async_add_listener(listener)
+        with self._registry():
+            _run(storage.async_load())
+            path.unlink()
+            assert _run(storage.async_load()) is True
+            assert _run(storage.async_load()) is False
+        assert storage.data is None
+        assert listener.call_count == 2
+
+        # The known modification time was reset, so a recreated file is read again
+        path.write_text(json.dumps(_raw([_schedule("b", [])])), encoding="utf-8")
+        with self._registry():
+            assert _run(storage.async_load()) is True
+        assert "switch.schedule_b" in storage.data.by_entity
+
+    def test_renamed_switch_from_registry(self, tmp_path):
+        """Schedule ids are mapped to their current entity id through the registry."""
+        storage, _path, _hass = self._storage(tmp_path)
+        registry = MagicMock()
+        registry.async_get_entity_id.return_value = "switch.chauffage_salon"
+        with patch("custom_components.homeshift.scheduler_storage.er.async_get", return_value=registry):
+            _run(storage.async_load())
+        registry.async_get_entity_id.assert_called_with("switch", "scheduler", "a")
+        assert storage.data.tags_of("switch.chauffage_salon") == ("Chauffage",)
+
+    def test_concurrent_track_starts_one_poller(self, tmp_path):
+        """Entries set up concurrently share a single poller, stopped with the last one."""
+        storage, _path, _hass = self._storage(tmp_path)
+        unsub = MagicMock()
+
+        async def _track_both():
+            return await asyncio.gather(storage.async_track(), storage.async_track())
+
+        with self._registry(), patch(
+            "custom_components.homeshift.scheduler_storage.async_track_time_interval", return_value=unsub
+        ) as track_interval:
+            untrack_first, untrack_second = _run(_track_both())
+        track_interval.assert_called_once()
+        untrack_first()
+        unsub.assert_not_called()
+        untrack_second()
+        unsub.assert_called_once()
+
+    def test_shared_instance(self):
+        """get_scheduler_storage returns one instance per hass."""
+        hass = make_mock_hass()
+        storage = get_scheduler_storage(hass)
+        assert get_scheduler_storage(hass) is storage
+        assert hass.data[DOMAIN][DATA_SCHEDULER_STORAGE] is storage
+
+
+class TestPlanWithStorage:
+    """Verify plan_scheduler_changes reads tags from the storage file."""
+
+    def test_off_uses_storage_tags(self):
+        """Thermostat Off force-disables schedulers tagged in the storage file."""
+        hass = make_mock_hass()
+        hass.states.get.return_value = None  # no state attributes at all
+        storage = get_scheduler_storage(hass)
+        storage._data = parse_scheduler_storage(
+            _raw([_schedule("a", []), _schedule("b", [])], {"Chauffage": ["a"]})
+        )
+        to_enable, to_disable = plan_scheduler_changes(
+            hass,
+            {"Maison": ["switch.schedule_a", "switch.schedule_b"]},
+            "Maison",
+            THERMOSTAT_OFF_KEY,
+            {"Heating": "Chauffage"},
+        )
+        assert to_enable == {"switch.schedule_b"}
+        assert to_disable == {"switch.schedule_a"}
@@ -0,0 +1,135 @@
+"""Tests for the configurable intra-day segments."""
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.homeshift.const import CONF_DAY_SEGMENTS, CONF_MODE_RULES, EVENT_PERIOD_ALL_DAY
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+from custom_components.homeshift.day_table import day_table
+from custom_components.homeshift.evaluation import CalendarEvaluation
+from custom_components.homeshift.rules import build_decision_table
+from custom_components.homeshift.segments import DEFAULT_SEGMENTS, classify_period, parse_day_segments
+from custom_components.homeshift.transitions import REASON_SEGMENT
+
+from .conftest import make_calendar_state, make_mock_entry, make_mock_hass
+
+PARIS = ZoneInfo("Europe/Paris")
+SEGMENTS = "night:00:00, morning:06:00, lunch:12:00, afternoon:13:30, evening:18:00"
+
+
+@pytest.fixture(autouse=True)
+def _paris():
+    """Run every test in the Europe/Paris time zone."""
+    dt_util.set_default_time_zone(PARIS)
+    yield
+    dt_util.set_default_time_zone(dt_util.UTC)
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 3, 4, hour, minute, tzinfo=PARIS)
+
+
+class TestParse:
+    """Verify the segment definitions."""
+
+    def test_sorted_by_start(self):
+        """Segments are ordered by start time."""
+        segments = parse_day_segments("evening:18:00, Morning:06:00")
+        assert [(segment.name, segment.start) for segment in segments] == [("morning", 360), ("evening", 1080)]
+
+    def test_invalid_falls_back_to_default(self):
+        """Duplicates, bad times and reserved names keep the morning / afternoon split."""
+        assert parse_day_segments("") == DEFAULT_SEGMENTS
+        assert parse_day_segments("a:08:00, a:10:00") == DEFAULT_SEGMENTS
+        assert parse_day_segments("a:25:00") == DEFAULT_SEGMENTS
+        assert parse_day_segments("all_day:08:00") == DEFAULT_SEGMENTS
+
+
+class TestPeriods:
+    """Verify how events map onto segments."""
+
+    def test_event_in_one_segment(self):
+        """An event within one segment takes its name, across several it is all-day."""
+        segments = parse_day_segments(SEGMENTS)
+        assert classify_period(segments, 12 * 60, 13 * 60) == "lunch"
+        assert classify_period(segments, 19 * 60, 0, days=1) == "evening"
+        assert classify_period(segments, 11 * 60, 13 * 60) == EVENT_PERIOD_ALL_DAY
+        assert classify_period(segments, 0, 0, days=1) == EVENT_PERIOD_ALL_DAY
+
+    def test_wrapping_segment(self):
+        """A segment before the first start belongs to the last one."""
+        segments = parse_day_segments("morning:06:00, evening:18:00")
+        assert classify_period(segments, 2 * 60, 5 * 60) == "evening"
+
+
+class TestTimeline:
+    """Verify the per-day segment timeline."""
+
+    def test_wrapping_timeline(self):
+        """The wrapping segment appears at both ends of the day."""
+        table = day_table(date(2026, 3, 4), PARIS, parse_day_segments("morning:06:00, evening:18:00"))
+        assert [segment.name for segment in table.segments] == ["evening", "morning", "evening"]
+        assert table.segment_at(dt_util.as_utc(_at(5))).name == "evening"
+        assert table.segment_start("evening") == dt_util.as_utc(_at(18))
+
+    def test_segment_rule(self):
+        """A segment condition resolves its own mode."""
+        segments = parse_day_segments(SEGMENTS)
+        table = build_decision_table(
+            "segment=evening,night => Home", {}, {}, "Maison", "Maison", "Travail", segments=segments
+        )
+        assert table.lookup(CalendarEvaluation(weekday=2, minute=19 * 60)) == "Home"
+        assert table.lookup(CalendarEvaluation(weekday=2, minute=3 * 60)) == "Home"
+        assert table.lookup(CalendarEvaluation(weekday=2, minute=10 * 60)) == "Travail"
+
+
+class TestAlignedCoordinator:
+    """Verify events applied to whole segments by the coordinator."""
+
+    EVENTS = [{"summary": "Télétravail", "start": "2026-03-04T09:00:00+01:00", "end": "2026-03-04T11:00:00+01:00"}]
+
+    def _update(self, now: datetime, rules: str = ""):
+        hass = make_mock_hass()
+        hass.services.async_call.return_value = {"calendar.teletravail": {"events": self.EVENTS}}
+        calendar_state = make_calendar_state("off")
+        hass.states.get.side_effect = lambda entity_id: calendar_state if entity_id == "calendar.teletravail" else None
+        entry = make_mock_entry()
+        entry.data[CONF_DAY_SEGMENTS] = SEGMENTS
+        entry.data[CONF_MODE_RULES] = rules
+        coordinator = HomeShiftCoordinator(hass, entry)
+        with (
+            patch("custom_components.homeshift.coordinator.dt_util") as mock_dt,
+            patch("custom_components.homeshift.coordinator.async_track_point_in_utc_time"),
+        ):
+            mock_dt.now.return_value = now
+            asyncio.get_event_loop().run_until_complete(coordinator.async_update_data())
+        return coordinator
+
+    def test_event_covers_its_segment(self):
+        """Before the event starts, its segment already takes the event mode."""
+        coordinator = self._update(_at(7))
+        assert coordinator.day_mode == "Télétravail"
+        assert coordinator.event_period == "morning"
+
+    def test_transition_at_segment_edge(self):
+        """The mode changes at the end of the segment, not at the end of the event."""
+        transition = self._update(_at(7)).next_transition
+        assert (transition.at, transition.reason, transition.target) == (dt_util.as_utc(_at(12)), REASON_SEGMENT, "Travail")
+
+    def test_segment_timeline(self):
+        """Each segment of the day is listed with its resolved mode."""
+        timeline = self._update(_at(7), "segment=evening,night => Home").segment_timeline
+        assert [(segment["segment"], segment["mode"]) for segment in timeline] == [
+            ("night", "Maison"),
+            ("morning", "Télétravail"),
+            ("lunch", "Travail"),
+            ("afternoon", "Travail"),
+            ("evening", "Maison"),
+        ]
+        assert timeline[1]["start"] == "2026-03-04T06:00:00+01:00"
@@ -0,0 +1,120 @@
+"""Tests for the on-disk event timeline snapshot."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+from custom_components.homeshift.snapshot import decode_spans, encode_spans
+from custom_components.homeshift.transitions import REASON_EVENT_END, event_spans
+
+from .conftest import make_calendar_state, make_mock_entry, make_mock_hass
+
+PARIS = ZoneInfo("Europe/Paris")
+EVENTS = [
+    {"summary": "Télétravail", "start": "2026-03-04T13:00:00+01:00", "end": "2026-03-04T18:00:00+01:00"},
+]
+
+
+@pytest.fixture(autouse=True)
+def _paris():
+    """Run every test in the Europe/Paris time zone."""
+    dt_util.set_default_time_zone(PARIS)
+    yield
+    dt_util.set_default_time_zone(dt_util.UTC)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 3, 4, hour, minute, tzinfo=PARIS)
+
+
+def _coordinator(states: dict) -> HomeShiftCoordinator:
+    hass = make_mock_hass()
+    hass.services.async_call.return_value = {"calendar.teletravail": {"events": EVENTS}}
+    hass.states.get.side_effect = states.get
+    return HomeShiftCoordinator(hass, make_mock_entry())
+
+
+def _update(coordinator: HomeShiftCoordinator, now: datetime) -> None:
+    with (
+        patch("custom_components.homeshift.coordinator.dt_util") as mock_dt,
+        patch("custom_components.homeshift.coordinator.async_track_point_in_utc_time"),
+    ):
+        mock_dt.now.return_value = now
+        _run(coordinator.async_update_data())
+
+
+class TestEncoding:
+    """Verify the compact row format."""
+
+    def test_round_trip(self):
+        """Spans survive encoding as epoch-second rows."""
+        spans = event_spans(EVENTS)
+        rows = encode_spans(spans)
+        assert rows == [[1772625600, 1772643600, "Télétravail", "télétravail"]]
+        assert decode_spans(rows) == spans
+        assert decode_spans(rows)[0].start.tzinfo is timezone.utc
+
+    def test_malformed_rows_are_skipped(self):
+        """Rows of the wrong shape or type are ignored."""
+        assert decode_spans([[1, 2, "a"], ["x", 2, "a", ""], None]) == []
+
+
+class TestOutage:
+    """Verify the coordinator keeps following the timeline while the calendar is down."""
+
+    def test_unavailable_calendar_uses_last_timeline(self):
+        """The running event still drives the mode and its end stays predicted."""
+        states = {"calendar.teletravail": make_calendar_state("off")}
+        coordinator = _coordinator(states)
+        _update(coordinator, _at(8))
+        assert coordinator.timeline["stale"] is False
+        states["calendar.teletravail"] = make_calendar_state("unavailable")
+        _update(coordinator, _at(14))
+        assert coordinator.day_mode == "Télétravail"
+        assert coordinator.current_event == "Télétravail"
+        assert coordinator.next_transition.reason == REASON_EVENT_END
+        assert coordinator.timeline["stale"] is True
+        assert coordinator.timeline["source"] == "calendar"
+
+    def test_missing_calendar_without_timeline(self):
+        """Without any timeline a missing calendar leaves the mode untouched."""
+        coordinator = _coordinator({})
+        _update(coordinator, _at(14))
+        assert coordinator.day_mode == "Maison"
+        assert coordinator.timeline is None
+
+    def test_restored_snapshot_after_restart(self):
+        """Events restored from disk apply before the calendar entity is loaded."""
+        coordinator = _coordinator({})
+        coordinator._snapshot.async_load = AsyncMock(return_value=(event_spans(EVENTS), _at(7)))
+        _run(coordinator.async_load_snapshot())
+        _update(coordinator, _at(14))
+        assert coordinator.day_mode == "Télétravail"
+        assert coordinator.timeline == {
+            "source": "snapshot",
+            "fetched_at": _at(7).isoformat(),
+            "stale": True,
+            "events": 1,
+        }
+
+    def test_fetch_saves_snapshot(self):
+        """A successful fetch schedules one compact write once the snapshot is loaded."""
+        coordinator = _coordinator({"calendar.teletravail": make_calendar_state("off")})
+        coordinator._snapshot._store = MagicMock()
+        coordinator._snapshot._store.async_load = AsyncMock(return_value=None)
+        _run(coordinator.async_load_snapshot())
+        _update(coordinator, _at(8))
+        coordinator._snapshot._store.async_delay_save.assert_called_once()
+        data = coordinator._snapshot._store.async_delay_save.call_args.args[0]()
+        assert data["spans"] == encode_spans(event_spans(EVENTS))
+        assert data["fetched_at"] == "2026-03-04T07:00:00+00:00"
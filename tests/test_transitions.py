@@ -0,0 +1,148 @@
+"""Tests for the next-transition predictor."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+from custom_components.homeshift.transitions import (
+    REASON_EVENT_END,
+    REASON_EVENT_START,
+    REASON_SEGMENT,
+    REASON_MIDNIGHT,
+    REASON_OVERRIDE_END,
+    event_spans,
+    predict_next_transition,
+    transition_candidates,
+)
+
+from .conftest import make_calendar_state, make_mock_entry, make_mock_hass
+
+PARIS = ZoneInfo("Europe/Paris")
+EVENTS = [
+    {"summary": "Télétravail", "start": "2026-03-04T13:00:00+01:00", "end": "2026-03-04T18:00:00+01:00"},
+    {"summary": "Vacances", "start": "2026-03-05", "end": "2026-03-06"},
+]
+
+
+@pytest.fixture(autouse=True)
+def _paris():
+    """Run every test in the Europe/Paris time zone."""
+    dt_util.set_default_time_zone(PARIS)
+    yield
+    dt_util.set_default_time_zone(dt_util.UTC)
+
+
+def _run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def _at(hour: int, minute: int = 0, day: int = 4) -> datetime:
+    return datetime(2026, 3, day, hour, minute, tzinfo=PARIS)
+
+
+class TestCandidates:
+    """Verify the candidate instants."""
+
+    def test_candidates_until_midnight(self):
+        """Segment starts, event boundaries and midnight are listed in order."""
+        candidates = transition_candidates(_at(8), event_spans(EVENTS))
+        assert candidates == [
+            (_at(13), REASON_SEGMENT),
+            (_at(13), REASON_EVENT_START),
+            (_at(18), REASON_EVENT_END),
+            (_at(0, day=5), REASON_MIDNIGHT),
+        ]
+
+    def test_past_boundaries_are_dropped(self):
+        """Instants at or before now are not candidates."""
+        candidates = transition_candidates(_at(13), event_spans(EVENTS))
+        assert candidates == [(_at(18), REASON_EVENT_END), (_at(0, day=5), REASON_MIDNIGHT)]
+
+    def test_all_day_event_spans_local_days(self):
+        """A date-only event runs from local midnight to the next local midnight."""
+        span = event_spans(EVENTS)[1]
+        assert span.start == _at(0, day=5)
+        assert span.end == _at(0, day=6)
+
+
+class TestPredict:
+    """Verify the choice of the next transition."""
+
+    def test_skips_candidates_without_change(self):
+        """Candidates where no mode changes are skipped."""
+        modes = {_at(13): ("Télétravail",), _at(18): ("Travail",)}
+        transition = predict_next_transition(
+            _at(8), event_spans(EVENTS), ("Travail",), lambda at: modes.get(at, ("Travail",))
+        )
+        assert (transition.at, transition.reason, transition.target) == (_at(13), REASON_SEGMENT, "Télétravail")
+
+    def test_midnight_is_always_kept(self):
+        """Midnight is returned even when the mode does not change."""
+        transition = predict_next_transition(_at(19), [], ("Travail",), lambda at: ("Travail",))
+        assert transition.reason == REASON_MIDNIGHT
+        assert transition.as_dict() == {"at": "2026-03-05T00:00:00+01:00", "reason": REASON_MIDNIGHT, "target": "Travail"}
+
+    def test_override_expiry_comes_first(self):
+        """An active override makes its expiry the next transition."""
+        transition = predict_next_transition(
+            _at(8), event_spans(EVENTS), ("Maison",), lambda at: ("Travail",), override_until=_at(9)
+        )
+        assert (transition.at, transition.reason, transition.target) == (_at(9), REASON_OVERRIDE_END, "Travail")
+
+
+class TestCoordinatorTransition:
+    """Verify the coordinator exposes the transition and arms one timer."""
+
+    def _update(self, now: datetime, calendar_state=None):
+        hass = make_mock_hass()
+        hass.services.async_call.return_value = {"calendar.teletravail": {"events": EVENTS}}
+        calendar_state = calendar_state or make_calendar_state("off")
+        hass.states.get.side_effect = lambda entity_id: calendar_state if entity_id == "calendar.teletravail" else None
+        coordinator = HomeShiftCoordinator(hass, make_mock_entry())
+        with (
+            patch("custom_components.homeshift.coordinator.dt_util") as mock_dt,
+            patch("custom_components.homeshift.coordinator.async_track_point_in_utc_time") as mock_track,
+        ):
+            mock_dt.now.return_value = now
+            _run(coordinator.async_update_data())
+            _run(coordinator.async_update_data())
+        return coordinator, mock_track
+
+    def test_next_event_start(self):
+        """The remote-work event start is predicted with its target mode."""
+        coordinator, mock_track = self._update(_at(8))
+        transition = coordinator.next_transition
+        assert transition.at == _at(13)
+        assert transition.target == "Télétravail"
+        # One timer per update, the previous one being cancelled
+        assert mock_track.call_count == 2
+        mock_track.return_value.assert_called_once()
+        assert mock_track.call_args.args[2] == _at(13) + timedelta(seconds=1)
+
+    def test_event_end(self):
+        """During the event, its end brings the default mode back."""
+        coordinator, _mock_track = self._update(
+            _at(14), make_calendar_state("on", "Télétravail", "2026-03-04 13:00:00", "2026-03-04 18:00:00")
+        )
+        assert coordinator.day_mode == "Télétravail"
+        transition = coordinator.next_transition
+        assert (transition.at, transition.reason, transition.target) == (_at(18), REASON_EVENT_END, "Travail")
+
+    def test_vacation_day_after(self):
+        """After the last event of the day, midnight leads to the vacation mode."""
+        coordinator, _mock_track = self._update(_at(19))
+        transition = coordinator.next_transition
+        assert (transition.at, transition.reason, transition.target) == (_at(0, day=5), REASON_MIDNIGHT, "Maison")
+
+    def test_result_attribute(self):
+        """The transition is part of the coordinator data."""
+        coordinator, _mock_track = self._update(_at(8))
+        result = coordinator._build_result()
+        assert result["next_transition"]["reason"] == REASON_SEGMENT
+        assert result["next_transition"]["target"] == "Télétravail"
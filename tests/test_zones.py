@@ -0,0 +1,194 @@
+"""Tests for per-zone day modes driven by a single shared calendar evaluation."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+from custom_components.homeshift.const import (
+    CONF_EVENT_MATCH_FOLD_ACCENTS,
+    CONF_ZONES,
+    PRESENCE_ALL_AWAY,
+    PRESENCE_SOMEONE_HOME,
+)
+from custom_components.homeshift.coordinator import HomeShiftCoordinator
+from custom_components.homeshift.evaluation import CalendarEvaluation
+
+from .conftest import make_mock_hass, make_mock_entry, make_calendar_state
+
+ZONES = {
+    "Bureau": {
+        "day_mode_map": "Work:Fermé, Remote:Occupé, Home:Ouvert, Absence:Hors-gel",
+        "schedulers_per_mode": {
+            "Fermé": ["switch.schedule_bureau_ferme"],
+            "Occupé": ["switch.schedule_bureau_occupe"],
+        },
+    },
+    "Chambres": {
+        "mode_default": "Home",
+        "schedulers_per_mode": {"Maison": ["switch.schedule_chambres"]},
+    },
+}
+
+
+def _coordinator(hass, zones=None) -> HomeShiftCoordinator:
+    entry = make_mock_entry()
+    entry.data[CONF_ZONES] = zones if zones is not None else ZONES
+    return HomeShiftCoordinator(hass, entry)
+
+
+def _update(coordinator: HomeShiftCoordinator, now: datetime) -> dict:
+    with patch("custom_components.homeshift.coordinator.dt_util") as mock_dt:
+        mock_dt.now.return_value = now
+        return asyncio.get_event_loop().run_until_complete(coordinator.async_update_data())
+
+
+class TestZoneConfiguration:
+    """Verify zone parsing and inheritance from the entry configuration."""
+
+    def test_zones_built_from_config(self):
+        """Zones built from config."""
+        coordinator = _coordinator(make_mock_hass())
+        assert list(coordinator.zones) == ["Bureau", "Chambres"]
+        assert coordinator.zones["Bureau"].day_modes == ["Fermé", "Occupé", "Ouvert", "Hors-gel"]
+
+    def test_missing_settings_inherited(self):
+        """Missing settings inherited."""
+        coordinator = _coordinator(make_mock_hass())
+        assert coordinator.zones["Chambres"].day_modes == coordinator.day_modes
+
+    def test_entry_schedulers_not_inherited(self):
+        """Entry schedulers not inherited."""
+        hass = make_mock_hass()
+        entry = make_mock_entry(schedulers_per_mode={"Travail": ["switch.entry_only"]})
+        entry.data[CONF_ZONES] = {"Salon": {}}
+        coordinator = HomeShiftCoordinator(hass, entry)
+        assert not coordinator.zones["Salon"].schedulers_per_mode
+
+    def test_invalid_zone_config_ignored(self):
+        """Invalid zone config ignored."""
+        coordinator = _coordinator(make_mock_hass(), zones={"Bad": "not a mapping", "Good": {}})
+        assert list(coordinator.zones) == ["Good"]
+
+    def test_zones_in_result(self):
+        """Zones in result."""
+        hass = make_mock_hass()
+        hass.states.get.return_value = make_calendar_state(state="off")
+        result = _update(_coordinator(hass), datetime(2026, 3, 4, 10, 0, 0))
+        assert result["zones"] == {"Bureau": "Fermé", "Chambres": "Maison"}
+
+
+class TestZoneEvaluation:
+    """Verify that every zone resolves its own mode from one calendar read."""
+
+    def test_remote_event_drives_each_zone(self):
+        """Remote event drives each zone."""
+        hass = make_mock_hass()
+        hass.states.get.return_value = make_calendar_state(
+            state="on", message="Télétravail",
+            start_time="2026-03-04 00:00:00", end_time="2026-03-05 00:00:00",
+        )
+        coordinator = _coordinator(hass)
+        _update(coordinator, datetime(2026, 3, 4, 10, 0, 0))
+
+        assert coordinator.day_mode == "Télétravail"
+        assert coordinator.zones["Bureau"].day_mode == "Occupé"
+        assert coordinator.zones["Chambres"].day_mode == "Télétravail"
+
+    def test_zone_keyword_matched_in_event_text(self):
+        """A zone keyword only contained in the event summary still matches, accents folded."""
+        hass = make_mock_hass()
+        hass.states.get.return_value = make_calendar_state(
+            state="on", message="Réunion Portes ouvertes au 2e étage",
+            start_time="2026-03-04 00:00:00", end_time="2026-03-05 00:00:00",
+        )
+        zones = {"Bureau": {**ZONES["Bureau"], "event_mode_map": "portes ouvertes:Home"}}
+        entry = make_mock_entry()
+        entry.data[CONF_ZONES] = zones
+        entry.data[CONF_EVENT_MATCH_FOLD_ACCENTS] = True
+        coordinator = HomeShiftCoordinator(hass, entry)
+        _update(coordinator, datetime(2026, 3, 4, 10, 0, 0))
+
+        assert coordinator.zones["Bureau"].day_mode == "Ouvert"
+
+    def test_calendar_read_once_regardless_of_zone_count(self):
+        """Calendar read once regardless of zone count."""
+        hass = make_mock_hass()
+        hass.states.get.return_value = make_calendar_state(state="off")
+        many_zones = {f"Zone {i}": {} for i in range(20)}
+        _update(_coordinator(hass, zones=many_zones), datetime(2026, 3, 4, 10, 0, 0))
+
+        calendar_reads = [c for c in hass.states.get.call_args_list if c.args[0] == "calendar.teletravail"]
+        assert len(calendar_reads) == 1
+
+    def test_zone_change_refreshes_only_zone_schedulers(self):
+        """Zone change refreshes only zone schedulers."""
+        hass = make_mock_hass()
+        hass.states.get.return_value = make_calendar_state(
+            state="on", message="Télétravail",
+            start_time="2026-03-04 00:00:00", end_time="2026-03-05 00:00:00",
+        )
+        coordinator = _coordinator(hass)
+        coordinator.day_mode = "Télétravail"
+        _update(coordinator, datetime(2026, 3, 4, 10, 0, 0))
+
+        on_calls = [c for c in hass.services.async_call.call_args_list if c.args[1] == "turn_on"]
+        assert [c.args[2]["entity_id"] for c in on_calls] == [["switch.schedule_bureau_occupe"]]
+
+    def test_zone_absence_blocks_auto_update(self):
+        """Zone absence blocks auto update."""
+        hass = make_mock_hass()
+        hass.states.get.return_value = make_calendar_state(state="off")
+        coordinator = _coordinator(hass)
+        coordinator.zones["Bureau"].day_mode = "Hors-gel"
+        _update(coordinator, datetime(2026, 3, 4, 10, 0, 0))
+        assert coordinator.zones["Bureau"].day_mode == "Hors-gel"
+
+    def test_rule_absence_kept_when_someone_home(self):
+        """An absence not caused by presence is not left automatically."""
+        zone = _coordinator(make_mock_hass()).zones["Bureau"]
+        now = datetime(2026, 3, 4, 10, 0, 0)
+        zone.determine_mode = lambda evaluation: "Hors-gel"
+        assert zone.apply_evaluation(CalendarEvaluation(presence=PRESENCE_SOMEONE_HOME), now)
+        zone.determine_mode = lambda evaluation: "Fermé"
+        assert not zone.apply_evaluation(CalendarEvaluation(presence=PRESENCE_SOMEONE_HOME), now)
+        assert zone.day_mode == "Hors-gel"
+
+    def test_presence_absence_left_automatically(self):
+        """An absence entered because everyone left ends with the next evaluation."""
+        zone = _coordinator(make_mock_hass()).zones["Bureau"]
+        now = datetime(2026, 3, 4, 10, 0, 0)
+        zone.determine_mode = lambda evaluation: "Hors-gel"
+        assert zone.apply_evaluation(CalendarEvaluation(presence=PRESENCE_ALL_AWAY), now)
+        zone.determine_mode = lambda evaluation: "Fermé"
+        assert zone.apply_evaluation(CalendarEvaluation(presence=PRESENCE_SOMEONE_HOME), now)
+        assert zone.day_mode == "Fermé"
+
+
+class TestZoneManualChange:
+    """Verify manual zone changes and their override."""
+
+    def test_manual_change_by_key(self):
+        """Manual change by key."""
+        hass = make_mock_hass()
+        coordinator = _coordinator(hass)
+        with patch("custom_components.homeshift.coordinator.dt_util") as mock_dt:
+            mock_dt.now.return_value = datetime(2026, 3, 4, 9, 0, 0)
+            asyncio.get_event_loop().run_until_complete(coordinator.async_set_zone_day_mode("Bureau", "remote"))
+        assert coordinator.zones["Bureau"].day_mode == "Occupé"
+        assert coordinator.day_mode == coordinator.day_modes[0]
+
+    def test_manual_override_blocks_zone_auto_update(self):
+        """Manual override blocks zone auto update."""
+        hass = make_mock_hass()
+        hass.states.get.return_value = make_calendar_state(state="off")
+        coordinator = _coordinator(hass)
+        coordinator.set_override_duration_minutes(60)
+        with patch("custom_components.homeshift.coordinator.dt_util") as mock_dt:
+            mock_dt.now.return_value = datetime(2026, 3, 4, 9, 0, 0)
+            asyncio.get_event_loop().run_until_complete(coordinator.async_set_zone_day_mode("Bureau", "Occupé"))
+
+        _update(coordinator, datetime(2026, 3, 4, 9, 30, 0))
+        assert coordinator.zones["Bureau"].day_mode == "Occupé"
+        _update(coordinator, datetime(2026, 3, 4, 10, 1, 0))
+        assert coordinator.zones["Bureau"].day_mode == "Fermé"